@@ -0,0 +1,86 @@
+"""
+Compara a extração serial e paralela de PDFs.
+
+Uso:
+    python scripts/benchmark_extracao_pdf.py [--paginas 1000] [--processos 0]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+projeto_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(projeto_dir / "src"))
+
+import fitz  # noqa: E402
+
+from peticionador.servicos.extrator_pdf import (  # noqa: E402
+    _resolver_num_processos,
+    extrair_texto_pdf_separado,
+)
+
+PARAGRAFO = (
+    "O recorrente sustenta violação ao art. 619 do Código de Processo Penal, "
+    "alegando omissão no acórdão quanto às teses defensivas. Requer a reforma "
+    "do julgado e o reconhecimento da nulidade apontada. "
+)
+
+
+def gerar_pdf_sintetico(caminho: Path, num_paginas: int) -> None:
+    documento = fitz.open()
+    for i in range(num_paginas):
+        pagina = documento.new_page()
+        pagina.insert_text((72, 40), "PODER JUDICIÁRIO - TRIBUNAL DE JUSTIÇA")
+        pagina.insert_textbox(fitz.Rect(72, 72, 520, 760), PARAGRAFO * 12)
+        pagina.insert_text((280, 810), f"Folha {i + 1}")
+    documento.save(str(caminho))
+    documento.close()
+
+
+def medir(caminho: str, num_processos: int, repeticoes: int = 3) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        extrair_texto_pdf_separado(caminho, num_processos=num_processos, usar_cache=False)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def comparar(nome: str, caminho: str, processos: int) -> None:
+    with fitz.open(caminho) as documento:
+        num_paginas = len(documento)
+    serial = medir(caminho, 1)
+    paralelo = medir(caminho, processos)
+    print(
+        f"{nome:<22} {num_paginas:>6} págs | serial {serial:7.3f}s | "
+        f"paralelo ({processos} proc.) {paralelo:7.3f}s | ganho {serial / paralelo:5.2f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paginas", type=int, default=1000)
+    parser.add_argument("--processos", type=int, default=0)
+    args = parser.parse_args()
+
+    #  Força o caminho paralelo também para documentos pequenos
+    import peticionador.servicos.extrator_pdf as extrator_pdf
+
+    extrator_pdf.PDF_MINIMO_PAGINAS_PARALELO = 1
+    processos = _resolver_num_processos(args.processos)
+
+    exemplo = projeto_dir / "exemplo.pdf"
+    if exemplo.exists():
+        comparar("exemplo.pdf", str(exemplo), processos)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        sintetico = Path(pasta) / "sintetico.pdf"
+        gerar_pdf_sintetico(sintetico, args.paginas)
+        comparar(f"sintético ({args.paginas})", str(sintetico), processos)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONIOENCODING", "utf-8")
+    main()
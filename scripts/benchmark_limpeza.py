@@ -0,0 +1,73 @@
+"""
+Compara a vazão (MB/s) da limpeza de texto: implementação sequencial
+original (uma passada de re.sub por regra) x MotorLimpeza (varredura única).
+
+Uso:
+    python scripts/benchmark_limpeza.py [--mb 4] [--regras tjgo]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+projeto_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(projeto_dir / "src"))
+
+import fitz  # noqa: E402
+
+from peticionador.servicos.motor_limpeza import carregar_motor_limpeza  # noqa: E402
+from peticionador.servicos.preprocessador_pdf import limpar_texto_pdf_sequencial  # noqa: E402
+
+PAGINA_SINTETICA = (
+    "PODER JUDICIÁRIO\nTRIBUNAL DE JUSTIÇA DO ESTADO DE GOIÁS\n"
+    "O recorrente  sustenta violação ao art. 619 do Código de Processo Penal,\t"
+    "alegando omissão no acórdão quanto às teses defensivas.\n\n\n"
+    "Requer a reforma do julgado. MINUTA\nPágina 3 de 40\n"
+)
+
+
+def carregar_texto(mb: float) -> str:
+    exemplo = projeto_dir / "exemplo.pdf"
+    if exemplo.exists():
+        with fitz.open(str(exemplo)) as documento:
+            base = "".join(pagina.get_text() for pagina in documento)
+    else:
+        base = PAGINA_SINTETICA * 200
+    repeticoes = max(1, int(mb * 1024 * 1024 / len(base.encode("utf-8"))) + 1)
+    return base * repeticoes
+
+
+def medir(funcao: Callable[[str], str], texto: str, repeticoes: int = 3) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(texto)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=4.0)
+    parser.add_argument("--regras", default="tjgo")
+    args = parser.parse_args()
+
+    texto = carregar_texto(args.mb)
+    tamanho_mb = len(texto.encode("utf-8")) / (1024 * 1024)
+    motor = carregar_motor_limpeza(args.regras)
+
+    if args.regras == "tjgo" and motor.limpar(texto) != limpar_texto_pdf_sequencial(texto):
+        print("AVISO: resultados divergentes entre as implementações.")
+
+    sequencial = medir(limpar_texto_pdf_sequencial, texto)
+    unica = medir(motor.limpar, texto)
+    print(f"texto: {tamanho_mb:.1f} MB | regras: {args.regras} ({len(motor.regras)})")
+    print(f"sequencial (re.sub por regra) {tamanho_mb / sequencial:8.1f} MB/s")
+    print(f"MotorLimpeza (varredura única) {tamanho_mb / unica:8.1f} MB/s | ganho {sequencial / unica:5.2f}x")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONIOENCODING", "utf-8")
+    main()
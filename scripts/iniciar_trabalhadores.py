@@ -0,0 +1,84 @@
+"""
+Inicia os processos trabalhadores da fila de tarefas (fila_tarefas), que
+executam o processamento de petições e a geração de peças enfileirados
+por /tarefas/processar e /tarefas/gerar_peca.
+
+Os trabalhadores devem rodar no mesmo host do servidor web, que grava o
+banco (TAREFAS_ARQUIVO) e a pasta de uploads (TAREFAS_PASTA_ARQUIVOS) em
+disco local; o SQLite não é confiável em sistemas de arquivos de rede.
+Ctrl+C ou SIGTERM encerram os trabalhadores ao fim da tarefa em andamento.
+
+Uso:
+    python scripts/iniciar_trabalhadores.py [--processos 2] [--banco caminho.sqlite3]
+    python scripts/iniciar_trabalhadores.py --estatisticas
+    python scripts/iniciar_trabalhadores.py --reenfileirar ID
+    python scripts/iniciar_trabalhadores.py --expurgar [ID]
+"""
+import argparse
+import multiprocessing
+import signal
+import sys
+from pathlib import Path
+
+projeto_dir = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(projeto_dir / "src"))
+
+from peticionador.controladores.tarefas_peticao import executar_trabalhador  # noqa: E402
+from peticionador.servicos.fila_tarefas import FilaTarefas, obter_fila_tarefas  # noqa: E402
+from peticionador.utilitarios.configuracoes import TAREFAS_TRABALHADORES  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processos", type=int, default=TAREFAS_TRABALHADORES)
+    parser.add_argument("--banco", default=None, help="Banco SQLite da fila (padrão: TAREFAS_ARQUIVO)")
+    parser.add_argument("--estatisticas", action="store_true", help="Mostra as tarefas por estado e sai")
+    parser.add_argument("--reenfileirar", metavar="ID", help="Devolve uma tarefa descartada à fila e sai")
+    parser.add_argument(
+        "--expurgar", metavar="ID", nargs="?", const="",
+        help="Apaga a tarefa descartada ID (ou todas as descartadas) e seus arquivos e sai",
+    )
+    args = parser.parse_args()
+
+    fila = FilaTarefas(args.banco) if args.banco else obter_fila_tarefas()
+    if args.estatisticas:
+        print(fila.estatisticas())
+        return 0
+    if args.reenfileirar:
+        if not fila.reenfileirar(args.reenfileirar):
+            print(f"Tarefa {args.reenfileirar} não encontrada entre as descartadas.")
+            return 1
+        print(f"Tarefa {args.reenfileirar} reenfileirada.")
+        return 0
+    if args.expurgar is not None:
+        print(f"{fila.expurgar(args.expurgar or None)} tarefa(s) descartada(s) expurgada(s).")
+        return 0
+
+    parar = multiprocessing.Event()
+    processos = [
+        multiprocessing.Process(
+            target=executar_trabalhador, args=(args.banco, parar), name=f"trabalhador-{i + 1}"
+        )
+        for i in range(max(1, args.processos))
+    ]
+    #  Os filhos ignoram SIGINT: o encerramento é coordenado pelo evento parar
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for processo in processos:
+        processo.start()
+
+    def _encerrar(*_) -> None:
+        if not parar.is_set():
+            print("Encerrando os trabalhadores ao fim das tarefas em andamento...")
+            parar.set()
+
+    signal.signal(signal.SIGINT, _encerrar)
+    signal.signal(signal.SIGTERM, _encerrar)
+    print(f"{len(processos)} trabalhador(es) consumindo {fila.caminho_banco}. Ctrl+C para encerrar.")
+
+    for processo in processos:
+        processo.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# src/peticionador/agentes/agente_analise_combinada.py
+import logging
+from typing import Any, Dict, List, Optional
+
+from peticionador.agentes.agente_extrator import TIPOS_RECURSO_VALIDOS
+from peticionador.servicos.integrador_gemini import ClienteGemini, obter_cliente_gemini
+from peticionador.servicos.orcamento_tokens import obter_estimador
+from peticionador.utilitarios.configuracoes import ANALISE_COMBINADA_MAXIMO_TOKENS
+
+log = logging.getLogger(__name__)
+
+#  Esquema da resposta (ClienteGemini.gerar_json)
+ESQUEMA_ANALISE = {
+    "type": "object",
+    "properties": {
+        "recorrente": {"type": "string"},
+        "tipo_recurso": {"type": "string", "enum": TIPOS_RECURSO_VALIDOS},
+        "relatorio": {"type": "string"},
+        "teses": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["recorrente", "tipo_recurso", "relatorio", "teses"],
+}
+#  Limite de saída: um parágrafo de relatório e uma dezena de teses curtas
+MAXIMO_TOKENS_ANALISE = 2048
+
+
+def usar_analise_combinada(texto_completo: Optional[str], limite_tokens: Optional[int] = None) -> bool:
+    """
+    Indica se o texto é curto o bastante para a análise em uma única chamada.
+
+    limite_tokens (padrão: ANALISE_COMBINADA_MAXIMO_TOKENS) igual a 0 desliga o modo combinado.
+    """
+    if limite_tokens is None:
+        limite_tokens = ANALISE_COMBINADA_MAXIMO_TOKENS
+    if limite_tokens <= 0 or not (texto_completo or "").strip():
+        return False
+    return obter_estimador(ClienteGemini.DEFAULT_MODEL_FLASH).estimar(texto_completo) <= limite_tokens
+
+
+def _montar_analise(dados: Dict[str, Any], modelos_existentes: List[str]) -> Optional[Dict[str, Any]]:
+    """Converte a resposta validada no formato dos agentes separados; None se o relatório vier vazio."""
+    relatorio = dados["relatorio"].strip()
+    if not relatorio:
+        log.warning("Análise combinada retornou relatório vazio.")
+        return None
+    recorrente = dados["recorrente"].strip() or "Desconhecido"
+    sugeridas = [tese.strip() for tese in dados["teses"] if tese.strip()]
+    return {
+        "dados_iniciais": {"recorrente": recorrente, "tipo_recurso": dados["tipo_recurso"]},
+        "resumo": relatorio,
+        "teses": {"presentes": [t for t in sugeridas if t in modelos_existentes], "sugeridas": sugeridas},
+    }
+
+
+def analisar_recurso_combinado(
+    texto_primeira_pagina: Optional[str], texto_completo: str, modelos_existentes: List[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Faz em uma única chamada ao Gemini (Flash) o trabalho de
+    extrair_dados_iniciais_gemini, gerar_resumo_tecnico e sugerir_teses.
+
+    O texto do recurso é enviado uma só vez, em vez de uma vez por agente.
+
+    Retorna:
+        dict | None: {"dados_iniciais": {...}, "resumo": str, "teses": {"presentes": [...], "sugeridas": [...]}},
+        no mesmo formato dos agentes separados, ou None se a API falhar ou a
+        resposta não respeitar ESQUEMA_ANALISE; nesse caso o chamador deve
+        usar os agentes separados.
+    """
+    cliente = obter_cliente_gemini()
+    if cliente.model_instance is None:
+        log.error("Cliente Gemini (Flash) não instanciado corretamente. Análise combinada indisponível.")
+        return None
+
+    prompt = (
+        "Você é um Procurador de Justiça especializado na elaboração de contrarrazões para o Ministério Público. "
+        "Analise o recurso judicial brasileiro abaixo.\n\n"
+        "--- PRIMEIRA PÁGINA ---\n"
+        f"{texto_primeira_pagina or ''}\n"
+        "--- TEXTO INTEGRAL DO RECURSO ---\n"
+        f"{texto_completo}\n"
+        "--- FIM DO TEXTO ---\n\n"
+        "Preencha as chaves abaixo:\n"
+        '- "recorrente": nome completo da parte que interpôs o recurso, ou "Desconhecido".\n'
+        '- "tipo_recurso": "RE", "REsp", "Agravo" ou "Indeterminado" se não for claro.\n'
+        '- "relatorio": breve relatório introdutório para as contrarrazões, no estilo formal do Ministério Público, '
+        "sucinto, objetivo e impessoal, focado nos atos processuais relevantes (acórdãos, datas, artigos de lei e "
+        "súmulas invocados, fundamentos centrais do recurso), sem juízo de valor, terminando obrigatoriamente com "
+        '"É o sucinto relatório.".\n'
+        '- "teses": lista de teses de defesa concisas que o Ministério Público poderia usar contra os argumentos '
+        "do recorrente (ex: ausência de prequestionamento, Súmula 7/STJ, Súmula 284/STF, ausência de repercussão "
+        "geral, reexame de provas, e teses de mérito pertinentes), uma string por tese, ou lista vazia.\n"
+    )
+
+    log.info("Enviando prompt para Gemini (Flash) para análise combinada do recurso...")
+    dados = cliente.gerar_json(prompt, ESQUEMA_ANALISE, max_tokens=MAXIMO_TOKENS_ANALISE)
+    if dados is None:
+        log.warning("Análise combinada sem resposta utilizável da API.")
+        return None
+
+    analise = _montar_analise(dados, modelos_existentes)
+    if analise is not None:
+        log.info(f"Análise combinada concluída: {analise['dados_iniciais']}, {len(analise['teses']['sugeridas'])} teses.")
+    return analise
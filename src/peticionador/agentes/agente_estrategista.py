@@ -2,7 +2,8 @@
 import logging
 import json
 from typing import Dict, List, Optional
-from peticionador.servicos.integrador_gemini import ClienteGemini
+from peticionador.servicos.integrador_gemini import obter_cliente_gemini
+from peticionador.servicos.orcamento_tokens import SecaoPrompt
 
 log = logging.getLogger(__name__)
 
@@ -24,7 +25,7 @@ def sugerir_teses(
     teses_sugeridas_api = []
 
     # Usa Gemini Flash por padrão
-    cliente = ClienteGemini()  # Padrão Flash
+    cliente = obter_cliente_gemini()  # Padrão Flash
 
     tipo_extra = ""
     if tipo_recurso == "RE":
@@ -36,18 +37,23 @@ def sugerir_teses(
             "Priorize teses típicas de recursos especiais ao STJ, como violação à lei federal, Súmula 7/STJ, ausência de prequestionamento infraconstitucional, ou inépcia da argumentação recursal."
         )
 
-    prompt = (
-        "Você é um Procurador de Justiça especializado na elaboração de contrarrazões para o Ministério Público. "
-        f"{tipo_extra}\n\n"
-        "Analise o texto da petição de recurso a seguir:\n\n"
-        f"--- INÍCIO DO TEXTO ---\n{texto_peticao}\n--- FIM DO TEXTO ---\n\n"
-        "Com base nos argumentos apresentados pelo recorrente no texto acima, identifique as principais teses ou pontos levantados por ele. "
-        "Para cada argumento principal do recorrente, sugira uma ou mais teses de defesa concisas e aplicáveis que o Ministério Público poderia usar nas contrarrazões. "
-        "Priorize teses comuns em recursos especiais e extraordinários (ex: ausência de prequestionamento, Súmula 7/STJ, Súmula 284/STF, ausência de repercussão geral, reexame de provas, etc.), mas também sugira teses de mérito pertinentes.\n\n"
-        "Liste APENAS as teses de defesa sugeridas para o MP, uma por linha, sem numeração, marcadores ou explicações adicionais. Se nenhuma tese clara puder ser sugerida, retorne uma lista vazia.\n"
-    )
+    def _prompt(texto: str) -> str:
+        return (
+            "Você é um Procurador de Justiça especializado na elaboração de contrarrazões para o Ministério Público. "
+            f"{tipo_extra}\n\n"
+            "Analise o texto da petição de recurso a seguir:\n\n"
+            f"--- INÍCIO DO TEXTO ---\n{texto}\n--- FIM DO TEXTO ---\n\n"
+            "Com base nos argumentos apresentados pelo recorrente no texto acima, identifique as principais teses ou pontos levantados por ele. "
+            "Para cada argumento principal do recorrente, sugira uma ou mais teses de defesa concisas e aplicáveis que o Ministério Público poderia usar nas contrarrazões. "
+            "Priorize teses comuns em recursos especiais e extraordinários (ex: ausência de prequestionamento, Súmula 7/STJ, Súmula 284/STF, ausência de repercussão geral, reexame de provas, etc.), mas também sugira teses de mérito pertinentes.\n\n"
+            "Liste APENAS as teses de defesa sugeridas para o MP, uma por linha, sem numeração, marcadores ou explicações adicionais. Se nenhuma tese clara puder ser sugerida, retorne uma lista vazia.\n"
+        )
 
-    resposta = cliente.resumir(prompt)
+    # Petições longas perdem o miolo; abertura (fatos) e fecho (pedidos) ficam
+    ajustado = cliente.orcamento().ajustar(
+        [SecaoPrompt("peticao", texto_peticao, politica="meio")], texto_fixo=_prompt(""), rotulo="sugerir_teses"
+    )
+    resposta = cliente.resumir(_prompt(ajustado["peticao"]))
 
     if resposta:
         teses_brutas = [linha.strip() for linha in resposta.splitlines() if linha.strip()]
@@ -1,23 +1,57 @@
 # src/peticionador/agentes/agente_extrator.py
 import logging
-import json
-import re
 from typing import Dict, Optional
 
-from peticionador.servicos.integrador_gemini import ClienteGemini
+from peticionador.servicos.blocos_texto import BlocosTexto
+from peticionador.servicos.extrator_dados_locais import extrair_dados_locais, extrair_numero_cnj
+from peticionador.servicos.integrador_gemini import obter_cliente_gemini
+from peticionador.utilitarios.configuracoes import EXTRACAO_LOCAL_CONFIANCA_MINIMA
 
 logging.basicConfig(level=logging.INFO) # Considere mover para um config central de logging
 log = logging.getLogger(__name__)
 
+TIPOS_RECURSO_VALIDOS = ["RE", "REsp", "Agravo", "Indeterminado", "Desconhecido"]
+#  Esquema da resposta de extrair_dados_iniciais_gemini (ClienteGemini.gerar_json)
+ESQUEMA_DADOS_INICIAIS = {
+    "type": "object",
+    "properties": {
+        "recorrente": {"type": "string"},
+        "tipo_recurso": {"type": "string", "enum": TIPOS_RECURSO_VALIDOS},
+    },
+    "required": ["recorrente", "tipo_recurso"],
+}
+#  Um nome e um rótulo cabem com folga neste limite de saída
+MAXIMO_TOKENS_DADOS_INICIAIS = 128
+
 def extrair_numero_processo_cnj(texto: str) -> str:
     """
     Extrai o número de processo no formato CNJ (número único) do texto.
 
     Exemplo de formato válido: 0119841-30.2017.8.09.0175
     """
-    padrao = r"\b\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}\b"
-    resultado = re.search(padrao, texto)
-    return resultado.group(0) if resultado else "Não identificado"
+    return extrair_numero_cnj(texto) or "Não identificado"
+
+def extrair_dados_iniciais(
+    texto_pagina: Optional[str], blocos: Optional[BlocosTexto] = None, confianca_minima: Optional[float] = None
+) -> Dict[str, str]:
+    """
+    Extrai recorrente e tipo de recurso da primeira página.
+
+    Tenta primeiro as regras locais (extrator_dados_locais); o Gemini só é
+    chamado se a confiança local ficar abaixo de confianca_minima
+    (padrão: EXTRACAO_LOCAL_CONFIANCA_MINIMA).
+    """
+    if confianca_minima is None:
+        confianca_minima = EXTRACAO_LOCAL_CONFIANCA_MINIMA
+    dados_locais = extrair_dados_locais(texto_pagina, blocos)
+    if dados_locais.confianca >= confianca_minima:
+        log.info(f"Dados iniciais extraídos localmente (confiança {dados_locais.confianca:.2f}): {dados_locais.como_dicionario()}")
+        return dados_locais.como_dicionario()
+    log.info(
+        f"Confiança local {dados_locais.confianca:.2f} abaixo de {confianca_minima:.2f}; "
+        "usando Gemini para os dados iniciais."
+    )
+    return extrair_dados_iniciais_gemini(texto_pagina)
 
 def extrair_dados_iniciais_gemini(texto_pagina: Optional[str]) -> Dict[str, str]:
     dados_padrao = {"recorrente": "Desconhecido", "tipo_recurso": "Indeterminado"}
@@ -26,7 +60,7 @@ def extrair_dados_iniciais_gemini(texto_pagina: Optional[str]) -> Dict[str, str]
         log.warning("Texto da primeira página ausente para extração inicial. Retornando dados padrão.")
         return dados_padrao
 
-    cliente = ClienteGemini() # Usa o modelo FLASH por padrão
+    cliente = obter_cliente_gemini() # Usa o modelo FLASH por padrão
     
     # Verifique se a API Key está configurada e se o modelo foi instanciado
     if cliente.model_instance is None: # <--- MUDANÇA AQUI (de cliente.chat para cliente.model_instance)
@@ -39,63 +73,20 @@ def extrair_dados_iniciais_gemini(texto_pagina: Optional[str]) -> Dict[str, str]
         f"{texto_pagina}\n"
         "--- FIM DO TEXTO ---\n\n"
         "Sua tarefa é extrair DUAS informações:\n"
-        "1. O nome completo do RECORRENTE (a parte que interpôs o recurso).\n"
-        "2. O TIPO DE RECURSO principal mencionado (identifique como 'RE', 'REsp', 'Agravo' ou 'Indeterminado' se não for claro).\n\n"
-        "Responda APENAS no formato JSON, como no exemplo abaixo:\n"
-        "{\n"
-        '  "recorrente": "Nome Completo do Recorrente Encontrado",\n'
-        '  "tipo_recurso": "REsp"\n'
-        "}\n\n"
+        "1. recorrente: o nome completo do RECORRENTE (a parte que interpôs o recurso).\n"
+        "2. tipo_recurso: o TIPO DE RECURSO principal mencionado.\n\n"
         'Se não conseguir encontrar o nome do recorrente, use o valor "Desconhecido".\n'
-        'Se não conseguir identificar o tipo de recurso claramente como RE, REsp ou Agravo, use o valor "Indeterminado".\n'
-        "Não inclua nenhuma outra informação ou explicação na sua resposta, apenas o JSON."
+        'Se não conseguir identificar o tipo de recurso claramente como RE, REsp ou Agravo, use o valor "Indeterminado".'
     )
 
-    log.info("Enviando prompt para Gemini (Flash) para extração inicial de dados...")
-    # A função resumir() agora chama internamente gerar_conteudo()
-    # Para esta tarefa, a temperatura padrão do modelo flash deve ser suficiente.
-    resposta_api = cliente.resumir(prompt) 
-
-    if resposta_api:
-        log.debug(f"Resposta recebida da API Gemini para extração: {resposta_api[:200]}...") # Log truncado
-        if "[ERRO:" in resposta_api or "[CONTEÚDO BLOQUEADO PELA API:" in resposta_api or "[RESPOSTA INESPERADA OU VAZIA DA API GEMINI]" in resposta_api:
-            log.error(f"API Gemini retornou erro/bloqueio durante extração inicial: {resposta_api}")
-            return dados_padrao # Retorna padrão em caso de erro da API
-
-        try:
-            resposta_limpa = resposta_api.strip()
-            if resposta_limpa.startswith("```json"):
-                resposta_limpa = resposta_limpa[7:] 
-            if resposta_limpa.endswith("```"):
-                resposta_limpa = resposta_limpa[:-3] 
-            resposta_limpa = resposta_limpa.strip()
-
-            if not resposta_limpa: # Checa se a string ficou vazia após limpeza
-                log.warning("Resposta da API Gemini para extração inicial ficou vazia após limpeza.")
-                return dados_padrao
-
-            dados_extraidos = json.loads(resposta_limpa)
-
-            if isinstance(dados_extraidos, dict) and "recorrente" in dados_extraidos and "tipo_recurso" in dados_extraidos:
-                tipos_validos = ["RE", "REsp", "Agravo", "Indeterminado", "Desconhecido"]
-                if dados_extraidos.get("tipo_recurso") not in tipos_validos:
-                    log.warning(f"Tipo de recurso '{dados_extraidos.get('tipo_recurso')}' não reconhecido pela IA. Usando 'Indeterminado'.")
-                    dados_extraidos["tipo_recurso"] = "Indeterminado"
-                
-                # Garante que o recorrente não seja uma string vazia se a IA retornar assim
-                if not dados_extraidos.get("recorrente", "").strip():
-                    dados_extraidos["recorrente"] = "Desconhecido"
-
-                log.info(f"Dados extraídos com sucesso pelo Gemini: {dados_extraidos}")
-                return dados_extraidos
-            else:
-                log.warning(f"Formato JSON da resposta da API Gemini inesperado (extração inicial): {resposta_api}")
-        except json.JSONDecodeError as e:
-            log.error(f"Falha ao decodificar JSON da resposta da API Gemini (extração inicial): {e}\nResposta recebida:\n{resposta_api}")
-        except Exception as e:
-             log.error(f"Erro inesperado ao processar resposta da API Gemini (extração inicial): {e}\nResposta recebida:\n{resposta_api}")
-    else:
-        log.warning("API Gemini não retornou resposta para extração inicial.")
+    log.info("Enviando prompt para Gemini (Flash) para extração inicial de dados (saída JSON com esquema)...")
+    dados_extraidos = cliente.gerar_json(prompt, ESQUEMA_DADOS_INICIAIS, max_tokens=MAXIMO_TOKENS_DADOS_INICIAIS)
+    if dados_extraidos is None:
+        log.warning("Retornando dados padrão devido a falha na extração Gemini (extração inicial).")
+        return dados_padrao
 
-    log.warning("Retornando dados padrão devido a falha na extração Gemini (extração inicial).")
-    return dados_padrao
\ No newline at end of file
+    # Garante que o recorrente não seja uma string vazia se a IA retornar assim
+    if not dados_extraidos["recorrente"].strip():
+        dados_extraidos["recorrente"] = "Desconhecido"
+    log.info(f"Dados extraídos com sucesso pelo Gemini: {dados_extraidos}")
+    return dados_extraidos
@@ -1,19 +1,36 @@
 # src/peticionador/agentes/agente_gerador_peca.py
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional
-from peticionador.servicos.integrador_gemini import ClienteGemini
+from typing import Dict, Iterator, List, Optional, Tuple
+from peticionador.servicos.integrador_gemini import ClienteGemini, obter_cliente_gemini
+from peticionador.servicos.orcamento_tokens import SecaoPrompt
 
 log = logging.getLogger(__name__)
 
-def construir_minuta_com_ia(
-    resumo_tecnico: str, # Este é o "ANÁLISE COMPLETA DO RECURSO ADVERSÁRIO"
+#  Marcadores de falha que podem aparecer no texto da minuta (gerar_conteudo e gerar_conteudo_stream)
+MARCADORES_ERRO_MINUTA = (
+    "[ERRO:", "[ERRO INTERNO:", "[ERRO AO COMUNICAR COM API GEMINI:", "[FALHA NA GERAÇÃO PELA IA",
+    "[CONTEÚDO BLOQUEADO PELA API:", "[RESPOSTA INESPERADA OU VAZIA DA API GEMINI]",
+)
+
+
+def minuta_com_erro(minuta: Optional[str]) -> bool:
+    """Indica se o texto da minuta é (ou contém) uma mensagem de falha da IA."""
+    return minuta is None or any(marcador in minuta for marcador in MARCADORES_ERRO_MINUTA)
+
+
+def _preparar_minuta(
+    resumo_tecnico: str,
     teses_selecionadas: List[str],
     modelo_base_path: Path,
     dados_processo: Dict[str, str],
-    temperatura_ia: float = 0.2,
-    max_tokens_ia: Optional[int] = 8000 # Aumentado um pouco para peças completas
-) -> str:
+    max_tokens_ia: Optional[int],
+) -> Tuple[Optional[ClienteGemini], str]:
+    """
+    Monta o prompt da minuta ajustado ao orçamento do modelo Pro.
+
+    Retorna (cliente, prompt), ou (None, mensagem de erro) se o modelo base não puder ser lido.
+    """
     log.info(f"Iniciando construção da minuta com IA. Modelo base: {modelo_base_path.name}")
     log.info(f"Teses selecionadas pelo usuário para IA: {teses_selecionadas}")
     log.debug(f"Resumo técnico (análise do recurso) para IA: {resumo_tecnico[:300]}...") # Log truncado
@@ -23,10 +40,10 @@ def construir_minuta_com_ia(
             conteudo_modelo_base = f.read()
     except FileNotFoundError:
         log.error(f"Arquivo de modelo base não encontrado em: {modelo_base_path}")
-        return "[ERRO INTERNO: Arquivo de modelo base não encontrado.]"
+        return None, "[ERRO INTERNO: Arquivo de modelo base não encontrado.]"
     except Exception as e:
         log.error(f"Erro ao ler arquivo de modelo base {modelo_base_path}: {e}")
-        return f"[ERRO INTERNO: Falha ao ler modelo base - {e}]"
+        return None, f"[ERRO INTERNO: Falha ao ler modelo base - {e}]"
 
     teses_formatadas_prompt = ""
     if teses_selecionadas:
@@ -36,7 +53,8 @@ def construir_minuta_com_ia(
         teses_formatadas_prompt = "Nenhuma tese específica foi selecionada pelo usuário para esta seção."
 
     # ----- ESTE É O PROMPT CORRIGIDO E MAIS DETALHADO -----
-    prompt = f"""
+    def _prompt(resumo: str) -> str:
+        return f"""
 Você é um Procurador de Justiça do Ministério Público do Estado de Goiás, um especialista experiente e altamente eficiente na elaboração de contrarrazões a Recursos Extraordinários e Especiais (RE/REsp), aderindo a um estilo formal, técnico, objetivo e conciso.
 
 Sua tarefa é gerar o texto COMPLETO de uma peça de contrarrazões, utilizando um MODELO BASE e integrando informações específicas.
@@ -50,7 +68,7 @@ Sua tarefa é gerar o texto COMPLETO de uma peça de contrarrazões, utilizando
 **2. INFORMAÇÕES DISPONÍVEIS PARA INTEGRAR NA PEÇA:**
 
     **A. ANÁLISE DO RECURSO ADVERSÁRIO (Use como CONTEXTO para criar o "Relatório da Peça"):**
-        {resumo_tecnico}
+        {resumo}
 
     **B. TESES DE DEFESA (Selecionadas pelo usuário. Estas DEVEM ser desenvolvidas na peça. Se estiver indicado "Nenhuma tese específica foi selecionada...", então a seção de argumentação deve refletir isso de forma apropriada, como indicando que os fundamentos do acórdão recorrido são suficientes):**
         {teses_formatadas_prompt}
@@ -90,7 +108,29 @@ PEÇA PROCESSUAL FINALIZADA:
 """
     # ----- FIM DO PROMPT CORRIGIDO -----
 
-    cliente_ia = ClienteGemini(model_name=ClienteGemini.DEFAULT_MODEL_PRO) 
+    cliente_ia = obter_cliente_gemini(ClienteGemini.DEFAULT_MODEL_PRO) 
+    # Modelo base e teses entram inteiros (texto_fixo); só a análise do recurso pode ser cortada
+    ajustado = cliente_ia.orcamento(max_tokens_ia).ajustar(
+        [SecaoPrompt("resumo_tecnico", resumo_tecnico, politica="fim")],
+        texto_fixo=_prompt(""),
+        rotulo="construir_minuta_com_ia",
+    )
+    return cliente_ia, _prompt(ajustado["resumo_tecnico"])
+
+
+def construir_minuta_com_ia(
+    resumo_tecnico: str, # Este é o "ANÁLISE COMPLETA DO RECURSO ADVERSÁRIO"
+    teses_selecionadas: List[str],
+    modelo_base_path: Path,
+    dados_processo: Dict[str, str],
+    temperatura_ia: float = 0.2,
+    max_tokens_ia: Optional[int] = 8000 # Aumentado um pouco para peças completas
+) -> str:
+    cliente_ia, prompt = _preparar_minuta(
+        resumo_tecnico, teses_selecionadas, modelo_base_path, dados_processo, max_tokens_ia
+    )
+    if cliente_ia is None:
+        return prompt
     log.info(f"Enviando prompt para IA com temperatura {temperatura_ia} e max_tokens {max_tokens_ia}")
     
     minuta_final = cliente_ia.gerar_conteudo(prompt, temperatura=temperatura_ia, max_tokens=max_tokens_ia)
@@ -103,4 +143,29 @@ PEÇA PROCESSUAL FINALIZADA:
         return f"[FALHA NA GERAÇÃO PELA IA. Detalhe: {minuta_final}]"
 
     log.info("Minuta gerada com IA com sucesso.")
-    return minuta_final.strip()
\ No newline at end of file
+    return minuta_final.strip()
+
+
+def construir_minuta_com_ia_stream(
+    resumo_tecnico: str,
+    teses_selecionadas: List[str],
+    modelo_base_path: Path,
+    dados_processo: Dict[str, str],
+    temperatura_ia: float = 0.2,
+    max_tokens_ia: Optional[int] = 8000,
+) -> Iterator[str]:
+    """
+    Mesmo prompt de construir_minuta_com_ia, entregando a minuta em trechos
+    à medida que a IA os gera (ClienteGemini.gerar_conteudo_stream).
+
+    Falhas chegam como um trecho com mensagem de erro (ver minuta_com_erro);
+    cabe ao chamador verificar o texto completo antes de salvá-lo.
+    """
+    cliente_ia, prompt = _preparar_minuta(
+        resumo_tecnico, teses_selecionadas, modelo_base_path, dados_processo, max_tokens_ia
+    )
+    if cliente_ia is None:
+        yield prompt
+        return
+    log.info(f"Enviando prompt para IA (stream) com temperatura {temperatura_ia} e max_tokens {max_tokens_ia}")
+    yield from cliente_ia.gerar_conteudo_stream(prompt, temperatura=temperatura_ia, max_tokens=max_tokens_ia)
@@ -1,10 +1,125 @@
 # src/peticionador/agentes/agente_resumidor.py
 import logging
-from peticionador.servicos.integrador_gemini import ClienteGemini # TipoModeloGemini não é usado aqui diretamente
-from typing import Optional # Dict, List, Tuple, Any, Literal não são usados aqui
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from peticionador.servicos.integrador_gemini import ClienteGemini, obter_cliente_gemini # TipoModeloGemini não é usado aqui diretamente
+from typing import List, Optional # Dict, Tuple, Any, Literal não são usados aqui
+from peticionador.servicos.orcamento_tokens import EstimadorTokens, SecaoPrompt
+from peticionador.utilitarios.configuracoes import (
+    RESUMO_LIMIAR_TOKENS_TRECHOS,
+    RESUMO_TOKENS_POR_TRECHO,
+    RESUMO_TRECHOS_SIMULTANEOS,
+)
 
 log = logging.getLogger(__name__)
 
+#  Saída de cada resumo parcial (fase map)
+MAXIMO_TOKENS_RESUMO_TRECHO = 1024
+#  Tamanho mínimo e tamanho médio buscado de um trecho, como fração do máximo (ver dividir_em_trechos)
+FRACAO_MINIMA_TRECHO = 0.25
+FRACAO_ALVO_TRECHO = 0.6
+#  Tamanho de parágrafo suposto no cálculo do divisor das fronteiras; fixo para que o
+#  divisor não dependa do documento (ver dividir_em_trechos)
+CARACTERES_PARAGRAFO_ESPERADO = 500
+_RE_PARAGRAFOS = re.compile(r"\n\s*\n")
+
+
+def dividir_em_trechos(texto: str, tokens_por_trecho: int, estimador: EstimadorTokens) -> List[str]:
+    """
+    Divide o texto em trechos de até tokens_por_trecho, sem quebrar parágrafos
+    (exceto os maiores que um trecho).
+
+    As fronteiras dependem do conteúdo: passado o tamanho mínimo, um trecho
+    termina no primeiro parágrafo cujo crc32 é múltiplo de um divisor
+    calculado para que os trechos fiquem, em média, em FRACAO_ALVO_TRECHO do
+    máximo com parágrafos de CARACTERES_PARAGRAFO_ESPERADO. O divisor só
+    depende de tokens_por_trecho: alterar algumas páginas muda só os trechos
+    vizinhos, e os demais continuam idênticos (e com o resumo no cache de
+    respostas) em um novo envio.
+    """
+    maximo = max(1, estimador.caracteres_para(tokens_por_trecho))
+    minimo = int(maximo * FRACAO_MINIMA_TRECHO)
+    pedacos = [
+        paragrafo[i:i + maximo]
+        for paragrafo in _RE_PARAGRAFOS.split(texto) if paragrafo.strip()
+        for i in range(0, len(paragrafo), maximo)
+    ]
+    if not pedacos:
+        return []
+    #  Divisor mínimo 2: com 1, todo parágrafo encerraria o trecho ao atingir o mínimo, e as
+    #  fronteiras voltariam a depender do tamanho acumulado, não do conteúdo
+    divisor = max(2, round((maximo * FRACAO_ALVO_TRECHO - minimo) / CARACTERES_PARAGRAFO_ESPERADO))
+
+    trechos: List[str] = []
+    atual: List[str] = []
+    tamanho = 0
+    for pedaco in pedacos:
+        if atual and tamanho + len(pedaco) > maximo:
+            trechos.append("\n\n".join(atual))
+            atual, tamanho = [], 0
+        atual.append(pedaco)
+        tamanho += len(pedaco) + 2
+        if tamanho >= minimo and zlib.crc32(pedaco.encode("utf-8")) % divisor == 0:
+            trechos.append("\n\n".join(atual))
+            atual, tamanho = [], 0
+    if atual:
+        trechos.append("\n\n".join(atual))
+    return trechos
+
+
+def _prompt_relatorio(texto: str, descricao_texto: str = "Texto base fornecido (geralmente o recurso da outra parte)") -> str:
+    return f"""Sua tarefa é redigir um breve relatório introdutório para uma peça de contrarrazões recursais criminais, seguindo o estilo formal do Ministério Público. O relatório deve ser sucinto, objetivo, impessoal e focado estritamente nos atos processuais relevantes mencionados no texto fornecido (como números de acórdão, datas importantes, artigos de lei e súmulas invocados pelo recorrente, e os fundamentos centrais do recurso). Não emita juízo de valor nem realize análise jurídica. Conclua o relatório obrigatoriamente com a frase: "É o sucinto relatório."
+
+{descricao_texto}:
+---
+{texto}
+---
+
+Relatório das Contrarrazões:
+"""
+
+
+def _prompt_trecho(trecho: str) -> str:
+    #  Sem número do trecho no prompt: o cache de respostas é indexado pelo hash do prompt,
+    #  e o mesmo trecho deve reaproveitar o resumo mesmo que mude de posição
+    return (
+        "Você auxilia na elaboração de contrarrazões do Ministério Público. Abaixo está um trecho de um recurso "
+        "judicial. Liste, em tópicos curtos e objetivos, apenas o que for processualmente relevante no trecho: "
+        "partes, acórdãos e eventos recorridos, datas, artigos de lei e súmulas invocados, fundamentos e pedidos "
+        "do recorrente. Não emita juízo de valor. Se o trecho não tiver nada relevante, responda apenas "
+        '"Nada relevante."\n\n'
+        f"--- TRECHO ---\n{trecho}\n--- FIM DO TRECHO ---\n"
+    )
+
+
+def _resumir_em_trechos(cliente: ClienteGemini, texto: str) -> str:
+    """Map-reduce: resume os trechos em paralelo e gera o relatório a partir dos resumos parciais."""
+    trechos = dividir_em_trechos(texto, RESUMO_TOKENS_POR_TRECHO, cliente.orcamento().estimador)
+    log.info(f"Resumo em trechos: {len(trechos)} trechos, até {RESUMO_TRECHOS_SIMULTANEOS} simultâneos.")
+
+    def _resumir(trecho: str) -> Optional[str]:
+        return cliente.gerar_conteudo(_prompt_trecho(trecho), max_tokens=MAXIMO_TOKENS_RESUMO_TRECHO)
+
+    with ThreadPoolExecutor(max_workers=max(1, RESUMO_TRECHOS_SIMULTANEOS), thread_name_prefix="resumo") as executor:
+        resumos = list(executor.map(_resumir, trechos))
+
+    partes: List[str] = []
+    falhas = 0
+    for numero, resumo in enumerate(resumos, start=1):
+        if not resumo or resumo.startswith("["):
+            log.error(f"Trecho {numero}/{len(trechos)} não resumido: {resumo}")
+            partes.append(f"[Trecho {numero}: resumo indisponível]")
+            falhas += 1
+        else:
+            partes.append(f"Trecho {numero}:\n{resumo.strip()}")
+    if falhas == len(trechos):
+        return "[ERRO: nenhum trecho do recurso pôde ser resumido pela API Gemini.]"
+
+    return cliente.resumir(
+        _prompt_relatorio("\n\n".join(partes), "Resumos parciais do recurso, em ordem, com os pontos relevantes de cada trecho")
+    )
+
 def gerar_resumo_tecnico(texto_para_resumir: Optional[str]) -> str:
     if not texto_para_resumir or not texto_para_resumir.strip(): # Adicionada checagem de strip
         log.warning("Texto para resumo está vazio ou None. Retornando default.")
@@ -13,28 +128,26 @@ def gerar_resumo_tecnico(texto_para_resumir: Optional[str]) -> str:
     log.info("Usando Gemini (Flash por padrão) para resumo técnico.")
     # ClienteGemini usa Flash por padrão, se ClienteGemini.DEFAULT_MODEL_PRO for desejado, precisa especificar.
     # Para resumos, Flash é geralmente suficiente e mais rápido/barato.
-    cliente = ClienteGemini() # Modelo padrão (Flash)
+    cliente = obter_cliente_gemini() # Modelo padrão (Flash)
 
     # Verifique se a API Key está configurada e se o modelo foi instanciado
     if cliente.model_instance is None: # <--- MUDANÇA AQUI (se houvesse .chat antes, mas não havia)
          log.error("Cliente Gemini não instanciado corretamente para resumo. Verifique API Key e logs.")
          return "[ERRO: Modelo Gemini não pôde ser inicializado para resumo.]"
 
-    prompt = (
-        f"""Sua tarefa é redigir um breve relatório introdutório para uma peça de contrarrazões recursais criminais, seguindo o estilo formal do Ministério Público. O relatório deve ser sucinto, objetivo, impessoal e focado estritamente nos atos processuais relevantes mencionados no texto fornecido (como números de acórdão, datas importantes, artigos de lei e súmulas invocados pelo recorrente, e os fundamentos centrais do recurso). Não emita juízo de valor nem realize análise jurídica. Conclua o relatório obrigatoriamente com a frase: "É o sucinto relatório."
-
-Texto base fornecido (geralmente o recurso da outra parte):
----
-{texto_para_resumir}
----
-
-Relatório das Contrarrazões:
-"""
-    )
-    
-    # A função resumir() em ClienteGemini agora chama internamente gerar_conteudo().
-    # Para resumos, a temperatura padrão do modelo costuma ser adequada.
-    resumo = cliente.resumir(prompt)
+    estimador = cliente.orcamento().estimador
+    if RESUMO_LIMIAR_TOKENS_TRECHOS > 0 and estimador.estimar(texto_para_resumir) > RESUMO_LIMIAR_TOKENS_TRECHOS:
+        # Recursos longos: resumo por trechos (map-reduce) em vez de um único prompt
+        resumo = _resumir_em_trechos(cliente, texto_para_resumir)
+    else:
+        ajustado = cliente.orcamento().ajustar(
+            [SecaoPrompt("recurso", texto_para_resumir, politica="meio")],
+            texto_fixo=_prompt_relatorio(""),
+            rotulo="gerar_resumo_tecnico",
+        )
+        # A função resumir() em ClienteGemini agora chama internamente gerar_conteudo().
+        # Para resumos, a temperatura padrão do modelo costuma ser adequada.
+        resumo = cliente.resumir(_prompt_relatorio(ajustado["recurso"]))
 
     if resumo is None:
          log.error(f"Falha ao gerar resumo com {cliente.target_model_name}. A resposta foi None.")
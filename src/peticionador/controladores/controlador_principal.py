@@ -1,12 +1,26 @@
 import logging
 import os
-from typing import Dict, List, Optional # Garanta que todos os tipos usados estão aqui
+import time
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional # Garanta que todos os tipos usados estão aqui
 
 # Imports dos módulos do projeto
 from peticionador.modelos.estado_peticao import EstadoPeticao
-from peticionador.servicos.extrator_pdf import extrair_texto_pdf_separado
+from peticionador.servicos.blocos_texto import BlocosTexto
+from peticionador.servicos.documento_pdf import DocumentoPDF, FontePDF, abrir_documento
+from peticionador.servicos.executor_etapas import ExecutorEtapas
+from peticionador.servicos.extrator_dados_locais import extrair_numero_cnj
+from peticionador.servicos.extrator_pdf import ExtracaoPDF, extrair_texto_pdf
+from peticionador.servicos.segmentador_autos import localizar_recurso
+from peticionador.utilitarios.configuracoes import (
+    ANALISE_COMBINADA_MAXIMO_TOKENS,
+    PDF_MINIMO_PAGINAS_SEGMENTACAO,
+    PDF_SEGMENTAR_AUTOS,
+    PIPELINE_ETAPAS_SIMULTANEAS,
+)
+from peticionador.agentes.agente_analise_combinada import analisar_recurso_combinado, usar_analise_combinada
 from peticionador.agentes.agente_resumidor import gerar_resumo_tecnico
-from peticionador.agentes.agente_extrator import extrair_dados_iniciais_gemini
+from peticionador.agentes.agente_extrator import extrair_dados_iniciais
 from peticionador.agentes.agente_estrategista import sugerir_teses
 from peticionador.servicos.seletor_modelo import selecionar_modelo
 
@@ -14,66 +28,212 @@ log = logging.getLogger(__name__)
 
 RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 CAMINHO_SAIDA_ARQUIVOS = os.path.join(RAIZ_PROJETO, "arquivos_gerados")
+#  Etapas notificadas a ao_concluir_etapa, cada uma com os campos do estado que preenche:
+#  dados_iniciais (estrutura_base), resumo (resumo) e teses (argumentos_reutilizaveis)
+ETAPAS_PROGRESSIVAS = ("dados_iniciais", "resumo", "teses")
+#  Início do resumo quando o pipeline falha (o erro é devolvido no estado, não levantado)
+PREFIXO_ERRO_PROCESSAMENTO = "[ERRO NO PROCESSAMENTO"
+
+
+def _notificar_etapa(
+    ao_concluir_etapa: Optional[Callable[[str, EstadoPeticao], None]], nome_etapa: str, estado: EstadoPeticao
+) -> None:
+    """Falhas do observador são registradas e não interrompem o pipeline."""
+    if ao_concluir_etapa is None:
+        return
+    try:
+        ao_concluir_etapa(nome_etapa, estado)
+    except Exception as erro:
+        log.warning(f"Falha ao notificar a conclusão da etapa '{nome_etapa}': {erro}", exc_info=True)
+
+
+def _blocos_primeira_pagina(documento: DocumentoPDF, estado: EstadoPeticao) -> Optional[BlocosTexto]:
+    """
+    Blocos da primeira página extraída (a do recurso, se os autos foram
+    segmentados), para os sinais de posição da extração local; None se a
+    página não puder ser lida.
+    """
+    indice = estado.intervalo_recurso[0] - 1 if estado.intervalo_recurso else 0
+    try:
+        return BlocosTexto.de_documento(documento, indice, indice)
+    except Exception as erro:
+        log.warning(f"Falha ao ler os blocos da página {indice + 1}; extração só pelo texto: {erro}")
+        return None
+
+
+def _extrair_texto_recurso(
+    fonte: FontePDF, estado: EstadoPeticao, ao_extrair_primeira_pagina: Optional[Callable[[str], None]] = None
+) -> ExtracaoPDF:
+    """
+    Em autos com ao menos PDF_MINIMO_PAGINAS_SEGMENTACAO páginas, localiza a
+    peça recursal e extrai só o seu intervalo; senão, extrai o documento todo.
+    """
+    with abrir_documento(fonte, manter_cache=False) as documento:
+        if len(documento) < PDF_MINIMO_PAGINAS_SEGMENTACAO:
+            return extrair_texto_pdf(documento, ao_extrair_primeira_pagina=ao_extrair_primeira_pagina)
+        segmento = localizar_recurso(documento)
+        if segmento is None:
+            return extrair_texto_pdf(documento, ao_extrair_primeira_pagina=ao_extrair_primeira_pagina)
+        estado.intervalo_recurso = [segmento.pagina_inicio + 1, segmento.pagina_fim]
+        return extrair_texto_pdf(
+            documento,
+            intervalo_paginas=segmento.como_intervalo(),
+            ao_extrair_primeira_pagina=ao_extrair_primeira_pagina,
+        )
+
 
 def processar_peticao(
-    caminho_arquivo_pdf: str,
+    caminho_arquivo_pdf: FontePDF,
     modelos_existentes: list[str],
     modelos_por_tipo: dict[str, str],
     modelo_padrao: str = "",
+    nome_arquivo: str = "",
+    ao_concluir_etapa: Optional[Callable[[str, EstadoPeticao], None]] = None,
 ) -> dict:
     """
     Executa o pipeline completo de processamento da petição.
+
+    caminho_arquivo_pdf pode ser um caminho ou o conteúdo do PDF em memória
+    (bytes/memoryview), caso em que nome_arquivo identifica o upload.
+
+    As etapas com Gemini formam um pequeno DAG (ExecutorEtapas): a extração
+    de dados iniciais começa assim que a primeira página é extraída, e o
+    resumo e as teses começam juntos ao fim da extração. Uma etapa que falha
+    não interrompe as demais; a duração de cada uma fica em
+    estado.tempos_etapas.
+
+    Recursos com até ANALISE_COMBINADA_MAXIMO_TOKENS tokens estimados são
+    analisados em uma única chamada (agente_analise_combinada); se o JSON
+    vier malformado, o pipeline volta aos agentes separados.
+
+    ao_concluir_etapa(nome_etapa, estado), se informado, é chamado na thread
+    do chamador assim que o resultado de cada etapa de ETAPAS_PROGRESSIVAS
+    é aplicado ao estado, na ordem de conclusão; com a análise combinada, as
+    três são notificadas juntas. Etapas não agendadas não são notificadas.
     """
     estado = EstadoPeticao()
-    estado.nome_arquivo_pdf = os.path.basename(caminho_arquivo_pdf)
-    
-    try:
-        log.info(f"Iniciando processamento do PDF: {estado.nome_arquivo_pdf}")
-
-        # 0. Extrair texto separado
-        texto_pg1, texto_outras_pgs, texto_completo = extrair_texto_pdf_separado(caminho_arquivo_pdf)
-
-        if texto_pg1 is None and texto_completo is None:
-             raise ValueError("Falha crítica ao extrair qualquer texto do PDF.")
-        texto_pg1_valido = texto_pg1 if texto_pg1 is not None else ""
-        texto_completo_valido = texto_completo if texto_completo is not None else texto_pg1_valido
-
-        # 1. Extração Inicial com Gemini
-        log.info("Iniciando Etapa 1: Extração de dados iniciais com Gemini (Flash)...")
-        dados_iniciais = extrair_dados_iniciais_gemini(texto_pg1_valido)
-        estado.estrutura_base.update(dados_iniciais)
-        log.info(f"Extração Gemini (Flash) concluída: {estado.estrutura_base}")
-        
-        if hasattr(estado, 'numero_processo'): # Verifica se o campo existe
-            from peticionador.agentes.agente_extrator import extrair_numero_processo_cnj
-            estado.numero_processo = extrair_numero_processo_cnj(texto_pg1_valido)
-            estado.estrutura_base["numero_processo"] = estado.numero_processo
-
-
-        # 3. Resumo técnico com Gemini Flash
-        log.info("Iniciando Etapa 3: Geração de resumo com Gemini (Flash)...")
-        texto_para_resumo = texto_outras_pgs if texto_outras_pgs else texto_completo_valido
-        if texto_para_resumo:
-             estado.resumo = gerar_resumo_tecnico(texto_para_resumo)
-             log.info(f"Resumo Gemini (Flash) gerado (tamanho: {len(estado.resumo)}).")
-        else:
-             log.warning("Nenhum texto disponível para resumo (páginas 2+).")
-             estado.resumo = "[Resumo não gerado - Sem texto das páginas subsequentes]"
-
-        # 4. Teses jurídicas com Gemini Flash
-        log.info("Iniciando Etapa 4: Sugestão de teses com Gemini (Flash)...")
-        if texto_completo_valido:
-             teses = sugerir_teses(texto_completo_valido, modelos_existentes)
-             estado.argumentos_reutilizaveis = teses.get("sugeridas", [])
-             estado.modelos_usados = teses.get("presentes", [])
-             log.info(f"Sugestão de teses (Gemini Flash): {len(estado.argumentos_reutilizaveis)} teses sugeridas.")
-        else:
-            log.warning("Nenhum texto completo disponível para sugestão de teses.")
-        
-    except Exception as e:
-        log.error(f"Erro GERAL no processamento da petição: {e}", exc_info=True)
-        estado.resumo = f"[ERRO NO PROCESSAMENTO: {str(e)}]" # Exibe a mensagem do erro                
-        return {"estado": estado}
-
-    log.info(f"Processamento do PDF {estado.nome_arquivo_pdf} concluído.")
-    return {"estado": estado}
\ No newline at end of file
+    if nome_arquivo:
+        estado.nome_arquivo_pdf = nome_arquivo
+    elif isinstance(caminho_arquivo_pdf, str):
+        estado.nome_arquivo_pdf = os.path.basename(caminho_arquivo_pdf)
+
+    inicio_processamento = time.perf_counter()
+    with ExecutorEtapas(max_paralelo=PIPELINE_ETAPAS_SIMULTANEAS) as etapas, ExitStack() as pilha:
+        try:
+            log.info(f"Iniciando processamento do PDF: {estado.nome_arquivo_pdf}")
+            #  Aberto uma vez: serve à extração e aos blocos da primeira página
+            documento = pilha.enter_context(abrir_documento(caminho_arquivo_pdf, manter_cache=False))
+
+            # 0. Extrair texto separado; a Etapa 1 começa com a primeira página
+            def _iniciar_dados_iniciais(texto_primeira_pagina: str) -> None:
+                log.info("Iniciando Etapa 1: Extração de dados iniciais (regras locais ou Gemini Flash)...")
+                etapas.agendar(
+                    "dados_iniciais", extrair_dados_iniciais,
+                    texto_primeira_pagina, _blocos_primeira_pagina(documento, estado),
+                )
+
+            # Com o modo combinado habilitado, a Etapa 1 espera o fim da extração: só então
+            # se sabe se o recurso cabe em uma única chamada
+            ao_extrair_primeira_pagina = None if ANALISE_COMBINADA_MAXIMO_TOKENS > 0 else _iniciar_dados_iniciais
+
+            inicio_extracao = time.perf_counter()
+            if PDF_SEGMENTAR_AUTOS:
+                extracao = _extrair_texto_recurso(documento, estado, ao_extrair_primeira_pagina)
+            else:
+                extracao = extrair_texto_pdf(documento, ao_extrair_primeira_pagina=ao_extrair_primeira_pagina)
+            estado.tempos_etapas["extracao"] = round(time.perf_counter() - inicio_extracao, 3)
+            estado.contagem_paginas = extracao.contagem_classes
+            estado.economia_deduplicacao = extracao.economia_deduplicacao
+            texto_pg1, texto_outras_pgs, texto_completo = extracao.como_tupla()
+
+            if texto_pg1 is None and texto_completo is None:
+                 raise ValueError("Falha crítica ao extrair qualquer texto do PDF.")
+            if not (texto_completo or "").strip() and estado.contagem_paginas.get("digitalizada"):
+                 raise ValueError(
+                     f"PDF sem camada de texto ({estado.contagem_paginas['digitalizada']} páginas digitalizadas). "
+                     "Habilite o OCR (PDF_OCR_HABILITADO) ou envie um PDF pesquisável."
+                 )
+            texto_pg1_valido = texto_pg1 if texto_pg1 is not None else ""
+            texto_completo_valido = texto_completo if texto_completo is not None else texto_pg1_valido
+
+            # 1-4 em uma única chamada, para recursos curtos (agente_analise_combinada)
+            analise = None
+            if "dados_iniciais" not in etapas and usar_analise_combinada(texto_completo_valido, ANALISE_COMBINADA_MAXIMO_TOKENS):
+                log.info("Iniciando análise combinada (dados iniciais, resumo e teses) com Gemini (Flash)...")
+                etapas.agendar(
+                    "analise_combinada", analisar_recurso_combinado,
+                    texto_pg1_valido, texto_completo_valido, modelos_existentes,
+                )
+                analise = etapas.resultado("analise_combinada")
+                if analise is None:
+                    log.warning("Análise combinada indisponível ou malformada; usando os agentes separados.")
+
+            if analise is not None:
+                estado.estrutura_base.update(analise["dados_iniciais"])
+                estado.resumo = analise["resumo"]
+                estado.argumentos_reutilizaveis = analise["teses"]["sugeridas"]
+                estado.modelos_usados = analise["teses"]["presentes"]
+            else:
+                # 1. Extração Inicial com Gemini (se a primeira página não foi entregue durante a extração)
+                if "dados_iniciais" not in etapas:
+                    _iniciar_dados_iniciais(texto_pg1_valido)
+
+                # 3. Resumo técnico com Gemini Flash
+                texto_para_resumo = texto_outras_pgs if texto_outras_pgs else texto_completo_valido
+                if texto_para_resumo:
+                    log.info("Iniciando Etapa 3: Geração de resumo com Gemini (Flash)...")
+                    etapas.agendar("resumo", gerar_resumo_tecnico, texto_para_resumo)
+                else:
+                    log.warning("Nenhum texto disponível para resumo (páginas 2+).")
+                    estado.resumo = "[Resumo não gerado - Sem texto das páginas subsequentes]"
+
+                # 4. Teses jurídicas com Gemini Flash
+                if texto_completo_valido:
+                    log.info("Iniciando Etapa 4: Sugestão de teses com Gemini (Flash)...")
+                    etapas.agendar("teses", sugerir_teses, texto_completo_valido, modelos_existentes)
+                else:
+                    log.warning("Nenhum texto completo disponível para sugestão de teses.")
+
+        except Exception as e:
+            log.error(f"Erro GERAL no processamento da petição: {e}", exc_info=True)
+            estado.resumo = f"{PREFIXO_ERRO_PROCESSAMENTO}: {str(e)}]" # Exibe a mensagem do erro
+            return {"estado": estado}
+
+        # 2. Número do processo (CNJ), da primeira página ou, na falta dele, do texto todo.
+        # Sem número, a chave fica ausente e a minuta usa o informado pelo usuário
+        numero_processo = extrair_numero_cnj(texto_pg1_valido) or extrair_numero_cnj(texto_completo_valido)
+        if numero_processo:
+            estado.estrutura_base["numero_processo"] = numero_processo
+
+        if analise is not None:
+            for nome_etapa in ETAPAS_PROGRESSIVAS:
+                _notificar_etapa(ao_concluir_etapa, nome_etapa, estado)
+
+        # Os resultados são aplicados na ordem em que as etapas terminam
+        for nome_etapa in etapas.concluidas(ETAPAS_PROGRESSIVAS):
+            if nome_etapa == "dados_iniciais":
+                dados_iniciais = etapas.resultado("dados_iniciais", padrao={})
+                estado.estrutura_base.update(dados_iniciais)
+                log.info(f"Extração de dados iniciais concluída: {estado.estrutura_base}")
+
+            elif nome_etapa == "resumo":
+                estado.resumo = etapas.resultado("resumo", padrao="")
+                if "resumo" in etapas.erros:
+                    estado.resumo = f"[ERRO NA GERAÇÃO DO RESUMO: {etapas.erros['resumo']}]"
+                log.info(f"Resumo Gemini (Flash) gerado (tamanho: {len(estado.resumo)}).")
+
+            elif nome_etapa == "teses":
+                teses = etapas.resultado("teses", padrao={})
+                estado.argumentos_reutilizaveis = teses.get("sugeridas", [])
+                estado.modelos_usados = teses.get("presentes", [])
+                log.info(f"Sugestão de teses (Gemini Flash): {len(estado.argumentos_reutilizaveis)} teses sugeridas.")
+
+            _notificar_etapa(ao_concluir_etapa, nome_etapa, estado)
+
+    estado.tempos_etapas.update(etapas.tempos)
+    estado.tempo_processamento = round(time.perf_counter() - inicio_processamento, 3)
+    log.info(
+        f"Processamento do PDF {estado.nome_arquivo_pdf} concluído em {estado.tempo_processamento:.2f}s "
+        f"(etapas: {estado.tempos_etapas})."
+    )
+    return {"estado": estado}
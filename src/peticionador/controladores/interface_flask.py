@@ -1,27 +1,48 @@
 ﻿# src/peticionador/controladores/interface_flask.py
 
+import json
 import os
+import queue
 import shutil
+import tempfile
+import threading
+from io import BytesIO
 from babel.dates import format_date
 from datetime import datetime
 from pathlib import Path
 import uuid
 import logging # Adicionado para logging
 from flask import (
-    Flask, render_template, request, jsonify, flash,
-    send_from_directory, current_app
+    Flask, Request, Response, render_template, request, jsonify, flash,
+    send_from_directory, current_app, session, stream_with_context, url_for
 )
-from docx import Document
-from odf.opendocument import OpenDocumentText
-from odf.text import P
 from werkzeug.utils import secure_filename
-from typing import Set, Dict
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
 from docx.shared import Pt
 from odf import text as odf_text_module, teletype
 from odf.opendocument import load as load_odt_file
 
-from peticionador.controladores.controlador_principal import processar_peticao
-from peticionador.agentes.agente_gerador_peca import construir_minuta_com_ia
+from peticionador.controladores.controlador_principal import ETAPAS_PROGRESSIVAS, processar_peticao
+from peticionador.controladores.tarefas_peticao import TAREFA_GERAR_PECA, TAREFA_PROCESSAR
+from peticionador.agentes.agente_gerador_peca import (
+    construir_minuta_com_ia,
+    construir_minuta_com_ia_stream,
+    minuta_com_erro,
+)
+from peticionador.modelos.estado_peticao import EstadoPeticao, estado_de_dict
+from peticionador.modelos.interfaces.armazenamento_sessao import DadosSessao
+from peticionador.servicos.armazenamento_sessao import obter_armazenamento_sessao
+from peticionador.servicos.documento_pdf import FontePDF
+from peticionador.servicos.fila_tarefas import (
+    CHAVE_ARQUIVO_TEMPORARIO,
+    CONCLUIDA,
+    DESCARTADA,
+    Tarefa,
+    obter_fila_tarefas,
+)
+from peticionador.servicos.gravador_minuta import salvar_minuta
+from peticionador.servicos.integrador_gemini import aquecer_modelos
+from peticionador.utilitarios.configuracoes import TAREFAS_PASTA_ARQUIVOS, UPLOAD_LIMITE_MEMORIA_MB
 
 # --- Constantes de Caminho e Configuração ---
 RAIZ_FLASK_APP = Path(__file__).resolve().parents[3]
@@ -55,13 +76,31 @@ UPLOAD_FOLDER = RAIZ_PROJETO / "arquivos_upload"
 EXTENSOES_PERMITIDAS_PDF = {"pdf"}
 EXTENSOES_PERMITIDAS_MODELO_UPLOAD = {".txt", ".odt"}
 TESES_DISPONIVEIS = []
+UPLOAD_LIMITE_MEMORIA_BYTES = UPLOAD_LIMITE_MEMORIA_MB * 1024 * 1024
 
 # --- Inicialização da Aplicação Flask ---
+class RequisicaoUpload(Request):
+    """
+    Mantém uploads de até UPLOAD_LIMITE_MEMORIA_BYTES em memória (BytesIO).
+
+    Acima do limite (ou sem Content-Length), o upload vai para um arquivo
+    temporário com nome exclusivo em UPLOAD_FOLDER, removido automaticamente
+    ao fim da requisição.
+    """
+    def _get_file_stream(self, total_content_length: Optional[int], content_type: Optional[str],
+                         filename: Optional[str] = None, content_length: Optional[int] = None) -> IO[bytes]:
+        if total_content_length is not None and total_content_length <= UPLOAD_LIMITE_MEMORIA_BYTES:
+            return BytesIO()
+        UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=UPLOAD_FOLDER, prefix="upload_", suffix=".tmp")
+
+
 def configurar_app() -> Flask:
     pasta_atual = Path(__file__).parent
     app_instance = Flask(__name__,
                          template_folder=pasta_atual / "templates",
                          static_folder=pasta_atual / "static")
+    app_instance.request_class = RequisicaoUpload
     app_instance.config["SECRET_KEY"] = os.environ.get("FLASK_SECRET_KEY", "padrao_seguro_para_desenvolvimento_trocar")
     app_instance.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
     app_instance.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024
@@ -81,6 +120,7 @@ def configurar_app() -> Flask:
         app_instance.logger.setLevel(logging.DEBUG) # Debug level para desenvolvimento Flask
         app_instance.logger.info('Logging configurado para desenvolvimento Flask (debug=True).')
     
+    aquecer_modelos()
     app_instance.logger.info("Aplicação Flask configurada.")
     return app_instance
 
@@ -89,10 +129,30 @@ app.logger.info("Instância da aplicação Flask criada.")
 
 
 # --- Funções Auxiliares ---
+def fonte_pdf_do_upload(arquivo) -> FontePDF:
+    """
+    Devolve o PDF enviado sem regravá-lo em disco.
+
+    Uploads em memória são entregues como memoryview do próprio buffer;
+    uploads que excederam o limite são entregues pelo caminho do arquivo temporário.
+    """
+    stream = arquivo.stream
+    if isinstance(stream, BytesIO):
+        return stream.getbuffer()
+    nome_temporario = getattr(stream, "name", None)
+    if isinstance(nome_temporario, str) and os.path.isfile(nome_temporario):
+        stream.flush()
+        return nome_temporario
+    return stream.read()
+
 def extensao_permitida_geral(nome_arquivo: str, extensoes_validas: Set[str]) -> bool:
     return '.' in nome_arquivo and \
            nome_arquivo.rsplit('.', 1)[1].lower() in extensoes_validas
 
+def evento_sse(evento: str, dados: Dict[str, Any]) -> str:
+    """Formata um evento server-sent events com os dados em JSON (uma linha)."""
+    return f"event: {evento}\ndata: {json.dumps(dados, ensure_ascii=False)}\n\n"
+
 def extrair_texto_de_arquivo(caminho_arquivo_upload: Path) -> str:
     extensao = caminho_arquivo_upload.suffix.lower()
     texto_extraido = ""
@@ -163,89 +223,182 @@ def index():
     return render_template("index.html", TESES_PARA_BOTOES=todas_as_teses_para_index, title="AutoLex")
 
 
-@app.route('/processar', methods=["POST"])
-def processar():
+def _validar_upload_pdf(rota: str) -> Tuple[Optional[Any], Optional[Tuple[Response, int]]]:
+    """Retorna (arquivo enviado, None) ou (None, (resposta de erro, status))."""
     logger = app.logger
-    logger.info("Requisição recebida em /processar")
     if "arquivo" not in request.files:
-        logger.warning("Nenhum arquivo enviado em /processar")
-        return jsonify({"erro": "Nenhum arquivo enviado"}), 400
+        logger.warning(f"Nenhum arquivo enviado em {rota}")
+        return None, (jsonify({"erro": "Nenhum arquivo enviado"}), 400)
     
     arquivo = request.files["arquivo"]
     if not arquivo or not arquivo.filename:
-        logger.warning("Arquivo enviado sem nome em /processar")
-        return jsonify({"erro": "Arquivo sem nome"}), 400
+        logger.warning(f"Arquivo enviado sem nome em {rota}")
+        return None, (jsonify({"erro": "Arquivo sem nome"}), 400)
 
     if not extensao_permitida_geral(arquivo.filename, EXTENSOES_PERMITIDAS_PDF):
-        logger.warning(f"Extensão não permitida para {arquivo.filename} em /processar")
-        return jsonify({"erro": "Extensão de arquivo não permitida. Apenas PDF."}), 400
+        logger.warning(f"Extensão não permitida para {arquivo.filename} em {rota}")
+        return None, (jsonify({"erro": "Extensão de arquivo não permitida. Apenas PDF."}), 400)
+    return arquivo, None
 
-    nome_seguro = secure_filename(arquivo.filename)
-    caminho_arquivo = app.config["UPLOAD_FOLDER"] / nome_seguro
-    try:
-        arquivo.save(caminho_arquivo)
-        logger.info(f"Arquivo '{nome_seguro}' salvo em {caminho_arquivo}")
-    except Exception as e_save:
-        logger.error(f"Erro ao salvar arquivo de upload '{nome_seguro}': {e_save}", exc_info=True)
-        return jsonify({"erro": "Erro interno ao salvar arquivo de upload."}), 500
 
-    try:
-        modelos_por_tipo_str = {k: str(v) for k, v in CAMINHO_MODELOS.items()}
-        # MODELO_PADRAO já é string pela definição global
-        
-        resultado = processar_peticao(
-            caminho_arquivo_pdf=str(caminho_arquivo),
-            modelos_existentes=TESES_DISPONIVEIS,
-            modelos_por_tipo=modelos_por_tipo_str,
-            modelo_padrao=MODELO_PADRAO # Já é string
-        )
-        
-        estado = resultado.get("estado")
-        
-        if not estado:
-            logger.error("Controlador 'processar_peticao' não retornou estado.")
-            raise ValueError("Controlador não retornou estado.")
-
-        # Armazena os dados para uso posterior (download, gerar peça com IA)
-        app.config["ULTIMO_PROCESSAMENTO"] = {
-            "estado": {
-                "resumo": estado.resumo,
-                "argumentos": estado.argumentos_reutilizaveis,
-                "recorrente": estado.estrutura_base.get("recorrente", "Não identificado"),
-                "tipo_recurso": estado.estrutura_base.get("tipo_recurso", "Indeterminado"),
-                "numero_processo": estado.estrutura_base.get("numero_processo"),
-                "num_eventos": estado.estrutura_base.get("num_eventos"),
-                "artigo_fundamento": estado.estrutura_base.get("artigo_fundamento")
-            },
-        }
-        logger.info(f"Processamento do PDF '{nome_seguro}' concluído com sucesso.")
-        
-        return jsonify({
-            "resumo": estado.resumo,
-            "argumentos": estado.argumentos_reutilizaveis,
+def _id_sessao() -> str:
+    """
+    Id da sessão do navegador (cookie de sessão do Flask), criado no primeiro uso.
+
+    Deve ser obtido antes de a resposta começar a ser enviada: rotas em
+    streaming o repassam às threads e geradores que gravam o estado.
+    """
+    if "id_sessao" not in session:
+        session["id_sessao"] = uuid.uuid4().hex
+    return session["id_sessao"]
+
+
+def _processar_upload(fonte_pdf: FontePDF, nome_seguro: str, id_sessao: str, ao_concluir_etapa=None) -> EstadoPeticao:
+    """Executa o pipeline e guarda o resultado na sessão para download e geração da peça com IA."""
+    modelos_por_tipo_str = {k: str(v) for k, v in CAMINHO_MODELOS.items()}
+    # MODELO_PADRAO já é string pela definição global
+    
+    resultado = processar_peticao(
+        caminho_arquivo_pdf=fonte_pdf,
+        modelos_existentes=TESES_DISPONIVEIS,
+        modelos_por_tipo=modelos_por_tipo_str,
+        modelo_padrao=MODELO_PADRAO, # Já é string
+        nome_arquivo=nome_seguro,
+        ao_concluir_etapa=ao_concluir_etapa,
+    )
+    
+    estado = resultado.get("estado")
+    
+    if not estado:
+        app.logger.error("Controlador 'processar_peticao' não retornou estado.")
+        raise ValueError("Controlador não retornou estado.")
+
+    _registrar_processamento(estado, id_sessao)
+    app.logger.info(f"Processamento do PDF '{nome_seguro}' concluído com sucesso.")
+    return estado
+
+
+def _registrar_processamento(estado: EstadoPeticao, id_sessao: str) -> None:
+    """Armazena o estado na sessão para uso posterior (download, gerar peça com IA)."""
+    obter_armazenamento_sessao().gravar(id_sessao, DadosSessao(estado=estado))
+
+
+def resultado_da_etapa(nome_etapa: str, estado: EstadoPeticao) -> Dict[str, Any]:
+    """Campos da resposta de /processar preenchidos pela etapa (ver ETAPAS_PROGRESSIVAS)."""
+    if nome_etapa == "dados_iniciais":
+        return {
             "recorrente": estado.estrutura_base.get("recorrente", "Não identificado"),
             "tipo_recurso": estado.estrutura_base.get("tipo_recurso", "Indeterminado"),
             "numero_processo": estado.estrutura_base.get("numero_processo"),
-        })
+        }
+    if nome_etapa == "resumo":
+        return {"resumo": estado.resumo}
+    if nome_etapa == "teses":
+        return {"argumentos": estado.argumentos_reutilizaveis}
+    return {}
+
+
+def _resposta_processamento(estado: EstadoPeticao) -> Dict[str, Any]:
+    resposta: Dict[str, Any] = {}
+    for nome_etapa in ETAPAS_PROGRESSIVAS:
+        resposta.update(resultado_da_etapa(nome_etapa, estado))
+    return resposta
+
+
+@app.route('/processar', methods=["POST"])
+def processar():
+    logger = app.logger
+    logger.info("Requisição recebida em /processar")
+    arquivo, erro = _validar_upload_pdf("/processar")
+    if erro:
+        return erro
+
+    nome_seguro = secure_filename(arquivo.filename)
+    fonte_pdf = fonte_pdf_do_upload(arquivo)
+    logger.info(f"Upload '{nome_seguro}' recebido ({'em memória' if isinstance(fonte_pdf, memoryview) else 'em arquivo temporário'}).")
+
+    try:
+        estado = _processar_upload(fonte_pdf, nome_seguro, _id_sessao())
+        return jsonify(_resposta_processamento(estado))
     except ValueError as ve:
         logger.error(f"Erro de valor durante o processamento da petição '{nome_seguro}': {ve}", exc_info=True)
         return jsonify({"erro": f"Erro de processamento de dados: {str(ve)}"}), 400
     except Exception as erro:
         logger.exception(f"Erro geral inesperado ao processar a petição '{nome_seguro}'.")
         return jsonify({"erro": f"Erro inesperado no servidor durante o processamento: {str(erro)}"}), 500
+    finally:
+        if isinstance(fonte_pdf, memoryview):
+            fonte_pdf.release() # Libera o buffer do upload para que o stream possa ser fechado
+
+
+@app.route('/processar_stream', methods=["POST"])
+def processar_stream():
+    """
+    Mesmo pedido de /processar, com a resposta em server-sent events: um
+    evento por etapa, assim que o seu resultado fica pronto ('dados_iniciais'
+    com recorrente, tipo_recurso e numero_processo; 'resumo'; 'teses' com
+    argumentos), e ao final 'fim' com a resposta completa de /processar, ou 'erro'.
+    """
+    logger = app.logger
+    logger.info("Requisição recebida em /processar_stream")
+    arquivo, erro = _validar_upload_pdf("/processar_stream")
+    if erro:
+        return erro
+
+    nome_seguro = secure_filename(arquivo.filename)
+    fonte_pdf = fonte_pdf_do_upload(arquivo)
+    logger.info(f"Upload '{nome_seguro}' recebido ({'em memória' if isinstance(fonte_pdf, memoryview) else 'em arquivo temporário'}).")
+    id_sessao = _id_sessao()
+
+    def _eventos() -> Iterator[str]:
+        # O pipeline roda em outra thread e publica cada etapa na fila; None encerra
+        fila: "queue.Queue[Optional[str]]" = queue.Queue()
+
+        def _executar() -> None:
+            try:
+                estado = _processar_upload(
+                    fonte_pdf, nome_seguro, id_sessao,
+                    ao_concluir_etapa=lambda nome, estado: fila.put(evento_sse(nome, resultado_da_etapa(nome, estado))),
+                )
+                fila.put(evento_sse("fim", _resposta_processamento(estado)))
+            except ValueError as ve:
+                logger.error(f"Erro de valor durante o processamento da petição '{nome_seguro}': {ve}", exc_info=True)
+                fila.put(evento_sse("erro", {"erro": f"Erro de processamento de dados: {str(ve)}"}))
+            except Exception as erro:
+                logger.exception(f"Erro geral inesperado ao processar a petição '{nome_seguro}'.")
+                fila.put(evento_sse("erro", {"erro": f"Erro inesperado no servidor durante o processamento: {str(erro)}"}))
+            finally:
+                fila.put(None)
+
+        pipeline = threading.Thread(target=_executar, name="processar-stream", daemon=True)
+        pipeline.start()
+        try:
+            while (evento := fila.get()) is not None:
+                yield evento
+        finally:
+            # O upload só pode ser fechado depois que o pipeline deixar de lê-lo
+            pipeline.join()
+            if isinstance(fonte_pdf, memoryview):
+                fonte_pdf.release()
+
+    return Response(
+        stream_with_context(_eventos()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @app.route("/download/<tipo_arquivo>")
 def download(tipo_arquivo: str):
     logger = app.logger
     logger.info(f"Requisição de download para tipo: {tipo_arquivo}")
-    ultima_execucao = app.config.get("ULTIMO_PROCESSAMENTO")
+    ultima_execucao = obter_armazenamento_sessao().obter(_id_sessao())
 
-    if not ultima_execucao:
+    if ultima_execucao.estado is None and not ultima_execucao.arquivos:
         logger.warning("Tentativa de download sem processamento recente.")
         flash("Nenhum processamento recente encontrado para download.", "warning")
         return "Erro: Nenhum processamento recente encontrado.", 404
 
-    arquivos_gerados = ultima_execucao.get("arquivos", {})
+    arquivos_gerados = ultima_execucao.arquivos
     if tipo_arquivo not in arquivos_gerados:
         logger.warning(f"Tipo de arquivo '{tipo_arquivo}' não disponível para download.")
         flash(f"Tipo de arquivo '{tipo_arquivo}' não está disponível para download.", "warning")
@@ -584,33 +737,35 @@ def sugerir_teses_endpoint():
         return jsonify({"erro": f"Erro ao sugerir teses: {str(e)}"}), 500
 
 
-@app.route('/gerar_peca_com_ia', methods=['POST'])
-def gerar_peca_com_ia_endpoint():
+def _preparar_pedido_minuta(
+    data: Dict[str, Any], id_sessao: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[Tuple[Response, int]]]:
+    """
+    Reúne os argumentos do agente gerador a partir do pedido e do último
+    processamento da sessão.
+
+    Retorna (argumentos, None), ou (None, (resposta de erro, status)).
+    """
     logger = app.logger
-    data = request.json
     resumo_tecnico_frontend = data.get('resumo_tecnico')
     teses_selecionadas = data.get('teses_selecionadas', [])
     tipo_recurso_frontend = data.get('tipo_recurso')
     dados_processo_frontend = data.get('dados_processo', {})
 
-    logger.info(f"Requisição para /gerar_peca_com_ia recebida.")
-
     if not resumo_tecnico_frontend or not teses_selecionadas:
-        return jsonify({"erro": "Resumo técnico e ao menos uma tese selecionada são necessários."}), 400
+        return None, (jsonify({"erro": "Resumo técnico e ao menos uma tese selecionada são necessários."}), 400)
 
-    ultimo_processamento_servidor = app.config.get("ULTIMO_PROCESSAMENTO")
-    dados_estado_servidor = {}
+    estado_servidor = obter_armazenamento_sessao().obter(id_sessao).estado
     estrutura_base_servidor = {}
+    resumo_tecnico_para_agente = resumo_tecnico_frontend
+    tipo_recurso_para_agente = tipo_recurso_frontend
 
-    if ultimo_processamento_servidor and isinstance(ultimo_processamento_servidor.get("estado"), dict):
-        dados_estado_servidor = ultimo_processamento_servidor["estado"]
-        if isinstance(dados_estado_servidor.get("estrutura_base"), dict):
-            estrutura_base_servidor = dados_estado_servidor["estrutura_base"]
+    if estado_servidor is not None:
+        estrutura_base_servidor = estado_servidor.estrutura_base
+        resumo_tecnico_para_agente = estado_servidor.resumo or resumo_tecnico_frontend
+        tipo_recurso_para_agente = estrutura_base_servidor.get('tipo_recurso', tipo_recurso_frontend)
     else:
-        logger.warning("Nenhum 'ULTIMO_PROCESSAMENTO' válido encontrado no app.config. Usando dados do frontend ou defaults.")
-
-    resumo_tecnico_para_agente = dados_estado_servidor.get('resumo', resumo_tecnico_frontend)
-    tipo_recurso_para_agente = dados_estado_servidor.get('tipo_recurso', tipo_recurso_frontend)
+        logger.warning("Nenhum processamento encontrado para a sessão. Usando dados do frontend ou defaults.")
 
     tipo_recurso_usado_para_modelo = "REsp"
     if tipo_recurso_para_agente and tipo_recurso_para_agente != "Indeterminado" and tipo_recurso_para_agente in CAMINHO_MODELOS:
@@ -622,7 +777,7 @@ def gerar_peca_com_ia_endpoint():
 
     if not modelo_path_obj.exists():
         logger.error(f"Modelo base TXT não encontrado: {modelo_path_obj} para tipo {tipo_recurso_usado_para_modelo}")
-        return jsonify({"erro": f"Arquivo de modelo base (.txt) para '{tipo_recurso_usado_para_modelo}' não encontrado no servidor."}), 500
+        return None, (jsonify({"erro": f"Arquivo de modelo base (.txt) para '{tipo_recurso_usado_para_modelo}' não encontrado no servidor."}), 500)
 
     dados_para_agente = {
         'numero_processo': estrutura_base_servidor.get('numero_processo') or dados_processo_frontend.get('numero_processo', "{{NUM_PROCESSO}}"),
@@ -647,87 +802,213 @@ def gerar_peca_com_ia_endpoint():
     logger.debug(f"Dados para agente: {dados_para_agente}")
     logger.debug(f"Resumo para agente (início): {resumo_tecnico_para_agente[:200] if resumo_tecnico_para_agente else 'Nenhum'}...")
 
-    arquivos_gerados_nesta_etapa: Dict[str, str] = {}
+    return {
+        "resumo_tecnico": resumo_tecnico_para_agente,
+        "teses_selecionadas": teses_selecionadas,
+        "modelo_base_path": modelo_path_obj,
+        "dados_processo": dados_para_agente,
+        "temperatura_ia": 0.2,
+    }, None
+
+
+def _registrar_arquivos_minuta(arquivos_gerados_nesta_etapa: Dict[str, str], id_sessao: str) -> None:
+    """Registra na sessão os caminhos da minuta para /download."""
+    armazenamento = obter_armazenamento_sessao()
+    dados = armazenamento.obter(id_sessao)
+    dados.arquivos.update(arquivos_gerados_nesta_etapa)
+    armazenamento.gravar(id_sessao, dados)
+    app.logger.info(f"Caminhos da minuta registrados para download: {arquivos_gerados_nesta_etapa}")
+
+
+def _salvar_minuta(minuta_gerada: str, id_sessao: str) -> Dict[str, str]:
+    """
+    Grava a minuta em .txt, .docx e .odt em PASTA_MINUTAS_FINAIS_IA e registra
+    os caminhos na sessão para /download. Retorna {tipo de arquivo: caminho relativo}.
+    """
+    arquivos_gerados_nesta_etapa = salvar_minuta(minuta_gerada, PASTA_MINUTAS_FINAIS_IA, RAIZ_PROJETO)
+    _registrar_arquivos_minuta(arquivos_gerados_nesta_etapa, id_sessao)
+    return arquivos_gerados_nesta_etapa
+
+
+def _descartar_arquivos_minuta(id_sessao: str) -> None:
+    armazenamento = obter_armazenamento_sessao()
+    dados = armazenamento.obter(id_sessao)
+    if dados.arquivos:
+        dados.arquivos = {}
+        armazenamento.gravar(id_sessao, dados)
+    app.logger.info("Arquivos da minuta removidos da sessão devido a erro.")
+
+
+@app.route('/gerar_peca_com_ia', methods=['POST'])
+def gerar_peca_com_ia_endpoint():
+    logger = app.logger
+    logger.info(f"Requisição para /gerar_peca_com_ia recebida.")
+
+    id_sessao = _id_sessao()
+    argumentos, erro = _preparar_pedido_minuta(request.json, id_sessao)
+    if erro:
+        return erro
 
     try:
-        minuta_gerada = construir_minuta_com_ia(
-            resumo_tecnico=resumo_tecnico_para_agente,
-            teses_selecionadas=teses_selecionadas,
-            modelo_base_path=modelo_path_obj,
-            dados_processo=dados_para_agente,
-            temperatura_ia=0.2
-        )
-
-        if isinstance(minuta_gerada, str) and any(
-            erro in minuta_gerada for erro in [
-                "[ERRO:", "[FALHA NA GERAÇÃO PELA IA", "[CONTEÚDO BLOQUEADO PELA API:", "[RESPOSTA INESPERADA OU VAZIA DA API GEMINI]"
-            ]
-        ):
-            logger.error(f"Agente de IA retornou erro/bloqueio: {minuta_gerada}")
-            return jsonify({"erro": f"A IA encontrou um problema ao gerar a peça. Detalhe técnico: {minuta_gerada}"}), 500
-        elif minuta_gerada is None:
+        minuta_gerada = construir_minuta_com_ia(**argumentos)
+
+        if minuta_gerada is None:
             logger.error("Agente de IA retornou None.")
             return jsonify({"erro": "A IA não retornou uma minuta válida."}), 500
+        elif minuta_com_erro(minuta_gerada):
+            logger.error(f"Agente de IA retornou erro/bloqueio: {minuta_gerada}")
+            return jsonify({"erro": f"A IA encontrou um problema ao gerar a peça. Detalhe técnico: {minuta_gerada}"}), 500
 
-        # Salvar a minuta gerada como .txt
-        nome_arquivo_minuta_txt = f"minuta_gerada_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        caminho_completo_minuta = PASTA_MINUTAS_FINAIS_IA / nome_arquivo_minuta_txt
-
-        with open(caminho_completo_minuta, "w", encoding="utf-8") as f_minuta:
-            f_minuta.write(minuta_gerada)
-        logger.info(f"Minuta gerada pela IA salva em '{caminho_completo_minuta}'")
-
-        # Gerar .docx com python-docx
-        try:
-            caminho_docx = caminho_completo_minuta.with_suffix(".docx")
-            doc = Document()
-            for paragrafo in minuta_gerada.strip().split("\n\n"):
-                doc.add_paragraph(paragrafo.strip())
-            doc.save(caminho_docx)
-            logger.info(f"Minuta .docx salva em '{caminho_docx.name}'")
-            arquivos_gerados_nesta_etapa["minuta_gerada_docx"] = str(caminho_docx.relative_to(RAIZ_PROJETO))
-        except Exception as e_docx:
-            logger.error(f"Erro ao gerar .docx: {e_docx}", exc_info=True)
-
-
-        # Gerar .odt com odfpy
-        try:
-            caminho_odt = caminho_completo_minuta.with_suffix(".odt")
-            odt = OpenDocumentText()
-            for paragrafo in minuta_gerada.strip().split("\n\n"):
-                p = P(text=paragrafo.strip())
-                odt.text.addElement(p)
-            odt.save(str(caminho_odt))
-            logger.info(f"Minuta .odt salva em '{caminho_odt.name}'")
-            arquivos_gerados_nesta_etapa["minuta_gerada_odt"] = str(caminho_docx.relative_to(RAIZ_PROJETO))
-        except Exception as e_odt:
-            logger.error(f"Erro ao gerar .odt: {e_odt}", exc_info=True)
-
-
-        # Registrar caminho para download
-        caminho_relativo_minuta = caminho_completo_minuta.relative_to(RAIZ_PROJETO)
-        arquivos_gerados_nesta_etapa["minuta_gerada"] = str(caminho_relativo_minuta)
-
-        # Garante a estrutura correta
-        if "ULTIMO_PROCESSAMENTO" not in app.config:
-            app.config["ULTIMO_PROCESSAMENTO"] = {"estado": {}, "arquivos": {}}
-
-        if "arquivos" not in app.config["ULTIMO_PROCESSAMENTO"]:
-            app.config["ULTIMO_PROCESSAMENTO"]["arquivos"] = {}
-
-        app.config["ULTIMO_PROCESSAMENTO"]["arquivos"].update(arquivos_gerados_nesta_etapa)
-        logger.info(f"Caminhos da minuta registrados para download: {arquivos_gerados_nesta_etapa}")
+        _salvar_minuta(minuta_gerada, id_sessao)
         return jsonify({"minuta_gerada": minuta_gerada})
 
     except Exception as e:
         logger.exception("Erro crítico ao gerar ou salvar a minuta com IA.")
+        _descartar_arquivos_minuta(id_sessao)
+        return jsonify({"erro": f"Erro interno no servidor ao gerar ou salvar a peça: {str(e)}"}), 500
+
+
+@app.route('/gerar_peca_com_ia_stream', methods=['POST'])
+def gerar_peca_com_ia_stream_endpoint():
+    """
+    Mesmo pedido de /gerar_peca_com_ia, com a resposta em server-sent events:
+    um evento 'trecho' ({"texto": ...}) por trecho gerado pela IA e, ao
+    final, 'fim' ({"minuta_gerada": ..., "arquivos": [...]}) depois de
+    salvar a minuta, ou 'erro' ({"erro": ...}).
+    """
+    logger = app.logger
+    logger.info(f"Requisição para /gerar_peca_com_ia_stream recebida.")
 
-    if "ULTIMO_PROCESSAMENTO" in app.config:
-        if "arquivos" in app.config["ULTIMO_PROCESSAMENTO"]:
-            del app.config["ULTIMO_PROCESSAMENTO"]["arquivos"]
-        logger.info("Chave 'arquivos' removida de ULTIMO_PROCESSAMENTO devido a erro.")
-    
-    return jsonify({"erro": f"Erro interno no servidor ao gerar ou salvar a peça: {str(e)}"}), 500
+    id_sessao = _id_sessao()
+    argumentos, erro = _preparar_pedido_minuta(request.json, id_sessao)
+    if erro:
+        return erro
+
+    def _eventos() -> Iterator[str]:
+        trechos: List[str] = []
+        try:
+            for trecho in construir_minuta_com_ia_stream(**argumentos):
+                if minuta_com_erro(trecho):
+                    logger.error(f"Agente de IA retornou erro/bloqueio no stream: {trecho}")
+                    yield evento_sse("erro", {"erro": f"A IA encontrou um problema ao gerar a peça. Detalhe técnico: {trecho}"})
+                    return
+                trechos.append(trecho)
+                yield evento_sse("trecho", {"texto": trecho})
+
+            minuta_gerada = "".join(trechos).strip()
+            if not minuta_gerada:
+                logger.error("Agente de IA não retornou texto no stream.")
+                yield evento_sse("erro", {"erro": "A IA não retornou uma minuta válida."})
+                return
+            arquivos = _salvar_minuta(minuta_gerada, id_sessao)
+            yield evento_sse("fim", {"minuta_gerada": minuta_gerada, "arquivos": sorted(arquivos)})
+        except Exception as e:
+            logger.exception("Erro crítico ao gerar ou salvar a minuta com IA (stream).")
+            _descartar_arquivos_minuta(id_sessao)
+            yield evento_sse("erro", {"erro": f"Erro interno no servidor ao gerar ou salvar a peça: {str(e)}"})
+
+    return Response(
+        stream_with_context(_eventos()),
+        mimetype="text/event-stream",
+        #  Sem cache nem buffer em proxies (nginx), para os trechos chegarem assim que gerados
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# --- Tarefas em segundo plano (fila_tarefas; consumidas por scripts/iniciar_trabalhadores.py) ---
+#  Parâmetro com a sessão que enviou a tarefa; só ela pode consultá-la
+CHAVE_SESSAO_TAREFA = "id_sessao"
+
+
+def _tarefa_da_sessao(id_tarefa: str) -> Optional[Tarefa]:
+    """A tarefa, se existir e tiver sido enviada pela sessão atual; senão None."""
+    tarefa = obter_fila_tarefas().obter(id_tarefa)
+    if tarefa is None or tarefa.parametros.get(CHAVE_SESSAO_TAREFA) != _id_sessao():
+        return None
+    return tarefa
+
+
+def _resposta_tarefa_enfileirada(id_tarefa: str):
+    tarefa = obter_fila_tarefas().obter(id_tarefa)
+    situacao = tarefa.situacao()
+    situacao["url_situacao"] = url_for("situacao_tarefa", id_tarefa=id_tarefa)
+    situacao["url_resultado"] = url_for("resultado_tarefa", id_tarefa=id_tarefa)
+    return jsonify(situacao), 202
+
+
+@app.route('/tarefas/processar', methods=["POST"])
+def enfileirar_processamento():
+    """Mesmo pedido de /processar; grava o PDF e responde 202 com o id da tarefa."""
+    logger = app.logger
+    arquivo, erro = _validar_upload_pdf("/tarefas/processar")
+    if erro:
+        return erro
+
+    nome_seguro = secure_filename(arquivo.filename)
+    pasta_arquivos = Path(TAREFAS_PASTA_ARQUIVOS)
+    pasta_arquivos.mkdir(parents=True, exist_ok=True)
+    caminho_pdf = pasta_arquivos / f"{uuid.uuid4().hex}.pdf"
+    arquivo.save(str(caminho_pdf))
+
+    id_tarefa = obter_fila_tarefas().enfileirar(TAREFA_PROCESSAR, {
+        CHAVE_ARQUIVO_TEMPORARIO: str(caminho_pdf),
+        "nome_arquivo": nome_seguro,
+        "modelos_existentes": TESES_DISPONIVEIS,
+        "modelos_por_tipo": {k: str(v) for k, v in CAMINHO_MODELOS.items()},
+        "modelo_padrao": MODELO_PADRAO,
+        CHAVE_SESSAO_TAREFA: _id_sessao(),
+    })
+    logger.info(f"Processamento de '{nome_seguro}' enfileirado como tarefa {id_tarefa}.")
+    return _resposta_tarefa_enfileirada(id_tarefa)
+
+
+@app.route('/tarefas/gerar_peca', methods=["POST"])
+def enfileirar_geracao_peca():
+    """Mesmo pedido de /gerar_peca_com_ia; responde 202 com o id da tarefa."""
+    id_sessao = _id_sessao()
+    argumentos, erro = _preparar_pedido_minuta(request.json, id_sessao)
+    if erro:
+        return erro
+
+    parametros = dict(argumentos)
+    parametros[CHAVE_SESSAO_TAREFA] = id_sessao
+    parametros["modelo_base_path"] = str(argumentos["modelo_base_path"])
+    parametros["pasta_saida"] = str(PASTA_MINUTAS_FINAIS_IA)
+    parametros["raiz"] = str(RAIZ_PROJETO)
+    id_tarefa = obter_fila_tarefas().enfileirar(TAREFA_GERAR_PECA, parametros)
+    app.logger.info(f"Geração de peça enfileirada como tarefa {id_tarefa}.")
+    return _resposta_tarefa_enfileirada(id_tarefa)
+
+
+@app.route('/tarefas/<id_tarefa>', methods=["GET"])
+def situacao_tarefa(id_tarefa: str):
+    tarefa = _tarefa_da_sessao(id_tarefa)
+    if tarefa is None:
+        return jsonify({"erro": "Tarefa não encontrada."}), 404
+    return jsonify(tarefa.situacao())
+
+
+@app.route('/tarefas/<id_tarefa>/resultado', methods=["GET"])
+def resultado_tarefa(id_tarefa: str):
+    """
+    Resultado da tarefa concluída, no mesmo formato de /processar ou de
+    /gerar_peca_com_ia (e registrado na sessão para download e geração da peça).
+    Tarefa ainda em andamento: 202 com a situação; descartada: 500 com o erro.
+    Tarefas de outra sessão respondem 404, como as inexistentes.
+    """
+    tarefa = _tarefa_da_sessao(id_tarefa)
+    if tarefa is None:
+        return jsonify({"erro": "Tarefa não encontrada."}), 404
+    if tarefa.estado == DESCARTADA:
+        return jsonify({"erro": tarefa.erro, **tarefa.situacao()}), 500
+    if tarefa.estado != CONCLUIDA:
+        return jsonify(tarefa.situacao()), 202
+
+    if tarefa.tipo == TAREFA_PROCESSAR:
+        estado = estado_de_dict(tarefa.resultado)
+        _registrar_processamento(estado, _id_sessao())
+        return jsonify(_resposta_processamento(estado))
+    _registrar_arquivos_minuta(tarefa.resultado["arquivos"], _id_sessao())
+    return jsonify({"minuta_gerada": tarefa.resultado["minuta_gerada"]})
 
 if __name__ == "__main__":
     # Configuração de logging para execução direta (python interface_flask.py)
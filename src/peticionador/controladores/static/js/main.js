@@ -45,6 +45,30 @@ $(document).ready(function () {
     });
     updateFileMessage(null); // Chama na inicialização para setar a mensagem padrão
 
+    // Lê uma resposta text/event-stream (fetch) e entrega cada evento a tratarEvento(evento, dados em JSON)
+    async function lerEventosSSE(response, tratarEvento) {
+        const leitor = response.body.getReader();
+        const decodificador = new TextDecoder();
+        let pendente = "";
+        while (true) {
+            const { value, done } = await leitor.read();
+            if (done) break;
+            pendente += decodificador.decode(value, { stream: true });
+            let separador;
+            while ((separador = pendente.indexOf('\n\n')) !== -1) {
+                const bloco = pendente.slice(0, separador);
+                pendente = pendente.slice(separador + 2);
+                let evento = 'message';
+                let dados = '';
+                bloco.split('\n').forEach(function(linha) {
+                    if (linha.startsWith('event: ')) evento = linha.slice(7);
+                    else if (linha.startsWith('data: ')) dados += linha.slice(6);
+                });
+                if (dados) tratarEvento(evento, JSON.parse(dados));
+            }
+        }
+    }
+
     // --- Handler para o Botão "Processar Petição" (#btnProcessar) ---
     $('#btnProcessar').on('click', function (e) {
         e.preventDefault(); // Mantido
@@ -62,107 +86,136 @@ $(document).ready(function () {
         $('#loadingModal').modal('show');
         $('#loadingModal .modal-body p').text('Analisando e processando a petição, por favor, aguarde...');
 
-        const ajaxUrlProcessar = (typeof urlParaProcessar !== 'undefined') ? urlParaProcessar : '/processar';
-
-        $.ajax({
-            url: ajaxUrlProcessar, 
-            type: 'POST',
-            data: formData, // formData é definido acima
-            processData: false,
-            contentType: false,
-            success: function (response) {
-                $('#loadingModal').modal('hide');
-                console.log("Sucesso AJAX /processar:", response);
-                ultimoResultadoProcessado = response; 
-
-                $('#resultadoRecorrente').text(response.recorrente || 'N/A');
-                $('#resultadoTipoRecurso').text(response.tipo_recurso || 'N/A');
-                $('#resultadoResumo').html(response.resumo ? response.resumo.replace(/\n/g, '<br>') : 'Nenhum resumo gerado.');
-                
-                const argumentosList = $('#resultadoArgumentos');
-                argumentosList.empty();
-                if (response.argumentos && response.argumentos.length > 0) {
-                    response.argumentos.forEach(arg => {
-                        if (arg) argumentosList.append($('<li>').addClass('list-group-item').text(arg));
-                    });
-                } else {
-                    argumentosList.append($('<li>').addClass('list-group-item').text('Nenhuma tese/argumento aplicável identificado pela IA.'));
-                }
-                
-                // ATUALIZA O TEXTAREA "resumoPeticao" com resumo E teses da IA
-                let textoCombinadoParaResumoArea = "";                
-                if (response.resumo) { 
-                    textoCombinadoParaResumoArea += `RESUMO TÉCNICO DO RECURSO (GERADO PELA IA):\n${response.resumo}\n\n`;
-                } else {
-                    textoCombinadoParaResumoArea += `RESUMO TÉCNICO DO RECURSO (GERADO PELA IA):\n[Nenhum resumo gerado.]\n\n`;
-                }
-
-                if (response.argumentos && response.argumentos.length > 0) {
-                    textoCombinadoParaResumoArea += "TESES E ARGUMENTOS APLICÁVEIS (SUGESTÕES DA IA):\n";
-                    response.argumentos.forEach(arg => {
-                        if (arg) textoCombinadoParaResumoArea += `- ${arg}\n`;
-                    });
-                } else {
-                    textoCombinadoParaResumoArea += "TESES E ARGUMENTOS APLICÁVEIS (SUGESTÕES DA IA):\n[Nenhuma tese/argumento aplicável identificado pela IA.]\n";
-                }
-                resumoPeticaoTextArea.val(textoCombinadoParaResumoArea.trim());
+        const urlStreamProcessar = (typeof urlParaProcessarStream !== 'undefined') ? urlParaProcessarStream : '/processar_stream';
 
+        function exibirResultadoProcessamento(response) {
+            $('#loadingModal').modal('hide');
+            console.log("Sucesso /processar_stream:", response);
+            ultimoResultadoProcessado = response; 
 
-                // Limpa a minuta principal e as teses aplicadas na interface
-                if (minutaTextArea.hasClass('note-editor')) {
-                    minutaTextArea.summernote('code', '');
-                } else {
-                    minutaTextArea.val('');
-                }
-                
-                containerTesesAplicadas.find('.tese-button').each(function() {
-                    $(this).removeClass('btn-success active').addClass('btn-outline-info');
-                    $(this).find('i.fas.fa-check-circle').remove(); // Remove ícone de check
-                    // Adicione aqui qualquer outro ícone que o botão "pronto" deveria ter, se houver
-                    // Ex: $(this).prepend('<i class="fas fa-plus-circle mr-2"></i> ');
-                    containerTesesProntas.append($(this)); // Move de volta para o container de teses prontas
+            $('#resultadoRecorrente').text(response.recorrente || 'N/A');
+            $('#resultadoTipoRecurso').text(response.tipo_recurso || 'N/A');
+            $('#resultadoResumo').html(response.resumo ? response.resumo.replace(/\n/g, '<br>') : 'Nenhum resumo gerado.');
+            
+            const argumentosList = $('#resultadoArgumentos');
+            argumentosList.empty();
+            if (response.argumentos && response.argumentos.length > 0) {
+                response.argumentos.forEach(arg => {
+                    if (arg) argumentosList.append($('<li>').addClass('list-group-item').text(arg));
                 });
+            } else {
+                argumentosList.append($('<li>').addClass('list-group-item').text('Nenhuma tese/argumento aplicável identificado pela IA.'));
+            }
+            
+            // ATUALIZA O TEXTAREA "resumoPeticao" com resumo E teses da IA
+            let textoCombinadoParaResumoArea = "";                
+            if (response.resumo) { 
+                textoCombinadoParaResumoArea += `RESUMO TÉCNICO DO RECURSO (GERADO PELA IA):\n${response.resumo}\n\n`;
+            } else {
+                textoCombinadoParaResumoArea += `RESUMO TÉCNICO DO RECURSO (GERADO PELA IA):\n[Nenhum resumo gerado.]\n\n`;
+            }
 
-                // Opcional: Reordenar os botões na lista de "Teses Prontas" alfabeticamente
-                const buttonsInProntas = containerTesesProntas.find('.tese-button').get();
-                buttonsInProntas.sort(function(a, b) {
-                    return $(a).text().trim().localeCompare($(b).text().trim());
+            if (response.argumentos && response.argumentos.length > 0) {
+                textoCombinadoParaResumoArea += "TESES E ARGUMENTOS APLICÁVEIS (SUGESTÕES DA IA):\n";
+                response.argumentos.forEach(arg => {
+                    if (arg) textoCombinadoParaResumoArea += `- ${arg}\n`;
                 });
-                $.each(buttonsInProntas, function(idx, itm) { containerTesesProntas.append(itm); });
-                
-                atualizarPlaceholderTesesAplicadas(); // Atualiza o placeholder se a lista de aplicadas estiver vazia
-                $('#buscarModelosTeses').trigger('keyup'); // Atualiza a visibilidade da busca nas teses prontas
-                
-                atualizarPlaceholderTesesAplicadas();
-
-
-                arquivosGerados = response.arquivos || [];
-                const downloadUrlDocx = (typeof urlParaDownloadDocx !== 'undefined') ? urlParaDownloadDocx : '#';
-                const downloadUrlOdt = (typeof urlParaDownloadOdt !== 'undefined') ? urlParaDownloadOdt : '#';
-
-                if (arquivosGerados.includes('docx')) {
-                    $('#btnDownloadDocx').removeClass('disabled').attr('aria-disabled', 'false').attr('href', downloadUrlDocx);
-                } else {
-                     $('#btnDownloadDocx').addClass('disabled').attr('aria-disabled', 'true').attr('href', '#');
-                }
-                if (arquivosGerados.includes('odt')) {
-                    $('#btnDownloadOdt').removeClass('disabled').attr('aria-disabled', 'false').attr('href', downloadUrlOdt);
-                } else {
-                    $('#btnDownloadOdt').addClass('disabled').attr('aria-disabled', 'true').attr('href', '#');
+            } else {
+                textoCombinadoParaResumoArea += "TESES E ARGUMENTOS APLICÁVEIS (SUGESTÕES DA IA):\n[Nenhuma tese/argumento aplicável identificado pela IA.]\n";
+            }
+            resumoPeticaoTextArea.val(textoCombinadoParaResumoArea.trim());
+
+
+            // Limpa a minuta principal e as teses aplicadas na interface
+            if (minutaTextArea.hasClass('note-editor')) {
+                minutaTextArea.summernote('code', '');
+            } else {
+                minutaTextArea.val('');
+            }
+            
+            containerTesesAplicadas.find('.tese-button').each(function() {
+                $(this).removeClass('btn-success active').addClass('btn-outline-info');
+                $(this).find('i.fas.fa-check-circle').remove(); // Remove ícone de check
+                // Adicione aqui qualquer outro ícone que o botão "pronto" deveria ter, se houver
+                // Ex: $(this).prepend('<i class="fas fa-plus-circle mr-2"></i> ');
+                containerTesesProntas.append($(this)); // Move de volta para o container de teses prontas
+            });
+
+            // Opcional: Reordenar os botões na lista de "Teses Prontas" alfabeticamente
+            const buttonsInProntas = containerTesesProntas.find('.tese-button').get();
+            buttonsInProntas.sort(function(a, b) {
+                return $(a).text().trim().localeCompare($(b).text().trim());
+            });
+            $.each(buttonsInProntas, function(idx, itm) { containerTesesProntas.append(itm); });
+            
+            atualizarPlaceholderTesesAplicadas(); // Atualiza o placeholder se a lista de aplicadas estiver vazia
+            $('#buscarModelosTeses').trigger('keyup'); // Atualiza a visibilidade da busca nas teses prontas
+            
+            atualizarPlaceholderTesesAplicadas();
+
+
+            arquivosGerados = response.arquivos || [];
+            const downloadUrlDocx = (typeof urlParaDownloadDocx !== 'undefined') ? urlParaDownloadDocx : '#';
+            const downloadUrlOdt = (typeof urlParaDownloadOdt !== 'undefined') ? urlParaDownloadOdt : '#';
+
+            if (arquivosGerados.includes('docx')) {
+                $('#btnDownloadDocx').removeClass('disabled').attr('aria-disabled', 'false').attr('href', downloadUrlDocx);
+            } else {
+                 $('#btnDownloadDocx').addClass('disabled').attr('aria-disabled', 'true').attr('href', '#');
+            }
+            if (arquivosGerados.includes('odt')) {
+                $('#btnDownloadOdt').removeClass('disabled').attr('aria-disabled', 'false').attr('href', downloadUrlOdt);
+            } else {
+                $('#btnDownloadOdt').addClass('disabled').attr('aria-disabled', 'true').attr('href', '#');
+            }
+            
+            $('#resultadosModal').modal('show');
+            if (ultimoResultadoProcessado) {
+                $('#btnReabrirAnalise').show();
+            }
+        }
+
+        // Resultados parciais: cada etapa é exibida assim que termina, enquanto as demais prosseguem
+        let concluido = false;
+
+        function tratarEvento(evento, dados) {
+            if (evento === 'dados_iniciais') {
+                $('#resultadoRecorrente').text(dados.recorrente || 'N/A');
+                $('#resultadoTipoRecurso').text(dados.tipo_recurso || 'N/A');
+                $('#loadingModal .modal-body p').text(
+                    `Recorrente: ${dados.recorrente || 'N/A'} (${dados.tipo_recurso || 'N/A'}). Gerando resumo e teses...`
+                );
+            } else if (evento === 'resumo') {
+                $('#resultadoResumo').html(dados.resumo ? dados.resumo.replace(/\n/g, '<br>') : 'Nenhum resumo gerado.');
+                resumoPeticaoTextArea.val(`RESUMO TÉCNICO DO RECURSO (GERADO PELA IA):\n${dados.resumo || '[Nenhum resumo gerado.]'}`);
+            } else if (evento === 'teses') {
+                $('#loadingModal .modal-body p').text(`${(dados.argumentos || []).length} teses sugeridas. Concluindo...`);
+            } else if (evento === 'fim') {
+                concluido = true;
+                exibirResultadoProcessamento(dados);
+            } else if (evento === 'erro') {
+                concluido = true;
+                $('#loadingModal').modal('hide');
+                alert(`Erro no processamento: ${dados.erro}`);
+            }
+        }
+
+        fetch(urlStreamProcessar, { method: 'POST', body: formData })
+            .then(async function (response) {
+                if (!response.ok) {
+                    const corpo = await response.json().catch(() => ({}));
+                    throw new Error(corpo.erro || 'Erro desconhecido ao processar o arquivo. Verifique os logs do servidor.');
                 }
-                
-                $('#resultadosModal').modal('show');
-                if (ultimoResultadoProcessado) {
-                    $('#btnReabrirAnalise').show();
+                await lerEventosSSE(response, tratarEvento);
+                if (!concluido) {
+                    throw new Error("conexão encerrada antes do fim do processamento.");
                 }
-            },
-            error: function (xhr) {
+            })
+            .catch(function (erro) {
                 $('#loadingModal').modal('hide');
-                console.error("Erro AJAX /processar:", xhr);
-                const erroMsg = xhr?.responseJSON?.erro || 'Erro desconhecido ao processar o arquivo. Verifique os logs do servidor.';
-                alert(`Erro no processamento: ${erroMsg}`);
-            }
-        });
+                console.error("Erro /processar_stream:", erro);
+                alert(`Erro no processamento: ${erro.message}`);
+            });
     });
 
     // --- Handler para o Botão "Reabrir Última Análise" (#btnReabrirAnalise) ---
@@ -370,44 +423,71 @@ $(document).ready(function () {
         $('#loadingModal').modal('show');
         $('#loadingModal .modal-body p').text('Gerando peça com IA, por favor, aguarde...');
 
-        const ajaxUrlGerarPeca = (typeof urlParaGerarPecaIA !== 'undefined') ? urlParaGerarPecaIA : '/gerar_peca_com_ia';
+        const urlStreamGerarPeca = (typeof urlParaGerarPecaIAStream !== 'undefined') ? urlParaGerarPecaIAStream : '/gerar_peca_com_ia_stream';
 
-        $.ajax({
-            url: ajaxUrlGerarPeca, 
-            type: 'POST',
-            contentType: 'application/json', 
-            data: JSON.stringify({
+        function exibirMinuta(texto) {
+            if (minutaTextArea.hasClass('note-editor')) {
+                minutaTextArea.summernote('code', texto.replace(/\n/g, '<br>'));
+            } else {
+                minutaTextArea.val(texto);
+            }
+        }
+
+        // Recebe a minuta por server-sent events: cada evento 'trecho' é exibido assim que chega
+        let minutaParcial = "";
+        let recebeuTrecho = false;
+        let concluido = false;
+
+        function tratarEvento(evento, dados) {
+            if (evento === 'trecho') {
+                if (!recebeuTrecho) {
+                    recebeuTrecho = true;
+                    $('#loadingModal').modal('hide');
+                }
+                minutaParcial += dados.texto;
+                exibirMinuta(minutaParcial);
+            } else if (evento === 'fim') {
+                concluido = true;
+                $('#loadingModal').modal('hide');
+                exibirMinuta(dados.minuta_gerada);
+                alert("Peça gerada com IA e atualizada na minuta!");
+
+                // ✅ Ativa os botões de download Word/LibreOffice
+                $('#btnDownloadDocx').removeClass('disabled')
+                    .attr('aria-disabled', 'false')
+                    .attr('href', '/download/minuta_gerada_docx');
+
+                $('#btnDownloadOdt').removeClass('disabled')
+                    .attr('aria-disabled', 'false')
+                    .attr('href', '/download/minuta_gerada_odt');
+            } else if (evento === 'erro') {
+                concluido = true;
+                $('#loadingModal').modal('hide');
+                alert("Erro ao gerar peça com IA: " + dados.erro);
+            }
+        }
+
+        fetch(urlStreamGerarPeca, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
                 resumo_tecnico: resumoTecnicoOriginalParaIA, // ENVIA O RESUMO TÉCNICO PURO DA IA
                 teses_selecionadas: tesesAplicadasTextos,
                 tipo_recurso: tipoRecursoDetectado,
                 dados_processo: dadosProcesso
-            }),
-            success: function(response) {
-                $('#loadingModal').modal('hide');
-            
-                if (response.minuta_gerada) {
-                    if (minutaTextArea.hasClass('note-editor')) {
-                        minutaTextArea.summernote('code', response.minuta_gerada.replace(/\n/g, '<br>'));
-                    } else {
-                        minutaTextArea.val(response.minuta_gerada);
-                    }
-            
-                    alert("Peça gerada com IA e atualizada na minuta!");
-            
-                    // ✅ Ativa os botões de download Word/LibreOffice
-                    $('#btnDownloadDocx').removeClass('disabled')
-                        .attr('aria-disabled', 'false')
-                        .attr('href', '/download/minuta_gerada_docx');
-            
-                    $('#btnDownloadOdt').removeClass('disabled')
-                        .attr('aria-disabled', 'false')
-                        .attr('href', '/download/minuta_gerada_odt');
-            
-                } else if (response.erro) {
-                    alert("Erro ao gerar peça com IA: " + response.erro);
-                }
-            },
-            
+            })
+        }).then(async function(response) {
+            if (!response.ok) {
+                const corpo = await response.json().catch(() => ({}));
+                throw new Error(corpo.erro || ("HTTP " + response.status));
+            }
+            await lerEventosSSE(response, tratarEvento);
+            if (!concluido) {
+                throw new Error("conexão encerrada antes do fim da geração.");
+            }
+        }).catch(function(erro) {
+            $('#loadingModal').modal('hide');
+            alert("Erro ao gerar peça com IA: " + erro.message);
         });
     });
     
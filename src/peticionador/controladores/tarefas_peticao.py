@@ -0,0 +1,84 @@
+#  src/peticionador/controladores/tarefas_peticao.py
+import logging
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from peticionador.agentes.agente_gerador_peca import construir_minuta_com_ia, minuta_com_erro
+from peticionador.controladores.controlador_principal import PREFIXO_ERRO_PROCESSAMENTO, processar_peticao
+from peticionador.servicos.fila_tarefas import (
+    CHAVE_ARQUIVO_TEMPORARIO,
+    FilaTarefas,
+    Trabalhador,
+    TratadorTarefa,
+    obter_fila_tarefas,
+)
+from peticionador.servicos.gravador_minuta import salvar_minuta
+
+log = logging.getLogger(__name__)
+
+TAREFA_PROCESSAR = "processar"
+TAREFA_GERAR_PECA = "gerar_peca"
+
+
+def tratar_processamento(parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Executa processar_peticao sobre o PDF gravado em arquivo_temporario.
+
+    Parâmetros: arquivo_temporario, nome_arquivo, modelos_existentes,
+    modelos_por_tipo, modelo_padrao. Retorna o EstadoPeticao como dict.
+    Falhas do pipeline (devolvidas no resumo) levantam RuntimeError, para a
+    tarefa ser repetida.
+    """
+    resultado = processar_peticao(
+        caminho_arquivo_pdf=parametros[CHAVE_ARQUIVO_TEMPORARIO],
+        modelos_existentes=parametros.get("modelos_existentes", []),
+        modelos_por_tipo=parametros.get("modelos_por_tipo", {}),
+        modelo_padrao=parametros.get("modelo_padrao", ""),
+        nome_arquivo=parametros.get("nome_arquivo", ""),
+    )
+    estado = resultado.get("estado")
+    if estado is None:
+        raise ValueError("Controlador não retornou estado.")
+    if estado.resumo.startswith(PREFIXO_ERRO_PROCESSAMENTO):
+        raise RuntimeError(estado.resumo)
+    return asdict(estado)
+
+
+def tratar_geracao_peca(parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Gera a minuta com construir_minuta_com_ia e grava os .txt/.docx/.odt.
+
+    Parâmetros: os de construir_minuta_com_ia (modelo_base_path como str),
+    mais pasta_saida e raiz, a pasta dos arquivos e a raiz dos caminhos
+    relativos. Falhas da IA levantam RuntimeError, para a tarefa ser repetida.
+    Retorna {"minuta_gerada": str, "arquivos": {tipo: caminho relativo}}.
+    """
+    minuta_gerada = construir_minuta_com_ia(
+        resumo_tecnico=parametros["resumo_tecnico"],
+        teses_selecionadas=parametros["teses_selecionadas"],
+        modelo_base_path=Path(parametros["modelo_base_path"]),
+        dados_processo=parametros["dados_processo"],
+        temperatura_ia=parametros.get("temperatura_ia", 0.2),
+    )
+    if minuta_com_erro(minuta_gerada):
+        raise RuntimeError(f"A IA encontrou um problema ao gerar a peça. Detalhe técnico: {minuta_gerada}")
+    arquivos = salvar_minuta(minuta_gerada, Path(parametros["pasta_saida"]), Path(parametros["raiz"]))
+    return {"minuta_gerada": minuta_gerada, "arquivos": arquivos}
+
+
+TRATADORES: Dict[str, TratadorTarefa] = {
+    TAREFA_PROCESSAR: tratar_processamento,
+    TAREFA_GERAR_PECA: tratar_geracao_peca,
+}
+
+
+def executar_trabalhador(caminho_banco: Optional[str] = None, parar=None) -> None:
+    """
+    Alvo de cada processo trabalhador (scripts/iniciar_trabalhadores.py):
+    consome a fila em caminho_banco (padrão: TAREFAS_ARQUIVO) até parar.
+    """
+    #  Sem efeito se o processo já tiver logging configurado
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(processName)s] %(name)s: %(message)s")
+    fila = FilaTarefas(caminho_banco) if caminho_banco else obter_fila_tarefas()
+    Trabalhador(fila, TRATADORES).executar(parar)
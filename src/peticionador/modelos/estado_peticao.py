@@ -1,4 +1,4 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Any, Dict, List
 
 
@@ -10,3 +10,18 @@ class EstadoPeticao:
     modelos_usados: List[str] = field(default_factory=list)
     nome_arquivo_pdf: str = ""
     tempo_processamento: float = 0.0
+    contagem_paginas: Dict[str, int] = field(default_factory=dict)
+    economia_deduplicacao: Dict[str, int] = field(default_factory=dict)
+    intervalo_recurso: List[int] = field(default_factory=list)  # [primeira, última] (1-indexed), se segmentado
+    tempos_etapas: Dict[str, float] = field(default_factory=dict)  # segundos por etapa do pipeline
+
+
+def estado_compacto(estado: EstadoPeticao) -> Dict[str, Any]:
+    """Campos do estado como dict, omitindo os vazios (iguais ao padrão)."""
+    return {campo.name: valor for campo in fields(estado) if (valor := getattr(estado, campo.name))}
+
+
+def estado_de_dict(dados: Dict[str, Any]) -> EstadoPeticao:
+    """Reconstrói o estado de estado_compacto ou asdict, ignorando campos desconhecidos."""
+    nomes = {campo.name for campo in fields(EstadoPeticao)}
+    return EstadoPeticao(**{nome: valor for nome, valor in dados.items() if nome in nomes})
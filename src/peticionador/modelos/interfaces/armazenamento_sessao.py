@@ -0,0 +1,70 @@
+import json
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from peticionador.modelos.estado_peticao import EstadoPeticao, estado_compacto, estado_de_dict
+
+
+@dataclass
+class DadosSessao:
+    """Último processamento e arquivos da minuta de uma sessão do navegador."""
+    estado: Optional[EstadoPeticao] = None
+    arquivos: Dict[str, str] = field(default_factory=dict)
+
+
+class ArmazenamentoSessao(ABC):
+    """
+    Guarda DadosSessao por id de sessão, com validade de ttl_segundos a
+    partir da última gravação.
+
+    Os dados são serializados de forma compacta (JSON sem campos vazios,
+    comprimido com zlib); as implementações só guardam bytes.
+    """
+
+    def __init__(self, ttl_segundos: float):
+        self.ttl_segundos = ttl_segundos
+
+    @staticmethod
+    def serializar(dados: DadosSessao) -> bytes:
+        conteudo: Dict[str, object] = {}
+        if dados.estado is not None:
+            conteudo["estado"] = estado_compacto(dados.estado)
+        if dados.arquivos:
+            conteudo["arquivos"] = dados.arquivos
+        return zlib.compress(json.dumps(conteudo, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def desserializar(conteudo: bytes) -> DadosSessao:
+        dados = json.loads(zlib.decompress(conteudo).decode("utf-8"))
+        estado = dados.get("estado")
+        return DadosSessao(
+            estado=estado_de_dict(estado) if estado is not None else None,
+            arquivos=dados.get("arquivos", {}),
+        )
+
+    def obter(self, id_sessao: str) -> DadosSessao:
+        """Dados válidos da sessão; DadosSessao vazio se não houver ou tiver expirado."""
+        conteudo = self._ler(id_sessao)
+        return self.desserializar(conteudo) if conteudo is not None else DadosSessao()
+
+    def gravar(self, id_sessao: str, dados: DadosSessao) -> None:
+        self._escrever(id_sessao, self.serializar(dados))
+
+    @abstractmethod
+    def _ler(self, id_sessao: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def _escrever(self, id_sessao: str, conteudo: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def remover(self, id_sessao: str) -> None:
+        ...
+
+    @abstractmethod
+    def limpar_expirados(self) -> int:
+        """Remove as sessões expiradas e retorna quantas foram removidas."""
+        ...
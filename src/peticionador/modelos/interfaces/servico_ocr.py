@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+class ServicoOCR(ABC):
+    """
+    Reconhecimento de texto em imagens de páginas digitalizadas.
+
+    Implementações são executadas em processos do PoolOCR, portanto devem
+    ser serializáveis (pickle) e não guardar recursos abertos.
+    """
+
+    @property
+    def identificador(self) -> str:
+        """Identifica o motor/configuração na chave do cache de OCR."""
+        return type(self).__name__
+
+    def disponivel(self) -> bool:
+        """Indica se as dependências do motor estão instaladas."""
+        return True
+
+    @abstractmethod
+    def reconhecer(self, imagem_png: bytes) -> str:
+        ...
@@ -0,0 +1,127 @@
+#  src/peticionador/servicos/analise_layout.py
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from peticionador.servicos.blocos_texto import BlocosTexto
+from peticionador.servicos.documento_pdf import DocumentoPDF
+
+log = logging.getLogger(__name__)
+
+_RE_ESPACOS = re.compile(r"\s+")
+_RE_DIGITOS = re.compile(r"\d+")
+
+
+def _normalizar(texto: str) -> str:
+    """Chave textual do bloco: ignora espaçamento e números (ex.: 'Folha 3' ~ 'Folha 4')."""
+    return _RE_DIGITOS.sub("#", _RE_ESPACOS.sub(" ", texto)).strip().lower()
+
+
+@dataclass
+class LayoutDocumento:
+    """
+    Blocos de texto do documento e a marcação dos que são cabeçalho/rodapé.
+
+    recorrentes é uma máscara booleana alinhada aos blocos de `blocos`.
+    """
+    blocos: BlocosTexto
+    recorrentes: np.ndarray
+
+    def texto_a_remover(self) -> Dict[int, List[str]]:
+        """Textos de cabeçalho/rodapé por página (0-indexed)."""
+        remover: Dict[int, List[str]] = {}
+        for indice in np.flatnonzero(self.recorrentes):
+            remover.setdefault(int(self.blocos.paginas[indice]) - 1, []).append(self.blocos.texto(int(indice)))
+        return remover
+
+    def texto_pagina(self, indice: int, remover_recorrentes: bool = True) -> str:
+        """Texto da página 0-indexed (equivalente a get_text()), sem os blocos recorrentes."""
+        return "".join(
+            self.blocos.texto(int(i))
+            for i in self.blocos.indices_da_pagina(indice + 1)
+            if not (remover_recorrentes and self.recorrentes[i])
+        )
+
+
+def marcar_recorrentes(
+    blocos: BlocosTexto,
+    faixa: float = 0.15,
+    tolerancia: float = 0.02,
+    frequencia_minima: float = 0.5,
+) -> np.ndarray:
+    """
+    Marca os blocos que são cabeçalho/rodapé recorrente.
+
+    As posições são normalizadas pela altura de cada página. Blocos na faixa
+    superior ou inferior (fração `faixa` da altura) são agrupados pelo texto
+    normalizado e pela posição vertical: entre os blocos de mesmo texto,
+    ordenados pelo centro vertical, um novo grupo começa onde a distância
+    para o anterior passa de `tolerancia`. Um grupo presente em pelo menos `frequencia_minima` das
+    páginas (e em no mínimo duas) é considerado cabeçalho/rodapé.
+
+    Retorna:
+        np.ndarray: Máscara booleana com um valor por bloco.
+    """
+    recorrentes = np.zeros(len(blocos), dtype=bool)
+    num_paginas = len(blocos.alturas)
+    if num_paginas < 2 or len(blocos) == 0:
+        return recorrentes
+
+    y0, y1 = blocos.posicoes_normalizadas()
+    candidatos = np.flatnonzero((y1 <= faixa) | (y0 >= 1.0 - faixa))
+    if len(candidatos) == 0:
+        return recorrentes
+
+    #  Só os candidatos têm o texto normalizado; blocos vazios nunca formam grupo
+    chaves = np.asarray([_normalizar(blocos.texto(int(i))) for i in candidatos], dtype=object)
+    validos = chaves != ""
+    candidatos, chaves = candidatos[validos], chaves[validos]
+    if len(candidatos) == 0:
+        return recorrentes
+
+    #  Grupo = (texto normalizado, aglomerado vertical): ordena por texto e centro
+    #  e abre um grupo a cada troca de texto ou salto maior que a tolerância
+    _, id_texto = np.unique(chaves, return_inverse=True)
+    centros = (y0 + y1)[candidatos] / 2.0
+    ordem = np.lexsort((centros, id_texto))
+    texto_ordenado, centro_ordenado = id_texto[ordem], centros[ordem]
+    inicio_grupo = np.ones(len(ordem), dtype=bool)
+    inicio_grupo[1:] = (texto_ordenado[1:] != texto_ordenado[:-1]) | (np.diff(centro_ordenado) > tolerancia)
+    grupo = np.empty(len(ordem), dtype=np.int64)
+    grupo[ordem] = np.cumsum(inicio_grupo) - 1
+
+    #  Conta em quantas páginas distintas cada grupo aparece
+    paginas = blocos.paginas[candidatos].astype(np.int64)
+    pares = np.unique(grupo * (paginas.max() + 1) + paginas)
+    grupos_unicos, paginas_por_grupo = np.unique(pares // (paginas.max() + 1), return_counts=True)
+    limiar = max(2, math.ceil(frequencia_minima * num_paginas))
+    grupos_recorrentes = grupos_unicos[paginas_por_grupo >= limiar]
+
+    recorrentes[candidatos[np.isin(grupo, grupos_recorrentes)]] = True
+    log.info(
+        f"Cabeçalhos/rodapés: {len(grupos_recorrentes)} grupos recorrentes, "
+        f"{int(recorrentes.sum())} blocos marcados."
+    )
+    return recorrentes
+
+
+def analisar_layout(documento: DocumentoPDF, **parametros: float) -> LayoutDocumento:
+    """
+    Coleta os blocos de todas as páginas em uma única análise e marca os
+    cabeçalhos/rodapés recorrentes. Ver marcar_recorrentes para os parâmetros.
+    """
+    blocos = BlocosTexto.de_documento(documento)
+    return LayoutDocumento(blocos=blocos, recorrentes=marcar_recorrentes(blocos, **parametros))
+
+
+def detectar_cabecalho_rodape_paginas(documento: DocumentoPDF, **parametros: float) -> Dict[int, List[str]]:
+    """
+    Retorna, para cada página (0-indexed), os textos de cabeçalho/rodapé a remover.
+
+    Ver marcar_recorrentes para os parâmetros.
+    """
+    return analisar_layout(documento, **parametros).texto_a_remover()
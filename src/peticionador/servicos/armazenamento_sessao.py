@@ -0,0 +1,138 @@
+#  src/peticionador/servicos/armazenamento_sessao.py
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from peticionador.modelos.interfaces.armazenamento_sessao import ArmazenamentoSessao
+from peticionador.utilitarios.configuracoes import SESSOES_ARQUIVO, SESSOES_BACKEND, SESSOES_TTL_HORAS
+
+log = logging.getLogger(__name__)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS sessoes (
+    id TEXT PRIMARY KEY,
+    dados BLOB NOT NULL,
+    expira_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessoes_expira_em ON sessoes (expira_em);
+"""
+
+
+class ArmazenamentoSessaoMemoria(ArmazenamentoSessao):
+    """Sessões no próprio processo; adequado a um único processo servidor."""
+
+    def __init__(self, ttl_segundos: float):
+        super().__init__(ttl_segundos)
+        self._sessoes: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def _ler(self, id_sessao: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._sessoes.get(id_sessao)
+            if item is None:
+                return None
+            if item[1] <= time.time():
+                del self._sessoes[id_sessao]
+                return None
+            return item[0]
+
+    def _escrever(self, id_sessao: str, conteudo: bytes) -> None:
+        with self._lock:
+            self._sessoes[id_sessao] = (conteudo, time.time() + self.ttl_segundos)
+        self.limpar_expirados()
+
+    def remover(self, id_sessao: str) -> None:
+        with self._lock:
+            self._sessoes.pop(id_sessao, None)
+
+    def limpar_expirados(self) -> int:
+        agora = time.time()
+        with self._lock:
+            expirados = [id_sessao for id_sessao, (_, expira_em) in self._sessoes.items() if expira_em <= agora]
+            for id_sessao in expirados:
+                del self._sessoes[id_sessao]
+        return len(expirados)
+
+
+class ArmazenamentoSessaoSQLite(ArmazenamentoSessao):
+    """
+    Sessões em um banco SQLite (WAL), compartilhado entre os processos do
+    servidor web em um mesmo host (ex.: workers do gunicorn). O banco deve
+    ficar em disco local: WAL e os bloqueios do SQLite não funcionam de
+    forma confiável em NFS/SMB.
+    """
+
+    def __init__(self, caminho_banco: str, ttl_segundos: float):
+        super().__init__(ttl_segundos)
+        self.caminho_banco = Path(caminho_banco)
+        self._banco_pronto = False
+
+    def _conectar(self) -> sqlite3.Connection:
+        conexao = sqlite3.connect(str(self.caminho_banco), timeout=30)
+        if not self._banco_pronto:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.executescript(_ESQUEMA)
+            self._banco_pronto = True
+        return conexao
+
+    def _ler(self, id_sessao: str) -> Optional[bytes]:
+        conexao = self._conectar()
+        try:
+            linha = conexao.execute(
+                "SELECT dados FROM sessoes WHERE id = ? AND expira_em > ?", (id_sessao, time.time())
+            ).fetchone()
+        finally:
+            conexao.close()
+        return linha[0] if linha is not None else None
+
+    def _escrever(self, id_sessao: str, conteudo: bytes) -> None:
+        agora = time.time()
+        conexao = self._conectar()
+        try:
+            with conexao:
+                conexao.execute(
+                    "INSERT OR REPLACE INTO sessoes (id, dados, expira_em) VALUES (?, ?, ?)",
+                    (id_sessao, conteudo, agora + self.ttl_segundos),
+                )
+                conexao.execute("DELETE FROM sessoes WHERE expira_em <= ?", (agora,))
+        finally:
+            conexao.close()
+
+    def remover(self, id_sessao: str) -> None:
+        conexao = self._conectar()
+        try:
+            with conexao:
+                conexao.execute("DELETE FROM sessoes WHERE id = ?", (id_sessao,))
+        finally:
+            conexao.close()
+
+    def limpar_expirados(self) -> int:
+        conexao = self._conectar()
+        try:
+            with conexao:
+                return conexao.execute("DELETE FROM sessoes WHERE expira_em <= ?", (time.time(),)).rowcount
+        finally:
+            conexao.close()
+
+
+_armazenamento_padrao: Optional[ArmazenamentoSessao] = None
+_lock_armazenamento_padrao = threading.Lock()
+
+
+def obter_armazenamento_sessao() -> ArmazenamentoSessao:
+    """Retorna o armazenamento configurado em utilitarios.configuracoes (SESSOES_BACKEND)."""
+    global _armazenamento_padrao
+    with _lock_armazenamento_padrao:
+        if _armazenamento_padrao is None:
+            ttl_segundos = SESSOES_TTL_HORAS * 3600
+            if SESSOES_BACKEND == "sqlite":
+                Path(SESSOES_ARQUIVO).parent.mkdir(parents=True, exist_ok=True)
+                _armazenamento_padrao = ArmazenamentoSessaoSQLite(SESSOES_ARQUIVO, ttl_segundos)
+            else:
+                if SESSOES_BACKEND != "memoria":
+                    log.warning(f"SESSOES_BACKEND '{SESSOES_BACKEND}' desconhecido; usando 'memoria'.")
+                _armazenamento_padrao = ArmazenamentoSessaoMemoria(ttl_segundos)
+        return _armazenamento_padrao
@@ -0,0 +1,177 @@
+#  src/peticionador/servicos/blocos_texto.py
+import re
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple, Union
+
+import numpy as np
+
+from peticionador.servicos.documento_pdf import DocumentoPDF
+
+
+def texto_bloco(bloco: Dict) -> str:
+    """Texto de um bloco no mesmo formato de page.get_text(): uma linha por '\\n'."""
+    return "".join(
+        "".join(span["text"] for span in linha.get("spans", [])) + "\n"
+        for linha in bloco.get("lines", [])
+    )
+
+
+class BlocoTexto:
+    """Visão leve de um bloco dentro de BlocosTexto (não copia os dados)."""
+
+    __slots__ = ("_blocos", "_indice")
+
+    def __init__(self, blocos: "BlocosTexto", indice: int):
+        self._blocos = blocos
+        self._indice = indice
+
+    @property
+    def pagina(self) -> int:
+        """Número da página (1-indexed)."""
+        return int(self._blocos.paginas[self._indice])
+
+    @property
+    def posicao(self) -> Tuple[float, float, float, float]:
+        """Bounding box (x0, y0, x1, y1)."""
+        x0, y0, x1, y1 = self._blocos.bboxes[self._indice]
+        return float(x0), float(y0), float(x1), float(y1)
+
+    @property
+    def texto(self) -> str:
+        return self._blocos.texto(self._indice)
+
+    def __repr__(self) -> str:
+        return f"BlocoTexto(pagina={self.pagina}, posicao={self.posicao}, texto={self.texto[:40]!r})"
+
+
+class BlocosTexto:
+    """
+    Blocos de texto de um PDF em representação colunar.
+
+    Em vez de um dicionário por bloco, guarda:
+        paginas  (int32, n)      número da página de cada bloco (1-indexed)
+        bboxes   (float32, n x 4) x0, y0, x1, y1
+        tamanhos (float32, n)    maior tamanho de fonte do bloco
+        alturas  (float32, p)    altura de cada página do intervalo
+        offsets  (int64, n + 1)  início/fim de cada bloco no buffer de texto
+    e o texto de todos os blocos em uma única string compartilhada. O acesso
+    por bloco usa visões BlocoTexto com __slots__; análises de layout operam
+    diretamente sobre os arrays.
+    """
+
+    __slots__ = ("paginas", "bboxes", "tamanhos", "alturas", "pagina_inicial", "offsets", "_buffer")
+
+    def __init__(
+        self,
+        paginas: np.ndarray,
+        bboxes: np.ndarray,
+        tamanhos: np.ndarray,
+        alturas: np.ndarray,
+        textos: List[str],
+        pagina_inicial: int = 1,
+    ):
+        self.paginas = paginas
+        self.bboxes = bboxes
+        self.tamanhos = tamanhos
+        self.alturas = alturas
+        self.pagina_inicial = pagina_inicial
+        self.offsets = np.zeros(len(textos) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in textos], out=self.offsets[1:])
+        self._buffer = "".join(textos)
+
+    @classmethod
+    def de_documento(
+        cls, documento: DocumentoPDF, pagina_inicio: int = 0, pagina_fim: Optional[int] = None
+    ) -> "BlocosTexto":
+        """
+        Coleta todos os blocos de texto das páginas [pagina_inicio, pagina_fim].
+
+        Todos os blocos de texto são mantidos, inclusive os só com espaços,
+        de modo que o texto de cada página possa ser reconstituído.
+        """
+        if pagina_fim is None:
+            pagina_fim = len(documento) - 1
+        pagina_fim = min(pagina_fim, len(documento) - 1)
+
+        paginas: List[int] = []
+        bboxes: List[Tuple[float, float, float, float]] = []
+        tamanhos: List[float] = []
+        textos: List[str] = []
+        alturas: List[float] = []
+        for num_pagina in range(pagina_inicio, pagina_fim + 1):
+            dicionario = documento.dicionario(num_pagina)
+            alturas.append(dicionario.get("height") or 1.0)
+            for bloco in dicionario["blocks"]:
+                if bloco.get("type", 0) != 0:
+                    continue
+                paginas.append(num_pagina + 1)
+                bboxes.append(tuple(bloco["bbox"]))
+                tamanhos.append(
+                    max(
+                        (span.get("size", 0.0) for linha in bloco.get("lines", []) for span in linha.get("spans", [])),
+                        default=0.0,
+                    )
+                )
+                textos.append(texto_bloco(bloco))
+
+        return cls(
+            paginas=np.asarray(paginas, dtype=np.int32),
+            bboxes=np.asarray(bboxes, dtype=np.float32).reshape(-1, 4),
+            tamanhos=np.asarray(tamanhos, dtype=np.float32),
+            alturas=np.asarray(alturas, dtype=np.float32),
+            textos=textos,
+            pagina_inicial=pagina_inicio + 1,
+        )
+
+    def __len__(self) -> int:
+        return len(self.paginas)
+
+    def __getitem__(self, indice: int) -> BlocoTexto:
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+        return BlocoTexto(self, indice)
+
+    def __iter__(self) -> Iterator[BlocoTexto]:
+        return (BlocoTexto(self, i) for i in range(len(self)))
+
+    def texto(self, indice: int) -> str:
+        return self._buffer[self.offsets[indice]:self.offsets[indice + 1]]
+
+    def altura_pagina(self) -> np.ndarray:
+        """Altura da página de cada bloco (array n)."""
+        return self.alturas[self.paginas - self.pagina_inicial]
+
+    def posicoes_normalizadas(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(y0, y1) de cada bloco divididos pela altura da respectiva página."""
+        alturas = self.altura_pagina().astype(np.float64)
+        return self.bboxes[:, 1] / alturas, self.bboxes[:, 3] / alturas
+
+    def indices_da_pagina(self, pagina: int) -> np.ndarray:
+        """Índices (em ordem) dos blocos de uma página (1-indexed)."""
+        #  Os blocos são coletados em ordem de página, então basta uma busca binária
+        inicio, fim = np.searchsorted(self.paginas, [pagina, pagina + 1])
+        return np.arange(inicio, fim)
+
+    def buscar(self, padrao: Union[str, Pattern[str]]) -> List[Tuple[int, re.Match]]:
+        """
+        Procura uma expressão regular no buffer compartilhado.
+
+        Retorna (índice do bloco, match) para cada ocorrência; o bloco é
+        localizado por busca binária nos offsets, sem percorrer bloco a bloco.
+        """
+        regex = re.compile(padrao) if isinstance(padrao, str) else padrao
+        ocorrencias = list(regex.finditer(self._buffer))
+        if not ocorrencias:
+            return []
+        inicios = np.fromiter((m.start() for m in ocorrencias), dtype=np.int64, count=len(ocorrencias))
+        blocos = np.searchsorted(self.offsets, inicios, side="right") - 1
+        return [(int(b), m) for b, m in zip(blocos, ocorrencias)]
+
+    def como_dicts(self) -> List[Dict]:
+        """Blocos não vazios como dicionários (pagina, posicao, texto), para código legado."""
+        return [
+            {"pagina": bloco.pagina, "posicao": list(bloco.posicao), "texto": bloco.texto.strip()}
+            for bloco in self
+            if bloco.texto.strip()
+        ]
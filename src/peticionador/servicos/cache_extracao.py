@@ -0,0 +1,172 @@
+#  src/peticionador/servicos/cache_extracao.py
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from peticionador.servicos.motor_limpeza import obter_motor_limpeza
+from peticionador.servicos.preprocessador_pdf import VERSAO_LIMPEZA
+from peticionador.utilitarios.configuracoes import (
+    PDF_CACHE_PASTA,
+    PDF_CACHE_TAMANHO_MAXIMO_MB,
+)
+
+log = logging.getLogger(__name__)
+
+EXTENSAO_ENTRADA = ".json.z"
+
+
+class CacheExtracao:
+    """
+    Cache em disco do texto limpo de PDFs, endereçado pelo conteúdo.
+
+    A chave combina o SHA-256 dos bytes do PDF com a versão das regras de
+    limpeza, de modo que reenvios do mesmo arquivo (com qualquer nome) reutilizam
+    a extração. Cada entrada guarda as páginas em JSON comprimido com zlib.
+    Quando o tamanho total excede o limite, as entradas menos usadas
+    recentemente (pela data de modificação, atualizada a cada acerto) são removidas.
+    """
+
+    def __init__(self, pasta: str, tamanho_maximo_bytes: int):
+        self.pasta = Path(pasta)
+        self.tamanho_maximo_bytes = tamanho_maximo_bytes
+        self.acertos = 0
+        self.falhas = 0
+        self._lock = threading.Lock()
+
+    def gerar_chave(self, hash_pdf: str, variante: str = "") -> str:
+        """Combina o hash do PDF, a versão e as regras da limpeza e opções de extração em uma chave."""
+        base = f"{hash_pdf}:{VERSAO_LIMPEZA}:{obter_motor_limpeza().assinatura}:{variante}"
+        return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+    def _caminho_entrada(self, chave: str) -> Path:
+        return self.pasta / f"{chave}{EXTENSAO_ENTRADA}"
+
+    def obter(self, chave: str) -> Optional[List[Tuple[int, str, str]]]:
+        """Retorna as páginas (número, texto, classe) armazenadas, ou None se ausentes."""
+        caminho = self._caminho_entrada(chave)
+        try:
+            dados = json.loads(zlib.decompress(caminho.read_bytes()).decode("utf-8"))
+            os.utime(caminho)  #  Marca como usada recentemente (LRU)
+        except FileNotFoundError:
+            self._registrar(acerto=False)
+            return None
+        except Exception as e:
+            log.warning(f"Entrada de cache de extração corrompida ({caminho.name}): {e}")
+            caminho.unlink(missing_ok=True)
+            self._registrar(acerto=False)
+            return None
+
+        self._registrar(acerto=True)
+        return [(int(numero), texto, classe) for numero, texto, classe in dados["paginas"]]
+
+    def armazenar(self, chave: str, paginas: List[Tuple[int, str, str]]) -> None:
+        """Grava as páginas de forma atômica e aplica a política de remoção."""
+        for _ in self.armazenar_em_fluxo(chave, paginas):
+            pass
+
+    def armazenar_em_fluxo(
+        self,
+        chave: str,
+        paginas: Iterable[Tuple[int, str, str]],
+        publicar: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[Tuple[int, str, str]]:
+        """
+        Repassa as páginas enquanto as comprime em um arquivo temporário.
+
+        Cada página é serializada e enviada ao compressor assim que chega, sem
+        manter a lista em memória; a entrada só é publicada (os.replace) se a
+        iteração chegar ao fim e publicar (consultado nesse momento) não
+        retornar False. Falhas de disco apenas desativam a gravação.
+        """
+        temporario: Optional[Path] = None
+        arquivo = None
+        compressor = zlib.compressobj()
+        try:
+            self.pasta.mkdir(parents=True, exist_ok=True)
+            temporario = self.pasta / f".{chave}.{uuid.uuid4().hex}.tmp"
+            arquivo = open(temporario, "wb")
+            arquivo.write(compressor.compress(b'{"paginas":['))
+        except OSError as e:
+            log.warning(f"Não foi possível gravar no cache de extração: {e}")
+            arquivo = None
+
+        concluido = False
+        try:
+            separador = b""
+            for pagina in paginas:
+                if arquivo is not None:
+                    try:
+                        serializada = json.dumps(list(pagina), ensure_ascii=False, separators=(",", ":"))
+                        arquivo.write(compressor.compress(separador + serializada.encode("utf-8")))
+                        separador = b","
+                    except OSError as e:
+                        log.warning(f"Não foi possível gravar no cache de extração: {e}")
+                        arquivo.close()
+                        arquivo = None
+                yield pagina
+            concluido = publicar is None or publicar()
+        finally:
+            if arquivo is not None:
+                try:
+                    if concluido:
+                        arquivo.write(compressor.compress(b"]}") + compressor.flush())
+                    arquivo.close()
+                    if concluido:
+                        os.replace(temporario, self._caminho_entrada(chave))
+                except OSError as e:
+                    log.warning(f"Não foi possível gravar no cache de extração: {e}")
+            if temporario is not None:
+                temporario.unlink(missing_ok=True)  #  Já publicado, ou incompleto
+        if arquivo is not None:
+            self._remover_excedentes()
+
+    def _remover_excedentes(self) -> None:
+        entradas = []
+        total = 0
+        for caminho in self.pasta.glob(f"*{EXTENSAO_ENTRADA}"):
+            try:
+                info = caminho.stat()
+            except FileNotFoundError:
+                continue  #  Removida por outro processo
+            entradas.append((info.st_mtime, info.st_size, caminho))
+            total += info.st_size
+
+        if total <= self.tamanho_maximo_bytes:
+            return
+        for _, tamanho, caminho in sorted(entradas):
+            caminho.unlink(missing_ok=True)
+            total -= tamanho
+            log.info(f"Entrada removida do cache de extração (LRU): {caminho.name}")
+            if total <= self.tamanho_maximo_bytes:
+                break
+
+    def _registrar(self, acerto: bool) -> None:
+        with self._lock:
+            if acerto:
+                self.acertos += 1
+            else:
+                self.falhas += 1
+
+    def estatisticas(self) -> Dict[str, int]:
+        """Contadores de acertos e falhas desde a criação da instância."""
+        with self._lock:
+            return {"acertos": self.acertos, "falhas": self.falhas}
+
+
+_cache_padrao: Optional[CacheExtracao] = None
+_lock_cache_padrao = threading.Lock()
+
+
+def obter_cache_extracao() -> CacheExtracao:
+    """Retorna a instância do cache configurada em utilitarios.configuracoes."""
+    global _cache_padrao
+    with _lock_cache_padrao:
+        if _cache_padrao is None:
+            _cache_padrao = CacheExtracao(PDF_CACHE_PASTA, PDF_CACHE_TAMANHO_MAXIMO_MB * 1024 * 1024)
+        return _cache_padrao
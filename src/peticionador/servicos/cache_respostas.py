@@ -0,0 +1,162 @@
+#  src/peticionador/servicos/cache_respostas.py
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from peticionador.utilitarios.configuracoes import (
+    GEMINI_CACHE_ARQUIVO,
+    GEMINI_CACHE_ITENS_MEMORIA,
+    GEMINI_CACHE_TTL_HORAS,
+)
+
+log = logging.getLogger(__name__)
+
+#  Respostas que não devem ser reaproveitadas (ver ClienteGemini.gerar_conteudo)
+PREFIXOS_NAO_CACHEAVEIS = ("[ERRO", "[CONTEÚDO BLOQUEADO", "[RESPOSTA INESPERADA")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS respostas (
+    chave TEXT PRIMARY KEY,
+    resposta TEXT NOT NULL,
+    latencia REAL NOT NULL,
+    expira_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS respostas_expira_em ON respostas (expira_em);
+"""
+
+
+def resposta_cacheavel(resposta: Optional[str]) -> bool:
+    """Respostas vazias, de erro ou bloqueadas pela API não entram no cache."""
+    return bool(resposta) and not resposta.startswith(PREFIXOS_NAO_CACHEAVEIS)
+
+
+class CacheRespostas:
+    """
+    Cache de respostas do modelo em dois níveis.
+
+    O nível em memória é um LRU com até itens_memoria respostas; o nível em
+    disco é um SQLite com validade (TTL), compartilhado entre processos e
+    reinícios. Cada resposta guarda a latência da chamada original, somada
+    em segundos_economizados a cada acerto.
+    """
+
+    def __init__(self, caminho_banco: str, itens_memoria: int, ttl_segundos: float):
+        self.caminho_banco = Path(caminho_banco)
+        self.itens_memoria = max(0, itens_memoria)
+        self.ttl_segundos = ttl_segundos
+        self._memoria: "OrderedDict[str, Tuple[str, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._banco_pronto = False
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+        self.segundos_economizados = 0.0
+
+    @staticmethod
+    def gerar_chave(
+        modelo: str, prompt: str, temperatura: Optional[float], max_tokens: Optional[int], variante: str = ""
+    ) -> str:
+        """Combina modelo, hash do prompt e parâmetros de geração em uma chave."""
+        hash_prompt = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{modelo}:{hash_prompt}:{temperatura}:{max_tokens}:{variante}".encode("utf-8")).hexdigest()
+
+    def _conectar(self) -> sqlite3.Connection:
+        conexao = sqlite3.connect(str(self.caminho_banco), timeout=30)
+        if not self._banco_pronto:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.executescript(_ESQUEMA)
+            self._banco_pronto = True
+        return conexao
+
+    def obter(self, chave: str) -> Optional[str]:
+        """Retorna a resposta armazenada e válida, ou None."""
+        agora = time.time()
+        with self._lock:
+            item = self._memoria.get(chave)
+            if item is not None and item[2] > agora:
+                self._memoria.move_to_end(chave)
+                self.acertos_memoria += 1
+                self.segundos_economizados += item[1]
+                return item[0]
+            if item is not None:
+                del self._memoria[chave]
+
+        try:
+            conexao = self._conectar()
+            try:
+                linha = conexao.execute(
+                    "SELECT resposta, latencia, expira_em FROM respostas WHERE chave = ? AND expira_em > ?",
+                    (chave, agora),
+                ).fetchone()
+            finally:
+                conexao.close()
+        except sqlite3.Error as e:
+            log.warning(f"Falha ao consultar o cache de respostas: {e}")
+            linha = None
+
+        with self._lock:
+            if linha is None:
+                self.falhas += 1
+                return None
+            self.acertos_disco += 1
+            self.segundos_economizados += linha[1]
+            self._guardar_em_memoria(chave, (linha[0], linha[1], linha[2]))
+        return linha[0]
+
+    def armazenar(self, chave: str, resposta: str, latencia_segundos: float) -> None:
+        """Grava a resposta nos dois níveis e remove as entradas vencidas do disco."""
+        expira_em = time.time() + self.ttl_segundos
+        with self._lock:
+            self._guardar_em_memoria(chave, (resposta, latencia_segundos, expira_em))
+        try:
+            conexao = self._conectar()
+            try:
+                with conexao:
+                    conexao.execute(
+                        "INSERT OR REPLACE INTO respostas (chave, resposta, latencia, expira_em) VALUES (?, ?, ?, ?)",
+                        (chave, resposta, latencia_segundos, expira_em),
+                    )
+                    conexao.execute("DELETE FROM respostas WHERE expira_em <= ?", (time.time(),))
+            finally:
+                conexao.close()
+        except sqlite3.Error as e:
+            log.warning(f"Não foi possível gravar no cache de respostas: {e}")
+
+    def _guardar_em_memoria(self, chave: str, item: Tuple[str, float, float]) -> None:
+        if not self.itens_memoria:
+            return
+        self._memoria[chave] = item
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.itens_memoria:
+            self._memoria.popitem(last=False)
+
+    def estatisticas(self) -> Dict[str, float]:
+        """Acertos por nível, falhas e segundos de API economizados desde a criação da instância."""
+        with self._lock:
+            return {
+                "acertos_memoria": self.acertos_memoria,
+                "acertos_disco": self.acertos_disco,
+                "falhas": self.falhas,
+                "segundos_economizados": round(self.segundos_economizados, 3),
+            }
+
+
+_cache_padrao: Optional[CacheRespostas] = None
+_lock_cache_padrao = threading.Lock()
+
+
+def obter_cache_respostas() -> CacheRespostas:
+    """Retorna a instância do cache configurada em utilitarios.configuracoes."""
+    global _cache_padrao
+    with _lock_cache_padrao:
+        if _cache_padrao is None:
+            Path(GEMINI_CACHE_ARQUIVO).parent.mkdir(parents=True, exist_ok=True)
+            _cache_padrao = CacheRespostas(
+                GEMINI_CACHE_ARQUIVO, GEMINI_CACHE_ITENS_MEMORIA, GEMINI_CACHE_TTL_HORAS * 3600
+            )
+        return _cache_padrao
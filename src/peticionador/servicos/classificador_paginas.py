@@ -0,0 +1,128 @@
+#  src/peticionador/servicos/classificador_paginas.py
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, Literal
+
+import fitz  # PyMuPDF
+
+log = logging.getLogger(__name__)
+
+ClassePagina = Literal["texto", "em_branco", "protocolar", "digitalizada"]
+CLASSES_PAGINA = ("texto", "em_branco", "protocolar", "digitalizada")
+
+PoliticaPagina = Literal["manter", "resumir", "descartar"]
+
+#  Limiares (em caracteres sem espaços / fração da área da página)
+MINIMO_CARACTERES_TEXTO = 10
+MINIMO_CARACTERES_SUBSTANTIVOS = 200
+MAXIMO_CARACTERES_CERTIDAO = 1500
+COBERTURA_MINIMA_DIGITALIZADA = 0.6
+
+#  Linhas típicas de assinatura, certificação e rodapés de sistemas processuais
+_RE_LINHA_PROTOCOLAR = re.compile(
+    r"(?i)assinad[oa]|certific|autenticidade|c[oó]digo verificador|localizar pelo c[oó]digo"
+    r"|https?://|www\.|^\s*processo\s*:|^\s*usu[aá]rio\s*:|^\s*valor\s*:|oab\s*/?\s*[a-z]{2}"
+    r"|defensor[a]? p[uú]blic|promotor[a]? de justi[cç]a|procurador[a]? de justi[cç]a"
+    r"|^\s*\d{1,4}\s*$|^\s*[\w\s]+,\s*\d{1,2}\s+de\s+\w+\s+de\s+\d{4}\.?\s*$"
+)
+#  Só aberturas inequívocas: 'CONCLUSÃO' sozinho também é o título da última seção das razões
+_RE_ABERTURA_CERTIDAO = re.compile(
+    r"(?i)^\W*(certid[aã]o|certifico|termo de (juntada|conclus[aã]o|remessa|recebimento)"
+    r"|ato ordinat[oó]rio)"
+)
+
+
+def eh_linha_protocolar(linha: str) -> bool:
+    """Linha de assinatura, certificação, endereço eletrônico ou numeração (não é conteúdo da peça)."""
+    return bool(_RE_LINHA_PROTOCOLAR.search(linha))
+
+
+@dataclass(frozen=True)
+class MetricasPagina:
+    """Métricas baratas de uma página, obtidas sem renderização."""
+    num_caracteres: int  # caracteres não brancos
+    num_caracteres_substantivos: int  # não brancos, fora de linhas de assinatura/rodapé
+    cobertura_imagens: float  # fração da área da página coberta por imagens
+    num_fontes: int
+
+
+def _contar_nao_brancos(texto: str) -> int:
+    return sum(1 for c in texto if not c.isspace())
+
+
+def medir_pagina(pagina: fitz.Page, texto: str) -> MetricasPagina:
+    """Calcula as métricas de classificação a partir da página e do seu get_text()."""
+    num_caracteres = _contar_nao_brancos(texto)
+    #  Mesma unidade de num_caracteres, para que a diferença seja o texto protocolar
+    num_substantivos = sum(
+        _contar_nao_brancos(linha)
+        for linha in texto.splitlines()
+        if linha.strip() and not eh_linha_protocolar(linha)
+    )
+
+    area_pagina = abs(pagina.rect) or 1.0
+    area_imagens = 0.0
+    for imagem in pagina.get_image_info():
+        area_imagens += abs(fitz.Rect(imagem["bbox"]) & pagina.rect)
+
+    return MetricasPagina(
+        num_caracteres=num_caracteres,
+        num_caracteres_substantivos=num_substantivos,
+        cobertura_imagens=min(area_imagens / area_pagina, 1.0),
+        num_fontes=len(pagina.get_fonts()),
+    )
+
+
+def classificar_pagina(metricas: MetricasPagina, texto: str) -> ClassePagina:
+    """
+    Classifica a página como texto, em branco, protocolar ou digitalizada.
+
+    - digitalizada: imagem cobrindo a maior parte da página e sem camada de
+      texto (ou sem fontes);
+    - em_branco: praticamente sem texto e sem imagem relevante;
+    - protocolar: certidões, termos de juntada e páginas de assinatura, cujo
+      texto curto é majoritariamente de linhas protocolares;
+    - texto: todas as demais.
+    """
+    if metricas.num_caracteres < MINIMO_CARACTERES_TEXTO:
+        if metricas.cobertura_imagens >= COBERTURA_MINIMA_DIGITALIZADA or (
+            metricas.num_fontes == 0 and metricas.cobertura_imagens > 0
+        ):
+            return "digitalizada"
+        return "em_branco"
+
+    num_protocolares = metricas.num_caracteres - metricas.num_caracteres_substantivos
+    if metricas.num_caracteres_substantivos < MINIMO_CARACTERES_SUBSTANTIVOS and (
+        num_protocolares >= metricas.num_caracteres_substantivos
+    ):
+        return "protocolar"
+    if metricas.num_caracteres <= MAXIMO_CARACTERES_CERTIDAO and _RE_ABERTURA_CERTIDAO.search(texto.lstrip()):
+        return "protocolar"
+    return "texto"
+
+
+def interpretar_politica(texto: str) -> Dict[str, PoliticaPagina]:
+    """
+    Converte 'classe:politica,...' (ex.: 'em_branco:descartar,protocolar:resumir')
+    em dicionário. Classes omitidas são mantidas.
+    """
+    politica: Dict[str, PoliticaPagina] = {classe: "manter" for classe in CLASSES_PAGINA}
+    for item in filter(None, (parte.strip() for parte in texto.split(","))):
+        classe, _, acao = item.partition(":")
+        classe, acao = classe.strip(), acao.strip()
+        if classe not in CLASSES_PAGINA or acao not in ("manter", "resumir", "descartar"):
+            log.warning(f"Política de página inválida ignorada: '{item}'")
+            continue
+        politica[classe] = acao  # type: ignore[assignment]
+    return politica
+
+
+def marcador_pagina_resumida(numero: int, classe: str) -> str:
+    """Texto que substitui uma página resumida no prompt."""
+    descricao = {
+        "em_branco": "página em branco",
+        "protocolar": "certidão/assinatura",
+        "digitalizada": "página digitalizada sem texto",
+    }.get(classe, classe)
+    return f"[Página {numero} omitida: {descricao}]"
@@ -0,0 +1,113 @@
+#  src/peticionador/servicos/deduplicador_texto.py
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+from peticionador.servicos.classificador_paginas import eh_linha_protocolar
+
+#  Linhas consecutivas (não vazias) por shingle
+TAMANHO_SHINGLE = 3
+#  Shingles mais curtos que isso (normalizados) não são considerados repetição
+MINIMO_CARACTERES_SHINGLE = 60
+#  Estimativa grosseira para textos em português
+CARACTERES_POR_TOKEN = 4
+
+_RE_NAO_PALAVRA = re.compile(r"[\W_]+")
+_RE_DIGITOS = re.compile(r"\d+")
+_RE_LINHAS_VAZIAS = re.compile(r"\n{3,}")
+
+
+def _normalizar_linha(linha: str) -> str:
+    """
+    Minúsculas e sem pontuação/espaços. Os números só são ignorados (trocados
+    por '#') em linhas protocolares, como assinaturas com data e hora e
+    numeração de folhas. No conteúdo, artigos, penas e números de processo
+    mudam o sentido do trecho e precisam coincidir.
+    """
+    normalizada = _RE_NAO_PALAVRA.sub(" ", linha.lower()).strip()
+    return _RE_DIGITOS.sub("#", normalizada) if eh_linha_protocolar(linha) else normalizada
+
+
+@dataclass
+class EconomiaDeduplicacao:
+    """Quanto a deduplicação retirou do texto."""
+    caracteres_removidos: int = 0
+    linhas_removidas: int = 0
+    trechos_removidos: int = 0
+
+    @property
+    def tokens_estimados(self) -> int:
+        return self.caracteres_removidos // CARACTERES_POR_TOKEN
+
+    def como_dict(self) -> Dict[str, int]:
+        return {
+            "caracteres_removidos": self.caracteres_removidos,
+            "linhas_removidas": self.linhas_removidas,
+            "trechos_removidos": self.trechos_removidos,
+            "tokens_estimados": self.tokens_estimados,
+        }
+
+
+class DeduplicadorTexto:
+    """
+    Remove trechos repetidos (qualificação das partes, citações padrão,
+    blocos de assinatura e rodapés) após a primeira ocorrência.
+
+    O texto limpo de PDF não tem parágrafos confiáveis (cada linha do PDF é
+    uma linha do texto), então os shingles são janelas de TAMANHO_SHINGLE
+    linhas não vazias consecutivas. Cada janela é normalizada e resumida em
+    um hash; janelas já vistas, sem sobreposição com a ocorrência anterior,
+    têm todas as suas linhas removidas. A normalização faz com que repetições
+    quase idênticas (pontuação, espaçamento e, nas linhas de assinatura e
+    rodapé, datas e números de folha) também sejam detectadas.
+
+    O estado é mantido entre chamadas de processar(), para deduplicar as
+    páginas de um documento em ordem.
+    """
+
+    def __init__(
+        self,
+        tamanho_shingle: int = TAMANHO_SHINGLE,
+        minimo_caracteres: int = MINIMO_CARACTERES_SHINGLE,
+    ):
+        self.tamanho_shingle = tamanho_shingle
+        self.minimo_caracteres = minimo_caracteres
+        self.economia = EconomiaDeduplicacao()
+        self._vistos: Dict[bytes, int] = {}  # hash do shingle -> posição global da primeira ocorrência
+        self._posicao = 0  # linhas não vazias já processadas
+
+    def processar(self, texto: str) -> str:
+        linhas = texto.split("\n")
+        normalizadas = [_normalizar_linha(linha) for linha in linhas]
+        indices = [i for i, normalizada in enumerate(normalizadas) if normalizada]
+        remover = [False] * len(linhas)
+
+        fim_trecho = -1
+        for j in range(len(indices) - self.tamanho_shingle + 1):
+            janela = [normalizadas[i] for i in indices[j:j + self.tamanho_shingle]]
+            if sum(len(n) for n in janela) < self.minimo_caracteres:
+                continue
+            chave = hashlib.blake2b("\n".join(janela).encode("utf-8"), digest_size=16).digest()
+            posicao = self._posicao + j
+            anterior = self._vistos.setdefault(chave, posicao)
+            if anterior == posicao or anterior + self.tamanho_shingle > posicao:
+                continue
+            if j >= fim_trecho:
+                self.economia.trechos_removidos += 1
+            for i in indices[j:j + self.tamanho_shingle]:
+                remover[i] = True
+            fim_trecho = j + self.tamanho_shingle
+        self._posicao += len(indices)
+
+        if not any(remover):
+            return texto
+        mantidas: List[str] = []
+        for linha, descartar in zip(linhas, remover):
+            if descartar:
+                self.economia.caracteres_removidos += len(linha) + 1
+                self.economia.linhas_removidas += 1
+            else:
+                mantidas.append(linha)
+        return _RE_LINHAS_VAZIAS.sub("\n\n", "\n".join(mantidas)).strip()
+
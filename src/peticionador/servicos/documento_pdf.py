@@ -0,0 +1,161 @@
+#  src/peticionador/servicos/documento_pdf.py
+import hashlib
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Union
+
+import fitz  # PyMuPDF
+
+log = logging.getLogger(__name__)
+
+ConteudoPDF = Union[bytes, bytearray, memoryview]
+TAMANHO_BLOCO_HASH = 1024 * 1024
+
+
+def calcular_hash_arquivo(caminho_arquivo: str) -> str:
+    """Retorna o SHA-256 (hex) do conteúdo do arquivo, lido em blocos."""
+    sha = hashlib.sha256()
+    with open(caminho_arquivo, "rb") as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+class DocumentoPDF:
+    """
+    Sessão sobre um PDF aberto uma única vez.
+
+    O arquivo (ou buffer em memória, sem cópia) é aberto com fitz uma só vez; as páginas
+    são carregadas sob demanda e o resultado de get_text() e get_text("dict")
+    de cada página fica em cache, para que texto, blocos, metadados e
+    detecção de cabeçalho/rodapé reutilizem a mesma análise.
+
+    Uso:
+        with DocumentoPDF("recurso.pdf") as documento:
+            texto = documento.texto(0)
+
+        with DocumentoPDF(conteudo=upload.read()) as documento:
+            ...
+    """
+
+    def __init__(
+        self,
+        caminho: Optional[str] = None,
+        conteudo: Optional[ConteudoPDF] = None,
+        manter_cache: bool = True,
+    ):
+        if (caminho is None) == (conteudo is None):
+            raise ValueError("Informe exatamente um entre 'caminho' e 'conteudo'.")
+        self.caminho = caminho
+        self.conteudo = conteudo
+        self.manter_cache = manter_cache
+        if caminho is not None:
+            self._documento = fitz.open(caminho, filetype="pdf")
+        else:
+            self._documento = fitz.open(stream=conteudo, filetype="pdf")
+        self._paginas: Dict[int, fitz.Page] = {}
+        self._textos: Dict[int, str] = {}
+        self._dicionarios: Dict[int, Dict[str, Any]] = {}
+        self._hash: Optional[str] = None
+
+    @property
+    def descricao(self) -> str:
+        """Identificação legível para logs."""
+        return self.caminho if self.caminho else f"<buffer de {len(self.conteudo or b'')} bytes>"
+
+    def __len__(self) -> int:
+        return len(self._documento)
+
+    def __enter__(self) -> "DocumentoPDF":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.fechar()
+
+    def fechar(self) -> None:
+        """Fecha o documento e descarta os caches de página."""
+        self._paginas.clear()
+        self._textos.clear()
+        self._dicionarios.clear()
+        if not self._documento.is_closed:
+            self._documento.close()
+
+    @property
+    def fitz_documento(self) -> fitz.Document:
+        """Documento fitz subjacente (para operações sem cache, como get_toc)."""
+        return self._documento
+
+    @property
+    def metadados(self) -> Dict[str, Any]:
+        return dict(self._documento.metadata or {})
+
+    def pagina(self, indice: int) -> fitz.Page:
+        """Carrega a página (0-indexed) na primeira chamada e a reutiliza depois."""
+        if not self.manter_cache:
+            return self._documento[indice]
+        if indice not in self._paginas:
+            self._paginas[indice] = self._documento[indice]
+        return self._paginas[indice]
+
+    def texto(self, indice: int, pagina: Optional[fitz.Page] = None) -> str:
+        """get_text() da página, em cache; pagina evita recarregá-la se já estiver em mãos."""
+        if indice in self._textos:
+            return self._textos[indice]
+        texto = (pagina or self.pagina(indice)).get_text()
+        if self.manter_cache:
+            self._textos[indice] = texto
+        return texto
+
+    def dicionario(self, indice: int) -> Dict[str, Any]:
+        """get_text("dict") da página, em cache."""
+        if indice in self._dicionarios:
+            return self._dicionarios[indice]
+        dicionario = self.pagina(indice).get_text("dict")
+        if self.manter_cache:
+            self._dicionarios[indice] = dicionario
+        return dicionario
+
+    @contextmanager
+    def sem_cache(self) -> Iterator["DocumentoPDF"]:
+        """
+        Suspende o cache de páginas enquanto durar o bloco (ex.: extração em
+        streaming), para que páginas e textos lidos não se acumulem na sessão.
+        O que já estava em cache continua disponível.
+        """
+        anterior, self.manter_cache = self.manter_cache, False
+        try:
+            yield self
+        finally:
+            self.manter_cache = anterior
+
+    def hash_conteudo(self) -> str:
+        """SHA-256 (hex) dos bytes do PDF, calculado uma vez por sessão."""
+        if self._hash is None:
+            if self.conteudo is not None:
+                self._hash = hashlib.sha256(self.conteudo).hexdigest()
+            else:
+                self._hash = calcular_hash_arquivo(str(self.caminho))
+        return self._hash
+
+
+FontePDF = Union[str, ConteudoPDF, DocumentoPDF]
+
+
+@contextmanager
+def abrir_documento(fonte: FontePDF, manter_cache: bool = True) -> Iterator[DocumentoPDF]:
+    """
+    Normaliza caminho, bytes ou sessão existente em um DocumentoPDF.
+
+    Sessões recebidas prontas não são fechadas ao final; as criadas aqui, sim.
+    """
+    if isinstance(fonte, DocumentoPDF):
+        yield fonte
+        return
+    if isinstance(fonte, (bytes, bytearray, memoryview)):
+        documento = DocumentoPDF(conteudo=fonte, manter_cache=manter_cache)
+    else:
+        documento = DocumentoPDF(caminho=str(fonte), manter_cache=manter_cache)
+    try:
+        yield documento
+    finally:
+        documento.fechar()
@@ -0,0 +1,130 @@
+#  src/peticionador/servicos/executor_etapas.py
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+log = logging.getLogger(__name__)
+
+
+class EtapaNaoExecutada(Exception):
+    """A etapa não rodou porque uma de suas dependências falhou."""
+
+
+class ExecutorEtapas:
+    """
+    Executa as etapas de um pipeline como um pequeno DAG em um pool de threads.
+
+    Cada etapa é agendada com agendar(nome, funcao, *args, depende_de=...) e
+    só é submetida ao pool quando todas as dependências terminam; etapas
+    independentes rodam ao mesmo tempo. A falha de uma etapa fica isolada:
+    é registrada em erros e apenas as etapas que dependem dela deixam de rodar.
+    A duração de cada etapa (em segundos) fica em tempos.
+
+    Uso:
+        with ExecutorEtapas(max_paralelo=3) as etapas:
+            etapas.agendar("resumo", gerar_resumo_tecnico, texto)
+            etapas.agendar("teses", sugerir_teses, texto, modelos)
+        resumo = etapas.resultado("resumo", padrao="")
+    """
+
+    def __init__(self, max_paralelo: int = 4):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_paralelo), thread_name_prefix="etapa")
+        self._futuros: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.tempos: Dict[str, float] = {}
+        self.erros: Dict[str, BaseException] = {}
+
+    def __enter__(self) -> "ExecutorEtapas":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.aguardar()
+        self._executor.shutdown(wait=True)
+
+    def _executar(self, nome: str, funcao: Callable[..., Any], args: tuple) -> Any:
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args)
+        except Exception as erro:
+            log.error(f"Etapa '{nome}' falhou: {erro}", exc_info=True)
+            with self._lock:
+                self.erros[nome] = erro
+            raise
+        finally:
+            duracao = time.perf_counter() - inicio
+            with self._lock:
+                self.tempos[nome] = round(duracao, 3)
+            log.info(f"Etapa '{nome}' concluída em {duracao:.2f}s.")
+
+    def agendar(self, nome: str, funcao: Callable[..., Any], *args: Any, depende_de: Iterable[str] = ()) -> Future:
+        """Agenda a etapa; ela roda assim que as etapas de depende_de terminarem."""
+        dependencias: List[Future] = [self._futuros[dependencia] for dependencia in depende_de]
+        resultado: Future = Future()
+        with self._lock:
+            if nome in self._futuros:
+                raise ValueError(f"Etapa já agendada: {nome}")
+            self._futuros[nome] = resultado
+
+        pendentes = [len(dependencias)]
+
+        def _submeter() -> None:
+            falhas = [f for f in dependencias if f.exception() is not None]
+            if falhas:
+                erro = EtapaNaoExecutada(f"dependência de '{nome}' falhou")
+                with self._lock:
+                    self.erros[nome] = erro
+                resultado.set_exception(erro)
+                return
+            futuro = self._executor.submit(self._executar, nome, funcao, args)
+            futuro.add_done_callback(lambda f: _repassar(f, resultado))
+
+        def _dependencia_concluida(_: Future) -> None:
+            with self._lock:
+                pendentes[0] -= 1
+                pronta = pendentes[0] == 0
+            if pronta:
+                _submeter()
+
+        if not dependencias:
+            _submeter()
+        for dependencia in dependencias:
+            dependencia.add_done_callback(_dependencia_concluida)
+        return resultado
+
+    def __contains__(self, nome: str) -> bool:
+        return nome in self._futuros
+
+    def resultado(self, nome: str, padrao: Any = None) -> Any:
+        """Aguarda a etapa e devolve o seu resultado, ou padrao se ela falhou ou não rodou."""
+        futuro = self._futuros[nome]
+        try:
+            return futuro.result()
+        except Exception:
+            return padrao
+
+    def concluidas(self, nomes: Iterable[str], timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        Entrega os nomes das etapas agendadas dentre nomes à medida que
+        terminam (com sucesso ou não), na ordem de conclusão.
+        """
+        futuros = {self._futuros[nome]: nome for nome in nomes if nome in self._futuros}
+        for futuro in as_completed(futuros, timeout=timeout):
+            yield futuros[futuro]
+
+    def aguardar(self, timeout: Optional[float] = None) -> None:
+        """Aguarda o término de todas as etapas agendadas."""
+        for futuro in list(self._futuros.values()):
+            try:
+                futuro.result(timeout=timeout)
+            except Exception:
+                pass  #  Já registrado em erros
+
+
+def _repassar(origem: Future, destino: Future) -> None:
+    erro = origem.exception()
+    if erro is not None:
+        destino.set_exception(erro)
+    else:
+        destino.set_result(origem.result())
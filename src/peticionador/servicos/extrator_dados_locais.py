@@ -0,0 +1,146 @@
+#  src/peticionador/servicos/extrator_dados_locais.py
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from peticionador.servicos.blocos_texto import BlocosTexto
+
+#  Número único do CNJ: NNNNNNN-DD.AAAA.J.TR.OOOO
+_RE_CNJ = re.compile(r"\b\d{7}-\d{2}\.\d{4}\.\d\.\d{2}\.\d{4}\b")
+#  Rótulo da parte recorrente, com o nome na mesma linha ("RECORRENTE: Fulano") ou sozinho
+_RE_ROTULO = re.compile(r"(?im)^\s*(recorrentes?|agravantes?)\s*(?:[:\-–]\s*(.*))?$")
+#  Qualquer rótulo sozinho na linha ("RECORRIDO:"), que não pode ser tomado por nome
+_RE_ROTULO_GENERICO = re.compile(r"^\s*[^\W\d_][^\W\d_ ]*(\s+[^\W\d_]+)?\s*(\(\w+\))?\s*:\s*$")
+#  O nome termina na qualificação ("Fulano, brasileiro, ...") ou em um parêntese
+_RE_FIM_NOME = re.compile(r"\s*[,;(]|\s+[-–]\s")
+#  Agravos são contados primeiro: "agravo em recurso especial" não é um REsp
+_RE_AGRAVO = re.compile(
+    r"(?i)\bagravo\s+(em\s+recurso\s+(especial|extraordin[aá]rio)|interno|regimental|de\s+instrumento)\b|\bagravo\b"
+)
+_PADROES_TIPO: List[Tuple[str, re.Pattern]] = [
+    ("REsp", re.compile(r"(?i)\brecurso\s+especial\b|\bart(igo|\.)?\s*105,?\s*(inciso\s+)?iii\b")),
+    ("RE", re.compile(r"(?i)\brecurso\s+extraordin[aá]rio\b|\bart(igo|\.)?\s*102,?\s*(inciso\s+)?iii\b")),
+]
+
+#  Confiança atribuída ao recorrente conforme a posição do nome em relação ao rótulo
+CONFIANCA_NOME_NA_LINHA = 0.95
+CONFIANCA_NOME_ADJACENTE = 0.85
+#  Com uma única menção ao tipo de recurso, a confiança fica abaixo do máximo
+FATOR_MENCAO_UNICA = 0.85
+MINIMO_CARACTERES_NOME = 3
+MAXIMO_CARACTERES_NOME = 150
+
+
+@dataclass(frozen=True)
+class DadosLocais:
+    """Dados iniciais extraídos por regras, com a confiança (0 a 1) de cada campo."""
+    recorrente: str = "Desconhecido"
+    tipo_recurso: str = "Indeterminado"
+    numero_processo: str = "Não identificado"
+    confianca_recorrente: float = 0.0
+    confianca_tipo: float = 0.0
+
+    @property
+    def confianca(self) -> float:
+        """Confiança do conjunto: a do campo menos confiável."""
+        return min(self.confianca_recorrente, self.confianca_tipo)
+
+    def como_dicionario(self) -> Dict[str, str]:
+        """Mesmo formato de extrair_dados_iniciais_gemini."""
+        return {"recorrente": self.recorrente, "tipo_recurso": self.tipo_recurso}
+
+
+def extrair_numero_cnj(texto: Optional[str]) -> Optional[str]:
+    """Primeiro número de processo no formato CNJ do texto, ou None."""
+    resultado = _RE_CNJ.search(texto or "")
+    return resultado.group(0) if resultado else None
+
+
+def _limpar_nome(candidato: str) -> str:
+    nome = _RE_FIM_NOME.split(candidato, maxsplit=1)[0].strip(" .:-–\t")
+    if not MINIMO_CARACTERES_NOME <= len(nome) <= MAXIMO_CARACTERES_NOME or not re.search(r"[^\W\d_]", nome):
+        return ""
+    return nome
+
+
+def _recorrente_no_texto(texto: str) -> Tuple[str, float]:
+    linhas = texto.splitlines()
+    for indice, linha in enumerate(linhas):
+        rotulo = _RE_ROTULO.match(linha)
+        if not rotulo:
+            continue
+        nome = _limpar_nome(rotulo.group(2) or "")
+        if nome:
+            return nome, CONFIANCA_NOME_NA_LINHA
+        #  Rótulo sozinho: o nome vem na próxima linha não vazia
+        seguinte = next((l for l in linhas[indice + 1:] if l.strip()), "")
+        nome = _limpar_nome(seguinte)
+        if nome and not _RE_ROTULO_GENERICO.match(seguinte):
+            return nome, CONFIANCA_NOME_ADJACENTE
+    return "Desconhecido", 0.0
+
+
+def _recorrente_nos_blocos(blocos: BlocosTexto) -> Tuple[str, float]:
+    """
+    Procura o rótulo em blocos do layout de quadro ("RECORRENTE:" em um
+    bloco e o nome em outro à direita, na mesma altura).
+    """
+    for indice in range(len(blocos)):
+        texto = blocos.texto(indice)
+        nome, confianca = _recorrente_no_texto(texto)
+        if confianca == CONFIANCA_NOME_NA_LINHA:
+            return nome, confianca
+        if not _RE_ROTULO.match(texto.strip()):
+            continue
+        _, y0, x1, y1 = blocos.bboxes[indice]
+        centro = (y0 + y1) / 2
+        mesma_linha = [
+            j for j in blocos.indices_da_pagina(blocos.paginas[indice])
+            if j != indice and blocos.bboxes[j][0] >= x1 and blocos.bboxes[j][1] <= centro <= blocos.bboxes[j][3]
+        ]
+        if mesma_linha:
+            vizinho = min(mesma_linha, key=lambda j: blocos.bboxes[j][0])
+            nome = _limpar_nome(next((l for l in blocos.texto(vizinho).splitlines() if l.strip()), ""))
+            if nome:
+                return nome, CONFIANCA_NOME_ADJACENTE
+    return "Desconhecido", 0.0
+
+
+def _tipo_recurso(texto: str) -> Tuple[str, float]:
+    pontuacao: Dict[str, int] = {"Agravo": len(_RE_AGRAVO.findall(texto))}
+    sem_agravos = _RE_AGRAVO.sub(" ", texto)
+    for tipo, padrao in _PADROES_TIPO:
+        pontuacao[tipo] = len(padrao.findall(sem_agravos))
+
+    total = sum(pontuacao.values())
+    if not total:
+        return "Indeterminado", 0.0
+    tipo, maior = max(pontuacao.items(), key=lambda item: item[1])
+    if list(pontuacao.values()).count(maior) > 1:
+        return "Indeterminado", 0.0
+    confianca = maior / total
+    if maior == 1:
+        confianca *= FATOR_MENCAO_UNICA
+    return tipo, round(confianca, 3)
+
+
+def extrair_dados_locais(texto_pagina: Optional[str], blocos: Optional[BlocosTexto] = None) -> DadosLocais:
+    """
+    Extrai recorrente, tipo de recurso e número CNJ da primeira página por regras.
+
+    O recorrente vem do rótulo "RECORRENTE:"/"AGRAVANTE:" (nome na mesma linha,
+    na linha seguinte ou, com blocos, no bloco à direita); o tipo de recurso,
+    da contagem de menções a recurso especial, extraordinário e agravo.
+    """
+    texto = texto_pagina or ""
+    recorrente, confianca_recorrente = _recorrente_no_texto(texto)
+    if not confianca_recorrente and blocos is not None:
+        recorrente, confianca_recorrente = _recorrente_nos_blocos(blocos)
+    tipo_recurso, confianca_tipo = _tipo_recurso(texto)
+    return DadosLocais(
+        recorrente=recorrente,
+        tipo_recurso=tipo_recurso,
+        numero_processo=extrair_numero_cnj(texto) or "Não identificado",
+        confianca_recorrente=confianca_recorrente,
+        confianca_tipo=confianca_tipo,
+    )
@@ -1,155 +1,590 @@
 # src/peticionador/servicos/extrator_pdf.py
-import fitz  # PyMuPDF
+import hashlib
 import os
 import re
-from typing import Tuple, Dict, List, Optional
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import islice
+from typing import Callable, Deque, Tuple, Dict, Iterable, Iterator, List, Optional
 from pathlib import Path
+from peticionador.servicos.analise_layout import analisar_layout
+from peticionador.servicos.blocos_texto import BlocosTexto
+from peticionador.servicos.cache_extracao import obter_cache_extracao
+from peticionador.servicos.classificador_paginas import (
+    CLASSES_PAGINA,
+    PoliticaPagina,
+    classificar_pagina,
+    interpretar_politica,
+    marcador_pagina_resumida,
+    medir_pagina,
+)
+from peticionador.servicos.deduplicador_texto import DeduplicadorTexto
+from peticionador.servicos.documento_pdf import DocumentoPDF, FontePDF, abrir_documento, calcular_hash_arquivo
+from peticionador.servicos.pool_ocr import PoolOCR, obter_pool_ocr
 from peticionador.servicos.preprocessador_pdf import limpar_texto_pdf
+from peticionador.utilitarios.configuracoes import (
+    PDF_CACHE_HABILITADO,
+    PDF_DEDUPLICAR_TEXTO,
+    PDF_MINIMO_PAGINAS_PARALELO,
+    PDF_OCR_HABILITADO,
+    PDF_POLITICA_PAGINAS,
+    PDF_PROCESSOS_EXTRACAO,
+    PDF_REMOVER_CABECALHO_RODAPE,
+)
 import logging
 
 log = logging.getLogger(__name__)
 
-def extrair_texto_pdf_separado(caminho_arquivo: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+
+@dataclass(frozen=True)
+class PaginaLimpa:
+    """Texto limpo de uma página do PDF."""
+    numero: int  # 1-indexed
+    texto: str
+    num_caracteres: int
+    classe: str = "texto"  # ver classificador_paginas.ClassePagina
+
+
+@dataclass
+class ExtracaoPDF:
     """
-    Extrai texto de um arquivo PDF, separando a primeira página do restante.
+    Resultado de extrair_texto_pdf: as três partes de texto, a contagem de
+    páginas por classe e o que a deduplicação retirou (ver EconomiaDeduplicacao).
+    """
+    texto_primeira_pagina: Optional[str] = None
+    texto_demais_paginas: Optional[str] = None
+    texto_completo: Optional[str] = None
+    contagem_classes: Dict[str, int] = field(default_factory=dict)
+    economia_deduplicacao: Dict[str, int] = field(default_factory=dict)
 
-    Parâmetros:
-        caminho_arquivo (str): Caminho para o arquivo PDF
+    def como_tupla(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        return self.texto_primeira_pagina, self.texto_demais_paginas, self.texto_completo
 
-    Retorna:
-        Tuple[Optional[str], Optional[str], Optional[str]]:
-            (texto_primeira_pagina, texto_demais_paginas, texto_completo)
-            Retorna None para uma parte se ela não existir ou ocorrer erro.
+
+#  (texto limpo, classe) de uma página, ou None se a extração falhou
+PaginaProcessada = Optional[Tuple[str, str]]
+
+#  Uma extração paralela por vez no processo; as concorrentes (ex.: uploads
+#  simultâneos no servidor) seguem em modo serial em vez de abrir outro pool
+_lock_extracao_paralela = threading.Lock()
+
+
+def _resolver_num_processos(num_processos: Optional[int]) -> int:
+    """Converte o parâmetro/configuração de processos em um número efetivo (>= 1)."""
+    if num_processos is None:
+        num_processos = PDF_PROCESSOS_EXTRACAO
+    if num_processos <= 0:
+        num_processos = os.cpu_count() or 1
+    return num_processos
+
+
+def _limpar_pagina(documento: DocumentoPDF, indice: int, texto_bruto: Optional[str] = None) -> PaginaProcessada:
     """
-    if not os.path.exists(caminho_arquivo):
-        log.error(f"Arquivo PDF não encontrado: {caminho_arquivo}")
-        return None, None, None
+    Classifica e limpa o texto de uma página; retorna None (e registra) em caso de erro.
+
+    texto_bruto substitui o get_text() da página (ex.: texto já sem cabeçalhos).
+    """
+    try:
+        #  Carregada uma vez para o texto e as métricas (sem cache, cada pagina() reabre a página)
+        pagina = documento.pagina(indice)
+        if texto_bruto is None:
+            texto_bruto = documento.texto(indice, pagina)
+        classe = classificar_pagina(medir_pagina(pagina, texto_bruto), texto_bruto)
+        return limpar_texto_pdf(texto_bruto), classe
+    except Exception as e_pagina:
+        log.error(f"Erro ao processar página {indice+1}: {e_pagina}", exc_info=True)
+        return None
+
+
+#  Documento aberto em cada processo do pool de extração (ver _inicializar_processo_extracao)
+_documento_processo: Optional[DocumentoPDF] = None
+
+
+def _inicializar_processo_extracao(caminho: Optional[str], conteudo: Optional[bytes]) -> None:
+    """Abre o PDF uma única vez por processo do pool, a partir do caminho ou do buffer."""
+    global _documento_processo
+    _documento_processo = DocumentoPDF(caminho=caminho, conteudo=conteudo, manter_cache=False)
+
+
+def _extrair_intervalo_paginas(inicio: int, fim: int) -> List[PaginaProcessada]:
+    """
+    Extrai e limpa o texto das páginas [inicio, fim) no processo corrente do pool.
+
+    Páginas que falharem são retornadas como None.
+    """
+    assert _documento_processo is not None  #  nosec B101
+    return [_limpar_pagina(_documento_processo, i) for i in range(inicio, fim)]
 
-    texto_primeira_pagina: Optional[str] = None
-    texto_demais_paginas: str = ""
-    texto_completo: str = ""
 
+def _iterar_paginas_em_paralelo(
+    documento: DocumentoPDF, inicio_paginas: int, fim_paginas: int, num_processos: int
+) -> Iterator[Tuple[int, PaginaProcessada]]:
+    """
+    Divide as páginas em lotes contíguos, extrai em um pool de processos e
+    devolve (índice, texto) na ordem original.
+
+    Cada processo abre o próprio handle fitz (do arquivo ou de uma cópia do
+    buffer). Apenas uma janela de lotes fica em andamento por vez, para que o
+    consumo de memória não cresça com o tamanho do documento.
+    """
+    #  Mais lotes que processos equilibra a carga entre páginas leves e pesadas
+    tamanho_lote = max(1, -(-(fim_paginas - inicio_paginas) // (num_processos * 4)))
+    intervalos = iter(
+        [(i, min(i + tamanho_lote, fim_paginas)) for i in range(inicio_paginas, fim_paginas, tamanho_lote)]
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=num_processos,
+        initializer=_inicializar_processo_extracao,
+        #  Buffers (ex.: memoryview de upload) são convertidos para bytes, que podem ser enviados aos processos
+        initargs=(documento.caminho, bytes(documento.conteudo) if documento.conteudo is not None else None),
+    ) as executor:
+        pendentes: Deque[Tuple[int, Future]] = deque(
+            (inicio, executor.submit(_extrair_intervalo_paginas, inicio, fim))
+            for inicio, fim in islice(intervalos, num_processos * 2)
+        )
+        while pendentes:
+            inicio, futuro = pendentes.popleft()
+            resultados = futuro.result()
+            proximo = next(intervalos, None)
+            if proximo is not None:
+                pendentes.append((proximo[0], executor.submit(_extrair_intervalo_paginas, *proximo)))
+            for deslocamento, resultado in enumerate(resultados):
+                yield inicio + deslocamento, resultado
+
+
+def _iterar_paginas_sem_cabecalho_rodape(
+    documento: DocumentoPDF, inicio_paginas: int, fim_paginas: int
+) -> Iterator[Tuple[int, PaginaProcessada]]:
+    """Analisa o layout do documento inteiro e devolve as páginas sem cabeçalhos/rodapés recorrentes."""
+    layout = analisar_layout(documento)
+    for indice in range(inicio_paginas, fim_paginas):
+        yield indice, _limpar_pagina(documento, indice, layout.texto_pagina(indice))
+
+
+def _pagina_com_ocr(pagina: PaginaLimpa, futuro: "Optional[Future[str]]", paginas_sem_ocr: List[int]) -> PaginaLimpa:
+    """Substitui o texto da página pelo OCR; em caso de erro, mantém a página como veio."""
+    if futuro is None:
+        return pagina
     try:
-        documento = fitz.open(caminho_arquivo)
-        num_paginas = len(documento)
-        log.info(f"Abrindo PDF: {caminho_arquivo} ({num_paginas} páginas)")
+        texto = limpar_texto_pdf(futuro.result())
+    except Exception as e_ocr:
+        log.error(f"Erro no OCR da página {pagina.numero}: {e_ocr}", exc_info=True)
+        paginas_sem_ocr.append(pagina.numero)
+        return pagina
+    return replace(pagina, texto=texto, num_caracteres=len(texto))
 
-        if num_paginas == 0:
-            log.warning("PDF não contém páginas.")
-            documento.close()
-            return None, None, None
 
-        # Extrair e limpar primeira página
+def _aplicar_ocr(
+    documento: DocumentoPDF, paginas: Iterable[PaginaLimpa], pool: PoolOCR, paginas_sem_ocr: List[int]
+) -> Iterator[PaginaLimpa]:
+    """
+    Envia as páginas digitalizadas ao pool de OCR e devolve todas na ordem original.
+
+    As demais páginas seguem assim que as digitalizadas anteriores a elas
+    ficam prontas; o pool limita quantas páginas ficam em andamento. Uma
+    falha de OCR (no envio ou no resultado) mantém a página como extraída e
+    acrescenta o seu número a paginas_sem_ocr.
+    """
+    pendentes: Deque[Tuple[PaginaLimpa, Optional[Future]]] = deque()
+    for pagina in paginas:
+        futuro: Optional[Future] = None
+        if pagina.classe == "digitalizada":
+            try:
+                futuro = pool.submeter(documento, pagina.numero - 1)
+            except Exception as e_ocr:
+                #  Ex.: falha ao renderizar ou pool de processos quebrado; a página segue sem OCR
+                log.error(f"Erro ao enviar a página {pagina.numero} para OCR: {e_ocr}", exc_info=True)
+                paginas_sem_ocr.append(pagina.numero)
+        pendentes.append((pagina, futuro))
+        while pendentes and (pendentes[0][1] is None or pendentes[0][1].done()):
+            yield _pagina_com_ocr(*pendentes.popleft(), paginas_sem_ocr)
+    while pendentes:
+        yield _pagina_com_ocr(*pendentes.popleft(), paginas_sem_ocr)
+    pool.registrar_estatisticas()
+
+
+def iterar_paginas_limpas(
+    fonte: FontePDF,
+    num_processos: Optional[int] = None,
+    remover_cabecalho_rodape: bool = False,
+    intervalo_paginas: Optional[Tuple[int, int]] = None,
+    usar_ocr: bool = False,
+    paginas_sem_ocr: Optional[List[int]] = None,
+) -> Iterator[PaginaLimpa]:
+    """
+    Percorre o PDF página a página, produzindo o texto limpo e a classe
+    (texto, em_branco, protocolar, digitalizada) de cada uma.
+
+    Nada além da página corrente (ou da janela de lotes, no modo paralelo) é
+    mantido em memória, o que permite limitar ou amostrar páginas de volumes
+    grandes sem materializar o documento inteiro. Um DocumentoPDF recebido
+    pronto tem o cache de páginas suspenso durante a iteração (sem_cache). Páginas que falharem na
+    extração são registradas no log e omitidas.
+
+    O modo paralelo só é usado se não houver outra extração paralela em
+    andamento no processo; caso contrário a extração segue serial.
+
+    Com remover_cabecalho_rodape, o layout de todas as páginas é analisado
+    antes (analise_layout) e os blocos recorrentes de topo/base são retirados
+    antes da limpeza; esse modo é sempre serial.
+
+    Parâmetros:
+        fonte (FontePDF): Caminho, bytes do PDF ou DocumentoPDF já aberto
+        num_processos (Optional[int]): Ver extrair_texto_pdf_separado.
+        remover_cabecalho_rodape (bool): Remove cabeçalhos/rodapés recorrentes.
+        intervalo_paginas (Optional[Tuple[int, int]]): Páginas [inicio, fim)
+            (0-indexed) a extrair; None extrai o documento inteiro.
+        usar_ocr (bool): Reconhece o texto das páginas digitalizadas (sem
+            camada de texto) com o pool de OCR, se disponível.
+        paginas_sem_ocr (Optional[List[int]]): Recebe os números das páginas
+            digitalizadas cujo OCR falhou (ficam com o texto extraído).
+
+    Retorna:
+        Iterator[PaginaLimpa]: Páginas na ordem do documento.
+    """
+    with abrir_documento(fonte, manter_cache=False) as documento, documento.sem_cache():
+        log.info(f"Abrindo PDF: {documento.descricao} ({len(documento)} páginas)")
+        inicio, fim = intervalo_paginas or (0, len(documento))
+        inicio, fim = max(inicio, 0), min(fim, len(documento))
+        num_paginas = max(fim - inicio, 0)
+        if intervalo_paginas is not None:
+            log.info(f"Extraindo apenas as páginas {inicio + 1} a {fim}.")
+
+        pool = obter_pool_ocr() if usar_ocr else None
+        processos = min(_resolver_num_processos(num_processos), max(num_paginas, 1))
+        em_paralelo = (
+            not remover_cabecalho_rodape
+            and processos > 1
+            and num_paginas >= PDF_MINIMO_PAGINAS_PARALELO
+            and _lock_extracao_paralela.acquire(blocking=False)
+        )
+        if remover_cabecalho_rodape:
+            paginas: Iterable[Tuple[int, PaginaProcessada]] = _iterar_paginas_sem_cabecalho_rodape(
+                documento, inicio, fim
+            )
+        elif em_paralelo:
+            log.info(f"Extraindo {num_paginas} páginas em paralelo ({processos} processos)...")
+            paginas = _iterar_paginas_em_paralelo(
+                documento, inicio, fim, processos
+            )
+        else:
+            paginas = ((i, _limpar_pagina(documento, i)) for i in range(inicio, fim))
+
+        paginas_limpas: Iterable[PaginaLimpa] = (
+            PaginaLimpa(numero=indice + 1, texto=resultado[0], num_caracteres=len(resultado[0]), classe=resultado[1])
+            for indice, resultado in paginas
+            if resultado is not None
+        )
+        if pool is not None:
+            paginas_limpas = _aplicar_ocr(
+                documento, paginas_limpas, pool, paginas_sem_ocr if paginas_sem_ocr is not None else []
+            )
         try:
-            primeira_pagina_raw = documento[0].get_text()
-            texto_primeira_pagina = limpar_texto_pdf(primeira_pagina_raw)
-            texto_completo += texto_primeira_pagina + "\n\n" # Adiciona ao completo
+            yield from paginas_limpas
+        finally:
+            if em_paralelo:
+                _lock_extracao_paralela.release()
+
+
+def _montar_partes(
+    paginas: Iterable[PaginaLimpa],
+    politica: Dict[str, PoliticaPagina],
+    numero_primeira: int = 1,
+    deduplicador: Optional[DeduplicadorTexto] = None,
+    ao_extrair_primeira_pagina: Optional[Callable[[str], None]] = None,
+) -> ExtracaoPDF:
+    """
+    Monta (primeira, demais, completo) a partir das páginas, com um único join por parte.
+
+    numero_primeira é o número (1-indexed) da página tratada como primeira,
+    que muda quando apenas um intervalo do documento é extraído.
+    ao_extrair_primeira_pagina recebe o texto dessa página assim que ele fica
+    pronto, antes das demais páginas serem extraídas.
+
+    Cada página é mantida, resumida (substituída por um marcador) ou descartada
+    conforme a política da sua classe; a contagem por classe considera todas.
+    Com deduplicador, trechos repetidos das páginas mantidas são retirados
+    após a primeira ocorrência, na ordem do documento.
+    """
+    texto_primeira_pagina: Optional[str] = None
+    partes_demais: List[str] = []
+    ha_demais_paginas = False
+    contagem_classes = {classe: 0 for classe in CLASSES_PAGINA}
+    for pagina in paginas:
+        contagem_classes[pagina.classe] = contagem_classes.get(pagina.classe, 0) + 1
+        acao = politica.get(pagina.classe, "manter")
+        if acao == "descartar":
+            continue
+        if acao == "manter":
+            texto = deduplicador.processar(pagina.texto) if deduplicador else pagina.texto
+        else:
+            texto = marcador_pagina_resumida(pagina.numero, pagina.classe)
+        if pagina.numero == numero_primeira:
+            texto_primeira_pagina = texto
             log.info("Texto da primeira página extraído e limpo.")
-        except Exception as e_pg1:
-            log.error(f"Erro ao processar primeira página: {e_pg1}", exc_info=True)
-            # Continua para tentar extrair o resto
-
-        # Extrair e limpar demais páginas (se existirem)
-        if num_paginas > 1:
-            log.info("Extraindo texto das demais páginas...")
-            for i in range(1, num_paginas):
-                try:
-                    pagina_raw = documento[i].get_text()
-                    texto_limpo = limpar_texto_pdf(pagina_raw)
-                    texto_demais_paginas += texto_limpo + "\n\n"
-                    texto_completo += texto_limpo + "\n\n" # Adiciona ao completo
-                except Exception as e_pg_demais:
-                     log.error(f"Erro ao processar página {i+1}: {e_pg_demais}", exc_info=True)
-            log.info("Texto das demais páginas extraído e limpo.")
+            if ao_extrair_primeira_pagina is not None:
+                ao_extrair_primeira_pagina(texto)
         else:
-            log.info("PDF possui apenas uma página.")
-            texto_demais_paginas = None # Explicitamente None se não há outras páginas
+            ha_demais_paginas = True
+            partes_demais.append(texto)
 
+    log.info(f"Páginas por classe: {contagem_classes}")
+    economia = deduplicador.economia.como_dict() if deduplicador else {}
+    if economia:
+        log.info(
+            f"Deduplicação: {economia['caracteres_removidos']} caracteres "
+            f"(~{economia['tokens_estimados']} tokens) em {economia['trechos_removidos']} trechos repetidos."
+        )
+    if texto_primeira_pagina is None and not ha_demais_paginas:
+        log.warning("PDF não contém páginas com texto extraível.")
+        return ExtracaoPDF(contagem_classes=contagem_classes, economia_deduplicacao=economia)
 
-        documento.close()
+    demais_bruto = "\n\n".join(partes_demais)
+    partes_demais.clear()
+    if texto_primeira_pagina is not None:
+        texto_completo = f"{texto_primeira_pagina}\n\n{demais_bruto}".strip()
+    else:
+        texto_completo = demais_bruto.strip()
 
-        # Limpeza final do texto completo
-        texto_completo = texto_completo.strip()
-        if texto_demais_paginas is not None:
-             texto_demais_paginas = texto_demais_paginas.strip()
+    texto_demais_paginas: Optional[str] = None
+    if ha_demais_paginas:
+        texto_demais_paginas = demais_bruto.strip()
+        log.info("Texto das demais páginas extraído e limpo.")
+    else:
+        log.info("PDF possui apenas uma página.")
 
+    return ExtracaoPDF(texto_primeira_pagina, texto_demais_paginas, texto_completo, contagem_classes, economia)
+
+
+def extrair_texto_pdf(
+    fonte: FontePDF,
+    num_processos: Optional[int] = None,
+    usar_cache: Optional[bool] = None,
+    remover_cabecalho_rodape: Optional[bool] = None,
+    politica_paginas: Optional[Dict[str, PoliticaPagina]] = None,
+    intervalo_paginas: Optional[Tuple[int, int]] = None,
+    usar_ocr: Optional[bool] = None,
+    deduplicar: Optional[bool] = None,
+    ao_extrair_primeira_pagina: Optional[Callable[[str], None]] = None,
+) -> ExtracaoPDF:
+    """
+    Extrai texto de um arquivo PDF, separando a primeira página do restante.
 
-        return texto_primeira_pagina, texto_demais_paginas, texto_completo
+    Construída sobre iterar_paginas_limpas. Antes de abrir o PDF, consulta o
+    cache de extração pelo SHA-256 do conteúdo. Documentos com pelo menos
+    PDF_MINIMO_PAGINAS_PARALELO páginas são extraídos em paralelo, com cada
+    processo abrindo o próprio handle do PDF. Páginas em branco, protocolares
+    ou digitalizadas são tratadas conforme a política de páginas.
+
+    Parâmetros:
+        fonte (FontePDF): Caminho, bytes do PDF ou DocumentoPDF já aberto
+        num_processos (Optional[int]): Processos para a extração. None usa
+            PDF_PROCESSOS_EXTRACAO; 0 usa todos os núcleos; 1 força extração serial.
+        usar_cache (Optional[bool]): Consulta/alimenta o cache de extração.
+            None segue PDF_CACHE_HABILITADO.
+        remover_cabecalho_rodape (Optional[bool]): Remove timbres e rodapés
+            recorrentes antes da limpeza. None segue PDF_REMOVER_CABECALHO_RODAPE.
+        politica_paginas (Optional[Dict[str, PoliticaPagina]]): Ação por classe
+            de página ('manter', 'resumir', 'descartar'). None segue PDF_POLITICA_PAGINAS.
+        intervalo_paginas (Optional[Tuple[int, int]]): Páginas [inicio, fim)
+            (0-indexed) a extrair, por exemplo o recurso localizado por
+            segmentador_autos; a primeira página do intervalo é tratada como
+            primeira página. None extrai o documento inteiro.
+        usar_ocr (Optional[bool]): Aplica OCR às páginas digitalizadas.
+            None segue PDF_OCR_HABILITADO.
+        deduplicar (Optional[bool]): Retira trechos repetidos entre páginas
+            (deduplicador_texto). None segue PDF_DEDUPLICAR_TEXTO.
+        ao_extrair_primeira_pagina (Optional[Callable[[str], None]]): Chamada
+            com o texto da primeira página assim que ele fica pronto, para que
+            etapas que só dependem dela comecem antes do fim da extração.
+
+    Retorna:
+        ExtracaoPDF: Partes do texto (None se inexistentes ou em caso de erro)
+            e a contagem de páginas por classe.
+    """
+    if isinstance(fonte, str) and not os.path.exists(fonte):
+        log.error(f"Arquivo PDF não encontrado: {fonte}")
+        return ExtracaoPDF()
+
+    if usar_cache is None:
+        usar_cache = PDF_CACHE_HABILITADO
+    if remover_cabecalho_rodape is None:
+        remover_cabecalho_rodape = PDF_REMOVER_CABECALHO_RODAPE
+    if politica_paginas is None:
+        politica_paginas = interpretar_politica(PDF_POLITICA_PAGINAS)
+    if usar_ocr is None:
+        usar_ocr = PDF_OCR_HABILITADO
+    #  Sem motor de OCR, o resultado é o mesmo da extração sem OCR (e assim fica no cache)
+    usar_ocr = usar_ocr and obter_pool_ocr() is not None
+    numero_primeira = intervalo_paginas[0] + 1 if intervalo_paginas else 1
+    if deduplicar is None:
+        deduplicar = PDF_DEDUPLICAR_TEXTO
+    deduplicador = DeduplicadorTexto() if deduplicar else None
+
+    try:
+        cache = None
+        chave_cache = ""
+        if usar_cache:
+            cache = obter_cache_extracao()
+            if isinstance(fonte, DocumentoPDF):
+                hash_pdf = fonte.hash_conteudo()
+            elif isinstance(fonte, (bytes, bytearray, memoryview)):
+                hash_pdf = hashlib.sha256(fonte).hexdigest()
+            else:
+                hash_pdf = calcular_hash_arquivo(fonte)
+            variante = "sem_cabecalho_rodape" if remover_cabecalho_rodape else ""
+            if intervalo_paginas is not None:
+                variante += f":paginas_{intervalo_paginas[0]}_{intervalo_paginas[1]}"
+            if usar_ocr:
+                variante += ":ocr"
+            chave_cache = cache.gerar_chave(hash_pdf, variante)
+            paginas_cache = cache.obter(chave_cache)
+            if paginas_cache is not None:
+                log.info("Texto do PDF obtido do cache de extração.")
+                return _montar_partes(
+                    (
+                        PaginaLimpa(numero=numero, texto=texto, num_caracteres=len(texto), classe=classe)
+                        for numero, texto, classe in paginas_cache
+                    ),
+                    politica_paginas,
+                    numero_primeira,
+                    deduplicador,
+                )
+
+        paginas_sem_ocr: List[int] = []
+        paginas_extraidas = iterar_paginas_limpas(
+            fonte, num_processos, remover_cabecalho_rodape, intervalo_paginas, usar_ocr, paginas_sem_ocr
+        )
+        if cache is None:
+            return _montar_partes(
+                paginas_extraidas, politica_paginas, numero_primeira, deduplicador, ao_extrair_primeira_pagina
+            )
+
+        def _publicar_no_cache() -> bool:
+            #  Com falha de OCR, a entrada guardaria a página sem texto e o OCR nunca seria refeito
+            if paginas_sem_ocr:
+                log.warning(f"Extração não gravada no cache: OCR falhou nas páginas {paginas_sem_ocr}.")
+            return not paginas_sem_ocr
+
+        #  As páginas seguem para a montagem enquanto são comprimidas no cache
+        paginas_gravadas = cache.armazenar_em_fluxo(
+            chave_cache, ((p.numero, p.texto, p.classe) for p in paginas_extraidas), _publicar_no_cache
+        )
+        return _montar_partes(
+            (
+                PaginaLimpa(numero=numero, texto=texto, num_caracteres=len(texto), classe=classe)
+                for numero, texto, classe in paginas_gravadas
+            ),
+            politica_paginas,
+            numero_primeira,
+            deduplicador,
+            ao_extrair_primeira_pagina,
+        )
 
     except Exception as e:
         log.error(f"Erro CRÍTICO ao extrair texto do PDF: {e}", exc_info=True)
-        if 'documento' in locals() and documento:
-            documento.close() # Garante fechar o documento
-        return None, None, None
+        return ExtracaoPDF()
+
+
+def extrair_texto_pdf_separado(
+    fonte: FontePDF,
+    num_processos: Optional[int] = None,
+    usar_cache: Optional[bool] = None,
+    remover_cabecalho_rodape: Optional[bool] = None,
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Extrai texto de um arquivo PDF, separando a primeira página do restante.
+
+    Ver extrair_texto_pdf para os parâmetros.
+
+    Retorna:
+        Tuple[Optional[str], Optional[str], Optional[str]]:
+            (texto_primeira_pagina, texto_demais_paginas, texto_completo)
+            Retorna None para uma parte se ela não existir ou ocorrer erro.
+    """
+    return extrair_texto_pdf(fonte, num_processos, usar_cache, remover_cabecalho_rodape).como_tupla()
+
 
-def extrair_metadados_pdf(caminho_arquivo: str) -> Dict:
+def extrair_metadados_pdf(fonte: FontePDF) -> Dict:
     """
     Extrai metadados de um arquivo PDF.
-    
+
     Parâmetros:
-        caminho_arquivo (str): Caminho para o arquivo PDF
-        
+        fonte (FontePDF): Caminho, bytes do PDF ou DocumentoPDF já aberto
+
     Retorna:
         Dict: Dicionário com metadados do documento
     """
     try:
-        documento = fitz.open(caminho_arquivo)
-        metadados = documento.metadata
-        documento.close()
-        return metadados
+        with abrir_documento(fonte) as documento:
+            return documento.metadados
     except Exception as e:
         return {"erro": str(e)}
 
 
-def extrair_blocos_texto(caminho_arquivo: str, pagina_inicio: int = 0, pagina_fim: Optional[int] = None) -> List[Dict]:
+def extrair_blocos_texto(fonte: FontePDF, pagina_inicio: int = 0, pagina_fim: Optional[int] = None) -> List[Dict]:
     """
     Extrai blocos de texto estruturado, mantendo informações de posicionamento.
     Útil para análise de layouts específicos de documentos jurídicos.
-    
+
     Parâmetros:
-        caminho_arquivo (str): Caminho para o arquivo PDF
+        fonte (FontePDF): Caminho, bytes do PDF ou DocumentoPDF já aberto
         pagina_inicio (int): Página inicial (0-indexed)
         pagina_fim (Optional[int]): Página final (inclusive), ou None para todas
-        
+
     Retorna:
         List[Dict]: Lista de blocos de texto com posição e conteúdo
     """
     try:
-        documento = fitz.open(caminho_arquivo)
-        
-        if pagina_fim is None:
-            pagina_fim = len(documento) - 1
-        
-        blocos = []
-        
-        for num_pagina in range(pagina_inicio, min(pagina_fim + 1, len(documento))):
-            pagina = documento[num_pagina]
-            # dict_keys(['type', 'bbox', 'lines', 'spans'])
-            blocks = pagina.get_text("dict")["blocks"]
-            
-            for bloco in blocks:
-                if "lines" in bloco:
-                    texto_bloco = ""
-                    for linha in bloco["lines"]:
-                        if "spans" in linha:
-                            for span in linha["spans"]:
-                                texto_bloco += span["text"] + " "
-                            texto_bloco += "\n"
-                    
-                    if texto_bloco.strip():
-                        blocos.append({
-                            "pagina": num_pagina + 1,  # 1-indexed para humanos
-                            "posicao": bloco["bbox"],  # [x0, y0, x1, y1]
-                            "texto": texto_bloco.strip()
-                        })
-        
-        documento.close()
-        return blocos
-    
+        with abrir_documento(fonte) as documento:
+            if pagina_fim is None:
+                pagina_fim = len(documento) - 1
+
+            blocos = []
+
+            for num_pagina in range(pagina_inicio, min(pagina_fim + 1, len(documento))):
+                # dict_keys(['type', 'bbox', 'lines', 'spans'])
+                blocks = documento.dicionario(num_pagina)["blocks"]
+
+                for bloco in blocks:
+                    if "lines" in bloco:
+                        texto_bloco = ""
+                        for linha in bloco["lines"]:
+                            if "spans" in linha:
+                                for span in linha["spans"]:
+                                    texto_bloco += span["text"] + " "
+                                texto_bloco += "\n"
+
+                        if texto_bloco.strip():
+                            blocos.append({
+                                "pagina": num_pagina + 1,  # 1-indexed para humanos
+                                "posicao": bloco["bbox"],  # [x0, y0, x1, y1]
+                                "texto": texto_bloco.strip()
+                            })
+
+            return blocos
+
     except Exception as e:
         raise Exception(f"Erro ao extrair blocos de texto: {str(e)}")
 
 
+def extrair_blocos_colunares(fonte: FontePDF, pagina_inicio: int = 0, pagina_fim: Optional[int] = None) -> BlocosTexto:
+    """
+    Variante compacta de extrair_blocos_texto: devolve os blocos em um
+    BlocosTexto (arrays de páginas/bboxes e um único buffer de texto).
+
+    Parâmetros:
+        fonte (FontePDF): Caminho, bytes do PDF ou DocumentoPDF já aberto
+        pagina_inicio (int): Página inicial (0-indexed)
+        pagina_fim (Optional[int]): Página final (inclusive), ou None para todas
+    """
+    with abrir_documento(fonte) as documento:
+        return BlocosTexto.de_documento(documento, pagina_inicio, pagina_fim)
+
+
 def detectar_cabecalho_rodape(blocos: List[Dict], tolerancia: float = 20.0) -> Dict[str, str]:
     """
     Detecta automaticamente cabeçalhos e rodapés recorrentes em um documento.
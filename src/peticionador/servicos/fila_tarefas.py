@@ -0,0 +1,392 @@
+#  src/peticionador/servicos/fila_tarefas.py
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from peticionador.utilitarios.configuracoes import (
+    TAREFAS_ARQUIVO,
+    TAREFAS_ESPERA_BASE_SEGUNDOS,
+    TAREFAS_INTERVALO_CONSULTA_SEGUNDOS,
+    TAREFAS_MAXIMO_TENTATIVAS,
+    TAREFAS_PRAZO_RESERVA_SEGUNDOS,
+)
+
+log = logging.getLogger(__name__)
+
+PENDENTE = "pendente"
+EXECUTANDO = "executando"
+CONCLUIDA = "concluida"
+#  Fila de descartadas (dead-letter): esgotou as tentativas ou não tem tratador
+DESCARTADA = "descartada"
+#  Parâmetro com um arquivo que só existe para a tarefa; é removido quando ela é concluída
+#  ou expurgada (descartadas o mantêm, para poderem ser reenfileiradas)
+CHAVE_ARQUIVO_TEMPORARIO = "arquivo_temporario"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS tarefas (
+    id TEXT PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    parametros TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    maximo_tentativas INTEGER NOT NULL,
+    resultado TEXT,
+    erro TEXT,
+    trabalhador TEXT,
+    disponivel_em REAL NOT NULL,
+    reservada_ate REAL,
+    criada_em REAL NOT NULL,
+    atualizada_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tarefas_estado_disponivel ON tarefas (estado, disponivel_em);
+"""
+
+
+@dataclass
+class Tarefa:
+    id: str
+    tipo: str
+    parametros: Dict[str, Any]
+    estado: str
+    tentativas: int
+    maximo_tentativas: int
+    resultado: Optional[Dict[str, Any]]
+    erro: Optional[str]
+    criada_em: float
+    atualizada_em: float
+
+    def situacao(self) -> Dict[str, Any]:
+        """Estado público da tarefa, sem parâmetros nem resultado."""
+        return {
+            "id": self.id,
+            "tipo": self.tipo,
+            "estado": self.estado,
+            "tentativas": self.tentativas,
+            "maximo_tentativas": self.maximo_tentativas,
+            "erro": self.erro,
+            "criada_em": self.criada_em,
+            "atualizada_em": self.atualizada_em,
+        }
+
+
+class FilaTarefas:
+    """
+    Fila de tarefas durável em SQLite, compartilhada entre processos de um
+    mesmo host. O banco (em modo WAL) deve ficar em disco local: WAL e os
+    bloqueios do SQLite não funcionam de forma confiável em NFS/SMB, então
+    trabalhadores em outros hosts exigiriam outro backend.
+
+    Cada tarefa é reservada por um trabalhador por prazo_reserva segundos;
+    se ele não a concluir nem registrar a falha nesse prazo (processo
+    encerrado), ela volta a ficar disponível. Falhas são repetidas com espera
+    exponencial (espera_base, 2x espera_base, ...) até maximo_tentativas;
+    depois a tarefa fica DESCARTADA, com o último erro, até ser reenfileirada.
+    """
+
+    def __init__(
+        self,
+        caminho_banco: str,
+        maximo_tentativas: int = TAREFAS_MAXIMO_TENTATIVAS,
+        espera_base: float = TAREFAS_ESPERA_BASE_SEGUNDOS,
+        prazo_reserva: float = TAREFAS_PRAZO_RESERVA_SEGUNDOS,
+    ):
+        self.caminho_banco = Path(caminho_banco)
+        self.maximo_tentativas = max(1, maximo_tentativas)
+        self.espera_base = espera_base
+        self.prazo_reserva = prazo_reserva
+        self._banco_pronto = False
+
+    def _conectar(self) -> sqlite3.Connection:
+        #  isolation_level=None: as transações são abertas explicitamente (BEGIN IMMEDIATE)
+        conexao = sqlite3.connect(str(self.caminho_banco), timeout=30, isolation_level=None)
+        conexao.row_factory = sqlite3.Row
+        if not self._banco_pronto:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.executescript(_ESQUEMA)
+            self._banco_pronto = True
+        return conexao
+
+    def enfileirar(self, tipo: str, parametros: Dict[str, Any], maximo_tentativas: Optional[int] = None) -> str:
+        """Grava a tarefa como PENDENTE e retorna o seu id."""
+        id_tarefa = uuid.uuid4().hex
+        agora = time.time()
+        conexao = self._conectar()
+        try:
+            conexao.execute(
+                "INSERT INTO tarefas (id, tipo, parametros, estado, maximo_tentativas, disponivel_em, criada_em, atualizada_em) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    id_tarefa, tipo, json.dumps(parametros, ensure_ascii=False), PENDENTE,
+                    maximo_tentativas or self.maximo_tentativas, agora, agora, agora,
+                ),
+            )
+        finally:
+            conexao.close()
+        log.info(f"Tarefa {id_tarefa} ({tipo}) enfileirada.")
+        return id_tarefa
+
+    def reservar(self, trabalhador: str) -> Optional[Tarefa]:
+        """
+        Reserva a tarefa disponível mais antiga para trabalhador e conta a
+        tentativa; None se não houver tarefa disponível.
+        """
+        agora = time.time()
+        conexao = self._conectar()
+        try:
+            conexao.execute("BEGIN IMMEDIATE")
+            #  Reservas vencidas na última tentativa não voltam à fila
+            conexao.execute(
+                "UPDATE tarefas SET estado = ?, erro = ?, atualizada_em = ? "
+                "WHERE estado = ? AND reservada_ate < ? AND tentativas >= maximo_tentativas",
+                (DESCARTADA, "Prazo de reserva esgotado na última tentativa.", agora, EXECUTANDO, agora),
+            )
+            linha = conexao.execute(
+                "SELECT id FROM tarefas WHERE (estado = ? AND disponivel_em <= ?) OR (estado = ? AND reservada_ate < ?) "
+                "ORDER BY criada_em LIMIT 1",
+                (PENDENTE, agora, EXECUTANDO, agora),
+            ).fetchone()
+            if linha is None:
+                conexao.execute("COMMIT")
+                return None
+            conexao.execute(
+                "UPDATE tarefas SET estado = ?, tentativas = tentativas + 1, trabalhador = ?, reservada_ate = ?, "
+                "atualizada_em = ? WHERE id = ?",
+                (EXECUTANDO, trabalhador, agora + self.prazo_reserva, agora, linha["id"]),
+            )
+            conexao.execute("COMMIT")
+        except sqlite3.Error:
+            if conexao.in_transaction:
+                conexao.execute("ROLLBACK")
+            raise
+        finally:
+            conexao.close()
+        return self.obter(linha["id"])
+
+    def concluir(self, id_tarefa: str, trabalhador: str, resultado: Dict[str, Any]) -> bool:
+        """
+        Marca a tarefa como CONCLUIDA com o resultado. Retorna False se a
+        reserva já não pertence a trabalhador (prazo esgotado e tarefa retomada).
+        """
+        conexao = self._conectar()
+        try:
+            cursor = conexao.execute(
+                "UPDATE tarefas SET estado = ?, resultado = ?, erro = NULL, reservada_ate = NULL, atualizada_em = ? "
+                "WHERE id = ? AND trabalhador = ? AND estado = ?",
+                (CONCLUIDA, json.dumps(resultado, ensure_ascii=False), time.time(), id_tarefa, trabalhador, EXECUTANDO),
+            )
+        finally:
+            conexao.close()
+        return cursor.rowcount == 1
+
+    def falhar(self, id_tarefa: str, trabalhador: str, erro: str, repetir: bool = True) -> Optional[str]:
+        """
+        Registra a falha da tentativa: a tarefa volta a PENDENTE após a espera
+        exponencial ou, sem tentativas restantes (ou com repetir=False), fica
+        DESCARTADA. Retorna o novo estado, ou None se a reserva já não pertence a trabalhador.
+        """
+        agora = time.time()
+        conexao = self._conectar()
+        try:
+            conexao.execute("BEGIN IMMEDIATE")
+            linha = conexao.execute(
+                "SELECT tentativas, maximo_tentativas FROM tarefas WHERE id = ? AND trabalhador = ? AND estado = ?",
+                (id_tarefa, trabalhador, EXECUTANDO),
+            ).fetchone()
+            if linha is None:
+                conexao.execute("COMMIT")
+                return None
+            if repetir and linha["tentativas"] < linha["maximo_tentativas"]:
+                estado = PENDENTE
+                disponivel_em = agora + self.espera_base * 2 ** (linha["tentativas"] - 1)
+            else:
+                estado, disponivel_em = DESCARTADA, agora
+            conexao.execute(
+                "UPDATE tarefas SET estado = ?, erro = ?, disponivel_em = ?, reservada_ate = NULL, atualizada_em = ? "
+                "WHERE id = ?",
+                (estado, erro, disponivel_em, agora, id_tarefa),
+            )
+            conexao.execute("COMMIT")
+        except sqlite3.Error:
+            if conexao.in_transaction:
+                conexao.execute("ROLLBACK")
+            raise
+        finally:
+            conexao.close()
+        return estado
+
+    def reenfileirar(self, id_tarefa: str) -> bool:
+        """Devolve uma tarefa DESCARTADA à fila, com as tentativas zeradas."""
+        agora = time.time()
+        conexao = self._conectar()
+        try:
+            cursor = conexao.execute(
+                "UPDATE tarefas SET estado = ?, tentativas = 0, disponivel_em = ?, atualizada_em = ? "
+                "WHERE id = ? AND estado = ?",
+                (PENDENTE, agora, agora, id_tarefa, DESCARTADA),
+            )
+        finally:
+            conexao.close()
+        return cursor.rowcount == 1
+
+    def expurgar(self, id_tarefa: Optional[str] = None) -> int:
+        """
+        Apaga a tarefa DESCARTADA id_tarefa (ou todas as descartadas, sem id)
+        e os seus arquivos temporários. Retorna quantas foram apagadas.
+        """
+        conexao = self._conectar()
+        try:
+            conexao.execute("BEGIN IMMEDIATE")
+            if id_tarefa is None:
+                linhas = conexao.execute("SELECT * FROM tarefas WHERE estado = ?", (DESCARTADA,)).fetchall()
+            else:
+                linhas = conexao.execute(
+                    "SELECT * FROM tarefas WHERE id = ? AND estado = ?", (id_tarefa, DESCARTADA)
+                ).fetchall()
+            conexao.executemany("DELETE FROM tarefas WHERE id = ?", [(linha["id"],) for linha in linhas])
+            conexao.execute("COMMIT")
+        except sqlite3.Error:
+            if conexao.in_transaction:
+                conexao.execute("ROLLBACK")
+            raise
+        finally:
+            conexao.close()
+        for linha in linhas:
+            _remover_arquivo_temporario(_tarefa_da_linha(linha))
+        return len(linhas)
+
+    def obter(self, id_tarefa: str) -> Optional[Tarefa]:
+        conexao = self._conectar()
+        try:
+            linha = conexao.execute("SELECT * FROM tarefas WHERE id = ?", (id_tarefa,)).fetchone()
+        finally:
+            conexao.close()
+        return _tarefa_da_linha(linha) if linha is not None else None
+
+    def estatisticas(self) -> Dict[str, int]:
+        """Número de tarefas por estado."""
+        conexao = self._conectar()
+        try:
+            linhas = conexao.execute("SELECT estado, COUNT(*) AS total FROM tarefas GROUP BY estado").fetchall()
+        finally:
+            conexao.close()
+        return {linha["estado"]: linha["total"] for linha in linhas}
+
+
+TratadorTarefa = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class Trabalhador:
+    """
+    Consome a fila executando o tratador registrado para o tipo de cada tarefa.
+
+    O tratador recebe os parâmetros e retorna o resultado (um dict serializável
+    em JSON); uma exceção conta como falha da tentativa. Tarefas de tipo sem
+    tratador são descartadas sem novas tentativas.
+    """
+
+    def __init__(
+        self,
+        fila: FilaTarefas,
+        tratadores: Dict[str, TratadorTarefa],
+        nome: Optional[str] = None,
+        intervalo_consulta: float = TAREFAS_INTERVALO_CONSULTA_SEGUNDOS,
+    ):
+        self.fila = fila
+        self.tratadores = tratadores
+        self.nome = nome or f"{socket.gethostname()}:{os.getpid()}"
+        self.intervalo_consulta = intervalo_consulta
+
+    def executar_uma(self) -> bool:
+        """Executa uma tarefa, se houver. Retorna True se alguma foi reservada."""
+        tarefa = self.fila.reservar(self.nome)
+        if tarefa is None:
+            return False
+        log.info(f"[{self.nome}] Tarefa {tarefa.id} ({tarefa.tipo}), tentativa {tarefa.tentativas}/{tarefa.maximo_tentativas}.")
+        tratador = self.tratadores.get(tarefa.tipo)
+        if tratador is None:
+            log.error(f"[{self.nome}] Tarefa {tarefa.id}: nenhum tratador para o tipo '{tarefa.tipo}'.")
+            estado = self.fila.falhar(tarefa.id, self.nome, f"Tipo de tarefa desconhecido: {tarefa.tipo}", repetir=False)
+        else:
+            inicio = time.perf_counter()
+            try:
+                resultado = tratador(tarefa.parametros)
+            except Exception as erro:
+                log.error(f"[{self.nome}] Tarefa {tarefa.id} falhou: {erro}", exc_info=True)
+                estado = self.fila.falhar(tarefa.id, self.nome, f"{type(erro).__name__}: {erro}")
+            else:
+                concluida = self.fila.concluir(tarefa.id, self.nome, resultado)
+                estado = CONCLUIDA if concluida else None
+                log.info(f"[{self.nome}] Tarefa {tarefa.id} concluída em {time.perf_counter() - inicio:.2f}s.")
+            if estado is None:
+                log.warning(f"[{self.nome}] Reserva da tarefa {tarefa.id} expirou antes do fim; resultado ignorado.")
+
+        if estado == CONCLUIDA:
+            _remover_arquivo_temporario(tarefa)
+        if estado == DESCARTADA:
+            log.error(f"[{self.nome}] Tarefa {tarefa.id} descartada após {tarefa.tentativas} tentativa(s).")
+        return True
+
+    def executar(self, parar: Optional[threading.Event] = None) -> None:
+        """Consome a fila até que parar seja sinalizado (multiprocessing.Event também serve)."""
+        log.info(f"Trabalhador {self.nome} iniciado ({self.fila.caminho_banco}).")
+        while parar is None or not parar.is_set():
+            try:
+                ocupado = self.executar_uma()
+            except sqlite3.Error as erro:
+                log.error(f"[{self.nome}] Falha ao acessar a fila de tarefas: {erro}")
+                ocupado = False
+            if not ocupado:
+                if parar is not None:
+                    parar.wait(self.intervalo_consulta)
+                else:
+                    time.sleep(self.intervalo_consulta)
+        log.info(f"Trabalhador {self.nome} encerrado.")
+
+
+def _tarefa_da_linha(linha: sqlite3.Row) -> Tarefa:
+    return Tarefa(
+        id=linha["id"],
+        tipo=linha["tipo"],
+        parametros=json.loads(linha["parametros"]),
+        estado=linha["estado"],
+        tentativas=linha["tentativas"],
+        maximo_tentativas=linha["maximo_tentativas"],
+        resultado=json.loads(linha["resultado"]) if linha["resultado"] else None,
+        erro=linha["erro"],
+        criada_em=linha["criada_em"],
+        atualizada_em=linha["atualizada_em"],
+    )
+
+
+def _remover_arquivo_temporario(tarefa: Tarefa) -> None:
+    caminho = tarefa.parametros.get(CHAVE_ARQUIVO_TEMPORARIO)
+    if not caminho:
+        return
+    try:
+        os.remove(caminho)
+    except FileNotFoundError:
+        pass
+    except OSError as erro:
+        log.warning(f"Não foi possível remover o arquivo da tarefa {tarefa.id} ({caminho}): {erro}")
+
+
+_fila_padrao: Optional[FilaTarefas] = None
+_lock_fila_padrao = threading.Lock()
+
+
+def obter_fila_tarefas() -> FilaTarefas:
+    """Retorna a fila configurada em utilitarios.configuracoes (TAREFAS_ARQUIVO)."""
+    global _fila_padrao
+    with _lock_fila_padrao:
+        if _fila_padrao is None:
+            Path(TAREFAS_ARQUIVO).parent.mkdir(parents=True, exist_ok=True)
+            _fila_padrao = FilaTarefas(TAREFAS_ARQUIVO)
+        return _fila_padrao
@@ -0,0 +1,62 @@
+#  src/peticionador/servicos/gravador_minuta.py
+import logging
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+from docx import Document
+from odf.opendocument import OpenDocumentText
+from odf.text import P
+
+log = logging.getLogger(__name__)
+
+
+def salvar_minuta(minuta_gerada: str, pasta: Path, raiz: Path) -> Dict[str, str]:
+    """
+    Grava a minuta em .txt, .docx e .odt na pasta.
+
+    O nome leva data, hora e um sufixo aleatório, para que gravações
+    simultâneas (vários trabalhadores) não se sobrescrevam. Falhas no .docx
+    ou no .odt são registradas e o arquivo correspondente fica de fora.
+
+    Retorna:
+        dict: {"minuta_gerada", "minuta_gerada_docx", "minuta_gerada_odt"} ->
+        caminho relativo a raiz.
+    """
+    pasta.mkdir(parents=True, exist_ok=True)
+    arquivos: Dict[str, str] = {}
+
+    nome_arquivo_minuta_txt = f"minuta_gerada_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.txt"
+    caminho_completo_minuta = pasta / nome_arquivo_minuta_txt
+
+    with open(caminho_completo_minuta, "w", encoding="utf-8") as f_minuta:
+        f_minuta.write(minuta_gerada)
+    log.info(f"Minuta gerada pela IA salva em '{caminho_completo_minuta}'")
+
+    # Gerar .docx com python-docx
+    try:
+        caminho_docx = caminho_completo_minuta.with_suffix(".docx")
+        doc = Document()
+        for paragrafo in minuta_gerada.strip().split("\n\n"):
+            doc.add_paragraph(paragrafo.strip())
+        doc.save(caminho_docx)
+        log.info(f"Minuta .docx salva em '{caminho_docx.name}'")
+        arquivos["minuta_gerada_docx"] = str(caminho_docx.relative_to(raiz))
+    except Exception as e_docx:
+        log.error(f"Erro ao gerar .docx: {e_docx}", exc_info=True)
+
+    # Gerar .odt com odfpy
+    try:
+        caminho_odt = caminho_completo_minuta.with_suffix(".odt")
+        odt = OpenDocumentText()
+        for paragrafo in minuta_gerada.strip().split("\n\n"):
+            odt.text.addElement(P(text=paragrafo.strip()))
+        odt.save(str(caminho_odt))
+        log.info(f"Minuta .odt salva em '{caminho_odt.name}'")
+        arquivos["minuta_gerada_odt"] = str(caminho_odt.relative_to(raiz))
+    except Exception as e_odt:
+        log.error(f"Erro ao gerar .odt: {e_odt}", exc_info=True)
+
+    arquivos["minuta_gerada"] = str(caminho_completo_minuta.relative_to(raiz))
+    return arquivos
@@ -1,9 +1,29 @@
 # src/peticionador/servicos/integrador_gemini.py
+import asyncio
+import json
 import logging
-from typing import Optional, Literal
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Literal, Tuple
 import google.generativeai as genai
-from peticionador.utilitarios.configuracoes import GEMINI_API_KEY
+from peticionador.utilitarios.configuracoes import (
+    GEMINI_API_KEY,
+    GEMINI_AQUECER_CONEXAO,
+    GEMINI_CACHE_HABILITADO,
+    GEMINI_ESPERA_VAGA_SEGUNDOS,
+    GEMINI_MAXIMO_CHAMADAS_ASYNC_POR_MODELO,
+    GEMINI_MAXIMO_CHAMADAS_SIMULTANEAS,
+    GEMINI_TIMEOUT_CHAMADA_SEGUNDOS,
+)
 from peticionador.modelos.interfaces.servico_resumidor import ServicoResumidor # Mantenha se usado em outros lugares
+from peticionador.servicos.orcamento_tokens import OrcamentoTokens, obter_estimador
+from peticionador.servicos.cache_respostas import (
+    PREFIXOS_NAO_CACHEAVEIS,
+    CacheRespostas,
+    obter_cache_respostas,
+    resposta_cacheavel,
+)
 
 genai.configure(api_key=GEMINI_API_KEY)
 log = logging.getLogger(__name__)
@@ -13,6 +33,98 @@ TipoModeloGemini = Literal[
     "models/gemini-1.5-flash",
 ]
 
+#  Registro de modelos por processo: um GenerativeModel por nome, reutilizado por
+#  todos os agentes. Cada instância usa o cliente padrão do google.generativeai,
+#  criado na primeira chamada e compartilhado pelo processo; a biblioteca não
+#  expõe configuração de pool/keep-alive do transporte.
+_modelos: Dict[str, genai.GenerativeModel] = {}
+_lock_modelos = threading.Lock()
+_clientes: Dict[str, "ClienteGemini"] = {}
+_lock_clientes = threading.Lock()
+#  Limite de concorrência (não é um pool de conexões): no máximo
+#  GEMINI_MAXIMO_CHAMADAS_SIMULTANEAS chamadas em andamento por processo, síncronas e assíncronas
+_vagas_chamadas = threading.BoundedSemaphore(max(1, GEMINI_MAXIMO_CHAMADAS_SIMULTANEAS))
+#  Semáforos das chamadas assíncronas, por event loop e por modelo (um asyncio.Semaphore
+#  pertence ao loop em que é usado)
+_vagas_async: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _vagas_async_do_modelo(nome_modelo: str) -> asyncio.Semaphore:
+    por_modelo = _vagas_async.setdefault(asyncio.get_running_loop(), {})
+    if nome_modelo not in por_modelo:
+        por_modelo[nome_modelo] = asyncio.Semaphore(max(1, GEMINI_MAXIMO_CHAMADAS_ASYNC_POR_MODELO))
+    return por_modelo[nome_modelo]
+
+
+async def _adquirir_vaga_chamada() -> bool:
+    """Aguarda uma vaga em _vagas_chamadas sem bloquear o event loop; False se a espera esgotar."""
+    espera = asyncio.ensure_future(asyncio.to_thread(_vagas_chamadas.acquire, timeout=GEMINI_ESPERA_VAGA_SEGUNDOS))
+    try:
+        return await asyncio.shield(espera)
+    except asyncio.CancelledError:
+        #  A thread continua esperando: a vaga obtida depois do cancelamento é devolvida
+        espera.add_done_callback(
+            lambda f: _vagas_chamadas.release() if not f.cancelled() and f.exception() is None and f.result() else None
+        )
+        raise
+
+
+_TIPOS_ESQUEMA = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+}
+
+
+def validar_esquema(valor: Any, esquema: Dict[str, Any], caminho: str = "$") -> List[str]:
+    """
+    Valida valor contra o subconjunto de esquema usado pelo Gemini (type,
+    properties, required, enum, items, nullable). Retorna a lista de erros.
+    """
+    if valor is None:
+        return [] if esquema.get("nullable") else [f"{caminho}: valor nulo"]
+    tipo = str(esquema.get("type", "")).lower()
+    esperado = _TIPOS_ESQUEMA.get(tipo)
+    if esperado is not None and (not isinstance(valor, esperado) or (tipo != "boolean" and isinstance(valor, bool))):
+        return [f"{caminho}: esperado {tipo}, recebido {type(valor).__name__}"]
+    if "enum" in esquema and valor not in esquema["enum"]:
+        return [f"{caminho}: {valor!r} fora de {esquema['enum']}"]
+
+    erros: List[str] = []
+    if tipo == "object":
+        for chave in esquema.get("required", []):
+            if chave not in valor:
+                erros.append(f"{caminho}.{chave}: ausente")
+        for chave, subesquema in esquema.get("properties", {}).items():
+            if chave in valor:
+                erros.extend(validar_esquema(valor[chave], subesquema, f"{caminho}.{chave}"))
+    elif tipo == "array" and "items" in esquema:
+        for indice, item in enumerate(valor):
+            erros.extend(validar_esquema(item, esquema["items"], f"{caminho}[{indice}]"))
+    return erros
+
+
+def obter_modelo(nome_modelo: str) -> Optional[genai.GenerativeModel]:
+    """Retorna a instância compartilhada do modelo, criando-a na primeira chamada."""
+    if GEMINI_API_KEY == "__MISSING__":
+        log.error("[ERRO CRÍTICO] GEMINI_API_KEY não configurada. Verifique suas variáveis de ambiente.")
+        return None
+    modelo = _modelos.get(nome_modelo)
+    if modelo is None:
+        with _lock_modelos:
+            modelo = _modelos.get(nome_modelo)
+            if modelo is None:
+                log.info(f"Tentando inicializar modelo Gemini: {nome_modelo}")
+                modelo = genai.GenerativeModel(nome_modelo)
+                _modelos[nome_modelo] = modelo
+                log.info(f"✅ Modelo Gemini instanciado: {nome_modelo}")
+    return modelo
+
 class ClienteGemini(ServicoResumidor):
     """
     Cliente para interagir com a API do Gemini, permitindo especificar o modelo e configurações de geração.
@@ -26,77 +138,388 @@ class ClienteGemini(ServicoResumidor):
         self._inicializar_modelo()
 
     def _inicializar_modelo(self):
-        """Tenta inicializar o modelo GenerativeModel."""
-        if GEMINI_API_KEY == "__MISSING__":
-            log.error("[ERRO CRÍTICO] GEMINI_API_KEY não configurada. Verifique suas variáveis de ambiente.")
-            self.model_instance = None
-            return
-
+        """Obtém o GenerativeModel compartilhado do registro (ver obter_modelo)."""
         try:
-            log.info(f"Tentando inicializar modelo Gemini: {self.target_model_name}")
-            self.model_instance = genai.GenerativeModel(self.target_model_name)
-            log.info(f"✅ Modelo Gemini instanciado: {self.target_model_name}")
+            self.model_instance = obter_modelo(self.target_model_name)
         except Exception as erro_inicializacao:
             log.error(f"[ERRO CRÍTICO] Falha ao instanciar {self.target_model_name}: {erro_inicializacao}", exc_info=True)
             self.model_instance = None
 
-    def gerar_conteudo(self, prompt_texto: str, temperatura: Optional[float] = None, max_tokens: Optional[int] = None) -> Optional[str]:
+    def gerar_conteudo(
+        self,
+        prompt_texto: str,
+        temperatura: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        usar_cache: Optional[bool] = None,
+    ) -> Optional[str]:
         """
         Gera conteúdo usando o modelo configurado, com controle opcional de temperatura e max_tokens.
 
+        Respostas bem-sucedidas ficam no cache de respostas (cache_respostas),
+        indexadas pelo modelo, pelo hash do prompt, pela temperatura e por
+        max_tokens; erros e bloqueios nunca são reaproveitados.
+
         Parâmetros:
             prompt_texto (str): O prompt completo a ser enviado para a API.
             temperatura (Optional[float]): Controla a aleatoriedade. Menor é mais determinístico. Ex: 0.2
             max_tokens (Optional[int]): Número máximo de tokens a serem gerados.
+            usar_cache (Optional[bool]): False força uma nova chamada à API.
+                None segue GEMINI_CACHE_HABILITADO.
 
         Retorna:
             str | None: Resposta do modelo, ou None em caso de falha.
         """
+        return self._gerar(prompt_texto, self._configuracao_geracao(temperatura, max_tokens), temperatura, max_tokens, usar_cache)
+
+    def gerar_json(
+        self,
+        prompt_texto: str,
+        esquema: Dict[str, Any],
+        max_tokens: Optional[int] = None,
+        temperatura: Optional[float] = None,
+        usar_cache: Optional[bool] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Gera uma resposta estruturada: a API devolve JSON (response_mime_type
+        'application/json') restrito a esquema, e o resultado é validado
+        contra o mesmo esquema antes de ser retornado.
+
+        Parâmetros:
+            esquema (dict): Esquema no formato OpenAPI aceito pelo Gemini
+                (type, properties, required, enum, items).
+            max_tokens (Optional[int]): Limite de saída; respostas JSON são
+                curtas, então vale usar um valor apertado.
+            Demais: ver gerar_conteudo. Só respostas válidas entram no cache.
+
+        Retorna:
+            dict | None: Objeto validado, ou None se a API falhar ou o JSON
+            não respeitar o esquema.
+        """
+        configuracao = self._configuracao_geracao(
+            temperatura, max_tokens, response_mime_type="application/json", response_schema=esquema
+        )
+        variante = json.dumps(esquema, sort_keys=True, ensure_ascii=False)
+        resposta = self._gerar(
+            prompt_texto, configuracao, temperatura, max_tokens, usar_cache, variante_cache=variante,
+            aceitar=lambda texto: self._interpretar_json(texto, esquema) is not None,
+        )
+        if not resposta or resposta.startswith(PREFIXOS_NAO_CACHEAVEIS):
+            log.error(f"[ERRO GEMINI JSON] Modelo: {self.target_model_name} - {resposta}")
+            return None
+        dados = self._interpretar_json(resposta, esquema)
+        if dados is None:
+            log.error(f"[ERRO GEMINI JSON] Modelo: {self.target_model_name} - resposta fora do esquema: {resposta[:200]}")
+        return dados
+
+    def _gerar(
+        self,
+        prompt_texto: str,
+        current_gen_config: Optional[genai.types.GenerationConfig],
+        temperatura: Optional[float],
+        max_tokens: Optional[int],
+        usar_cache: Optional[bool],
+        variante_cache: str = "",
+        aceitar: Optional[Callable[[str], bool]] = None,
+    ) -> Optional[str]:
+        """Chamada síncrona compartilhada; aceitar decide se a resposta pode ir para o cache."""
         if self.model_instance is None:
             log.error(f"[ERRO] Modelo {self.target_model_name} não instanciado. Impossível enviar prompt.")
             if not GEMINI_API_KEY or GEMINI_API_KEY == "__MISSING__":
                  log.error("Verifique se GEMINI_API_KEY está configurada corretamente.")
             return "[ERRO: Modelo Gemini não pôde ser inicializado. Verifique a API Key e logs do servidor.]"
 
+        cache, chave_cache, em_cache = self._consultar_cache(
+            prompt_texto, temperatura, max_tokens, usar_cache, variante_cache
+        )
+        if em_cache is not None:
+            return em_cache
+
+        if not _vagas_chamadas.acquire(timeout=GEMINI_ESPERA_VAGA_SEGUNDOS):
+            log.error(
+                f"[ERRO GEMINI API] Modelo: {self.target_model_name} - sem vaga para a chamada após "
+                f"{GEMINI_ESPERA_VAGA_SEGUNDOS:.0f}s (limite de {GEMINI_MAXIMO_CHAMADAS_SIMULTANEAS} simultâneas)."
+            )
+            return "[ERRO AO COMUNICAR COM API GEMINI: limite de chamadas simultâneas atingido]"
+        try:
+            log.info(
+                f"[API Call] Enviando prompt para {self.target_model_name} "
+                f"(~{obter_estimador(self.target_model_name).estimar(prompt_texto)} tokens estimados)..."
+            )
+            inicio = time.perf_counter()
+            try:
+                resposta = self.model_instance.generate_content(
+                    prompt_texto,
+                    generation_config=current_gen_config
+                )
+            finally:
+                _vagas_chamadas.release()
+            latencia = time.perf_counter() - inicio
+            log.info(f"[API Response] Resposta recebida de {self.target_model_name} em {latencia:.2f}s.")
+            texto = self._texto_da_resposta(resposta)
+        except Exception as erro_api:
+            log.error(f"[ERRO GEMINI API] Modelo: {self.target_model_name} - Erro: {erro_api}", exc_info=True)
+            return f"[ERRO AO COMUNICAR COM API GEMINI: {erro_api}]"
+
+        if cache is not None and resposta_cacheavel(texto) and (aceitar is None or aceitar(texto)):
+            cache.armazenar(chave_cache, texto, latencia)
+        return texto
+
+    def gerar_conteudo_stream(
+        self,
+        prompt_texto: str,
+        temperatura: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        usar_cache: Optional[bool] = None,
+    ) -> Iterator[str]:
+        """
+        Versão de gerar_conteudo que entrega a resposta em trechos, à medida
+        que a API os gera (generate_content com stream=True).
+
+        A vaga de chamada simultânea fica ocupada até o fim do stream. Uma
+        resposta em cache é entregue em um único trecho; uma resposta completa
+        e bem-sucedida entra no cache com a mesma chave de gerar_conteudo.
+        Erros, bloqueios e respostas vazias são entregues como um trecho com a
+        mesma mensagem padronizada de gerar_conteudo, possivelmente depois de
+        trechos já gerados.
+
+        Parâmetros: ver gerar_conteudo.
+        """
+        if self.model_instance is None:
+            log.error(f"[ERRO] Modelo {self.target_model_name} não instanciado. Impossível enviar prompt.")
+            yield "[ERRO: Modelo Gemini não pôde ser inicializado. Verifique a API Key e logs do servidor.]"
+            return
+
+        current_gen_config = self._configuracao_geracao(temperatura, max_tokens)
+        cache, chave_cache, em_cache = self._consultar_cache(prompt_texto, temperatura, max_tokens, usar_cache)
+        if em_cache is not None:
+            yield em_cache
+            return
+
+        if not _vagas_chamadas.acquire(timeout=GEMINI_ESPERA_VAGA_SEGUNDOS):
+            log.error(
+                f"[ERRO GEMINI API] Modelo: {self.target_model_name} - sem vaga para a chamada após "
+                f"{GEMINI_ESPERA_VAGA_SEGUNDOS:.0f}s (limite de {GEMINI_MAXIMO_CHAMADAS_SIMULTANEAS} simultâneas)."
+            )
+            yield "[ERRO AO COMUNICAR COM API GEMINI: limite de chamadas simultâneas atingido]"
+            return
+        trechos: List[str] = []
+        try:
+            log.info(
+                f"[API Call stream] Enviando prompt para {self.target_model_name} "
+                f"(~{obter_estimador(self.target_model_name).estimar(prompt_texto)} tokens estimados)..."
+            )
+            inicio = time.perf_counter()
+            resposta = self.model_instance.generate_content(
+                prompt_texto, generation_config=current_gen_config, stream=True
+            )
+            for parte in resposta:
+                trecho = "".join(p.text for p in parte.parts if hasattr(p, "text"))
+                if trecho:
+                    if not trechos:
+                        log.info(
+                            f"[API Response stream] Primeiro trecho de {self.target_model_name} "
+                            f"em {time.perf_counter() - inicio:.2f}s."
+                        )
+                    trechos.append(trecho)
+                    yield trecho
+            latencia = time.perf_counter() - inicio
+            log.info(f"[API Response stream] Resposta completa de {self.target_model_name} em {latencia:.2f}s.")
+        except Exception as erro_api:
+            log.error(f"[ERRO GEMINI API] Modelo: {self.target_model_name} - Erro: {erro_api}", exc_info=True)
+            yield f"[ERRO AO COMUNICAR COM API GEMINI: {erro_api}]"
+            return
+        finally:
+            _vagas_chamadas.release()
+
+        if not trechos:
+            #  Nenhum texto: bloqueio ou resposta vazia, com a mesma mensagem de gerar_conteudo
+            yield self._texto_da_resposta(resposta)
+            return
+        texto = "".join(trechos).strip()
+        if cache is not None and resposta_cacheavel(texto):
+            cache.armazenar(chave_cache, texto, latencia)
+
+    async def gerar_conteudo_async(
+        self,
+        prompt_texto: str,
+        temperatura: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        usar_cache: Optional[bool] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Versão assíncrona de gerar_conteudo (generate_content_async), com os
+        mesmos retornos, mensagens de erro e cache de respostas.
+
+        No máximo GEMINI_MAXIMO_CHAMADAS_ASYNC_POR_MODELO chamadas por modelo
+        ficam em andamento em cada event loop; as demais aguardam vaga. Cada
+        chamada também ocupa uma das GEMINI_MAXIMO_CHAMADAS_SIMULTANEAS vagas
+        do processo, divididas com as chamadas síncronas.
+
+        Parâmetros:
+            timeout (Optional[float]): Tempo máximo da chamada em segundos,
+                sem contar a espera por vaga. None usa GEMINI_TIMEOUT_CHAMADA_SEGUNDOS.
+            Demais: ver gerar_conteudo.
+        """
+        if self.model_instance is None:
+            log.error(f"[ERRO] Modelo {self.target_model_name} não instanciado. Impossível enviar prompt.")
+            return "[ERRO: Modelo Gemini não pôde ser inicializado. Verifique a API Key e logs do servidor.]"
+
+        current_gen_config = self._configuracao_geracao(temperatura, max_tokens)
+        cache, chave_cache, em_cache = self._consultar_cache(prompt_texto, temperatura, max_tokens, usar_cache)
+        if em_cache is not None:
+            return em_cache
+
+        if timeout is None:
+            timeout = GEMINI_TIMEOUT_CHAMADA_SEGUNDOS
+        async with _vagas_async_do_modelo(self.target_model_name):
+            if not await _adquirir_vaga_chamada():
+                log.error(
+                    f"[ERRO GEMINI API] Modelo: {self.target_model_name} - sem vaga para a chamada após "
+                    f"{GEMINI_ESPERA_VAGA_SEGUNDOS:.0f}s (limite de {GEMINI_MAXIMO_CHAMADAS_SIMULTANEAS} simultâneas)."
+                )
+                return "[ERRO AO COMUNICAR COM API GEMINI: limite de chamadas simultâneas atingido]"
+            try:
+                log.info(f"[API Call async] Enviando prompt para {self.target_model_name}...")
+                inicio = time.perf_counter()
+                resposta = await asyncio.wait_for(
+                    self.model_instance.generate_content_async(prompt_texto, generation_config=current_gen_config),
+                    timeout=timeout,
+                )
+                latencia = time.perf_counter() - inicio
+                log.info(f"[API Response async] Resposta recebida de {self.target_model_name} em {latencia:.2f}s.")
+                texto = self._texto_da_resposta(resposta)
+            except asyncio.TimeoutError:
+                log.error(f"[ERRO GEMINI API] Modelo: {self.target_model_name} - sem resposta em {timeout:.0f}s.")
+                return f"[ERRO AO COMUNICAR COM API GEMINI: tempo limite de {timeout:.0f}s excedido]"
+            except Exception as erro_api:
+                log.error(f"[ERRO GEMINI API] Modelo: {self.target_model_name} - Erro: {erro_api}", exc_info=True)
+                return f"[ERRO AO COMUNICAR COM API GEMINI: {erro_api}]"
+            finally:
+                _vagas_chamadas.release()
+
+        if cache is not None and resposta_cacheavel(texto):
+            cache.armazenar(chave_cache, texto, latencia)
+        return texto
 
-        generation_config_params = {}
+    @staticmethod
+    def _configuracao_geracao(
+        temperatura: Optional[float], max_tokens: Optional[int], **extras: Any
+    ) -> Optional[genai.types.GenerationConfig]:
+        generation_config_params = dict(extras)
         if temperatura is not None:
             generation_config_params["temperature"] = temperatura
         if max_tokens is not None:
             generation_config_params["max_output_tokens"] = max_tokens
-        
-        current_gen_config = None
-        if generation_config_params:
-            current_gen_config = genai.types.GenerationConfig(**generation_config_params)
-            log.info(f"Usando configuration de geração: {generation_config_params}")
+        if not generation_config_params:
+            return None
+        parametros_log = {k: v for k, v in generation_config_params.items() if k != "response_schema"}
+        log.info(f"Usando configuration de geração: {parametros_log}")
+        return genai.types.GenerationConfig(**generation_config_params)
 
+    def _consultar_cache(
+        self,
+        prompt_texto: str,
+        temperatura: Optional[float],
+        max_tokens: Optional[int],
+        usar_cache: Optional[bool],
+        variante: str = "",
+    ) -> Tuple[Optional[CacheRespostas], str, Optional[str]]:
+        """Retorna (cache ou None, chave, resposta em cache ou None)."""
+        if usar_cache is None:
+            usar_cache = GEMINI_CACHE_HABILITADO
+        if not usar_cache:
+            return None, "", None
+        cache = obter_cache_respostas()
+        chave_cache = cache.gerar_chave(self.target_model_name, prompt_texto, temperatura, max_tokens, variante)
+        em_cache = cache.obter(chave_cache)
+        if em_cache is not None:
+            log.info(f"[Cache] Resposta de {self.target_model_name} obtida do cache: {cache.estatisticas()}")
+        return cache, chave_cache, em_cache
+
+    @staticmethod
+    def _interpretar_json(texto: str, esquema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Decodifica o JSON da resposta e o valida contra o esquema; None se falhar."""
         try:
-            log.info(f"[API Call] Enviando prompt para {self.target_model_name}...")
-            resposta = self.model_instance.generate_content(
-                prompt_texto,
-                generation_config=current_gen_config
-            )
-            log.info(f"[API Response] Resposta recebida de {self.target_model_name}.")
-            
-            if resposta.parts:
-                # Se houver várias partes, concatena. Normalmente é uma.
-                full_text_response = "".join(part.text for part in resposta.parts if hasattr(part, 'text'))
-                return full_text_response.strip()
-            elif hasattr(resposta, 'text') and resposta.text: # Para modelos mais antigos ou respostas simples
-                return resposta.text.strip()
-            elif resposta.prompt_feedback and resposta.prompt_feedback.block_reason:
-                 block_reason_message = getattr(resposta.prompt_feedback, 'block_reason_message', str(resposta.prompt_feedback.block_reason))
-                 log.error(f"Geração bloqueada: {block_reason_message}")
-                 return f"[CONTEÚDO BLOQUEADO PELA API: {block_reason_message}]"
-            else:
-                log.warning(f"Resposta da API Gemini não continha partes de texto utilizáveis ou foi bloqueada. Resposta: {resposta}")
-                return "[RESPOSTA INESPERADA OU VAZIA DA API GEMINI]"
+            dados = json.loads(texto)
+        except (TypeError, json.JSONDecodeError) as e:
+            log.warning(f"JSON inválido na resposta estruturada: {e}")
+            return None
+        erros = validar_esquema(dados, esquema)
+        if erros or not isinstance(dados, dict):
+            log.warning(f"Resposta estruturada fora do esquema: {erros or 'não é um objeto'}")
+            return None
+        return dados
+
+    @staticmethod
+    def _texto_da_resposta(resposta) -> str:
+        """Texto da resposta, ou a mensagem padronizada de bloqueio/resposta vazia."""
+        if resposta.parts:
+            # Se houver várias partes, concatena. Normalmente é uma.
+            full_text_response = "".join(part.text for part in resposta.parts if hasattr(part, 'text'))
+            return full_text_response.strip()
+        elif hasattr(resposta, 'text') and resposta.text: # Para modelos mais antigos ou respostas simples
+            return resposta.text.strip()
+        elif resposta.prompt_feedback and resposta.prompt_feedback.block_reason:
+            block_reason_message = getattr(resposta.prompt_feedback, 'block_reason_message', str(resposta.prompt_feedback.block_reason))
+            log.error(f"Geração bloqueada: {block_reason_message}")
+            return f"[CONTEÚDO BLOQUEADO PELA API: {block_reason_message}]"
+        else:
+            log.warning(f"Resposta da API Gemini não continha partes de texto utilizáveis ou foi bloqueada. Resposta: {resposta}")
+            return "[RESPOSTA INESPERADA OU VAZIA DA API GEMINI]"
+
+    def orcamento(self, max_tokens_saida: Optional[int] = None) -> OrcamentoTokens:
+        """Orçamento de tokens de entrada deste modelo, reservando max_tokens_saida para a resposta."""
+        return OrcamentoTokens(self.target_model_name, max_tokens_saida)
 
-        except Exception as erro_api:
-            log.error(f"[ERRO GEMINI API] Modelo: {self.target_model_name} - Erro: {erro_api}", exc_info=True)
-            return f"[ERRO AO COMUNICAR COM API GEMINI: {erro_api}]"
-        
     # Para um resumo, geralmente não se especifica temperatura, deixa o padrão do modelo.
     def resumir(self, texto: str) -> Optional[str]:
         # Se você quiser uma temperatura específica para resumos, pode passar aqui
-        return self.gerar_conteudo(texto)
\ No newline at end of file
+        return self.gerar_conteudo(texto)
+
+
+def obter_cliente_gemini(model_name: Optional[TipoModeloGemini] = None) -> ClienteGemini:
+    """Retorna o ClienteGemini compartilhado do modelo (Flash por padrão)."""
+    nome = model_name or ClienteGemini.DEFAULT_MODEL_FLASH
+    cliente = _clientes.get(nome)
+    if cliente is None or cliente.model_instance is None:
+        with _lock_clientes:
+            cliente = _clientes.get(nome)
+            if cliente is None or cliente.model_instance is None:
+                cliente = ClienteGemini(nome)
+                _clientes[nome] = cliente
+    return cliente
+
+
+def aquecer_modelos(
+    nomes_modelos: Optional[Iterable[str]] = None, testar_conexao: Optional[bool] = None
+) -> None:
+    """
+    Instancia os modelos usados pelos agentes na inicialização do processo.
+
+    Com testar_conexao (padrão: GEMINI_AQUECER_CONEXAO), faz um count_tokens
+    por modelo em segundo plano, abrindo o canal com a API antes da primeira
+    petição e calibrando o estimador local de tokens (orcamento_tokens);
+    falhas são apenas registradas.
+    """
+    if GEMINI_API_KEY == "__MISSING__":
+        log.warning("Aquecimento dos modelos Gemini ignorado: GEMINI_API_KEY não configurada.")
+        return
+    if testar_conexao is None:
+        testar_conexao = GEMINI_AQUECER_CONEXAO
+    nomes = list(nomes_modelos or (ClienteGemini.DEFAULT_MODEL_FLASH, ClienteGemini.DEFAULT_MODEL_PRO))
+    modelos = {nome: obter_cliente_gemini(nome).model_instance for nome in nomes}
+
+    if not testar_conexao:
+        return
+
+    def _testar() -> None:
+        for nome, modelo in modelos.items():
+            if modelo is None:
+                continue
+            estimador = obter_estimador(nome)
+            estimador.calibrar(modelo)
+            if estimador.calibrado:
+                log.info(f"Conexão com {nome} estabelecida.")
+
+    threading.Thread(target=_testar, name="aquecimento-gemini", daemon=True).start()
@@ -0,0 +1,155 @@
+#  src/peticionador/servicos/motor_limpeza.py
+import hashlib
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from peticionador.utilitarios.configuracoes import PDF_REGRAS_LIMPEZA
+
+log = logging.getLogger(__name__)
+
+PASTA_REGRAS = Path(__file__).resolve().parent / "regras_limpeza"
+
+_RE_ESPACOS = re.compile(r"[ \t]+")
+_RE_QUEBRAS = re.compile(r"\n{3,}")
+
+
+@dataclass(frozen=True)
+class RegraLimpeza:
+    """Trecho a remover do texto; o padrão é escrito em minúsculas e casa sem distinção de caixa."""
+    nome: str
+    padrao: str
+
+
+#  Brancos que a limpeza altera: espaços/tabulações repetidos e 3+ quebras de linha.
+#  Cada alternativa começa por um caractere fixo, o que mantém a busca do re rápida.
+_BRANCOS_A_NORMALIZAR = r"\t[ \t]*| [ \t]+|\n\n\n+"
+_BRANCOS = " \t\n"
+
+
+def _normalizar_brancos(brancos: str) -> str:
+    return _RE_ESPACOS.sub(" ", _RE_QUEBRAS.sub("\n\n", brancos))
+
+
+class MotorLimpeza:
+    """
+    Limpeza de texto de PDF em uma única varredura.
+
+    As regras de remoção e os brancos a normalizar formam uma só alternância
+    compilada, aplicada sobre texto.lower() (o texto original é usado para
+    montar a saída; se lower() mudar o tamanho do texto, usa-se o padrão com
+    re.IGNORECASE). Os brancos ao redor de cada remoção são acumulados e
+    normalizados juntos, como nas passadas de normalização da versão
+    sequencial (limpar_texto_pdf_sequencial).
+
+    Diferente da versão sequencial, todas as regras casam com o texto
+    original: uma remoção não cria nem desfaz ocorrências de outra regra, e
+    onde duas regras se sobrepõem vale a que começa antes. Nas passadas
+    sequenciais, a linha 'TRIBUNAL DE JUSTIÇA ... - PODER JUDICIÁRIO'
+    seguida de 'RECORRENTE: X' perdia o recorrente: a remoção do timbre do
+    Poder Judiciário levava a quebra de linha e a regra do Tribunal apagava
+    a linha seguinte. Aqui só o timbre sai. Quando nenhuma remoção interfere em outra, o
+    resultado é o mesmo das passadas sequenciais.
+
+    Os padrões são compilados com re.MULTILINE ('^' casa em início de linha)
+    e não devem casar com texto só de brancos.
+    """
+
+    def __init__(self, regras: Sequence[RegraLimpeza], nome: str = ""):
+        if not regras:
+            raise ValueError("O motor de limpeza precisa de ao menos uma regra.")
+        self.nome = nome
+        self.regras = tuple(regras)
+        #  Alternância sem grupo externo: com todas as alternativas no topo, o re
+        #  consegue pular direto para os caracteres em que alguma pode começar
+        varredura = "|".join([*(regra.padrao for regra in self.regras), _BRANCOS_A_NORMALIZAR])
+        self._re_varredura = re.compile(varredura, re.MULTILINE)
+        self._re_varredura_caixa = re.compile(varredura, re.MULTILINE | re.IGNORECASE)
+        self.assinatura = hashlib.sha256(
+            json.dumps([regra.padrao for regra in self.regras]).encode("utf-8")
+        ).hexdigest()[:16]
+
+    def limpar(self, texto: str) -> str:
+        referencia = texto.lower()
+        varredura = self._re_varredura
+        if len(referencia) != len(texto):
+            referencia, varredura = texto, self._re_varredura_caixa
+
+        partes: List[str] = []
+        brancos = ""  # brancos desde o último trecho mantido, ainda não normalizados
+
+        def manter(trecho: str) -> None:
+            nonlocal brancos
+            nucleo = trecho.strip(_BRANCOS)
+            if not nucleo:
+                brancos += trecho
+                return
+            inicio = len(trecho) - len(trecho.lstrip(_BRANCOS))
+            brancos += trecho[:inicio]
+            if brancos:
+                partes.append(_normalizar_brancos(brancos))
+            partes.append(nucleo)
+            brancos = trecho[inicio + len(nucleo):]
+
+        posicao = 0
+        for ocorrencia in varredura.finditer(referencia):
+            inicio, fim = ocorrencia.span()
+            if inicio > posicao:
+                manter(texto[posicao:inicio])
+            trecho = texto[inicio:fim]
+            if not trecho.strip(_BRANCOS):
+                brancos += trecho  # brancos a normalizar; trechos removidos são descartados
+            posicao = fim
+        manter(texto[posicao:])
+        partes.append(_normalizar_brancos(brancos))
+        return "".join(partes).strip()
+
+
+def _ler_regras(nome_ou_caminho: str, visitados: Optional[List[str]] = None) -> List[RegraLimpeza]:
+    caminho = Path(nome_ou_caminho)
+    if caminho.suffix != ".json":
+        caminho = PASTA_REGRAS / f"{nome_ou_caminho.lower()}.json"
+    if not caminho.is_file():
+        raise FileNotFoundError(f"Conjunto de regras de limpeza não encontrado: {nome_ou_caminho}")
+
+    visitados = visitados or []
+    if str(caminho) in visitados:
+        raise ValueError(f"Herança circular nas regras de limpeza: {caminho}")
+    visitados.append(str(caminho))
+
+    with open(caminho, "r", encoding="utf-8") as f:
+        dados = json.load(f)
+    regras = _ler_regras(dados["herda"], visitados) if dados.get("herda") else []
+    regras.extend(RegraLimpeza(nome=regra["nome"], padrao=regra["padrao"]) for regra in dados["regras"])
+    return regras
+
+
+def carregar_motor_limpeza(nome_ou_caminho: str) -> MotorLimpeza:
+    """
+    Carrega um conjunto de regras pelo nome (tjgo, stj, stf, em
+    servicos/regras_limpeza) ou pelo caminho de um arquivo JSON.
+
+    O JSON tem 'nome', 'regras' (lista de {nome, padrao}, padrões em minúsculas)
+    e, opcionalmente, 'herda' com outro conjunto cujas regras vêm antes.
+    """
+    regras = _ler_regras(nome_ou_caminho)
+    log.info(f"Regras de limpeza '{nome_ou_caminho}' carregadas ({len(regras)} regras).")
+    return MotorLimpeza(regras, nome=Path(nome_ou_caminho).stem)
+
+
+_motor_padrao: Optional[MotorLimpeza] = None
+_lock_motor_padrao = threading.Lock()
+
+
+def obter_motor_limpeza() -> MotorLimpeza:
+    """Retorna o motor com as regras de PDF_REGRAS_LIMPEZA (padrão: tjgo)."""
+    global _motor_padrao
+    if _motor_padrao is None:
+        with _lock_motor_padrao:
+            if _motor_padrao is None:
+                _motor_padrao = carregar_motor_limpeza(PDF_REGRAS_LIMPEZA)
+    return _motor_padrao
@@ -0,0 +1,45 @@
+#  src/peticionador/servicos/ocr_tesseract.py
+import io
+import logging
+
+from peticionador.modelos.interfaces.servico_ocr import ServicoOCR
+
+log = logging.getLogger(__name__)
+
+
+class OCRTesseract(ServicoOCR):
+    """
+    OCR local com Tesseract (pytesseract + Pillow).
+
+    Dependências opcionais: sem pytesseract/Pillow ou sem o executável
+    tesseract, disponivel() retorna False e o OCR é ignorado.
+    """
+
+    def __init__(self, idioma: str = "por", configuracao: str = "--psm 3"):
+        self.idioma = idioma
+        self.configuracao = configuracao
+
+    @property
+    def identificador(self) -> str:
+        return f"tesseract:{self.idioma}:{self.configuracao}"
+
+    def disponivel(self) -> bool:
+        try:
+            import pytesseract  # noqa: F401
+            from PIL import Image  # noqa: F401
+
+            pytesseract.get_tesseract_version()
+        except ImportError:
+            log.warning("pytesseract/Pillow não instalados. OCR de páginas digitalizadas indisponível.")
+            return False
+        except Exception as e:
+            log.warning(f"Executável tesseract não encontrado ({e}). OCR de páginas digitalizadas indisponível.")
+            return False
+        return True
+
+    def reconhecer(self, imagem_png: bytes) -> str:
+        import pytesseract
+        from PIL import Image
+
+        with Image.open(io.BytesIO(imagem_png)) as imagem:
+            return pytesseract.image_to_string(imagem, lang=self.idioma, config=self.configuracao)
@@ -0,0 +1,188 @@
+#  src/peticionador/servicos/orcamento_tokens.py
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from peticionador.utilitarios.configuracoes import (
+    ORCAMENTO_MAXIMO_TOKENS_ENTRADA,
+    ORCAMENTO_TOKENS_SAIDA_PADRAO,
+)
+
+log = logging.getLogger(__name__)
+
+#  Janela de contexto (tokens de entrada + saída) de cada modelo
+LIMITES_CONTEXTO: Dict[str, int] = {
+    "models/gemini-2.0-flash": 1_048_576,
+    "models/gemini-1.5-flash": 1_048_576,
+    "models/gemini-1.5-pro": 2_097_152,
+}
+LIMITE_CONTEXTO_PADRAO = 32_768
+#  Relação inicial, antes da calibração, para texto jurídico em português
+CARACTERES_POR_TOKEN_PADRAO = 4.0
+#  Amostra usada na calibração contra count_tokens
+AMOSTRA_CALIBRACAO = (
+    "EXCELENTÍSSIMO SENHOR DESEMBARGADOR PRESIDENTE DO TRIBUNAL DE JUSTIÇA DO ESTADO DE GOIÁS. "
+    "Processo nº 0119841-30.2017.8.09.0175. O recorrente, inconformado com o v. acórdão proferido pela "
+    "Câmara Criminal, vem, respeitosamente, com fundamento no art. 105, inciso III, alínea 'a', da "
+    "Constituição Federal, interpor RECURSO ESPECIAL, alegando violação aos arts. 155 e 386, VII, do "
+    "Código de Processo Penal, bem como dissídio jurisprudencial, requerendo a reforma do julgado e a "
+    "consequente absolvição por insuficiência de provas. Termos em que pede deferimento."
+)
+MARCADOR_OMISSAO = "\n[...trecho omitido por limite de tokens...]\n"
+POLITICAS_TRUNCAMENTO = ("fim", "inicio", "meio", "nunca")
+
+
+class EstimadorTokens:
+    """
+    Estimativa local do número de tokens por contagem de caracteres.
+
+    A relação caracteres/token começa em CARACTERES_POR_TOKEN_PADRAO e pode
+    ser calibrada uma vez por modelo com count_tokens da API (calibrar).
+    """
+
+    def __init__(self, caracteres_por_token: float = CARACTERES_POR_TOKEN_PADRAO):
+        self.caracteres_por_token = caracteres_por_token
+        self.calibrado = False
+        self._lock = threading.Lock()
+
+    def estimar(self, texto: Optional[str]) -> int:
+        return math.ceil(len(texto or "") / self.caracteres_por_token)
+
+    def caracteres_para(self, tokens: int) -> int:
+        """Quantos caracteres cabem, em média, em tokens."""
+        return max(0, int(tokens * self.caracteres_por_token))
+
+    def calibrar(self, modelo, amostra: str = AMOSTRA_CALIBRACAO) -> float:
+        """
+        Ajusta a relação caracteres/token com count_tokens do modelo.
+
+        Falhas da API mantêm a relação atual. Retorna a relação em uso.
+        """
+        try:
+            tokens = modelo.count_tokens(amostra).total_tokens
+        except Exception as erro:
+            log.warning(f"Calibração do estimador de tokens falhou; mantendo {self.caracteres_por_token:.2f}: {erro}")
+            return self.caracteres_por_token
+        if tokens:
+            with self._lock:
+                self.caracteres_por_token = len(amostra) / tokens
+                self.calibrado = True
+            log.info(f"Estimador de tokens calibrado: {self.caracteres_por_token:.2f} caracteres por token.")
+        return self.caracteres_por_token
+
+
+_estimadores: Dict[str, EstimadorTokens] = {}
+_lock_estimadores = threading.Lock()
+
+
+def obter_estimador(nome_modelo: str) -> EstimadorTokens:
+    """Estimador compartilhado do modelo (um por nome, por processo)."""
+    with _lock_estimadores:
+        if nome_modelo not in _estimadores:
+            _estimadores[nome_modelo] = EstimadorTokens()
+        return _estimadores[nome_modelo]
+
+
+def limite_contexto(nome_modelo: str) -> int:
+    return LIMITES_CONTEXTO.get(nome_modelo, LIMITE_CONTEXTO_PADRAO)
+
+
+@dataclass
+class SecaoPrompt:
+    """
+    Trecho variável de um prompt, com a política de corte declarada pelo agente.
+
+    prioridade: seções de menor prioridade são cortadas primeiro.
+    politica: 'fim' corta o final, 'inicio' corta o começo, 'meio' preserva
+        começo e fim, 'nunca' não corta.
+    minimo_tokens: a seção não é reduzida abaixo disto.
+    """
+    nome: str
+    texto: str
+    prioridade: int = 0
+    politica: str = "fim"
+    minimo_tokens: int = 0
+
+    def __post_init__(self) -> None:
+        if self.politica not in POLITICAS_TRUNCAMENTO:
+            raise ValueError(f"Política de truncamento inválida: {self.politica}")
+
+
+def _truncar(texto: str, caracteres: int, politica: str) -> str:
+    if len(texto) <= caracteres:
+        return texto
+    #  O marcador também consome o orçamento; sem espaço para ele, corta sem marcar
+    marcador = MARCADOR_OMISSAO if caracteres > len(MARCADOR_OMISSAO) else ""
+    caracteres -= len(marcador)
+    if politica == "inicio":
+        return marcador + texto[len(texto) - caracteres:]
+    if politica == "meio":
+        metade = caracteres // 2
+        return texto[:metade] + marcador + texto[len(texto) - (caracteres - metade):]
+    return texto[:caracteres] + marcador
+
+
+class OrcamentoTokens:
+    """
+    Orçamento de tokens de entrada de uma chamada.
+
+    O limite é a janela de contexto do modelo menos a saída reservada,
+    limitado ainda por ORCAMENTO_MAXIMO_TOKENS_ENTRADA (0 = sem teto extra).
+    """
+
+    def __init__(
+        self,
+        nome_modelo: str,
+        max_tokens_saida: Optional[int] = None,
+        maximo_entrada: Optional[int] = None,
+    ):
+        self.nome_modelo = nome_modelo
+        self.estimador = obter_estimador(nome_modelo)
+        saida = max_tokens_saida if max_tokens_saida is not None else ORCAMENTO_TOKENS_SAIDA_PADRAO
+        if maximo_entrada is None:
+            maximo_entrada = ORCAMENTO_MAXIMO_TOKENS_ENTRADA
+        self.limite = limite_contexto(nome_modelo) - saida
+        if maximo_entrada > 0:
+            self.limite = min(self.limite, maximo_entrada)
+
+    def ajustar(self, secoes: List[SecaoPrompt], texto_fixo: str = "", rotulo: str = "") -> Dict[str, str]:
+        """
+        Corta as seções até que texto_fixo + seções caibam no limite.
+
+        texto_fixo é a parte do prompt que não pode ser cortada (instruções).
+        Retorna {nome da seção: texto ajustado} e registra o uso do orçamento.
+        """
+        tokens = {secao.nome: self.estimador.estimar(secao.texto) for secao in secoes}
+        tokens_fixos = self.estimador.estimar(texto_fixo)
+        total_original = tokens_fixos + sum(tokens.values())
+        excesso = total_original - self.limite
+        textos = {secao.nome: secao.texto for secao in secoes}
+        truncadas: List[str] = []
+
+        for secao in sorted(secoes, key=lambda s: s.prioridade):
+            if excesso <= 0:
+                break
+            if secao.politica == "nunca":
+                continue
+            cortavel = tokens[secao.nome] - secao.minimo_tokens
+            if cortavel <= 0:
+                continue
+            corte = min(excesso, cortavel)
+            tokens[secao.nome] -= corte
+            excesso -= corte
+            textos[secao.nome] = _truncar(
+                secao.texto, self.estimador.caracteres_para(tokens[secao.nome]), secao.politica
+            )
+            truncadas.append(f"{secao.nome} (-{corte} tokens)")
+
+        total = tokens_fixos + sum(tokens.values())
+        descricao = f"[Orçamento] {rotulo or self.nome_modelo}: {total}/{self.limite} tokens estimados ({total / self.limite:.0%})"
+        if truncadas:
+            log.warning(f"{descricao}; original {total_original}, cortes: {', '.join(truncadas)}.")
+        else:
+            log.info(f"{descricao}.")
+        if excesso > 0:
+            log.error(f"{descricao}: o prompt excede o orçamento mesmo após os cortes permitidos.")
+        return textos
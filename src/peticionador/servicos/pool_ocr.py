@@ -0,0 +1,204 @@
+#  src/peticionador/servicos/pool_ocr.py
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Optional
+
+import fitz  # PyMuPDF
+
+from peticionador.modelos.interfaces.servico_ocr import ServicoOCR
+from peticionador.servicos.cache_extracao import CacheExtracao, obter_cache_extracao
+from peticionador.servicos.documento_pdf import DocumentoPDF
+from peticionador.servicos.ocr_tesseract import OCRTesseract
+from peticionador.utilitarios.configuracoes import PDF_OCR_DPI, PDF_OCR_IDIOMA, PDF_OCR_PROCESSOS
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MetricasOCR:
+    """Métricas acumuladas do pool, para dimensionar o número de processos."""
+    paginas_reconhecidas: int
+    paginas_com_erro: int
+    acertos_cache: int
+    segundos_ativos: float  # tempo com ao menos uma página na fila
+    fila_atual: int
+    fila_maxima: int
+
+    @property
+    def paginas_por_segundo(self) -> float:
+        return self.paginas_reconhecidas / self.segundos_ativos if self.segundos_ativos else 0.0
+
+
+class PoolOCR:
+    """
+    Executa um ServicoOCR em um pool limitado de processos.
+
+    A página é renderizada no processo chamador e só a imagem PNG vai para o
+    pool. O texto reconhecido é guardado no cache de extração pelo SHA-256
+    dos pixels da página renderizada, então a mesma folha digitalizada em
+    outro PDF não é reconhecida de novo. No máximo limite_fila páginas ficam
+    em andamento: submeter() bloqueia até haver vaga. Se um processo do pool
+    morrer (BrokenProcessPool), o executor é descartado e o próximo envio cria outro.
+    """
+
+    def __init__(
+        self,
+        servico: ServicoOCR,
+        num_processos: int = 2,
+        dpi: int = 300,
+        cache: Optional[CacheExtracao] = None,
+    ):
+        self.servico = servico
+        self.num_processos = max(1, num_processos)
+        self.dpi = dpi
+        self.cache = cache
+        self.limite_fila = self.num_processos * 2
+        self._vagas = threading.BoundedSemaphore(self.limite_fila)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._paginas_reconhecidas = 0
+        self._paginas_com_erro = 0
+        self._acertos_cache = 0
+        self._fila = 0
+        self._fila_maxima = 0
+        self._segundos_ativos = 0.0
+        self._inicio_atividade = 0.0
+
+    def _obter_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.num_processos)
+            return self._executor
+
+    def _descartar_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Descarta o executor quebrado, se ainda for o atual (sem esperar: pode rodar em um callback dele)."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        log.warning("Pool de OCR quebrado (processo encerrado); um novo será criado no próximo envio.")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _renderizar(self, documento: DocumentoPDF, indice: int) -> fitz.Pixmap:
+        return documento.pagina(indice).get_pixmap(dpi=self.dpi, colorspace=fitz.csGRAY)
+
+    def _entrar_fila(self) -> None:
+        with self._lock:
+            if self._fila == 0:
+                self._inicio_atividade = time.perf_counter()
+            self._fila += 1
+            self._fila_maxima = max(self._fila_maxima, self._fila)
+
+    def _sair_fila(self, futuro: Future, executor: ProcessPoolExecutor, chave: str, resultado: Future) -> None:
+        """Contabiliza a página, grava o cache e só então conclui o Future entregue ao chamador."""
+        erro = futuro.exception()
+        if isinstance(erro, BrokenProcessPool):
+            self._descartar_executor(executor)
+        with self._lock:
+            self._fila -= 1
+            if self._fila == 0:
+                self._segundos_ativos += time.perf_counter() - self._inicio_atividade
+            if erro is None:
+                self._paginas_reconhecidas += 1
+            else:
+                self._paginas_com_erro += 1
+        self._vagas.release()
+        if erro is not None:
+            resultado.set_exception(erro)
+            return
+        if self.cache is not None:
+            self.cache.armazenar(chave, [(0, futuro.result(), "digitalizada")])
+        resultado.set_result(futuro.result())
+
+    def submeter(self, documento: DocumentoPDF, indice: int) -> "Future[str]":
+        """Agenda o OCR da página (0-indexed); o Future traz o texto bruto reconhecido."""
+        resultado: Future = Future()
+        pixmap = self._renderizar(documento, indice)
+        chave = ""
+        if self.cache is not None:
+            hash_imagem = hashlib.sha256(pixmap.samples_mv).hexdigest()
+            chave = self.cache.gerar_chave(hash_imagem, f"ocr:{self.servico.identificador}:{self.dpi}")
+            em_cache = self.cache.obter(chave)
+            if em_cache is not None:
+                with self._lock:
+                    self._acertos_cache += 1
+                resultado.set_result(em_cache[0][1])
+                return resultado
+
+        imagem_png = pixmap.tobytes("png")
+        pixmap = None
+        self._vagas.acquire()
+        self._entrar_fila()
+        try:
+            executor = self._obter_executor()
+            try:
+                futuro = executor.submit(self.servico.reconhecer, imagem_png)
+            except BrokenProcessPool:
+                #  Quebrado por uma falha anterior ainda não percebida; tenta uma vez com um novo
+                self._descartar_executor(executor)
+                executor = self._obter_executor()
+                futuro = executor.submit(self.servico.reconhecer, imagem_png)
+        except Exception:
+            self._vagas.release()
+            with self._lock:
+                self._fila -= 1
+            raise
+        futuro.add_done_callback(lambda f: self._sair_fila(f, executor, chave, resultado))
+        return resultado
+
+    def estatisticas(self) -> MetricasOCR:
+        with self._lock:
+            segundos = self._segundos_ativos
+            if self._fila:
+                segundos += time.perf_counter() - self._inicio_atividade
+            return MetricasOCR(
+                paginas_reconhecidas=self._paginas_reconhecidas,
+                paginas_com_erro=self._paginas_com_erro,
+                acertos_cache=self._acertos_cache,
+                segundos_ativos=segundos,
+                fila_atual=self._fila,
+                fila_maxima=self._fila_maxima,
+            )
+
+    def registrar_estatisticas(self) -> None:
+        metricas = self.estatisticas()
+        log.info(
+            f"OCR: {metricas.paginas_reconhecidas} páginas reconhecidas "
+            f"({metricas.paginas_por_segundo:.2f} páginas/s, {self.num_processos} processos), "
+            f"{metricas.acertos_cache} do cache, {metricas.paginas_com_erro} com erro; "
+            f"fila atual {metricas.fila_atual}, máxima {metricas.fila_maxima}/{self.limite_fila}."
+        )
+
+    def encerrar(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_pool_padrao: Optional[PoolOCR] = None
+_ocr_indisponivel = False
+_lock_pool_padrao = threading.Lock()
+
+
+def obter_pool_ocr() -> Optional[PoolOCR]:
+    """
+    Retorna o pool de OCR configurado em utilitarios.configuracoes (Tesseract),
+    ou None se o motor não estiver disponível neste ambiente.
+    """
+    global _pool_padrao, _ocr_indisponivel
+    with _lock_pool_padrao:
+        if _pool_padrao is None:
+            if _ocr_indisponivel:
+                return None
+            servico = OCRTesseract(idioma=PDF_OCR_IDIOMA)
+            if not servico.disponivel():
+                _ocr_indisponivel = True
+                return None
+            _pool_padrao = PoolOCR(servico, PDF_OCR_PROCESSOS, PDF_OCR_DPI, obter_cache_extracao())
+        return _pool_padrao
@@ -2,13 +2,37 @@
 
 import re
 
+from peticionador.servicos.motor_limpeza import obter_motor_limpeza
+
+#  Incrementar sempre que as regras de limpeza ou o formato das páginas em cache
+#  mudarem: invalida o cache de extração
+VERSAO_LIMPEZA = "2"
+
 
 def limpar_texto_pdf(texto: str) -> str:
     """
     Remove elementos visuais indesejados do texto extraído de um PDF.
 
     Essa função elimina numeração de página, cabeçalhos repetitivos,
-    marcas d'água e normaliza quebras de linha e espaçamentos.
+    marcas d'água e normaliza quebras de linha e espaçamentos, em uma única
+    varredura do MotorLimpeza com as regras de PDF_REGRAS_LIMPEZA.
+
+    Parâmetros:
+        texto (str): Texto bruto extraído do PDF.
+
+    Retorna:
+        str: Texto limpo e normalizado.
+    """
+    return obter_motor_limpeza().limpar(texto)
+
+
+def limpar_texto_pdf_sequencial(texto: str) -> str:
+    """
+    Implementação original, com uma passada de re.sub por regra (regras TJGO).
+
+    Mantida como referência para os testes de equivalência e o benchmark
+    do MotorLimpeza. Diverge do motor quando uma remoção junta linhas e cria
+    ou desfaz uma ocorrência de outra regra (ver MotorLimpeza).
 
     Parâmetros:
         texto (str): Texto bruto extraído do PDF.
@@ -0,0 +1,184 @@
+#  src/peticionador/servicos/segmentador_autos.py
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from peticionador.servicos.blocos_texto import BlocosTexto
+from peticionador.servicos.documento_pdf import DocumentoPDF
+
+log = logging.getLogger(__name__)
+
+#  Títulos que abrem a peça recursal
+_RE_ANCORA = re.compile(
+    r"(?im)^\s*(raz[oõ]es\s+(d[oe]\s+)?(recurso|recorrente)"
+    r"|recurso\s+(especial|extraordin[aá]rio)"
+    r"|agravo\s+em\s+recurso\s+(especial|extraordin[aá]rio))\b"
+)
+#  Endereçamento da petição de interposição, que antecede as razões
+_RE_ENDERECAMENTO = re.compile(r"(?im)^\s*(excelent[ií]ssim[oa]|exm[oa]\.?)\s")
+#  Títulos de outras peças dos autos, que encerram o recurso. 'EMENTA' fica de fora
+#  (as razões costumam transcrever a ementa do acórdão) e 'DECISÃO' só vale como
+#  título isolado na linha, não em 'decisão recorrida' ou 'decisão agravada'
+_RE_FRONTEIRA = re.compile(
+    r"(?im)^\s*((certid[aã]o|termo\s+de\s+\w+|contrarraz[oõ]es|ac[oó]rd[aã]o"
+    r"|despacho|senten[cç]a|ato\s+ordinat[oó]rio|parecer|intima[cç][aã]o|mandado|of[ií]cio)\b"
+    r"|decis[aã]o\s*$)"
+)
+
+#  Fração superior da página onde títulos de peças são procurados
+FAIXA_TITULO = 0.35
+#  Um bloco é título se a fonte for ao menos este fator maior que a mediana da página
+FATOR_TAMANHO_TITULO = 1.15
+#  Títulos em caixa alta no tamanho do corpo também contam, se curtos
+MAXIMO_CARACTERES_TITULO = 120
+#  Quantas páginas antes das razões a petição de interposição pode começar
+MAXIMO_PAGINAS_INTERPOSICAO = 3
+
+
+@dataclass(frozen=True)
+class SegmentoRecurso:
+    """Intervalo de páginas [pagina_inicio, pagina_fim) (0-indexed) da peça recursal."""
+    pagina_inicio: int
+    pagina_fim: int
+    origem: str  # 'sumario' ou 'titulos'
+    titulo: str = ""
+
+    @property
+    def num_paginas(self) -> int:
+        return self.pagina_fim - self.pagina_inicio
+
+    def como_intervalo(self) -> Tuple[int, int]:
+        return self.pagina_inicio, self.pagina_fim
+
+
+def _segmento_pelo_sumario(documento: DocumentoPDF) -> Optional[SegmentoRecurso]:
+    """
+    Usa o sumário (bookmarks) do PDF, quando houver, para localizar o recurso.
+
+    Como em _segmento_pelos_titulos, vale a última entrada recursal do
+    sumário, estendida às entradas recursais imediatamente anteriores
+    (interposição + razões).
+    """
+    sumario = documento.fitz_documento.get_toc(simple=True)
+    ancoras = [
+        posicao for posicao, (_, titulo, pagina) in enumerate(sumario)
+        if pagina >= 1 and _RE_ANCORA.search(titulo)
+    ]
+    if not ancoras:
+        return None
+
+    nivel, titulo, pagina = sumario[ancoras[-1]]
+    inicio, titulo_inicio, seguinte = pagina, titulo, ancoras[-1]
+    for posicao in reversed(ancoras[:-1]):
+        _, titulo_anterior, pagina_anterior = sumario[posicao]
+        #  Só entradas vizinhas no sumário: outra peça entre elas separa os recursos
+        if posicao != seguinte - 1 or not 0 <= inicio - pagina_anterior <= MAXIMO_PAGINAS_INTERPOSICAO:
+            break
+        inicio, titulo_inicio, seguinte = pagina_anterior, titulo_anterior, posicao
+
+    fim = len(documento)
+    for nivel_seguinte, titulo_seguinte, pagina_seguinte in sumario[ancoras[-1] + 1:]:
+        if nivel_seguinte <= nivel and pagina_seguinte > pagina and not _RE_ANCORA.search(titulo_seguinte):
+            fim = pagina_seguinte - 1
+            break
+    return SegmentoRecurso(inicio - 1, max(fim, pagina), "sumario", titulo_inicio.strip())
+
+
+def _eh_titulo(blocos: BlocosTexto, indice: int) -> bool:
+    """Bloco com fonte maior que o corpo da página ou curto e em caixa alta."""
+    indices_pagina = blocos.indices_da_pagina(int(blocos.paginas[indice]))
+    mediana = float(np.median(blocos.tamanhos[indices_pagina])) if len(indices_pagina) else 0.0
+    if mediana and blocos.tamanhos[indice] >= mediana * FATOR_TAMANHO_TITULO:
+        return True
+    texto = blocos.texto(indice).strip()
+    return len(texto) <= MAXIMO_CARACTERES_TITULO and texto.isupper()
+
+
+def _titulo_da_pagina(documento: DocumentoPDF, indice: int, regex: re.Pattern) -> Optional[str]:
+    """
+    Procura um título que case com regex no topo da página.
+
+    O texto do topo é obtido com clip (barato); só quando há candidato a
+    página é analisada em blocos para confirmar pelo tamanho da fonte.
+    """
+    pagina = documento.pagina(indice)
+    topo = fitz.Rect(pagina.rect.x0, pagina.rect.y0, pagina.rect.x1, pagina.rect.y0 + pagina.rect.height * FAIXA_TITULO)
+    if not regex.search(pagina.get_text("text", clip=topo)):
+        return None
+    blocos = BlocosTexto.de_documento(documento, indice, indice)
+    limite = topo.y1
+    for indice_bloco, _ in blocos.buscar(regex):
+        if blocos.bboxes[indice_bloco, 1] <= limite and _eh_titulo(blocos, indice_bloco):
+            return blocos.texto(indice_bloco).strip()
+    return None
+
+
+def _segmento_pelos_titulos(documento: DocumentoPDF) -> Optional[SegmentoRecurso]:
+    """
+    Localiza o recurso pelos títulos das páginas.
+
+    Considera a última ocorrência de título recursal (recursos são juntados
+    ao fim dos autos); o início recua até a petição de interposição, se ela
+    estiver até MAXIMO_PAGINAS_INTERPOSICAO páginas antes, e o fim é a
+    primeira página seguinte com título de outra peça.
+    """
+    num_paginas = len(documento)
+    ancoras: List[Tuple[int, str]] = []
+    for indice in range(num_paginas):
+        titulo = _titulo_da_pagina(documento, indice, _RE_ANCORA)
+        if titulo:
+            ancoras.append((indice, titulo))
+    if not ancoras:
+        return None
+
+    #  Âncoras consecutivas (interposição + razões) formam um mesmo recurso
+    inicio, titulo = ancoras[-1]
+    for indice, titulo_anterior in reversed(ancoras[:-1]):
+        if inicio - indice > MAXIMO_PAGINAS_INTERPOSICAO:
+            break
+        inicio, titulo = indice, titulo_anterior
+
+    for indice in range(inicio - 1, max(inicio - 1 - MAXIMO_PAGINAS_INTERPOSICAO, -1), -1):
+        if _titulo_da_pagina(documento, indice, _RE_FRONTEIRA):
+            break
+        if _RE_ENDERECAMENTO.search(documento.pagina(indice).get_text("text")):
+            inicio = indice
+            break
+
+    ultima_ancora = ancoras[-1][0]
+    fim = num_paginas
+    for indice in range(ultima_ancora + 1, num_paginas):
+        if _titulo_da_pagina(documento, indice, _RE_FRONTEIRA):
+            fim = indice
+            break
+    return SegmentoRecurso(inicio, fim, "titulos", titulo)
+
+
+def localizar_recurso(documento: DocumentoPDF) -> Optional[SegmentoRecurso]:
+    """
+    Encontra o intervalo de páginas da peça recursal em autos completos.
+
+    Tenta primeiro o sumário do PDF e, na falta dele, os títulos das páginas
+    (tamanho de fonte e âncoras como 'RECURSO ESPECIAL' e 'RAZÕES').
+
+    Retorna:
+        Optional[SegmentoRecurso]: O intervalo encontrado, ou None.
+    """
+    try:
+        segmento = _segmento_pelo_sumario(documento) or _segmento_pelos_titulos(documento)
+    except Exception as e:
+        log.error(f"Erro ao segmentar os autos: {e}", exc_info=True)
+        return None
+
+    if segmento is None:
+        log.info("Nenhuma peça recursal identificada nos autos.")
+    else:
+        log.info(
+            f"Recurso localizado ({segmento.origem}): páginas {segmento.pagina_inicio + 1} a "
+            f"{segmento.pagina_fim} de {len(documento)} - '{segmento.titulo[:60]}'"
+        )
+    return segmento
@@ -1,3 +1,126 @@
+from pathlib import Path
+
 from decouple import config
 
 GEMINI_API_KEY: str = config("GEMINI_API_KEY", default="__MISSING__")
+#  Limite de chamadas simultâneas à API Gemini por processo, somando as síncronas e as
+#  assíncronas (as demais aguardam vaga)
+GEMINI_MAXIMO_CHAMADAS_SIMULTANEAS: int = config("GEMINI_MAXIMO_CHAMADAS_SIMULTANEAS", default=4, cast=int)
+#  Espera máxima por uma vaga antes de desistir da chamada (segundos)
+GEMINI_ESPERA_VAGA_SEGUNDOS: float = config("GEMINI_ESPERA_VAGA_SEGUNDOS", default=120.0, cast=float)
+#  Chamadas assíncronas (gerar_conteudo_async): limite em andamento por modelo e tempo máximo por chamada
+GEMINI_MAXIMO_CHAMADAS_ASYNC_POR_MODELO: int = config(
+    "GEMINI_MAXIMO_CHAMADAS_ASYNC_POR_MODELO", default=8, cast=int
+)
+GEMINI_TIMEOUT_CHAMADA_SEGUNDOS: float = config("GEMINI_TIMEOUT_CHAMADA_SEGUNDOS", default=120.0, cast=float)
+#  Na inicialização do app, abre a conexão com a API (count_tokens) em segundo plano
+GEMINI_AQUECER_CONEXAO: bool = config("GEMINI_AQUECER_CONEXAO", default=False, cast=bool)
+
+#  Cache de respostas do Gemini (LRU em memória + SQLite com validade em disco)
+GEMINI_CACHE_HABILITADO: bool = config("GEMINI_CACHE_HABILITADO", default=True, cast=bool)
+GEMINI_CACHE_ARQUIVO: str = config(
+    "GEMINI_CACHE_ARQUIVO",
+    default=str(Path(__file__).resolve().parents[3] / "arquivos_cache" / "respostas_gemini.sqlite3"),
+)
+GEMINI_CACHE_ITENS_MEMORIA: int = config("GEMINI_CACHE_ITENS_MEMORIA", default=256, cast=int)
+GEMINI_CACHE_TTL_HORAS: float = config("GEMINI_CACHE_TTL_HORAS", default=168.0, cast=float)
+
+#  Extração de PDF
+#  Número de processos usados na extração paralela (0 = os.cpu_count(), 1 = serial).
+#  Serial por padrão: no servidor, cada upload grande abriria o próprio pool de processos
+PDF_PROCESSOS_EXTRACAO: int = config("PDF_PROCESSOS_EXTRACAO", default=1, cast=int)
+#  Abaixo deste número de páginas a extração é sempre serial
+PDF_MINIMO_PAGINAS_PARALELO: int = config(
+    "PDF_MINIMO_PAGINAS_PARALELO", default=64, cast=int
+)
+
+#  Cache de extração (texto limpo por página, indexado pelo SHA-256 do PDF)
+PDF_CACHE_HABILITADO: bool = config("PDF_CACHE_HABILITADO", default=True, cast=bool)
+PDF_CACHE_PASTA: str = config(
+    "PDF_CACHE_PASTA",
+    default=str(Path(__file__).resolve().parents[3] / "arquivos_cache" / "extracao"),
+)
+PDF_CACHE_TAMANHO_MAXIMO_MB: int = config(
+    "PDF_CACHE_TAMANHO_MAXIMO_MB", default=256, cast=int
+)
+
+#  Uploads até este tamanho ficam em memória; acima dele vão para um arquivo temporário
+UPLOAD_LIMITE_MEMORIA_MB: int = config("UPLOAD_LIMITE_MEMORIA_MB", default=8, cast=int)
+#  Remove cabeçalhos/rodapés recorrentes (timbres, assinaturas de rodapé) antes da limpeza
+PDF_REMOVER_CABECALHO_RODAPE: bool = config(
+    "PDF_REMOVER_CABECALHO_RODAPE", default=False, cast=bool
+)
+#  Tratamento por classe de página antes da montagem dos prompts (manter | resumir | descartar).
+#  Páginas protocolares são mantidas por padrão; 'protocolar:resumir' as troca por um marcador
+PDF_POLITICA_PAGINAS: str = config(
+    "PDF_POLITICA_PAGINAS",
+    default="em_branco:descartar,protocolar:manter,digitalizada:manter",
+)
+#  Em autos completos, extrai apenas as páginas da peça recursal (segmentador_autos)
+PDF_SEGMENTAR_AUTOS: bool = config("PDF_SEGMENTAR_AUTOS", default=False, cast=bool)
+PDF_MINIMO_PAGINAS_SEGMENTACAO: int = config(
+    "PDF_MINIMO_PAGINAS_SEGMENTACAO", default=30, cast=int
+)
+#  OCR local (Tesseract) das páginas sem camada de texto
+PDF_OCR_HABILITADO: bool = config("PDF_OCR_HABILITADO", default=False, cast=bool)
+PDF_OCR_IDIOMA: str = config("PDF_OCR_IDIOMA", default="por")
+PDF_OCR_DPI: int = config("PDF_OCR_DPI", default=300, cast=int)
+PDF_OCR_PROCESSOS: int = config("PDF_OCR_PROCESSOS", default=2, cast=int)
+#  Conjunto de regras de limpeza do texto (tjgo, stj, stf ou caminho de um JSON)
+PDF_REGRAS_LIMPEZA: str = config("PDF_REGRAS_LIMPEZA", default="tjgo")
+#  Retira trechos repetidos entre páginas (qualificação, citações, assinaturas) antes dos prompts.
+#  Desligado por padrão: remove texto da peça, então deve ser habilitado conscientemente
+PDF_DEDUPLICAR_TEXTO: bool = config("PDF_DEDUPLICAR_TEXTO", default=False, cast=bool)
+
+#  Pipeline de processar_peticao: etapas independentes (dados iniciais, resumo, teses) em paralelo
+PIPELINE_ETAPAS_SIMULTANEAS: int = config("PIPELINE_ETAPAS_SIMULTANEAS", default=3, cast=int)
+#  Recursos com até esta estimativa de tokens são analisados em uma única chamada
+#  (agente_analise_combinada); 0 desliga o modo combinado
+ANALISE_COMBINADA_MAXIMO_TOKENS: int = config("ANALISE_COMBINADA_MAXIMO_TOKENS", default=0, cast=int)
+#  Recorrente e tipo de recurso vêm das regras locais quando a confiança atinge este valor;
+#  abaixo dele, o Gemini é consultado (1.01 força sempre o Gemini)
+EXTRACAO_LOCAL_CONFIANCA_MINIMA: float = config("EXTRACAO_LOCAL_CONFIANCA_MINIMA", default=0.8, cast=float)
+
+#  Orçamento de tokens dos prompts (orcamento_tokens): teto de entrada por chamada,
+#  abaixo da janela do modelo (0 = só a janela), e saída reservada quando não informada
+ORCAMENTO_MAXIMO_TOKENS_ENTRADA: int = config("ORCAMENTO_MAXIMO_TOKENS_ENTRADA", default=250_000, cast=int)
+ORCAMENTO_TOKENS_SAIDA_PADRAO: int = config("ORCAMENTO_TOKENS_SAIDA_PADRAO", default=8192, cast=int)
+#  Resumo em trechos (map-reduce) para recursos acima deste número de tokens estimados (0 = nunca)
+RESUMO_LIMIAR_TOKENS_TRECHOS: int = config("RESUMO_LIMIAR_TOKENS_TRECHOS", default=30_000, cast=int)
+RESUMO_TOKENS_POR_TRECHO: int = config("RESUMO_TOKENS_POR_TRECHO", default=6_000, cast=int)
+RESUMO_TRECHOS_SIMULTANEOS: int = config("RESUMO_TRECHOS_SIMULTANEOS", default=4, cast=int)
+
+#  Fila de tarefas em segundo plano (fila_tarefas): banco SQLite e pasta dos PDFs enviados,
+#  compartilhados pelo servidor web e pelos trabalhadores do mesmo host (disco local, não NFS/SMB)
+TAREFAS_ARQUIVO: str = config(
+    "TAREFAS_ARQUIVO",
+    default=str(Path(__file__).resolve().parents[3] / "arquivos_tarefas" / "tarefas.sqlite3"),
+)
+TAREFAS_PASTA_ARQUIVOS: str = config(
+    "TAREFAS_PASTA_ARQUIVOS",
+    default=str(Path(__file__).resolve().parents[3] / "arquivos_tarefas" / "uploads"),
+)
+#  Número de processos trabalhadores iniciados por scripts/iniciar_trabalhadores.py
+TAREFAS_TRABALHADORES: int = config("TAREFAS_TRABALHADORES", default=2, cast=int)
+#  Tentativas por tarefa antes de ir para a fila de descartadas (dead-letter), com espera
+#  exponencial a partir de TAREFAS_ESPERA_BASE_SEGUNDOS entre elas
+TAREFAS_MAXIMO_TENTATIVAS: int = config("TAREFAS_MAXIMO_TENTATIVAS", default=3, cast=int)
+TAREFAS_ESPERA_BASE_SEGUNDOS: float = config("TAREFAS_ESPERA_BASE_SEGUNDOS", default=10.0, cast=float)
+#  Uma tarefa reservada por um trabalhador que não a concluir neste prazo (processo encerrado)
+#  volta a ficar disponível; deve exceder a duração da tarefa mais longa
+TAREFAS_PRAZO_RESERVA_SEGUNDOS: float = config("TAREFAS_PRAZO_RESERVA_SEGUNDOS", default=900.0, cast=float)
+#  Intervalo entre consultas de um trabalhador ocioso à fila
+TAREFAS_INTERVALO_CONSULTA_SEGUNDOS: float = config(
+    "TAREFAS_INTERVALO_CONSULTA_SEGUNDOS", default=1.0, cast=float
+)
+
+#  Estado de cada sessão do navegador (último processamento e arquivos da minuta):
+#  "memoria" (um único processo) ou "sqlite" (vários processos no mesmo host, ex.: workers
+#  do gunicorn; SESSOES_ARQUIVO em disco local, não NFS/SMB)
+SESSOES_BACKEND: str = config("SESSOES_BACKEND", default="memoria")
+SESSOES_ARQUIVO: str = config(
+    "SESSOES_ARQUIVO",
+    default=str(Path(__file__).resolve().parents[3] / "arquivos_sessoes" / "sessoes.sqlite3"),
+)
+#  Validade do estado de uma sessão a partir da última gravação
+SESSOES_TTL_HORAS: float = config("SESSOES_TTL_HORAS", default=8.0, cast=float)
@@ -0,0 +1,130 @@
+import json
+from types import SimpleNamespace
+
+import fitz
+
+from peticionador.agentes import agente_analise_combinada
+from peticionador.agentes.agente_analise_combinada import analisar_recurso_combinado, usar_analise_combinada
+from peticionador.controladores import controlador_principal
+from peticionador.servicos import integrador_gemini
+from peticionador.servicos.integrador_gemini import ClienteGemini
+from peticionador.servicos import extrator_pdf
+
+
+class ModeloFixo:
+    """Modelo de teste: devolve sempre o mesmo texto e guarda a configuração recebida."""
+
+    def __init__(self, texto):
+        self.texto = texto
+        self.configuracoes = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.configuracoes.append(generation_config)
+        return SimpleNamespace(parts=[SimpleNamespace(text=self.texto)])
+
+
+def _usar_modelo(monkeypatch, texto) -> ModeloFixo:
+    modelo = ModeloFixo(texto)
+    cliente = ClienteGemini()
+    cliente.model_instance = modelo
+    monkeypatch.setattr(integrador_gemini, "GEMINI_CACHE_HABILITADO", False)
+    monkeypatch.setattr(agente_analise_combinada, "obter_cliente_gemini", lambda: cliente)
+    return modelo
+
+
+def test_resposta_json_vira_dados_resumo_e_teses(monkeypatch):
+    modelo = _usar_modelo(
+        monkeypatch,
+        json.dumps(
+            {
+                "recorrente": "Fulano de Tal",
+                "tipo_recurso": "REsp",
+                "relatorio": "Fulano interpôs recurso. É o sucinto relatório.",
+                "teses": ["Súmula 7/STJ", " ", "Ausência de prequestionamento"],
+            }
+        ),
+    )
+
+    analise = analisar_recurso_combinado("pg1", "texto integral", ["Súmula 7/STJ"])
+
+    assert len(modelo.configuracoes) == 1  #  nosec B101
+    assert modelo.configuracoes[0].response_mime_type == "application/json"  #  nosec B101
+    assert analise["dados_iniciais"] == {"recorrente": "Fulano de Tal", "tipo_recurso": "REsp"}  #  nosec B101
+    assert analise["resumo"].endswith("É o sucinto relatório.")  #  nosec B101
+    assert analise["teses"] == {  #  nosec B101
+        "presentes": ["Súmula 7/STJ"],
+        "sugeridas": ["Súmula 7/STJ", "Ausência de prequestionamento"],
+    }
+
+
+def test_json_malformado_ou_fora_do_esquema_retorna_none(monkeypatch):
+    for resposta in (
+        '{"recorrente": "X", "teses": [',
+        '{"recorrente": "X", "tipo_recurso": "REsp", "teses": []}',
+        '{"recorrente": "X", "tipo_recurso": "Apelação", "relatorio": "R", "teses": []}',
+        "[ERRO AO COMUNICAR COM API GEMINI: falha]",
+    ):
+        _usar_modelo(monkeypatch, resposta)
+        assert analisar_recurso_combinado("pg1", "texto", []) is None  #  nosec B101
+
+
+def test_selecao_automatica_pelo_tamanho():
+    assert usar_analise_combinada("a" * 400, limite_tokens=100)  #  nosec B101
+    assert not usar_analise_combinada("a" * 404, limite_tokens=100)  #  nosec B101
+    assert not usar_analise_combinada("a" * 40, limite_tokens=0)  #  nosec B101
+
+
+def _pdf(tmp_path) -> str:
+    documento = fitz.open()
+    for i in range(2):
+        documento.new_page().insert_text((72, 72), f"Conteudo da folha {i + 1}")
+    caminho = str(tmp_path / "recurso.pdf")
+    documento.save(caminho)
+    documento.close()
+    return caminho
+
+
+def _agentes_separados(monkeypatch, chamados):
+    monkeypatch.setattr(controlador_principal, "PDF_SEGMENTAR_AUTOS", False)
+    monkeypatch.setattr(extrator_pdf, "PDF_CACHE_HABILITADO", False)
+    monkeypatch.setattr(controlador_principal, "ANALISE_COMBINADA_MAXIMO_TOKENS", 10_000)
+    monkeypatch.setattr(
+        controlador_principal, "extrair_dados_iniciais",
+        lambda texto, blocos: chamados.append("dados") or {"recorrente": "Separado"},
+    )
+    monkeypatch.setattr(controlador_principal, "gerar_resumo_tecnico", lambda texto: chamados.append("resumo") or "R")
+    monkeypatch.setattr(
+        controlador_principal, "sugerir_teses",
+        lambda texto, modelos: chamados.append("teses") or {"sugeridas": [], "presentes": []},
+    )
+
+
+def test_pipeline_usa_uma_chamada_para_recurso_curto(tmp_path, monkeypatch):
+    chamados = []
+    _agentes_separados(monkeypatch, chamados)
+    monkeypatch.setattr(
+        controlador_principal, "analisar_recurso_combinado",
+        lambda pg1, texto, modelos: {
+            "dados_iniciais": {"recorrente": "Combinado", "tipo_recurso": "RE"},
+            "resumo": "Resumo combinado",
+            "teses": {"presentes": [], "sugeridas": ["Tese"]},
+        },
+    )
+
+    estado = controlador_principal.processar_peticao(_pdf(tmp_path), [], {})["estado"]
+
+    assert chamados == []  #  nosec B101
+    assert estado.estrutura_base["recorrente"] == "Combinado"  #  nosec B101
+    assert (estado.resumo, estado.argumentos_reutilizaveis) == ("Resumo combinado", ["Tese"])  #  nosec B101
+
+
+def test_pipeline_volta_aos_agentes_separados_se_a_combinada_falhar(tmp_path, monkeypatch):
+    chamados = []
+    _agentes_separados(monkeypatch, chamados)
+    monkeypatch.setattr(controlador_principal, "analisar_recurso_combinado", lambda pg1, texto, modelos: None)
+
+    estado = controlador_principal.processar_peticao(_pdf(tmp_path), [], {})["estado"]
+
+    assert sorted(chamados) == ["dados", "resumo", "teses"]  #  nosec B101
+    assert estado.estrutura_base["recorrente"] == "Separado"  #  nosec B101
+    assert estado.resumo == "R"  #  nosec B101
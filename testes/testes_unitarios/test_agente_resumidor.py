@@ -1,6 +1,13 @@
+import threading
+from types import SimpleNamespace
+
 import pytest
 
 from peticionador.agentes import agente_resumidor
+from peticionador.servicos import integrador_gemini
+from peticionador.servicos.cache_respostas import CacheRespostas
+from peticionador.servicos.integrador_gemini import ClienteGemini
+from peticionador.servicos.orcamento_tokens import EstimadorTokens
 
 
 #  Mock da função gerar_resumo_gemini
@@ -29,3 +36,80 @@ def test_resumo_texto_insuficiente(mock_resumidor):
     resumo = agente_resumidor.gerar_resumo_tecnico(texto)
     assert isinstance(resumo, str)  #  nosec B101
     assert len(resumo) > 0  #  nosec B101
+
+
+def _paragrafos(n: int) -> list:
+    return [f"Parágrafo {i}: o recorrente sustenta a tese número {i} com fundamento no art. {i} do CPP." for i in range(n)]
+
+
+def test_trechos_respeitam_o_limite_e_tem_fronteiras_estaveis():
+    estimador = EstimadorTokens(caracteres_por_token=1.0)
+    paragrafos = _paragrafos(200)
+    original = agente_resumidor.dividir_em_trechos("\n\n".join(paragrafos), 1000, estimador)
+
+    paragrafos[100] = "Parágrafo alterado na nova versão do recurso, com outro conteúdo."
+    alterado = agente_resumidor.dividir_em_trechos("\n\n".join(paragrafos), 1000, estimador)
+
+    assert all(len(trecho) <= 1000 for trecho in original)  #  nosec B101
+    assert "\n\n".join(original) == "\n\n".join(_paragrafos(200))  #  nosec B101
+    #  Só os trechos em volta do parágrafo alterado mudam
+    assert len(set(original) - set(alterado)) <= 2  #  nosec B101
+    assert len(set(original) & set(alterado)) >= len(original) - 2  #  nosec B101
+
+
+def test_fronteiras_nao_dependem_do_tamanho_dos_demais_paragrafos():
+    estimador = EstimadorTokens(caracteres_por_token=1.0)
+    #  Metade dos parágrafos curtos e metade longos: encurtar um longo muda a mediana dos tamanhos
+    paragrafos = [
+        f"Parágrafo {i}: " + ("o recorrente sustenta a tese. " if i % 2 else "o recorrente sustenta a tese com fundamento no art. 386 do CPP e na jurisprudência do STJ. " * 8)
+        for i in range(301)
+    ]
+    original = agente_resumidor.dividir_em_trechos("\n\n".join(paragrafos), 8000, estimador)
+
+    paragrafos[150] = "Parágrafo alterado: o recorrente desiste."
+    alterado = agente_resumidor.dividir_em_trechos("\n\n".join(paragrafos), 8000, estimador)
+
+    assert len(original) > 5  #  nosec B101
+    assert len(set(original) - set(alterado)) <= 2  #  nosec B101
+
+
+class ModeloResumidor:
+    """Modelo de teste: resume trechos e gera o relatório final, contando as chamadas."""
+
+    def __init__(self):
+        self.trechos = 0
+        self.relatorios = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None):
+        with self._lock:
+            if "--- TRECHO ---" in prompt:
+                self.trechos += 1
+                texto = f"- pontos do trecho {len(prompt)}"
+            else:
+                self.relatorios += 1
+                texto = "Relatório a partir dos resumos. É o sucinto relatório."
+        return SimpleNamespace(parts=[SimpleNamespace(text=texto)])
+
+
+def test_resumo_em_trechos_reaproveita_trechos_inalterados(tmp_path, monkeypatch):
+    cache = CacheRespostas(str(tmp_path / "respostas.sqlite3"), itens_memoria=64, ttl_segundos=3600)
+    monkeypatch.setattr(integrador_gemini, "obter_cache_respostas", lambda: cache)
+    monkeypatch.setattr(integrador_gemini, "GEMINI_CACHE_HABILITADO", True)
+    monkeypatch.setattr(agente_resumidor, "RESUMO_LIMIAR_TOKENS_TRECHOS", 500)
+    monkeypatch.setattr(agente_resumidor, "RESUMO_TOKENS_POR_TRECHO", 400)
+    modelo = ModeloResumidor()
+    cliente = ClienteGemini()
+    cliente.model_instance = modelo
+    monkeypatch.setattr(agente_resumidor, "obter_cliente_gemini", lambda: cliente)
+    paragrafos = _paragrafos(200)
+
+    resumo = agente_resumidor.gerar_resumo_tecnico("\n\n".join(paragrafos))
+    trechos_primeiro_envio = modelo.trechos
+    paragrafos[100] = "Parágrafo alterado na nova versão do recurso, com outro conteúdo."
+    agente_resumidor.gerar_resumo_tecnico("\n\n".join(paragrafos))
+
+    assert resumo.endswith("É o sucinto relatório.")  #  nosec B101
+    assert trechos_primeiro_envio > 2  #  nosec B101
+    assert modelo.trechos - trechos_primeiro_envio <= 2  #  nosec B101
+    assert modelo.relatorios == 2  #  nosec B101
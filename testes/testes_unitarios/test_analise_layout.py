@@ -0,0 +1,52 @@
+import fitz
+
+from peticionador.servicos.analise_layout import detectar_cabecalho_rodape_paginas
+from peticionador.servicos.documento_pdf import DocumentoPDF
+from peticionador.servicos.extrator_pdf import extrair_texto_pdf_separado
+
+
+def _pdf_com_timbre(num_paginas: int) -> bytes:
+    documento = fitz.open()
+    for i in range(num_paginas):
+        #  Alturas diferentes: a detecção deve normalizar pela altura de cada página
+        altura = 842 if i % 2 == 0 else 1000
+        pagina = documento.new_page(width=595, height=altura)
+        pagina.insert_text((72, 30), "DEFENSORIA PUBLICA DO ESTADO")
+        pagina.insert_text((72, altura / 2), f"Argumento numero {i + 1} do recorrente")
+        pagina.insert_text((290, altura - 20), f"{i + 1}")
+    conteudo = documento.tobytes()
+    documento.close()
+    return conteudo
+
+
+def test_detecta_timbre_e_numeracao_em_todas_as_paginas():
+    with DocumentoPDF(conteudo=_pdf_com_timbre(4)) as documento:
+        remover = detectar_cabecalho_rodape_paginas(documento)
+
+    assert sorted(remover) == [0, 1, 2, 3]  #  nosec B101
+    assert remover[2] == ["DEFENSORIA PUBLICA DO ESTADO\n", "3\n"]  #  nosec B101
+
+
+def test_extracao_opcional_sem_cabecalho_rodape():
+    conteudo = _pdf_com_timbre(3)
+    _, _, completo = extrair_texto_pdf_separado(
+        conteudo, usar_cache=False, remover_cabecalho_rodape=True
+    )
+    assert "DEFENSORIA" not in completo  #  nosec B101
+    assert "Argumento numero 2 do recorrente" in completo  #  nosec B101
+
+
+def test_timbre_com_pequeno_deslocamento_vertical():
+    #  O timbre oscila 1 pt entre as páginas; a posição não pode ser quantizada em faixas fixas
+    for y_timbre in (37, 54):
+        documento = fitz.open()
+        for i in range(6):
+            pagina = documento.new_page(width=595, height=842)
+            pagina.insert_text((72, y_timbre + i % 2), "TRIBUNAL DE JUSTICA DO ESTADO")
+            pagina.insert_text((72, 421), f"Fundamento numero {i + 1}")
+        conteudo = documento.tobytes()
+        documento.close()
+
+        with DocumentoPDF(conteudo=conteudo) as sessao:
+            remover = detectar_cabecalho_rodape_paginas(sessao, frequencia_minima=0.8)
+        assert sorted(remover) == list(range(6))  #  nosec B101
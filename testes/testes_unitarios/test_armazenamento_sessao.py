@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from peticionador.modelos.estado_peticao import EstadoPeticao
+from peticionador.modelos.interfaces.armazenamento_sessao import ArmazenamentoSessao, DadosSessao
+from peticionador.servicos.armazenamento_sessao import ArmazenamentoSessaoMemoria, ArmazenamentoSessaoSQLite
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def criar_armazenamento(request, tmp_path):
+    def criar(ttl_segundos: float = 60) -> ArmazenamentoSessao:
+        if request.param == "memoria":
+            return ArmazenamentoSessaoMemoria(ttl_segundos)
+        return ArmazenamentoSessaoSQLite(str(tmp_path / "sessoes.sqlite3"), ttl_segundos)
+    return criar
+
+
+def test_sessoes_sao_isoladas(criar_armazenamento):
+    armazenamento = criar_armazenamento()
+    estado = EstadoPeticao(resumo="Resumo", estrutura_base={"recorrente": "Fulano de Tal"}, tempos_etapas={"resumo": 1.5})
+    armazenamento.gravar("a", DadosSessao(estado=estado, arquivos={"minuta_gerada": "arquivos_gerados/m.txt"}))
+
+    assert armazenamento.obter("a") == DadosSessao(estado=estado, arquivos={"minuta_gerada": "arquivos_gerados/m.txt"})  #  nosec B101
+    assert armazenamento.obter("b") == DadosSessao()  #  nosec B101
+    armazenamento.remover("a")
+    assert armazenamento.obter("a") == DadosSessao()  #  nosec B101
+
+
+def test_sessao_expira_apos_o_ttl(criar_armazenamento):
+    armazenamento = criar_armazenamento(ttl_segundos=0.01)
+    armazenamento.gravar("a", DadosSessao(estado=EstadoPeticao(resumo="Resumo")))
+    time.sleep(0.05)
+
+    assert armazenamento.obter("a").estado is None  #  nosec B101
+    armazenamento.gravar("b", DadosSessao(estado=EstadoPeticao(resumo="Outro")))
+    time.sleep(0.05)
+    assert armazenamento.limpar_expirados() == 1  #  nosec B101
+
+
+def test_sqlite_e_compartilhado_entre_instancias(tmp_path):
+    caminho = str(tmp_path / "sessoes.sqlite3")
+    ArmazenamentoSessaoSQLite(caminho, 60).gravar("a", DadosSessao(estado=EstadoPeticao(resumo="Resumo")))
+
+    assert ArmazenamentoSessaoSQLite(caminho, 60).obter("a").estado.resumo == "Resumo"  #  nosec B101
+
+
+def test_serializacao_compacta_omite_campos_vazios():
+    estado = EstadoPeticao(resumo="Resumo " * 200)
+    conteudo = ArmazenamentoSessao.serializar(DadosSessao(estado=estado))
+
+    assert len(conteudo) < len(estado.resumo) / 10  #  nosec B101
+    assert ArmazenamentoSessao.desserializar(conteudo) == DadosSessao(estado=estado)  #  nosec B101
+    assert ArmazenamentoSessao.desserializar(ArmazenamentoSessao.serializar(DadosSessao())) == DadosSessao()  #  nosec B101
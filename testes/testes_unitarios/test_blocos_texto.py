@@ -0,0 +1,33 @@
+import fitz
+import pytest
+
+from peticionador.servicos.blocos_texto import BlocosTexto
+from peticionador.servicos.documento_pdf import DocumentoPDF
+
+
+@pytest.fixture
+def blocos() -> BlocosTexto:
+    documento = fitz.open()
+    for i in range(3):
+        pagina = documento.new_page()
+        pagina.insert_text((72, 72), f"Bloco inicial {i + 1}")
+        pagina.insert_text((72, 400), "RECORRENTE: Fulano" if i == 1 else "Outro texto")
+    with DocumentoPDF(conteudo=documento.tobytes()) as sessao:
+        resultado = BlocosTexto.de_documento(sessao)
+    documento.close()
+    return resultado
+
+
+def test_visoes_por_bloco(blocos):
+    assert len(blocos) == 6  #  nosec B101
+    assert blocos[2].pagina == 2  #  nosec B101
+    assert blocos[2].texto == "Bloco inicial 2\n"  #  nosec B101
+    assert blocos[-1].posicao[1] < 400 < blocos[-1].posicao[3]  #  nosec B101
+    assert list(blocos.indices_da_pagina(3)) == [4, 5]  #  nosec B101
+
+
+def test_busca_no_buffer_localiza_bloco(blocos):
+    ocorrencias = blocos.buscar(r"RECORRENTE:\s*(.+)")
+    assert [(blocos[i].pagina, m.group(1)) for i, m in ocorrencias] == [
+        (2, "Fulano")
+    ]  #  nosec B101
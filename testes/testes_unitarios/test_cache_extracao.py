@@ -0,0 +1,57 @@
+import shutil
+
+import fitz
+import pytest
+
+from peticionador.servicos.cache_extracao import CacheExtracao
+from peticionador.servicos.extrator_pdf import extrair_texto_pdf_separado
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    instancia = CacheExtracao(str(tmp_path / "cache"), 10 * 1024 * 1024)
+    monkeypatch.setattr(
+        "peticionador.servicos.extrator_pdf.obter_cache_extracao", lambda: instancia
+    )
+    return instancia
+
+
+def test_reenvio_do_mesmo_pdf_usa_cache(tmp_path, cache):
+    documento = fitz.open()
+    for i in range(2):
+        documento.new_page().insert_text((72, 72), f"Texto da folha {i + 1}")
+    documento.save(str(tmp_path / "a.pdf"))
+    documento.close()
+    shutil.copy(tmp_path / "a.pdf", tmp_path / "copia_com_outro_nome.pdf")
+
+    primeiro = extrair_texto_pdf_separado(str(tmp_path / "a.pdf"), usar_cache=True)
+    segundo = extrair_texto_pdf_separado(
+        str(tmp_path / "copia_com_outro_nome.pdf"), usar_cache=True
+    )
+
+    assert segundo == primeiro  #  nosec B101
+    assert cache.estatisticas() == {"acertos": 1, "falhas": 1}  #  nosec B101
+
+
+def test_remocao_lru_respeita_tamanho_maximo(tmp_path):
+    cache = CacheExtracao(str(tmp_path), tamanho_maximo_bytes=10 * 1024 * 1024)
+    cache.armazenar("antiga", [(1, "texto antigo", "texto")])
+    cache.tamanho_maximo_bytes = sum(p.stat().st_size for p in tmp_path.iterdir())
+    cache.armazenar("nova", [(1, "texto novo", "texto")])
+
+    assert cache.obter("antiga") is None  #  nosec B101
+    assert cache.obter("nova") == [(1, "texto novo", "texto")]  #  nosec B101
+
+
+def test_gravacao_em_fluxo_so_publica_ao_final(tmp_path):
+    cache = CacheExtracao(str(tmp_path), tamanho_maximo_bytes=10 * 1024 * 1024)
+    paginas = [(1, "folha um", "texto"), (2, "folha dois", "em_branco")]
+
+    interrompida = cache.armazenar_em_fluxo("interrompida", iter(paginas))
+    assert next(interrompida) == paginas[0]  #  nosec B101
+    interrompida.close()
+    assert cache.obter("interrompida") is None  #  nosec B101
+    assert not any(tmp_path.iterdir())  #  nosec B101
+
+    assert list(cache.armazenar_em_fluxo("completa", iter(paginas))) == paginas  #  nosec B101
+    assert cache.obter("completa") == paginas  #  nosec B101
@@ -0,0 +1,108 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from peticionador.servicos import integrador_gemini
+from peticionador.servicos.cache_respostas import CacheRespostas
+from peticionador.servicos.integrador_gemini import ClienteGemini
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    instancia = CacheRespostas(str(tmp_path / "respostas.sqlite3"), itens_memoria=2, ttl_segundos=3600)
+    monkeypatch.setattr(integrador_gemini, "obter_cache_respostas", lambda: instancia)
+    return instancia
+
+
+class ModeloContador:
+    """Modelo de teste: devolve as respostas na ordem e conta as chamadas."""
+
+    def __init__(self, *respostas: str):
+        self.respostas = list(respostas)
+        self.chamadas = 0
+
+    def generate_content(self, prompt, generation_config=None):
+        self.chamadas += 1
+        return SimpleNamespace(parts=[SimpleNamespace(text=self.respostas.pop(0))])
+
+
+def _cliente(modelo: ModeloContador) -> ClienteGemini:
+    cliente = ClienteGemini()
+    cliente.model_instance = modelo
+    return cliente
+
+
+def test_prompt_repetido_usa_o_cache(cache):
+    modelo = ModeloContador("Resumo do recurso.")
+    cliente = _cliente(modelo)
+
+    assert cliente.gerar_conteudo("prompt", temperatura=0.2) == "Resumo do recurso."  #  nosec B101
+    assert cliente.gerar_conteudo("prompt", temperatura=0.2) == "Resumo do recurso."  #  nosec B101
+    assert modelo.chamadas == 1  #  nosec B101
+    estatisticas = cache.estatisticas()
+    assert (estatisticas["acertos_memoria"], estatisticas["falhas"]) == (1, 1)  #  nosec B101
+
+
+def test_parametros_diferentes_e_bypass_chamam_a_api(cache):
+    modelo = ModeloContador("a", "b", "c")
+    cliente = _cliente(modelo)
+
+    cliente.gerar_conteudo("prompt", temperatura=0.2)
+    assert cliente.gerar_conteudo("prompt", temperatura=0.7) == "b"  #  nosec B101
+    assert cliente.gerar_conteudo("prompt", temperatura=0.2, usar_cache=False) == "c"  #  nosec B101
+    assert modelo.chamadas == 3  #  nosec B101
+
+
+def test_erros_e_bloqueios_nao_sao_armazenados(cache):
+    modelo = ModeloContador("[CONTEÚDO BLOQUEADO PELA API: SAFETY]", "Texto válido")
+    cliente = _cliente(modelo)
+
+    cliente.gerar_conteudo("prompt")
+    assert cliente.gerar_conteudo("prompt") == "Texto válido"  #  nosec B101
+    assert modelo.chamadas == 2  #  nosec B101
+
+
+def test_nivel_em_disco_sobrevive_a_nova_instancia_e_respeita_ttl(tmp_path):
+    caminho = str(tmp_path / "respostas.sqlite3")
+    chave = CacheRespostas.gerar_chave("modelo", "prompt", None, None)
+    CacheRespostas(caminho, itens_memoria=2, ttl_segundos=3600).armazenar(chave, "resposta", 4.5)
+
+    nova = CacheRespostas(caminho, itens_memoria=2, ttl_segundos=3600)
+    assert nova.obter(chave) == "resposta"  #  nosec B101
+    assert nova.estatisticas()["acertos_disco"] == 1  #  nosec B101
+    assert nova.estatisticas()["segundos_economizados"] == 4.5  #  nosec B101
+
+    vencida = CacheRespostas(caminho, itens_memoria=0, ttl_segundos=-1)
+    vencida.armazenar(chave, "resposta", 1.0)
+    assert vencida.obter(chave) is None  #  nosec B101
+
+
+def test_memoria_descarta_a_menos_usada(tmp_path):
+    cache = CacheRespostas(str(tmp_path / "respostas.sqlite3"), itens_memoria=2, ttl_segundos=3600)
+    for chave in ("a", "b", "c"):
+        cache.armazenar(chave, f"resposta {chave}", 1.0)
+
+    assert list(cache._memoria) == ["b", "c"]  #  nosec B101
+    assert cache.obter("a") == "resposta a"  #  nosec B101
+    assert cache.estatisticas()["acertos_disco"] == 1  #  nosec B101
+
+
+def test_conexoes_com_o_banco_sao_fechadas(cache, monkeypatch):
+    abertas = []
+    conectar = cache._conectar
+
+    def conectar_registrando():
+        conexao = conectar()
+        abertas.append(conexao)
+        return conexao
+
+    monkeypatch.setattr(cache, "_conectar", conectar_registrando)
+    cache.armazenar("chave", "resposta", 1.0)
+    cache._memoria.clear()
+    assert cache.obter("chave") == "resposta"  #  nosec B101
+
+    assert len(abertas) == 2  #  nosec B101
+    for conexao in abertas:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conexao.execute("SELECT 1")
@@ -0,0 +1,95 @@
+import fitz
+
+from peticionador.servicos.classificador_paginas import (
+    classificar_pagina,
+    interpretar_politica,
+    medir_pagina,
+)
+from peticionador.servicos.extrator_pdf import extrair_texto_pdf
+
+_ARGUMENTO = (
+    "O acordao recorrido violou o artigo 386 do Codigo de Processo Penal ao manter "
+    "a condenacao sem provas suficientes de autoria, contrariando a jurisprudencia "
+    "consolidada do Superior Tribunal de Justica sobre a materia em debate nos autos."
+)
+
+
+def _pdf_autos() -> bytes:
+    documento = fitz.open()
+    pagina = documento.new_page()
+    pagina.insert_textbox(fitz.Rect(72, 72, 520, 400), _ARGUMENTO)
+    documento.new_page()  #  em branco
+    pagina = documento.new_page()
+    pagina.insert_text((72, 72), "CERTIDAO")
+    pagina.insert_text((72, 100), "Certifico que os autos foram remetidos ao tribunal.")
+    pagina.insert_text((72, 128), "Documento assinado eletronicamente por Servidor")
+    pagina = documento.new_page()
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 40, 40), False)
+    pixmap.clear_with(200)
+    pagina.insert_image(pagina.rect, pixmap=pixmap)
+    conteudo = documento.tobytes()
+    documento.close()
+    return conteudo
+
+
+def test_classifica_cada_tipo_de_pagina():
+    with fitz.open(stream=_pdf_autos(), filetype="pdf") as documento:
+        classes = []
+        for pagina in documento:
+            texto = pagina.get_text()
+            classes.append(classificar_pagina(medir_pagina(pagina, texto), texto))
+
+    assert classes == ["texto", "em_branco", "protocolar", "digitalizada"]  #  nosec B101
+
+
+def test_politica_aplicada_na_extracao():
+    politica = interpretar_politica("em_branco:descartar,protocolar:resumir")
+    extracao = extrair_texto_pdf(_pdf_autos(), usar_cache=False, politica_paginas=politica)
+
+    assert extracao.contagem_classes == {  #  nosec B101
+        "texto": 1, "em_branco": 1, "protocolar": 1, "digitalizada": 1,
+    }
+    assert "Certifico" not in extracao.texto_completo  #  nosec B101
+    assert "[Página 3 omitida: certidão/assinatura]" in extracao.texto_completo  #  nosec B101
+    assert extracao.texto_primeira_pagina.startswith("O acordao recorrido")  #  nosec B101
+
+
+def test_politica_invalida_e_ignorada():
+    politica = interpretar_politica("protocolar:apagar,desconhecida:descartar,em_branco:descartar")
+
+    assert politica["protocolar"] == "manter"  #  nosec B101
+    assert politica["em_branco"] == "descartar"  #  nosec B101
+
+
+def test_secao_conclusao_do_recurso_nao_e_protocolar():
+    documento = fitz.open()
+    documento.new_page().insert_textbox(fitz.Rect(72, 72, 520, 400), _ARGUMENTO)
+    pagina = documento.new_page()
+    pagina.insert_text((72, 72), "CONCLUSAO")
+    pagina.insert_textbox(
+        fitz.Rect(72, 100, 520, 200),
+        "Ante o exposto, requer o conhecimento e o provimento do recurso especial, "
+        "para absolver o recorrente.",
+    )
+    pagina.insert_text((72, 240), "Goiania, 10 de maio de 2024.")
+    conteudo = documento.tobytes()
+    documento.close()
+
+    extracao = extrair_texto_pdf(conteudo, usar_cache=False)
+
+    assert extracao.contagem_classes["protocolar"] == 0  #  nosec B101
+    assert "requer o conhecimento e o provimento" in extracao.texto_completo  #  nosec B101
+
+
+def test_caracteres_substantivos_na_mesma_unidade_do_total():
+    documento = fitz.open()
+    pagina = documento.new_page()
+    texto = "Requer   o   provimento   do   recurso.\nDocumento assinado eletronicamente por Servidor\n"
+
+    metricas = medir_pagina(pagina, texto)
+    documento.close()
+
+    assert metricas.num_caracteres_substantivos == len("Requeroprovimentodorecurso.")  #  nosec B101
+    assert metricas.num_caracteres - metricas.num_caracteres_substantivos == len(  #  nosec B101
+        "DocumentoassinadoeletronicamenteporServidor"
+    )
@@ -0,0 +1,58 @@
+from peticionador.servicos.deduplicador_texto import DeduplicadorTexto
+
+RODAPE = (
+    "Avenida Olinda, Qd. G., Lt. 04, 2º andar, sala 230, Goiânia-GO\n"
+    "Processo: 0119841-30.2017.8.09.0175\n"
+    "Documento Assinado e Publicado Digitalmente em {data}\n"
+    "Assinado por DEFENSOR PUBLICO"
+)
+
+
+def test_remove_bloco_repetido_entre_paginas():
+    deduplicador = DeduplicadorTexto()
+    pagina_1 = "Razões do recurso especial.\n" + RODAPE.format(data="02/04/2025 20:08:00")
+    pagina_2 = "Da violação ao art. 157 do CPP.\n" + RODAPE.format(data="03/04/2025 09:15:12")
+
+    assert deduplicador.processar(pagina_1) == pagina_1  #  nosec B101
+    assert deduplicador.processar(pagina_2) == "Da violação ao art. 157 do CPP."  #  nosec B101
+    economia = deduplicador.economia.como_dict()
+    assert economia["linhas_removidas"] == 4  #  nosec B101
+    assert economia["trechos_removidos"] == 1  #  nosec B101
+    assert economia["tokens_estimados"] == economia["caracteres_removidos"] // 4  #  nosec B101
+
+
+def test_mantem_linhas_curtas_e_texto_unico():
+    deduplicador = DeduplicadorTexto()
+    texto = "I.\nII.\nIII.\nI.\nII.\nIII.\nConclusão única do recurso."
+
+    assert deduplicador.processar(texto) == texto  #  nosec B101
+    assert deduplicador.economia.caracteres_removidos == 0  #  nosec B101
+
+
+def test_repeticao_dentro_da_mesma_pagina():
+    citacao = (
+        "PENAL. RECEPTAÇÃO. DOLO. CIÊNCIA DA ORIGEM ILÍCITA.\n"
+        "Não demonstrado o conhecimento prévio da origem ilícita do bem,\n"
+        "impõe-se a absolvição do acusado."
+    )
+    texto = f"{citacao}\nComo se vê, a tese é pacífica.\n\n{citacao}\nPedido final."
+
+    resultado = DeduplicadorTexto().processar(texto)
+
+    assert resultado.count("RECEPTAÇÃO") == 1  #  nosec B101
+    assert resultado.endswith("Como se vê, a tese é pacífica.\n\nPedido final.")  #  nosec B101
+
+
+def test_trechos_que_diferem_so_nos_numeros_sao_mantidos():
+    deduplicador = DeduplicadorTexto()
+    fato = (
+        "Quanto ao fato {fato}, a pena-base foi fixada em {pena} anos de reclusão,\n"
+        "com aumento de {fracao} na terceira fase, nos termos do art. {artigo} do Código Penal,\n"
+        "sem fundamentação concreta que justifique a exasperação."
+    )
+    pagina_1 = fato.format(fato=1, pena=5, fracao="1/6", artigo=61)
+    pagina_2 = fato.format(fato=2, pena=8, fracao="1/3", artigo=71)
+
+    assert deduplicador.processar(pagina_1) == pagina_1  #  nosec B101
+    assert deduplicador.processar(pagina_2) == pagina_2  #  nosec B101
+    assert deduplicador.economia.caracteres_removidos == 0  #  nosec B101
@@ -0,0 +1,55 @@
+import fitz
+import pytest
+
+from peticionador.servicos.documento_pdf import DocumentoPDF
+from peticionador.servicos.extrator_pdf import (
+    extrair_blocos_texto,
+    extrair_metadados_pdf,
+    extrair_texto_pdf_separado,
+)
+
+
+@pytest.fixture
+def conteudo_pdf() -> bytes:
+    documento = fitz.open()
+    documento.set_metadata({"title": "Recurso Especial"})
+    for i in range(2):
+        documento.new_page().insert_text((72, 72), f"Texto da folha {i + 1}")
+    conteudo = documento.tobytes()
+    documento.close()
+    return conteudo
+
+
+def test_sessao_reutiliza_analise_das_paginas(conteudo_pdf):
+    with DocumentoPDF(conteudo=conteudo_pdf) as documento:
+        assert documento.dicionario(0) is documento.dicionario(0)  #  nosec B101
+        assert documento.texto(1) is documento.texto(1)  #  nosec B101
+
+        blocos = extrair_blocos_texto(documento)
+        metadados = extrair_metadados_pdf(documento)
+        primeira, demais, _ = extrair_texto_pdf_separado(documento, usar_cache=False)
+
+    assert [b["pagina"] for b in blocos] == [1, 2]  #  nosec B101
+    assert metadados["title"] == "Recurso Especial"  #  nosec B101
+    assert (primeira, demais) == ("Texto da folha 1", "Texto da folha 2")  #  nosec B101
+
+
+def test_extracao_aceita_bytes(conteudo_pdf):
+    primeira, _, _ = extrair_texto_pdf_separado(conteudo_pdf, usar_cache=False)
+    assert primeira == "Texto da folha 1"  #  nosec B101
+
+
+def test_sessao_exige_uma_unica_fonte():
+    with pytest.raises(ValueError):
+        DocumentoPDF()
+
+
+def test_extracao_sem_cache_carrega_cada_pagina_uma_vez(conteudo_pdf, monkeypatch):
+    carregadas = []
+    with DocumentoPDF(conteudo=conteudo_pdf, manter_cache=False) as documento:
+        pagina_original = DocumentoPDF.pagina
+        monkeypatch.setattr(
+            DocumentoPDF, "pagina", lambda self, i: carregadas.append(i) or pagina_original(self, i)
+        )
+        extrair_texto_pdf_separado(documento, usar_cache=False)
+    assert carregadas == [0, 1]  #  nosec B101
@@ -0,0 +1,141 @@
+import threading
+
+import fitz
+
+from peticionador.controladores import controlador_principal
+from peticionador.servicos import extrator_pdf
+from peticionador.servicos.executor_etapas import EtapaNaoExecutada, ExecutorEtapas
+
+
+def test_etapas_independentes_rodam_ao_mesmo_tempo():
+    barreira = threading.Barrier(2, timeout=5)
+
+    def etapa(valor):
+        barreira.wait()  #  Só passa se as duas etapas estiverem em execução juntas
+        return valor
+
+    with ExecutorEtapas(max_paralelo=2) as etapas:
+        etapas.agendar("resumo", etapa, "r")
+        etapas.agendar("teses", etapa, "t")
+
+    assert (etapas.resultado("resumo"), etapas.resultado("teses")) == ("r", "t")  #  nosec B101
+    assert set(etapas.tempos) == {"resumo", "teses"}  #  nosec B101
+
+
+def test_dependencia_roda_depois_e_falha_fica_isolada():
+    ordem = []
+
+    def falhar():
+        raise RuntimeError("API indisponível")
+
+    with ExecutorEtapas(max_paralelo=3) as etapas:
+        etapas.agendar("base", lambda: ordem.append("base") or 1)
+        etapas.agendar("derivada", lambda: ordem.append("derivada") or 2, depende_de=["base"])
+        etapas.agendar("quebrada", falhar)
+        etapas.agendar("orfa", lambda: 3, depende_de=["quebrada"])
+
+    assert ordem == ["base", "derivada"]  #  nosec B101
+    assert etapas.resultado("derivada") == 2  #  nosec B101
+    assert etapas.resultado("quebrada", padrao="vazio") == "vazio"  #  nosec B101
+    assert isinstance(etapas.erros["quebrada"], RuntimeError)  #  nosec B101
+    assert isinstance(etapas.erros["orfa"], EtapaNaoExecutada)  #  nosec B101
+
+
+def test_processar_peticao_isola_falha_do_resumo(tmp_path, monkeypatch):
+    documento = fitz.open()
+    for i in range(2):
+        documento.new_page().insert_text((72, 72), f"Conteudo da folha {i + 1}")
+    caminho = str(tmp_path / "recurso.pdf")
+    documento.save(caminho)
+    documento.close()
+
+    def resumo_quebrado(texto):
+        raise RuntimeError("cota excedida")
+
+    monkeypatch.setattr(controlador_principal, "PDF_SEGMENTAR_AUTOS", False)
+    monkeypatch.setattr(extrator_pdf, "PDF_CACHE_HABILITADO", False)
+    monkeypatch.setattr(controlador_principal, "extrair_dados_iniciais", lambda texto, blocos: {"recorrente": "X"})
+    monkeypatch.setattr(controlador_principal, "gerar_resumo_tecnico", resumo_quebrado)
+    monkeypatch.setattr(
+        controlador_principal, "sugerir_teses", lambda texto, modelos: {"sugeridas": ["tese"], "presentes": []}
+    )
+
+    estado = controlador_principal.processar_peticao(caminho, [], {})["estado"]
+
+    assert estado.estrutura_base["recorrente"] == "X"  #  nosec B101
+    assert estado.argumentos_reutilizaveis == ["tese"]  #  nosec B101
+    assert "cota excedida" in estado.resumo  #  nosec B101
+    assert {"extracao", "dados_iniciais", "resumo", "teses"} <= set(estado.tempos_etapas)  #  nosec B101
+    assert estado.tempo_processamento > 0  #  nosec B101
+
+
+def test_processar_peticao_passa_os_blocos_da_primeira_pagina(tmp_path, monkeypatch):
+    documento = fitz.open()
+    for i in range(2):
+        documento.new_page().insert_text((72, 72), f"Conteudo da folha {i + 1}")
+    caminho = str(tmp_path / "recurso.pdf")
+    documento.save(caminho)
+    documento.close()
+    recebidos = []
+
+    monkeypatch.setattr(controlador_principal, "PDF_SEGMENTAR_AUTOS", False)
+    monkeypatch.setattr(controlador_principal, "ANALISE_COMBINADA_MAXIMO_TOKENS", 0)
+    monkeypatch.setattr(extrator_pdf, "PDF_CACHE_HABILITADO", False)
+    monkeypatch.setattr(
+        controlador_principal, "extrair_dados_iniciais", lambda texto, blocos: recebidos.append(blocos) or {}
+    )
+    monkeypatch.setattr(controlador_principal, "gerar_resumo_tecnico", lambda texto: "Resumo.")
+    monkeypatch.setattr(
+        controlador_principal, "sugerir_teses", lambda texto, modelos: {"sugeridas": [], "presentes": []}
+    )
+
+    controlador_principal.processar_peticao(caminho, [], {})
+
+    assert len(recebidos) == 1  #  nosec B101
+    assert [(bloco.pagina, bloco.texto.strip()) for bloco in recebidos[0]] == [(1, "Conteudo da folha 1")]  #  nosec B101
+
+
+def test_concluidas_segue_a_ordem_de_conclusao():
+    liberar_lenta = threading.Event()
+    with ExecutorEtapas(max_paralelo=2) as etapas:
+        etapas.agendar("lenta", liberar_lenta.wait, 5)
+        etapas.agendar("rapida", lambda: 1)
+        ordem = []
+        for nome in etapas.concluidas(["lenta", "rapida", "nao_agendada"]):
+            ordem.append(nome)
+            liberar_lenta.set()
+
+    assert ordem == ["rapida", "lenta"]  #  nosec B101
+
+
+def test_processar_peticao_notifica_cada_etapa_ao_concluir(tmp_path, monkeypatch):
+    documento = fitz.open()
+    for i in range(2):
+        documento.new_page().insert_text((72, 72), f"Conteudo da folha {i + 1}")
+    caminho = str(tmp_path / "recurso.pdf")
+    documento.save(caminho)
+    documento.close()
+    teses_liberadas = threading.Event()
+
+    def teses_lentas(texto, modelos):
+        teses_liberadas.wait(5)
+        return {"sugeridas": ["tese"], "presentes": []}
+
+    monkeypatch.setattr(controlador_principal, "PDF_SEGMENTAR_AUTOS", False)
+    monkeypatch.setattr(extrator_pdf, "PDF_CACHE_HABILITADO", False)
+    monkeypatch.setattr(controlador_principal, "extrair_dados_iniciais", lambda texto, blocos: {"recorrente": "X"})
+    monkeypatch.setattr(controlador_principal, "gerar_resumo_tecnico", lambda texto: "Resumo.")
+    monkeypatch.setattr(controlador_principal, "sugerir_teses", teses_lentas)
+    notificadas = []
+
+    def ao_concluir_etapa(nome_etapa, estado):
+        #  O estado já traz o resultado da etapa notificada
+        notificadas.append((nome_etapa, estado.resumo, list(estado.argumentos_reutilizaveis)))
+        if nome_etapa == "resumo":
+            teses_liberadas.set()
+
+    controlador_principal.processar_peticao(caminho, [], {}, ao_concluir_etapa=ao_concluir_etapa)
+
+    assert sorted(nome for nome, _, _ in notificadas) == ["dados_iniciais", "resumo", "teses"]  #  nosec B101
+    assert ("resumo", "Resumo.", []) in notificadas  #  nosec B101
+    assert notificadas[-1] == ("teses", "Resumo.", ["tese"])  #  nosec B101
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from peticionador.agentes import agente_extrator
+from peticionador.servicos.blocos_texto import BlocosTexto
+from peticionador.servicos.extrator_dados_locais import extrair_dados_locais, extrair_numero_cnj
+
+
+@pytest.mark.parametrize(
+    "texto,recorrente,tipo",
+    [
+        ("RECORRENTE: Maria da Silva\nRecurso Especial interposto...", "Maria da Silva", "REsp"),
+        ("RECORRENTE: João Pedro, brasileiro, casado\nRecurso extraordinário contra acórdão...", "João Pedro", "RE"),
+        ("AGRAVANTE:\nFulano de Tal\nAgravo em Recurso Especial contra decisão...", "Fulano de Tal", "Agravo"),
+        ("O MP interpõe recurso constitucional sem nomear o recorrente...", "Desconhecido", "Indeterminado"),
+    ],
+)
+def test_regras_locais(texto, recorrente, tipo):
+    dados = extrair_dados_locais(texto)
+    assert (dados.recorrente, dados.tipo_recurso) == (recorrente, tipo)  #  nosec B101
+
+
+def test_confianca_cresce_com_mencoes_concordantes():
+    unica = extrair_dados_locais("RECORRENTE: Maria\nRecurso Especial")
+    repetida = extrair_dados_locais("RECORRENTE: Maria\nRecurso Especial com fundamento no art. 105, III")
+    dividida = extrair_dados_locais("RECORRENTE: Maria\nRecurso Especial e Recurso Extraordinário")
+
+    assert repetida.confianca > unica.confianca >= 0.8  #  nosec B101
+    assert (dividida.tipo_recurso, dividida.confianca) == ("Indeterminado", 0.0)  #  nosec B101
+
+
+def test_numero_cnj():
+    assert extrair_numero_cnj("Processo nº 0119841-30.2017.8.09.0175 - Goiânia") == "0119841-30.2017.8.09.0175"  #  nosec B101
+    assert extrair_numero_cnj("Processo nº 119841-30.2017") is None  #  nosec B101
+
+
+def test_rotulo_e_nome_em_blocos_lado_a_lado():
+    #  Quadro de partes: rótulos em uma coluna e nomes em outra; o texto corrido
+    #  sai na ordem das colunas e separa cada rótulo do seu nome
+    textos = ["RECORRENTE:\n", "RECORRIDO:\n", "Maria da Silva\n", "Ministério Público\n"]
+    blocos = BlocosTexto(
+        paginas=np.ones(4, dtype=np.int32),
+        bboxes=np.array(
+            [[72, 88, 150, 103], [72, 110, 150, 125], [300, 88, 450, 103], [300, 110, 450, 125]], dtype=np.float32
+        ),
+        tamanhos=np.full(4, 12, dtype=np.float32),
+        alturas=np.array([842], dtype=np.float32),
+        textos=textos,
+    )
+
+    assert extrair_dados_locais("".join(textos)).recorrente == "Desconhecido"  #  nosec B101
+    assert extrair_dados_locais("".join(textos), blocos).recorrente == "Maria da Silva"  #  nosec B101
+
+
+def test_gemini_so_e_chamado_abaixo_da_confianca_minima(monkeypatch):
+    chamadas = []
+    monkeypatch.setattr(
+        agente_extrator, "extrair_dados_iniciais_gemini",
+        lambda texto: chamadas.append(texto) or {"recorrente": "Gemini", "tipo_recurso": "RE"},
+    )
+
+    local = agente_extrator.extrair_dados_iniciais("RECORRENTE: Maria\nRecurso Especial", confianca_minima=0.8)
+    remoto = agente_extrator.extrair_dados_iniciais("Petição sem rótulos", confianca_minima=0.8)
+
+    assert local == {"recorrente": "Maria", "tipo_recurso": "REsp"}  #  nosec B101
+    assert remoto["recorrente"] == "Gemini"  #  nosec B101
+    assert len(chamadas) == 1  #  nosec B101
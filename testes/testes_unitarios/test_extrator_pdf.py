@@ -0,0 +1,75 @@
+import fitz
+
+from peticionador.servicos import extrator_pdf
+from peticionador.servicos.documento_pdf import DocumentoPDF
+from peticionador.servicos.extrator_pdf import (
+    extrair_texto_pdf_separado,
+    iterar_paginas_limpas,
+)
+
+
+def _criar_pdf(caminho, num_paginas: int) -> str:
+    documento = fitz.open()
+    for i in range(num_paginas):
+        pagina = documento.new_page()
+        pagina.insert_text((72, 72), f"Conteudo da folha {i + 1}")
+    documento.save(str(caminho))
+    documento.close()
+    return str(caminho)
+
+
+def test_extracao_separa_primeira_pagina(tmp_path):
+    caminho = _criar_pdf(tmp_path / "peticao.pdf", 3)
+    primeira, demais, completo = extrair_texto_pdf_separado(
+        caminho, num_processos=1, usar_cache=False
+    )
+    assert primeira == "Conteudo da folha 1"  #  nosec B101
+    assert demais == "Conteudo da folha 2\n\nConteudo da folha 3"  #  nosec B101
+    assert completo.startswith(primeira)  #  nosec B101
+
+
+def test_extracao_paralela_preserva_ordem(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "peticionador.servicos.extrator_pdf.PDF_MINIMO_PAGINAS_PARALELO", 1
+    )
+    caminho = _criar_pdf(tmp_path / "autos.pdf", 40)
+    serial = extrair_texto_pdf_separado(caminho, num_processos=1, usar_cache=False)
+    paralelo = extrair_texto_pdf_separado(caminho, num_processos=3, usar_cache=False)
+    assert paralelo == serial  #  nosec B101
+
+
+def test_extracao_arquivo_inexistente(tmp_path):
+    resultado = extrair_texto_pdf_separado(str(tmp_path / "nao_existe.pdf"))
+    assert resultado == (None, None, None)  #  nosec B101
+
+
+def test_iterador_produz_paginas_sob_demanda(tmp_path):
+    caminho = _criar_pdf(tmp_path / "peticao.pdf", 5)
+    iterador = iterar_paginas_limpas(caminho, num_processos=1)
+    primeira = next(iterador)
+    assert primeira.numero == 1  #  nosec B101
+    assert primeira.texto == "Conteudo da folha 1"  #  nosec B101
+    assert primeira.num_caracteres == len(primeira.texto)  #  nosec B101
+    assert [p.numero for p in iterador] == [2, 3, 4, 5]  #  nosec B101
+
+
+def test_extracao_paralela_concorrente_segue_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "peticionador.servicos.extrator_pdf.PDF_MINIMO_PAGINAS_PARALELO", 1
+    )
+    caminho = _criar_pdf(tmp_path / "autos.pdf", 8)
+    em_andamento = iterar_paginas_limpas(caminho, num_processos=2)
+    next(em_andamento)
+    assert extrator_pdf._lock_extracao_paralela.locked()  #  nosec B101
+    concorrente = [p.numero for p in iterar_paginas_limpas(caminho, num_processos=2)]
+    assert concorrente == list(range(1, 9))  #  nosec B101
+    em_andamento.close()
+    assert not extrator_pdf._lock_extracao_paralela.locked()  #  nosec B101
+
+
+def test_iterador_nao_acumula_paginas_na_sessao_recebida(tmp_path):
+    caminho = _criar_pdf(tmp_path / "peticao.pdf", 4)
+    with DocumentoPDF(caminho) as documento:
+        assert len(list(iterar_paginas_limpas(documento, num_processos=1))) == 4  #  nosec B101
+        assert documento._paginas == {} and documento._textos == {}  #  nosec B101
+        assert documento.manter_cache  #  nosec B101
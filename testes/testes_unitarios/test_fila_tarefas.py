@@ -0,0 +1,136 @@
+import threading
+import time
+
+import pytest
+
+from peticionador.servicos.fila_tarefas import (
+    CHAVE_ARQUIVO_TEMPORARIO,
+    CONCLUIDA,
+    DESCARTADA,
+    EXECUTANDO,
+    PENDENTE,
+    FilaTarefas,
+    Trabalhador,
+)
+
+
+@pytest.fixture
+def fila(tmp_path):
+    return FilaTarefas(str(tmp_path / "tarefas.sqlite3"), maximo_tentativas=2, espera_base=0, prazo_reserva=60)
+
+
+def test_tarefa_concluida_guarda_o_resultado(fila):
+    id_tarefa = fila.enfileirar("somar", {"a": 1, "b": 2})
+    trabalhador = Trabalhador(fila, {"somar": lambda p: {"soma": p["a"] + p["b"]}}, nome="t1")
+
+    assert trabalhador.executar_uma()  #  nosec B101
+    assert not trabalhador.executar_uma()  #  nosec B101
+    tarefa = fila.obter(id_tarefa)
+    assert (tarefa.estado, tarefa.tentativas, tarefa.resultado) == (CONCLUIDA, 1, {"soma": 3})  #  nosec B101
+
+
+def test_falhas_sao_repetidas_e_depois_descartadas(fila, tmp_path):
+    arquivo = tmp_path / "upload.pdf"
+    arquivo.write_bytes(b"%PDF")
+    id_tarefa = fila.enfileirar("quebrar", {CHAVE_ARQUIVO_TEMPORARIO: str(arquivo)})
+
+    def quebrar(parametros):
+        raise RuntimeError("API indisponível")
+
+    trabalhador = Trabalhador(fila, {"quebrar": quebrar}, nome="t1")
+    trabalhador.executar_uma()
+    tarefa = fila.obter(id_tarefa)
+    assert (tarefa.estado, tarefa.tentativas) == (PENDENTE, 1)  #  nosec B101
+    assert arquivo.exists()  #  nosec B101
+
+    trabalhador.executar_uma()
+    tarefa = fila.obter(id_tarefa)
+    assert (tarefa.estado, tarefa.tentativas) == (DESCARTADA, 2)  #  nosec B101
+    assert "API indisponível" in tarefa.erro  #  nosec B101
+    #  O arquivo fica para a tarefa poder ser reenfileirada
+    assert arquivo.exists()  #  nosec B101
+
+    assert fila.reenfileirar(id_tarefa)  #  nosec B101
+    assert (fila.obter(id_tarefa).estado, fila.obter(id_tarefa).tentativas) == (PENDENTE, 0)  #  nosec B101
+
+
+def test_expurgar_apaga_descartadas_e_seus_arquivos(fila, tmp_path):
+    arquivo = tmp_path / "upload.pdf"
+    arquivo.write_bytes(b"%PDF")
+    id_tarefa = fila.enfileirar("desconhecido", {CHAVE_ARQUIVO_TEMPORARIO: str(arquivo)})
+    id_pendente = fila.enfileirar("outra", {})
+    Trabalhador(fila, {}, nome="t1").executar_uma()
+
+    assert fila.expurgar(id_pendente) == 0  #  nosec B101
+    assert fila.expurgar() == 1  #  nosec B101
+    assert fila.obter(id_tarefa) is None  #  nosec B101
+    assert not arquivo.exists()  #  nosec B101
+
+
+def test_espera_exponencial_entre_tentativas(tmp_path):
+    fila = FilaTarefas(str(tmp_path / "tarefas.sqlite3"), maximo_tentativas=3, espera_base=60, prazo_reserva=60)
+    fila.enfileirar("quebrar", {})
+    trabalhador = Trabalhador(fila, {"quebrar": lambda p: 1 / 0}, nome="t1")
+
+    assert trabalhador.executar_uma()  #  nosec B101
+    #  A tarefa só volta a ficar disponível depois da espera
+    assert fila.reservar("t2") is None  #  nosec B101
+
+
+def test_tipo_sem_tratador_e_descartado_sem_repetir(fila):
+    id_tarefa = fila.enfileirar("desconhecido", {})
+    Trabalhador(fila, {}, nome="t1").executar_uma()
+    tarefa = fila.obter(id_tarefa)
+    assert (tarefa.estado, tarefa.tentativas) == (DESCARTADA, 1)  #  nosec B101
+
+
+def test_reserva_vencida_volta_para_a_fila(tmp_path):
+    fila = FilaTarefas(str(tmp_path / "tarefas.sqlite3"), maximo_tentativas=2, espera_base=0, prazo_reserva=0.01)
+    id_tarefa = fila.enfileirar("lenta", {})
+    assert fila.reservar("encerrado").estado == EXECUTANDO  #  nosec B101
+    time.sleep(0.05)
+
+    retomada = fila.reservar("t2")
+    assert (retomada.id, retomada.tentativas) == (id_tarefa, 2)  #  nosec B101
+    #  O trabalhador original já não pode concluir a tarefa
+    assert not fila.concluir(id_tarefa, "encerrado", {"ok": True})  #  nosec B101
+    assert fila.concluir(id_tarefa, "t2", {"ok": True})  #  nosec B101
+
+
+def test_trabalhadores_concorrentes_nao_repetem_tarefas(fila):
+    ids = {fila.enfileirar("registrar", {"n": n}) for n in range(20)}
+    executadas = []
+    lock = threading.Lock()
+
+    def registrar(parametros):
+        with lock:
+            executadas.append(parametros["n"])
+        return {}
+
+    def consumir(nome):
+        trabalhador = Trabalhador(fila, {"registrar": registrar}, nome=nome)
+        while trabalhador.executar_uma():
+            pass
+
+    threads = [threading.Thread(target=consumir, args=(f"t{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(executadas) == list(range(20))  #  nosec B101
+    assert fila.estatisticas() == {CONCLUIDA: len(ids)}  #  nosec B101
+
+
+def test_reserva_vencida_na_ultima_tentativa_mantem_o_arquivo(tmp_path):
+    fila = FilaTarefas(str(tmp_path / "tarefas.sqlite3"), maximo_tentativas=1, espera_base=0, prazo_reserva=0.01)
+    arquivo = tmp_path / "upload.pdf"
+    arquivo.write_bytes(b"%PDF")
+    id_tarefa = fila.enfileirar("lenta", {CHAVE_ARQUIVO_TEMPORARIO: str(arquivo)})
+    fila.reservar("encerrado")
+    time.sleep(0.05)
+
+    assert fila.reservar("t2") is None  #  nosec B101
+    assert fila.obter(id_tarefa).estado == DESCARTADA  #  nosec B101
+    assert arquivo.exists()  #  nosec B101
+    assert fila.reenfileirar(id_tarefa)  #  nosec B101
@@ -0,0 +1,228 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from peticionador.servicos import integrador_gemini
+from peticionador.servicos.cache_respostas import CacheRespostas
+from peticionador.servicos.integrador_gemini import (
+    ClienteGemini,
+    obter_cliente_gemini,
+    obter_modelo,
+    validar_esquema,
+)
+
+
+def _registro_limpo(monkeypatch):
+    monkeypatch.setattr(integrador_gemini, "GEMINI_API_KEY", "chave-de-teste")
+    monkeypatch.setattr(integrador_gemini, "_modelos", {})
+    monkeypatch.setattr(integrador_gemini, "_clientes", {})
+
+
+def test_modelo_reutilizado_por_nome(monkeypatch):
+    _registro_limpo(monkeypatch)
+    flash = obter_modelo(ClienteGemini.DEFAULT_MODEL_FLASH)
+    assert flash is obter_modelo(ClienteGemini.DEFAULT_MODEL_FLASH)  #  nosec B101
+    assert flash is not obter_modelo(ClienteGemini.DEFAULT_MODEL_PRO)  #  nosec B101
+    assert ClienteGemini().model_instance is flash  #  nosec B101
+
+
+def test_cliente_compartilhado_entre_threads(monkeypatch):
+    _registro_limpo(monkeypatch)
+    clientes = []
+    threads = [threading.Thread(target=lambda: clientes.append(obter_cliente_gemini())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(cliente) for cliente in clientes}) == 1  #  nosec B101
+    assert len(integrador_gemini._modelos) == 1  #  nosec B101
+
+
+def test_sem_chave_nao_registra_modelo(monkeypatch):
+    _registro_limpo(monkeypatch)
+    monkeypatch.setattr(integrador_gemini, "GEMINI_API_KEY", "__MISSING__")
+    assert obter_cliente_gemini().model_instance is None  #  nosec B101
+    assert integrador_gemini._modelos == {}  #  nosec B101
+
+
+def test_chamada_sem_vaga_desiste_apos_espera(monkeypatch):
+    class ModeloFixo:
+        def generate_content(self, prompt, generation_config=None):
+            raise AssertionError("não deveria chamar a API sem vaga")
+
+    vagas = threading.BoundedSemaphore(1)
+    vagas.acquire()
+    monkeypatch.setattr(integrador_gemini, "_vagas_chamadas", vagas)
+    monkeypatch.setattr(integrador_gemini, "GEMINI_ESPERA_VAGA_SEGUNDOS", 0.01)
+    cliente = ClienteGemini()
+    cliente.model_instance = ModeloFixo()
+
+    resposta = cliente.gerar_conteudo("prompt", usar_cache=False)
+
+    assert resposta.startswith("[ERRO AO COMUNICAR COM API GEMINI")  #  nosec B101
+
+
+class ModeloAssincrono:
+    """Modelo de teste para generate_content_async: registra o pico de chamadas em andamento."""
+
+    def __init__(self, espera: float):
+        self.espera = espera
+        self.em_andamento = 0
+        self.pico = 0
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        self.em_andamento += 1
+        self.pico = max(self.pico, self.em_andamento)
+        try:
+            await asyncio.sleep(self.espera)
+        finally:
+            self.em_andamento -= 1
+        return SimpleNamespace(parts=[SimpleNamespace(text=f"resposta de {prompt}")])
+
+
+def test_chamadas_assincronas_respeitam_limite_por_modelo(monkeypatch):
+    monkeypatch.setattr(integrador_gemini, "GEMINI_MAXIMO_CHAMADAS_ASYNC_POR_MODELO", 2)
+    modelo = ModeloAssincrono(espera=0.01)
+    cliente = ClienteGemini()
+    cliente.model_instance = modelo
+
+    async def _executar():
+        return await asyncio.gather(
+            *(cliente.gerar_conteudo_async(f"p{i}", usar_cache=False) for i in range(6))
+        )
+
+    respostas = asyncio.run(_executar())
+
+    assert respostas == [f"resposta de p{i}" for i in range(6)]  #  nosec B101
+    assert modelo.pico == 2  #  nosec B101
+
+
+def test_chamadas_assincronas_respeitam_limite_do_processo(monkeypatch):
+    monkeypatch.setattr(integrador_gemini, "GEMINI_MAXIMO_CHAMADAS_ASYNC_POR_MODELO", 8)
+    vagas = threading.BoundedSemaphore(2)
+    vagas.acquire()  #  Uma vaga ocupada por uma chamada síncrona
+    monkeypatch.setattr(integrador_gemini, "_vagas_chamadas", vagas)
+    modelo = ModeloAssincrono(espera=0.01)
+    cliente = ClienteGemini()
+    cliente.model_instance = modelo
+
+    async def _executar():
+        return await asyncio.gather(
+            *(cliente.gerar_conteudo_async(f"p{i}", usar_cache=False) for i in range(4))
+        )
+
+    respostas = asyncio.run(_executar())
+
+    assert respostas == [f"resposta de p{i}" for i in range(4)]  #  nosec B101
+    assert modelo.pico == 1  #  nosec B101
+    vagas.release()
+    assert vagas.acquire(blocking=False) and vagas.acquire(blocking=False)  #  nosec B101
+
+
+def test_chamada_assincrona_com_tempo_limite():
+    cliente = ClienteGemini()
+    cliente.model_instance = ModeloAssincrono(espera=1.0)
+
+    resposta = asyncio.run(cliente.gerar_conteudo_async("p", usar_cache=False, timeout=0.01))
+
+    assert resposta.startswith("[ERRO AO COMUNICAR COM API GEMINI: tempo limite")  #  nosec B101
+
+
+ESQUEMA = {
+    "type": "object",
+    "properties": {"nome": {"type": "string"}, "tipo": {"type": "string", "enum": ["RE", "REsp"]}},
+    "required": ["nome", "tipo"],
+}
+
+
+class ModeloJson:
+    """Modelo de teste: devolve as respostas na ordem e guarda as configurações recebidas."""
+
+    def __init__(self, *respostas):
+        self.respostas = list(respostas)
+        self.configuracoes = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.configuracoes.append(generation_config)
+        return SimpleNamespace(parts=[SimpleNamespace(text=self.respostas.pop(0))])
+
+
+def test_gerar_json_pede_mime_json_e_valida_o_esquema(tmp_path, monkeypatch):
+    cache = CacheRespostas(str(tmp_path / "respostas.sqlite3"), itens_memoria=4, ttl_segundos=3600)
+    monkeypatch.setattr(integrador_gemini, "obter_cache_respostas", lambda: cache)
+    modelo = ModeloJson('{"nome": "Maria", "tipo": "Apelação"}', '{"nome": "Maria", "tipo": "REsp"}')
+    cliente = ClienteGemini()
+    cliente.model_instance = modelo
+
+    assert cliente.gerar_json("prompt", ESQUEMA, max_tokens=64, usar_cache=True) is None  #  nosec B101
+    #  A resposta fora do esquema não foi para o cache: a segunda chamada vai à API
+    assert cliente.gerar_json("prompt", ESQUEMA, max_tokens=64, usar_cache=True) == {  #  nosec B101
+        "nome": "Maria",
+        "tipo": "REsp",
+    }
+    configuracao = modelo.configuracoes[-1]
+    assert configuracao.response_mime_type == "application/json"  #  nosec B101
+    assert configuracao.max_output_tokens == 64  #  nosec B101
+    assert cliente.gerar_json("prompt", ESQUEMA, max_tokens=64, usar_cache=True)["tipo"] == "REsp"  #  nosec B101
+    assert len(modelo.configuracoes) == 2  #  nosec B101
+
+
+def test_validar_esquema_aponta_o_caminho_do_erro():
+    esquema = {"type": "object", "properties": {"teses": {"type": "array", "items": {"type": "string"}}}}
+    assert validar_esquema({"teses": ["a", "b"]}, esquema) == []  #  nosec B101
+    assert validar_esquema({"teses": ["a", 2]}, esquema) == ["$.teses[1]: esperado string, recebido int"]  #  nosec B101
+
+
+class RespostaStream:
+    """Resposta de generate_content(stream=True): iterável de trechos."""
+
+    def __init__(self, *trechos: str):
+        self.trechos = [SimpleNamespace(parts=[SimpleNamespace(text=trecho)]) for trecho in trechos]
+        self.parts = []
+        self.prompt_feedback = SimpleNamespace(block_reason="SAFETY", block_reason_message="SAFETY")
+
+    def __iter__(self):
+        return iter(self.trechos)
+
+
+class ModeloStream:
+    def __init__(self, *trechos: str):
+        self.trechos = trechos
+        self.chamadas = []
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        self.chamadas.append(stream)
+        return RespostaStream(*self.trechos)
+
+
+def test_stream_entrega_trechos_e_guarda_a_resposta_completa(tmp_path, monkeypatch):
+    cache = CacheRespostas(str(tmp_path / "respostas.sqlite3"), itens_memoria=4, ttl_segundos=3600)
+    monkeypatch.setattr(integrador_gemini, "obter_cache_respostas", lambda: cache)
+    modelo = ModeloStream("EXCELENTÍSSIMO ", "SENHOR ", "DESEMBARGADOR")
+    cliente = ClienteGemini()
+    cliente.model_instance = modelo
+
+    trechos = list(cliente.gerar_conteudo_stream("prompt", temperatura=0.2, max_tokens=100, usar_cache=True))
+
+    assert trechos == ["EXCELENTÍSSIMO ", "SENHOR ", "DESEMBARGADOR"]  #  nosec B101
+    assert modelo.chamadas == [True]  #  nosec B101
+    #  Mesma chave de gerar_conteudo: a versão sem stream reaproveita a resposta
+    assert cliente.gerar_conteudo("prompt", temperatura=0.2, max_tokens=100, usar_cache=True) == (  #  nosec B101
+        "EXCELENTÍSSIMO SENHOR DESEMBARGADOR"
+    )
+    assert list(cliente.gerar_conteudo_stream("prompt", temperatura=0.2, max_tokens=100, usar_cache=True)) == [  #  nosec B101
+        "EXCELENTÍSSIMO SENHOR DESEMBARGADOR"
+    ]
+    assert modelo.chamadas == [True]  #  nosec B101
+
+
+def test_stream_sem_texto_entrega_o_bloqueio_e_libera_a_vaga(monkeypatch):
+    vagas = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(integrador_gemini, "_vagas_chamadas", vagas)
+    cliente = ClienteGemini()
+    cliente.model_instance = ModeloStream()
+
+    trechos = list(cliente.gerar_conteudo_stream("prompt", usar_cache=False))
+
+    assert trechos == ["[CONTEÚDO BLOQUEADO PELA API: SAFETY]"]  #  nosec B101
+    assert vagas.acquire(blocking=False)  #  nosec B101
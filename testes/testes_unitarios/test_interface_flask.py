@@ -0,0 +1,302 @@
+import io
+import json
+
+import fitz
+import pytest
+
+from peticionador.controladores import interface_flask, tarefas_peticao
+from peticionador.modelos.estado_peticao import EstadoPeticao
+from peticionador.modelos.interfaces.armazenamento_sessao import DadosSessao
+from peticionador.servicos.armazenamento_sessao import ArmazenamentoSessaoMemoria
+from peticionador.servicos.fila_tarefas import FilaTarefas, Trabalhador
+
+
+@pytest.fixture(autouse=True)
+def armazenamento(monkeypatch):
+    armazenamento = ArmazenamentoSessaoMemoria(ttl_segundos=60)
+    monkeypatch.setattr(interface_flask, "obter_armazenamento_sessao", lambda: armazenamento)
+    return armazenamento
+
+
+@pytest.fixture
+def cliente():
+    interface_flask.app.config["TESTING"] = True
+    return interface_flask.app.test_client()
+
+
+def _dados_da_sessao(cliente, armazenamento) -> DadosSessao:
+    with cliente.session_transaction() as sessao:
+        return armazenamento.obter(sessao["id_sessao"])
+
+
+def _pdf_em_bytes() -> bytes:
+    documento = fitz.open()
+    documento.new_page().insert_text((72, 72), "RECORRENTE: Fulano de Tal")
+    conteudo = documento.tobytes()
+    documento.close()
+    return conteudo
+
+
+def test_processar_entrega_upload_em_memoria(cliente, monkeypatch):
+    recebidos = {}
+
+    def processar_fake(caminho_arquivo_pdf, nome_arquivo="", **kwargs):
+        recebidos["tipo"] = type(caminho_arquivo_pdf)
+        recebidos["conteudo"] = bytes(caminho_arquivo_pdf)
+        recebidos["nome"] = nome_arquivo
+        return {"estado": EstadoPeticao(resumo="Resumo")}
+
+    monkeypatch.setattr(interface_flask, "processar_peticao", processar_fake)
+    arquivos_antes = set(interface_flask.UPLOAD_FOLDER.iterdir())
+    conteudo = _pdf_em_bytes()
+
+    resposta = cliente.post(
+        "/processar",
+        data={"arquivo": (io.BytesIO(conteudo), "recurso.pdf")},
+        content_type="multipart/form-data",
+    )
+
+    assert resposta.status_code == 200  #  nosec B101
+    assert recebidos["tipo"] is memoryview  #  nosec B101
+    assert recebidos["conteudo"] == conteudo  #  nosec B101
+    assert recebidos["nome"] == "recurso.pdf"  #  nosec B101
+    assert set(interface_flask.UPLOAD_FOLDER.iterdir()) == arquivos_antes  #  nosec B101
+
+
+def test_processar_grava_temporario_apenas_acima_do_limite(cliente, monkeypatch):
+    recebidos = {}
+
+    def processar_fake(caminho_arquivo_pdf, nome_arquivo="", **kwargs):
+        recebidos["caminho"] = caminho_arquivo_pdf
+        with open(caminho_arquivo_pdf, "rb") as f:
+            recebidos["conteudo"] = f.read()
+        return {"estado": EstadoPeticao()}
+
+    monkeypatch.setattr(interface_flask, "processar_peticao", processar_fake)
+    monkeypatch.setattr(interface_flask, "UPLOAD_LIMITE_MEMORIA_BYTES", 0)
+    conteudo = _pdf_em_bytes()
+
+    resposta = cliente.post(
+        "/processar",
+        data={"arquivo": (io.BytesIO(conteudo), "recurso.pdf")},
+        content_type="multipart/form-data",
+    )
+
+    assert resposta.status_code == 200  #  nosec B101
+    assert recebidos["conteudo"] == conteudo  #  nosec B101
+    assert not interface_flask.Path(recebidos["caminho"]).exists()  #  nosec B101
+
+
+def _eventos_sse(corpo: str):
+    eventos = []
+    for bloco in corpo.strip().split("\n\n"):
+        linhas = dict(linha.split(": ", 1) for linha in bloco.splitlines())
+        eventos.append((linhas["event"], json.loads(linhas["data"])))
+    return eventos
+
+
+@pytest.fixture
+def pasta_minutas(tmp_path, monkeypatch):
+    monkeypatch.setattr(interface_flask, "RAIZ_PROJETO", tmp_path)
+    monkeypatch.setattr(interface_flask, "PASTA_MINUTAS_FINAIS_IA", tmp_path)
+    return tmp_path
+
+
+_PEDIDO_MINUTA = {"resumo_tecnico": "Resumo do recurso.", "teses_selecionadas": ["Súmula 7/STJ"], "tipo_recurso": "REsp"}
+
+
+def test_minuta_em_stream_envia_trechos_e_salva_ao_final(cliente, pasta_minutas, armazenamento, monkeypatch):
+    def minuta_fake(**kwargs):
+        yield "EXCELENTÍSSIMO SENHOR\n\n"
+        assert not list(pasta_minutas.iterdir())  #  nosec B101
+        yield "Contrarrazões."
+
+    monkeypatch.setattr(interface_flask, "construir_minuta_com_ia_stream", minuta_fake)
+
+    resposta = cliente.post("/gerar_peca_com_ia_stream", json=_PEDIDO_MINUTA)
+
+    assert resposta.mimetype == "text/event-stream"  #  nosec B101
+    eventos = _eventos_sse(resposta.get_data(as_text=True))
+    assert eventos[:2] == [("trecho", {"texto": "EXCELENTÍSSIMO SENHOR\n\n"}), ("trecho", {"texto": "Contrarrazões."})]  #  nosec B101
+    evento, dados = eventos[2]
+    assert evento == "fim"  #  nosec B101
+    assert dados["minuta_gerada"] == "EXCELENTÍSSIMO SENHOR\n\nContrarrazões."  #  nosec B101
+    assert dados["arquivos"] == ["minuta_gerada", "minuta_gerada_docx", "minuta_gerada_odt"]  #  nosec B101
+    arquivos = _dados_da_sessao(cliente, armazenamento).arquivos
+    assert arquivos["minuta_gerada_odt"].endswith(".odt")  #  nosec B101
+    assert (pasta_minutas / arquivos["minuta_gerada"]).read_text(encoding="utf-8") == dados["minuta_gerada"]  #  nosec B101
+
+
+def test_minuta_em_stream_com_erro_nao_salva(cliente, pasta_minutas, monkeypatch):
+    def minuta_fake(**kwargs):
+        yield "EXCELENTÍSSIMO"
+        yield "[ERRO AO COMUNICAR COM API GEMINI: conexão perdida]"
+
+    monkeypatch.setattr(interface_flask, "construir_minuta_com_ia_stream", minuta_fake)
+
+    resposta = cliente.post("/gerar_peca_com_ia_stream", json=_PEDIDO_MINUTA)
+
+    eventos = _eventos_sse(resposta.get_data(as_text=True))
+    assert [evento for evento, _ in eventos] == ["trecho", "erro"]  #  nosec B101
+    assert "conexão perdida" in eventos[1][1]["erro"]  #  nosec B101
+    assert not list(pasta_minutas.iterdir())  #  nosec B101
+
+
+def test_minuta_em_stream_valida_o_pedido(cliente):
+    resposta = cliente.post("/gerar_peca_com_ia_stream", json={"resumo_tecnico": "Resumo"})
+    assert resposta.status_code == 400  #  nosec B101
+
+
+def test_processar_em_stream_envia_cada_etapa_e_o_resultado_final(cliente, armazenamento, monkeypatch):
+    def processar_fake(caminho_arquivo_pdf, nome_arquivo="", ao_concluir_etapa=None, **kwargs):
+        estado = EstadoPeticao(estrutura_base={"recorrente": "Fulano de Tal", "tipo_recurso": "REsp"})
+        ao_concluir_etapa("dados_iniciais", estado)
+        estado.resumo = "Resumo"
+        ao_concluir_etapa("resumo", estado)
+        estado.argumentos_reutilizaveis = ["Súmula 7/STJ"]
+        ao_concluir_etapa("teses", estado)
+        return {"estado": estado}
+
+    monkeypatch.setattr(interface_flask, "processar_peticao", processar_fake)
+
+    resposta = cliente.post(
+        "/processar_stream",
+        data={"arquivo": (io.BytesIO(_pdf_em_bytes()), "recurso.pdf")},
+        content_type="multipart/form-data",
+    )
+
+    assert resposta.mimetype == "text/event-stream"  #  nosec B101
+    eventos = _eventos_sse(resposta.get_data(as_text=True))
+    assert eventos == [  #  nosec B101
+        ("dados_iniciais", {"recorrente": "Fulano de Tal", "tipo_recurso": "REsp", "numero_processo": None}),
+        ("resumo", {"resumo": "Resumo"}),
+        ("teses", {"argumentos": ["Súmula 7/STJ"]}),
+        ("fim", {"recorrente": "Fulano de Tal", "tipo_recurso": "REsp", "numero_processo": None,
+                 "resumo": "Resumo", "argumentos": ["Súmula 7/STJ"]}),
+    ]
+    assert _dados_da_sessao(cliente, armazenamento).estado.resumo == "Resumo"  #  nosec B101
+
+
+def test_processar_em_stream_informa_erro_do_pipeline(cliente, monkeypatch):
+    def processar_fake(**kwargs):
+        raise ValueError("PDF sem camada de texto")
+
+    monkeypatch.setattr(interface_flask, "processar_peticao", processar_fake)
+
+    resposta = cliente.post(
+        "/processar_stream",
+        data={"arquivo": (io.BytesIO(_pdf_em_bytes()), "recurso.pdf")},
+        content_type="multipart/form-data",
+    )
+
+    eventos = _eventos_sse(resposta.get_data(as_text=True))
+    assert eventos == [("erro", {"erro": "Erro de processamento de dados: PDF sem camada de texto"})]  #  nosec B101
+
+
+def test_processamento_em_tarefa_e_consumido_por_trabalhador(cliente, armazenamento, tmp_path, monkeypatch):
+    fila = FilaTarefas(str(tmp_path / "tarefas.sqlite3"))
+    monkeypatch.setattr(interface_flask, "obter_fila_tarefas", lambda: fila)
+    monkeypatch.setattr(interface_flask, "TAREFAS_PASTA_ARQUIVOS", str(tmp_path / "uploads"))
+
+    def processar_fake(caminho_arquivo_pdf, nome_arquivo="", **kwargs):
+        with open(caminho_arquivo_pdf, "rb") as f:
+            assert f.read().startswith(b"%PDF")  #  nosec B101
+        return {"estado": EstadoPeticao(resumo="Resumo", estrutura_base={"recorrente": "Fulano de Tal"})}
+
+    monkeypatch.setattr(tarefas_peticao, "processar_peticao", processar_fake)
+
+    resposta = cliente.post(
+        "/tarefas/processar",
+        data={"arquivo": (io.BytesIO(_pdf_em_bytes()), "recurso.pdf")},
+        content_type="multipart/form-data",
+    )
+    assert resposta.status_code == 202  #  nosec B101
+    id_tarefa = resposta.get_json()["id"]
+    assert cliente.get(f"/tarefas/{id_tarefa}/resultado").status_code == 202  #  nosec B101
+
+    assert Trabalhador(fila, tarefas_peticao.TRATADORES, nome="teste").executar_uma()  #  nosec B101
+
+    assert cliente.get(f"/tarefas/{id_tarefa}").get_json()["estado"] == "concluida"  #  nosec B101
+    resultado = cliente.get(f"/tarefas/{id_tarefa}/resultado")
+    assert resultado.status_code == 200  #  nosec B101
+    assert resultado.get_json()["recorrente"] == "Fulano de Tal"  #  nosec B101
+    assert _dados_da_sessao(cliente, armazenamento).estado.resumo == "Resumo"  #  nosec B101
+    assert not list((tmp_path / "uploads").iterdir())  #  nosec B101
+    assert cliente.get("/tarefas/inexistente").status_code == 404  #  nosec B101
+
+
+def test_estado_do_processamento_e_separado_por_sessao(armazenamento, pasta_minutas, monkeypatch):
+    interface_flask.app.config["TESTING"] = True
+    usuario_a = interface_flask.app.test_client()
+    usuario_b = interface_flask.app.test_client()
+    recebidos = {}
+
+    def processar_fake(**kwargs):
+        return {"estado": EstadoPeticao(resumo="Resumo de A", estrutura_base={"numero_processo": "123"})}
+
+    def minuta_fake(**kwargs):
+        recebidos.update(kwargs)
+        return "Contrarrazões."
+
+    monkeypatch.setattr(interface_flask, "processar_peticao", processar_fake)
+    monkeypatch.setattr(interface_flask, "construir_minuta_com_ia", minuta_fake)
+
+    usuario_a.post(
+        "/processar",
+        data={"arquivo": (io.BytesIO(_pdf_em_bytes()), "recurso.pdf")},
+        content_type="multipart/form-data",
+    )
+    assert usuario_a.post("/gerar_peca_com_ia", json=_PEDIDO_MINUTA).status_code == 200  #  nosec B101
+    assert recebidos["resumo_tecnico"] == "Resumo de A"  #  nosec B101
+    assert recebidos["dados_processo"]["numero_processo"] == "123"  #  nosec B101
+    assert usuario_a.get("/download/minuta_gerada").status_code == 200  #  nosec B101
+
+    assert usuario_b.get("/download/minuta_gerada").status_code == 404  #  nosec B101
+    usuario_b.post("/gerar_peca_com_ia", json=_PEDIDO_MINUTA)
+    assert recebidos["resumo_tecnico"] == _PEDIDO_MINUTA["resumo_tecnico"]  #  nosec B101
+
+
+def test_falha_do_pipeline_em_tarefa_e_repetida(cliente, tmp_path, monkeypatch):
+    fila = FilaTarefas(str(tmp_path / "tarefas.sqlite3"), espera_base=0)
+    monkeypatch.setattr(interface_flask, "obter_fila_tarefas", lambda: fila)
+    monkeypatch.setattr(interface_flask, "TAREFAS_PASTA_ARQUIVOS", str(tmp_path / "uploads"))
+
+    def processar_fake(**kwargs):
+        return {"estado": EstadoPeticao(resumo="[ERRO NO PROCESSAMENTO: API indisponível]")}
+
+    monkeypatch.setattr(tarefas_peticao, "processar_peticao", processar_fake)
+
+    resposta = cliente.post(
+        "/tarefas/processar",
+        data={"arquivo": (io.BytesIO(_pdf_em_bytes()), "recurso.pdf")},
+        content_type="multipart/form-data",
+    )
+    id_tarefa = resposta.get_json()["id"]
+    Trabalhador(fila, tarefas_peticao.TRATADORES, nome="teste").executar_uma()
+
+    situacao = cliente.get(f"/tarefas/{id_tarefa}").get_json()
+    assert (situacao["estado"], situacao["tentativas"]) == ("pendente", 1)  #  nosec B101
+    assert "API indisponível" in situacao["erro"]  #  nosec B101
+    assert cliente.get(f"/tarefas/{id_tarefa}/resultado").status_code == 202  #  nosec B101
+
+
+def test_tarefa_so_e_visivel_para_a_sessao_que_a_enviou(cliente, tmp_path, monkeypatch):
+    fila = FilaTarefas(str(tmp_path / "tarefas.sqlite3"))
+    monkeypatch.setattr(interface_flask, "obter_fila_tarefas", lambda: fila)
+    monkeypatch.setattr(interface_flask, "TAREFAS_PASTA_ARQUIVOS", str(tmp_path / "uploads"))
+    monkeypatch.setattr(
+        tarefas_peticao, "processar_peticao", lambda **kwargs: {"estado": EstadoPeticao(resumo="Resumo sigiloso")}
+    )
+
+    resposta = cliente.post(
+        "/tarefas/processar",
+        data={"arquivo": (io.BytesIO(_pdf_em_bytes()), "recurso.pdf")},
+        content_type="multipart/form-data",
+    )
+    id_tarefa = resposta.get_json()["id"]
+    Trabalhador(fila, tarefas_peticao.TRATADORES, nome="teste").executar_uma()
+
+    outro_usuario = interface_flask.app.test_client()
+    assert outro_usuario.get(f"/tarefas/{id_tarefa}").status_code == 404  #  nosec B101
+    assert outro_usuario.get(f"/tarefas/{id_tarefa}/resultado").status_code == 404  #  nosec B101
+    assert cliente.get(f"/tarefas/{id_tarefa}/resultado").get_json()["resumo"] == "Resumo sigiloso"  #  nosec B101
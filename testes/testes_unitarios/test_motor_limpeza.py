@@ -0,0 +1,87 @@
+import json
+import random
+
+import pytest
+
+from peticionador.servicos.motor_limpeza import carregar_motor_limpeza
+from peticionador.servicos.preprocessador_pdf import limpar_texto_pdf, limpar_texto_pdf_sequencial
+
+AMOSTRAS = [
+    "",
+    "   \n\n  ",
+    "PODER JUDICIÁRIO\nTRIBUNAL DE JUSTIÇA DO ESTADO DE GOIÁS\nRecurso Especial",
+    "Texto  com \t espaços\n\n\n\nrepetidos",
+    "Página 3 de 40\nconteúdo\nPÁGINAS: 12",
+    "a minuta b",
+    "fim da linha \nMINUTA\n\n\ncontinua",
+    "cópia\n\n\nCOPIA provisório",
+    "Página\n\n7 depois",
+    "İstanbul  minuta  x",
+]
+
+#  Os timbres terminam em '\n': sem isso, uma remoção pode juntar linhas e a versão
+#  sequencial diverge de propósito (ver test_remocao_nao_cria_ocorrencias_de_outra_regra)
+_FRAGMENTOS = [
+    "texto", "Recurso", " ", "  ", "\t", "\n", "\n\n", "\n\n\n", "Página 3", "página 2 de 10",
+    "PODER JUDICIÁRIO\n", "Tribunal de Justiça do Estado\n", "MINUTA", "cópia", "Provisório", "x", "12", ":",
+]
+
+
+@pytest.mark.parametrize("texto", AMOSTRAS)
+def test_equivalente_a_implementacao_sequencial(texto):
+    assert limpar_texto_pdf(texto) == limpar_texto_pdf_sequencial(texto)  #  nosec B101
+
+
+def test_equivalencia_em_textos_aleatorios():
+    aleatorio = random.Random(42)
+    for _ in range(2000):
+        texto = "".join(aleatorio.choice(_FRAGMENTOS) for _ in range(aleatorio.randint(0, 15)))
+        assert limpar_texto_pdf(texto) == limpar_texto_pdf_sequencial(texto), repr(texto)  #  nosec B101
+
+
+@pytest.mark.parametrize(
+    "texto, esperado",
+    [
+        (
+            "TRIBUNAL DE JUSTIÇA DO ESTADO DE GOIÁS - PODER JUDICIÁRIO\nRECORRENTE: Fulano\nRECORRIDO: MP",
+            "RECORRENTE: Fulano\nRECORRIDO: MP",
+        ),
+        ("Tribunal de Justiça x PODER JUDICIÁRIO\nRecurso", "Recurso"),
+    ],
+)
+def test_remocao_nao_cria_ocorrencias_de_outra_regra(texto, esperado):
+    #  As regras casam com o texto original; nas passadas sequenciais, a remoção do
+    #  Poder Judiciário (com a quebra de linha) mudava o que a regra do Tribunal via
+    assert limpar_texto_pdf(texto) == esperado  #  nosec B101
+    assert limpar_texto_pdf_sequencial(texto) != esperado  #  nosec B101
+
+
+def test_regras_stj_herdam_as_gerais():
+    motor = carregar_motor_limpeza("stj")
+    texto = (
+        "Superior Tribunal de Justiça\n"
+        "Documento eletrônico VDA12345 assinado eletronicamente\n"
+        "RECURSO ESPECIAL Nº 1.234\nPágina 2 de 9\n"
+        "Imprimido em: 01/02/2024\n"
+        "Código de Controle do Documento: ABC\n"
+        "Ementa"
+    )
+
+    assert motor.limpar(texto) == "RECURSO ESPECIAL Nº 1.234\n\nEmenta"  #  nosec B101
+
+
+def test_regras_de_arquivo_json(tmp_path):
+    caminho = tmp_path / "tribunal.json"
+    caminho.write_text(
+        json.dumps({"nome": "tribunal", "regras": [{"nome": "selo", "padrao": r"selo \d+"}]}),
+        encoding="utf-8",
+    )
+    motor = carregar_motor_limpeza(str(caminho))
+
+    assert motor.limpar("Peça  SELO 42  final") == "Peça final"  #  nosec B101
+    assert motor.assinatura != carregar_motor_limpeza("tjgo").assinatura  #  nosec B101
+
+
+def test_conjunto_inexistente():
+    with pytest.raises(FileNotFoundError):
+        carregar_motor_limpeza("tribunal_inexistente")
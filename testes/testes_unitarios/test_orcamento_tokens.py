@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from peticionador.servicos.orcamento_tokens import (
+    MARCADOR_OMISSAO,
+    EstimadorTokens,
+    OrcamentoTokens,
+    SecaoPrompt,
+    limite_contexto,
+)
+
+
+def test_calibracao_usa_count_tokens_e_sobrevive_a_falha():
+    estimador = EstimadorTokens()
+    modelo = SimpleNamespace(count_tokens=lambda texto: SimpleNamespace(total_tokens=len(texto) // 5))
+    estimador.calibrar(modelo, amostra="x" * 500)
+    assert (estimador.caracteres_por_token, estimador.calibrado) == (5.0, True)  #  nosec B101
+    assert estimador.estimar("x" * 51) == 11  #  nosec B101
+
+    def falhar(texto):
+        raise RuntimeError("sem rede")
+
+    estimador.calibrar(SimpleNamespace(count_tokens=falhar))
+    assert estimador.caracteres_por_token == 5.0  #  nosec B101
+
+
+def test_limite_desconta_saida_e_respeita_teto():
+    orcamento = OrcamentoTokens("models/gemini-2.0-flash", max_tokens_saida=1000, maximo_entrada=0)
+    assert orcamento.limite == limite_contexto("models/gemini-2.0-flash") - 1000  #  nosec B101
+    assert OrcamentoTokens("models/gemini-2.0-flash", 1000, maximo_entrada=5000).limite == 5000  #  nosec B101
+
+
+def test_corta_primeiro_a_secao_de_menor_prioridade():
+    orcamento = OrcamentoTokens("modelo-de-teste", max_tokens_saida=0, maximo_entrada=600)
+    orcamento.estimador = EstimadorTokens(caracteres_por_token=1.0)
+    secoes = [
+        SecaoPrompt("modelo", "m" * 300, prioridade=2, politica="nunca"),
+        SecaoPrompt("resumo", "r" * 200, prioridade=1, politica="fim", minimo_tokens=60),
+        SecaoPrompt("anexos", "a" * 200, prioridade=0, politica="meio"),
+    ]
+
+    textos = orcamento.ajustar(secoes, texto_fixo="f" * 20)
+
+    assert textos["modelo"] == "m" * 300  #  nosec B101
+    assert textos["resumo"] == "r" * 200  #  nosec B101
+    assert len(textos["anexos"]) == 80 and MARCADOR_OMISSAO in textos["anexos"]  #  nosec B101
+    assert textos["anexos"].startswith("a") and textos["anexos"].endswith("a")  #  nosec B101
+
+
+def test_respeita_minimo_e_politica_de_inicio():
+    orcamento = OrcamentoTokens("modelo-de-teste", max_tokens_saida=0, maximo_entrada=50)
+    orcamento.estimador = EstimadorTokens(caracteres_por_token=1.0)
+    texto = "".join(str(i % 10) for i in range(200))
+
+    textos = orcamento.ajustar([SecaoPrompt("historico", texto, politica="inicio", minimo_tokens=80)])
+
+    assert len(textos["historico"]) == 80  #  nosec B101
+    assert textos["historico"].startswith(MARCADOR_OMISSAO)  #  nosec B101
+    assert textos["historico"].endswith(texto[-(80 - len(MARCADOR_OMISSAO)):])  #  nosec B101
+
+
+def test_politica_invalida():
+    with pytest.raises(ValueError):
+        SecaoPrompt("x", "texto", politica="aleatoria")
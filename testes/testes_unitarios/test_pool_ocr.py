@@ -0,0 +1,120 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz
+import pytest
+
+from peticionador.modelos.interfaces.servico_ocr import ServicoOCR
+from peticionador.servicos import extrator_pdf
+from peticionador.servicos.cache_extracao import CacheExtracao
+from peticionador.servicos.documento_pdf import DocumentoPDF
+from peticionador.servicos.pool_ocr import PoolOCR
+
+
+class OCRFixo(ServicoOCR):
+    """Motor de OCR de teste: devolve o tamanho da imagem recebida."""
+
+    def reconhecer(self, imagem_png: bytes) -> str:
+        pixmap = fitz.Pixmap(imagem_png)
+        return f"Texto reconhecido {pixmap.width}x{pixmap.height}"
+
+
+class OCRQueEncerraUmaVez(OCRFixo):
+    """Encerra o processo do pool na primeira chamada (enquanto existir o arquivo de marca)."""
+
+    def __init__(self, marca: str):
+        self.marca = marca
+
+    def reconhecer(self, imagem_png: bytes) -> str:
+        if os.path.exists(self.marca):
+            os.remove(self.marca)
+            os._exit(1)
+        return super().reconhecer(imagem_png)
+
+
+def _pdf_digitalizado() -> bytes:
+    documento = fitz.open()
+    documento.new_page().insert_text((72, 72), "Peticao com camada de texto")
+    pagina = documento.new_page(width=100, height=100)
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 20, 20), False)
+    pixmap.clear_with(128)
+    pagina.insert_image(pagina.rect, pixmap=pixmap)
+    conteudo = documento.tobytes()
+    documento.close()
+    return conteudo
+
+
+def test_ocr_apenas_nas_paginas_digitalizadas(tmp_path, monkeypatch):
+    pool = PoolOCR(OCRFixo(), num_processos=1, dpi=72, cache=CacheExtracao(str(tmp_path), 1024 * 1024))
+    monkeypatch.setattr(extrator_pdf, "obter_pool_ocr", lambda: pool)
+    try:
+        extracao = extrator_pdf.extrair_texto_pdf(_pdf_digitalizado(), usar_cache=False, usar_ocr=True)
+    finally:
+        pool.encerrar()
+
+    assert extracao.texto_primeira_pagina == "Peticao com camada de texto"  #  nosec B101
+    assert extracao.texto_demais_paginas == "Texto reconhecido 100x100"  #  nosec B101
+    metricas = pool.estatisticas()
+    assert (metricas.paginas_reconhecidas, metricas.fila_atual, metricas.fila_maxima) == (1, 0, 1)  #  nosec B101
+
+
+def test_ocr_reutiliza_cache_pela_imagem(tmp_path):
+    pool = PoolOCR(OCRFixo(), num_processos=1, dpi=72, cache=CacheExtracao(str(tmp_path), 1024 * 1024))
+    try:
+        with DocumentoPDF(conteudo=_pdf_digitalizado()) as documento:
+            primeiro = pool.submeter(documento, 1).result()
+            segundo = pool.submeter(documento, 1).result()
+    finally:
+        pool.encerrar()
+
+    assert primeiro == segundo == "Texto reconhecido 100x100"  #  nosec B101
+    assert (pool.estatisticas().paginas_reconhecidas, pool.estatisticas().acertos_cache) == (1, 1)  #  nosec B101
+
+
+def test_falha_ao_enviar_pagina_nao_descarta_a_extracao(monkeypatch):
+    class PoolQuebrado(PoolOCR):
+        def submeter(self, documento, indice):
+            raise BrokenProcessPool("processo do OCR encerrado")
+
+    pool = PoolQuebrado(OCRFixo(), num_processos=1, dpi=72)
+    monkeypatch.setattr(extrator_pdf, "obter_pool_ocr", lambda: pool)
+    extracao = extrator_pdf.extrair_texto_pdf(_pdf_digitalizado(), usar_cache=False, usar_ocr=True)
+
+    assert extracao.texto_primeira_pagina == "Peticao com camada de texto"  #  nosec B101
+    assert extracao.contagem_classes["digitalizada"] == 1  #  nosec B101
+
+
+def test_extracao_com_falha_de_ocr_nao_vai_para_o_cache(tmp_path, monkeypatch):
+    envios = []
+
+    class PoolQuebrado(PoolOCR):
+        def submeter(self, documento, indice):
+            envios.append(indice)
+            raise BrokenProcessPool("processo do OCR encerrado")
+
+    cache = CacheExtracao(str(tmp_path), 1024 * 1024)
+    monkeypatch.setattr(extrator_pdf, "obter_cache_extracao", lambda: cache)
+    monkeypatch.setattr(extrator_pdf, "obter_pool_ocr", lambda: PoolQuebrado(OCRFixo(), num_processos=1, dpi=72))
+    conteudo = _pdf_digitalizado()
+
+    extrator_pdf.extrair_texto_pdf(conteudo, usar_cache=True, usar_ocr=True)
+    extrator_pdf.extrair_texto_pdf(conteudo, usar_cache=True, usar_ocr=True)
+
+    #  Sem entrada no cache, o OCR da página é tentado de novo
+    assert envios == [1, 1]  #  nosec B101
+    assert not list(tmp_path.glob("*.tmp"))  #  nosec B101
+
+
+def test_pool_quebrado_e_recriado_no_proximo_envio(tmp_path):
+    marca = tmp_path / "encerrar"
+    marca.touch()
+    pool = PoolOCR(OCRQueEncerraUmaVez(str(marca)), num_processos=1, dpi=72)
+    try:
+        with DocumentoPDF(conteudo=_pdf_digitalizado()) as documento:
+            with pytest.raises(BrokenProcessPool):
+                pool.submeter(documento, 1).result()
+            assert pool.submeter(documento, 1).result() == "Texto reconhecido 100x100"  #  nosec B101
+    finally:
+        pool.encerrar()
+
+    assert (pool.estatisticas().paginas_com_erro, pool.estatisticas().paginas_reconhecidas) == (1, 1)  #  nosec B101
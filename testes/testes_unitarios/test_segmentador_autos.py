@@ -0,0 +1,87 @@
+import fitz
+
+from peticionador.servicos.documento_pdf import DocumentoPDF
+from peticionador.servicos.extrator_pdf import extrair_texto_pdf
+from peticionador.servicos.segmentador_autos import localizar_recurso
+
+_PECAS = [
+    ("SENTENCA", "Julgo procedente a denuncia."),
+    ("ACORDAO", "Negaram provimento ao apelo."),
+    (None, "EXCELENTISSIMO SENHOR DESEMBARGADOR PRESIDENTE\nvem interpor recurso especial."),
+    ("RAZOES DO RECURSO ESPECIAL", "Violacao ao artigo 386 do CPP."),
+    (None, "Continuacao das razoes recursais."),
+    ("CERTIDAO", "Certifico a tempestividade."),
+    ("DESPACHO", "Intime-se para contrarrazoes."),
+]
+
+
+def _pdf_autos(com_sumario: bool = False, pecas=_PECAS) -> bytes:
+    documento = fitz.open()
+    for titulo, corpo in pecas:
+        pagina = documento.new_page()
+        if titulo:
+            pagina.insert_text((72, 80), titulo.title(), fontsize=16)
+        pagina.insert_text((72, 120), corpo, fontsize=11)
+    if com_sumario:
+        documento.set_toc([[1, "Sentenca", 1], [1, "Acordao", 2], [1, "Recurso Especial", 3], [1, "Certidao", 6]])
+    conteudo = documento.tobytes()
+    documento.close()
+    return conteudo
+
+
+def test_localiza_recurso_pelos_titulos():
+    with DocumentoPDF(conteudo=_pdf_autos()) as documento:
+        segmento = localizar_recurso(documento)
+
+    assert segmento is not None  #  nosec B101
+    assert segmento.origem == "titulos"  #  nosec B101
+    #  Interposição (página 3) até a página anterior à certidão (página 5)
+    assert segmento.como_intervalo() == (2, 5)  #  nosec B101
+
+
+def test_localiza_recurso_pelo_sumario():
+    with DocumentoPDF(conteudo=_pdf_autos(com_sumario=True)) as documento:
+        segmento = localizar_recurso(documento)
+
+    assert segmento is not None  #  nosec B101
+    assert (segmento.origem, segmento.como_intervalo()) == ("sumario", (2, 5))  #  nosec B101
+
+
+def test_autos_sem_recurso():
+    documento_fitz = fitz.open()
+    documento_fitz.new_page().insert_text((72, 80), "Sentenca", fontsize=16)
+    with DocumentoPDF(conteudo=documento_fitz.tobytes()) as documento:
+        assert localizar_recurso(documento) is None  #  nosec B101
+
+
+def test_extrai_apenas_o_intervalo():
+    extracao = extrair_texto_pdf(_pdf_autos(), usar_cache=False, intervalo_paginas=(2, 5))
+
+    assert extracao.texto_primeira_pagina.startswith("EXCELENTISSIMO")  #  nosec B101
+    assert "Continuacao das razoes recursais." in extracao.texto_demais_paginas  #  nosec B101
+    assert "Julgo procedente" not in extracao.texto_completo  #  nosec B101
+    assert "Certifico" not in extracao.texto_completo  #  nosec B101
+
+
+def test_sumario_usa_o_ultimo_recurso():
+    conteudo = _pdf_autos()
+    with fitz.open(stream=conteudo, filetype="pdf") as documento_fitz:
+        documento_fitz.set_toc([
+            [1, "Recurso Extraordinario", 1], [1, "Acordao", 2],
+            [1, "Recurso Especial", 3], [1, "Razoes do Recurso Especial", 4], [1, "Certidao", 6],
+        ])
+        conteudo = documento_fitz.tobytes()
+    with DocumentoPDF(conteudo=conteudo) as documento:
+        segmento = localizar_recurso(documento)
+
+    assert (segmento.origem, segmento.como_intervalo()) == ("sumario", (2, 5))  #  nosec B101
+    assert segmento.titulo == "Recurso Especial"  #  nosec B101
+
+
+def test_ementa_transcrita_nas_razoes_nao_encerra_o_recurso():
+    pecas = list(_PECAS)
+    pecas[4] = ("EMENTA", "Transcricao da ementa do acordao recorrido.")
+    with DocumentoPDF(conteudo=_pdf_autos(pecas=pecas)) as documento:
+        segmento = localizar_recurso(documento)
+
+    assert segmento.como_intervalo() == (2, 5)  #  nosec B101